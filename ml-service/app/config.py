@@ -4,7 +4,7 @@ Pydantic Settings를 사용하여 환경 변수 로드
 """
 from pydantic_settings import BaseSettings
 from functools import lru_cache
-from typing import List
+from typing import Dict, List, Optional
 
 
 class Settings(BaseSettings):
@@ -15,10 +15,16 @@ class Settings(BaseSettings):
     APP_VERSION: str = "1.0.0"
     DEBUG: bool = False
 
-    # Supabase
-    SUPABASE_URL: str
+    # Supabase (비어 있으면 DB 없이 시작, 조회 시 실패 → JSON 학습 데이터 / 헬스체크 degraded)
+    SUPABASE_URL: str = ""
     SUPABASE_ANON_KEY: str = ""  # 공개 키 (선택적)
-    SUPABASE_SERVICE_ROLE_KEY: str
+    SUPABASE_SERVICE_ROLE_KEY: str = ""
+    # 요청 경로 조회(대원 통계 / 행 패턴 / 이력 / 헬스체크)의 회로 차단기 — 차단 중에는 마지막 정상 응답
+    SUPABASE_CALL_TIMEOUT_SECONDS: float = 2.0  # 호출 1회 타임아웃 (클라이언트 기본 120초 대신)
+    SUPABASE_CALL_RETRIES: int = 1  # 실패 시 재시도 횟수 (지수 백오프 + 지터)
+    SUPABASE_RETRY_BACKOFF_SECONDS: float = 0.1  # 재시도 백오프 기준 (attempt마다 2배, 0~기준 사이 무작위)
+    SUPABASE_BREAKER_FAILURES: int = 3  # 연속 실패 호출 수 → 차단
+    SUPABASE_BREAKER_RESET_SECONDS: float = 15.0  # 차단 후 시험 호출까지 대기
 
     # CORS
     ALLOWED_ORIGINS: List[str] = [
@@ -30,6 +36,75 @@ class Settings(BaseSettings):
     MODEL_PATH: str = "models/seat_recommender.joblib"
     MIN_TRAINING_SAMPLES: int = 10  # 개발용: 낮은 값, 프로덕션에서는 50-100 권장
 
+    # Training Data
+    CORPUS_LOADER_WORKERS: int = 8  # ml_*.json 읽기(I/O) 스레드 수 (JSON 파싱은 순차)
+    CORPUS_WATCH_ENABLED: bool = True  # training_data/ml_output 증분 수집 (백그라운드 폴링, 워커 하나만)
+    CORPUS_WATCH_INTERVAL_SECONDS: float = 30.0  # 새/변경 파일 확인 주기
+    MEMBER_STATS_HALF_LIFE_DAYS: float = 0.0  # 대원 통계 출석 가중치 반감기 (0: 감쇠 없음 = 트리거 통계와 같음, 예: 180)
+    MEMBER_STATS_WORKERS: int = 4  # 대원 통계 전체 재계산 샤드 수
+    MEMBER_STATS_UPSERT_BATCH: int = 500  # member_seat_statistics 업서트 배치 크기
+    FEATURE_STORE_DIR: str = "models/feature_store"  # 배치별 열 기반 피처 세그먼트
+    FEATURE_STORE_MAX_SEGMENTS: int = 32  # 초과 시 세그먼트 압축
+    SEAT_PAGE_SIZE: int = 1000  # DB 학습 데이터 키셋 페이지 크기 (최대 1000)
+    SEAT_PAGE_PREFETCH: int = 4  # 동시에 미리 조회하는 키 구간 수 (= 대기 페이지 상한)
+    DATABASE_URL: Optional[str] = None  # 직접 Postgres DSN (설정 시 COPY로 학습 데이터 로드, asyncpg 필요)
+    DB_POOL_MIN_SIZE: int = 1
+    DB_POOL_MAX_SIZE: int = 4  # 동시 COPY 키 구간 수 상한
+
+    # Training (조기 종료 / 모델 크기 선택)
+    EARLY_STOPPING_ROUNDS: int = 10  # 검증 손실 개선이 없으면 중단할 반복 수 (0이면 비활성)
+    EARLY_STOPPING_VALIDATION_FRACTION: float = 0.1
+    MODEL_SIZE_SELECTION: bool = True  # 근접 정확도 허용 범위 내 최소 앙상블 선택
+    MODEL_SIZE_TOLERANCE: float = 0.01  # 최고 근접 정확도 대비 허용 하락폭
+    MODEL_SIZE_VALIDATION_FRACTION: float = 0.15  # 크기 선택용 검증 분할 (학습 분할에서 떼어냄, 테스트 세트는 보고 전용)
+    PREDICT_LATENCY_BUDGET_MS: float = 50.0  # 로스터 1회 추론 지연 예산
+    LATENCY_BUDGET_ROSTER_SIZE: int = 100  # 지연 예산 측정 로스터 크기
+
+    # Training (샘플 중복 제거 / 가중치)
+    SAMPLE_DEDUP: bool = True  # 같은 피처/레이블 행을 sample_weight 샘플 하나로 합침
+    SAMPLE_DEDUP_CONTEXT_STEP: float = 0.0  # 컨텍스트 피처 비교 단위 (0이면 완전 일치만, 예: 0.02)
+    SAMPLE_CORESET_FRACTION: float = 1.0  # 레이블 칸별 가중 추출 비율 (1.0이면 비활성)
+    SAMPLE_CORESET_TOLERANCE: float = 0.01  # 벤치마크에서 허용하는 근접 정확도 하락폭
+    TRAINING_CHUNK_ROWS: int = 65536  # float32 학습 행렬을 채우는 청크 크기 (행)
+
+    # Hyperparameter Tuning (오프라인)
+    FEATURE_CACHE_DIR: str = "models/cache"  # 코퍼스 해시별 피처 행렬 캐시
+    TUNING_REPORT_PATH: str = "models/tuning_report.json"
+    TUNED_PARAMS_PATH: str = "models/tuned_params.json"  # /train이 사용하는 최적 설정
+    TUNING_N_JOBS: int = -1  # joblib 워커 수 (-1: 전체 코어)
+
+    # Model Registry
+    MODEL_REGISTRY_DIR: str = "models/registry"
+    MODEL_REGISTRY_KEEP: int = 5  # 보관할 최근 모델 번들 수
+    MODEL_MMAP_SERVING: bool = True  # 서빙 번들(비압축 추론 배열)을 mmap으로 로드 → 워커 간 페이지 공유
+
+    # Serving (섀도우 / A/B 라우팅)
+    SHADOW_MODEL_VERSION: Optional[str] = None  # 섀도우로 평가할 레지스트리 버전
+    SHADOW_SAMPLE_RATE: float = 0.1  # 섀도우 평가 샘플링 비율 (0-1)
+    AB_ROUTING_WEIGHTS: Dict[str, float] = {}  # {"<version>": weight}, 비어 있으면 primary만 사용
+
+    # Multi-tenant (테넌트별 모델 번들, 메모리 예산 LRU)
+    TENANT_MODELS_DIR: str = "models/tenants"  # <dir>/<tenant_id>/seat_recommender.joblib
+    TENANT_MODEL_CACHE_MB: float = 512.0  # 상주 테넌트 모델 메모리 예산
+    TENANT_HEADER: str = "X-Tenant-ID"  # 테넌트 지정 헤더 (경로 /tenants/{tenant_id}/recommend도 가능)
+
+    # Latency budget (/recommend 지연 예산, 초과 예상 시 규칙 기반 배치)
+    RECOMMEND_LATENCY_BUDGET_MS: Optional[float] = None  # 요청에 예산이 없을 때 기본값 (None이면 예산 없음)
+    RECOMMEND_FALLBACK_RESERVE_MS: float = 5.0  # 규칙 기반 배치 + 응답 구성에 남겨 두는 시간
+    LATENCY_BUDGET_HEADER: str = "X-Latency-Budget-Ms"  # 요청별 예산 헤더 (본문 latencyBudgetMs가 우선)
+
+    # Logging (큐 기반 구조화 로그)
+    LOG_LEVEL: str = "INFO"
+    LOG_FORMAT: str = "json"  # json (한 줄 JSON 레코드) | text (로컬 개발용)
+    LOG_DEBUG_SAMPLE_RATE: float = 0.01  # 남길 DEBUG 레코드 비율 (LOG_LEVEL=DEBUG일 때)
+
+    # Startup (백그라운드 모델 로드 / 워밍업 후 /readyz 통과)
+    IMPORT_TIME_BUDGET_MS: float = 1000.0  # app.main import 시간 예산 (tests/test_import_time.py, HEALTHCHECK start-period 5s 안)
+    MODEL_WARMUP_ENABLED: bool = True
+    MODEL_WARMUP_ROSTER_SIZES: List[int] = [40, 80, 120]  # 합성 로스터 크기 (일반적인 출석 인원)
+    MODEL_WARMUP_ROUNDS: int = 2  # 크기별 반복 횟수 (마지막 회차 지연 = 정상 상태)
+    MEMBER_STATS_CACHE_SECONDS: float = 60.0  # 추천용 대원 통계 캐시 (시작 시 미리 조회, 0이면 비활성)
+
     class Config:
         env_file = ".env"
         env_file_encoding = "utf-8"
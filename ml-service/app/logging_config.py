@@ -0,0 +1,222 @@
+"""
+구조화 로깅 (큐 기반, 요청 스레드에서 I/O 없음)
+
+- 모든 로거 → 루트의 QueueHandler → 백그라운드 QueueListener 스레드가 stdout에 기록
+  (요청 처리 스레드는 레코드를 큐에 넣기만 함 → /recommend 지연에 stdout 쓰기가 포함되지 않음)
+- LOG_FORMAT=json이면 한 줄에 JSON 레코드 하나 (ts, level, logger, msg, request_id + extra 필드)
+- 요청마다 request_id(X-Request-ID 헤더 또는 새로 생성)와 단계별 소요 시간(stage_timer)을 기록하고
+  요청 종료 시 요약 레코드 1개 (method, path, status, duration_ms, stages)
+- DEBUG 레코드는 LOG_DEBUG_SAMPLE_RATE 비율만 남김 (파일별/행별 같은 대량 로그)
+- 레벨은 LOG_LEVEL
+- 서비스는 lifespan 시작 시 setup_logging, 종료 시 shutdown_logging (import만으로는 로깅 설정을 바꾸지 않음)
+"""
+import atexit
+import json
+import logging
+import logging.handlers
+import queue
+import random
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.config import settings
+
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+request_stages_var: ContextVar[Optional[Dict[str, float]]] = ContextVar("request_stages", default=None)
+
+# LogRecord 기본 속성 (나머지는 extra로 넘긴 구조화 필드)
+_RECORD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {"message", "asctime", "request_id"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_UVICORN_LOGGERS = ("uvicorn", "uvicorn.error", "uvicorn.access")
+_previous_config: Dict[str, Tuple[List[logging.Handler], int, bool]] = {}  # 로거 이름 → 설정 전 (핸들러, 레벨, 전파)
+
+logger = logging.getLogger("app.request")
+
+
+class RequestContextFilter(logging.Filter):
+    """요청 ID 부착 + DEBUG 샘플링 (큐에 넣기 전, 호출 스레드에서 실행)"""
+
+    def __init__(self, debug_sample_rate: float):
+        super().__init__()
+        self.debug_sample_rate = debug_sample_rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno <= logging.DEBUG and self.debug_sample_rate < 1.0:
+            if random.random() >= self.debug_sample_rate:
+                return False
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """한 줄 JSON 레코드"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        payload: Dict[str, Any] = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            payload["request_id"] = request_id
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                payload[key] = value
+        if record.exc_text:
+            payload["exc_info"] = record.exc_text
+        return json.dumps(payload, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """로컬 개발용 텍스트 (요청 ID와 extra 필드를 뒤에 붙임)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = f"{self.formatTime(record, '%H:%M:%S')} {record.levelname:<7} {record.getMessage()}"
+        extra = {k: v for k, v in vars(record).items() if k not in _RECORD_ATTRS and not k.startswith("_")}
+        request_id = getattr(record, "request_id", None)
+        if request_id:
+            extra = {"request_id": request_id, **extra}
+        if extra:
+            line += " " + json.dumps(extra, ensure_ascii=False, default=str)
+        if record.exc_text:
+            line += "\n" + record.exc_text
+        return line
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """extra 필드를 유지한 채 큐에 넣음 (JSON 직렬화는 리스너 스레드에서)"""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            # 트레이스백(프레임 참조)은 호출 스레드에서 문자열로 바꿔 둠
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+def setup_logging(level: Optional[str] = None, fmt: Optional[str] = None):
+    """
+    루트 로거를 큐 핸들러로 교체하고 리스너 시작 (여러 번 호출해도 한 번만 시작)
+
+    교체 전 루트 / uvicorn 로거 설정은 shutdown_logging에서 되돌림
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    for name in ("", *_UVICORN_LOGGERS):
+        target = logging.getLogger(name)
+        _previous_config[name] = (list(target.handlers), target.level, target.propagate)
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter() if (fmt or settings.LOG_FORMAT) == "json" else TextFormatter())
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    handler = _QueueHandler(log_queue)
+    handler.addFilter(RequestContextFilter(settings.LOG_DEBUG_SAMPLE_RATE))
+
+    root = logging.getLogger()
+    root.handlers = [handler]
+    root.setLevel((level or settings.LOG_LEVEL).upper())
+
+    # uvicorn 로그도 같은 큐로 (접근 로그는 요청 요약 레코드가 대신함)
+    for name in _UVICORN_LOGGERS:
+        uvicorn_logger = logging.getLogger(name)
+        uvicorn_logger.handlers = []
+        uvicorn_logger.propagate = True
+    logging.getLogger("uvicorn.access").setLevel(logging.WARNING)
+
+    _listener = logging.handlers.QueueListener(log_queue, stream, respect_handler_level=False)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging():
+    """큐에 남은 레코드를 모두 기록하고 리스너 종료, 루트 / uvicorn 로거 설정 복원"""
+    global _listener
+    if _listener is None:
+        return
+    _listener.stop()
+    _listener = None
+    atexit.unregister(shutdown_logging)
+
+    for name, (handlers, level, propagate) in _previous_config.items():
+        target = logging.getLogger(name)
+        target.handlers = handlers
+        target.setLevel(level)
+        target.propagate = propagate
+    _previous_config.clear()
+
+
+@contextmanager
+def stage_timer(stage: str) -> Iterator[None]:
+    """요청 단계 소요 시간 기록 (요청 요약 레코드의 stages에 ms로 포함)"""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        stages = request_stages_var.get()
+        if stages is not None:
+            stages[stage] = round(stages.get(stage, 0.0) + (time.perf_counter() - start) * 1000, 3)
+
+
+class RequestContextMiddleware:
+    """
+    요청 ID / 단계 시간 컨텍스트 + 요청 요약 레코드 (순수 ASGI, 응답 본문을 감싸지 않음)
+
+    헬스체크(/health, /readyz)는 DEBUG로 기록해 샘플링 대상
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        header = REQUEST_ID_HEADER.lower().encode("latin-1")
+        request_id = next(
+            (value.decode("latin-1") for key, value in scope.get("headers", []) if key == header),
+            None,
+        ) or uuid.uuid4().hex
+        request_id = request_id[:128]
+        stages: Dict[str, float] = {}
+        id_token = request_id_var.set(request_id)
+        stages_token = request_stages_var.set(stages)
+        status = {"code": 500}
+        start = time.perf_counter()
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                status["code"] = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(header, request_id.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            path = scope.get("path", "")
+            level = logging.DEBUG if path.endswith(("/health", "/readyz")) else logging.INFO
+            logger.log(level, f"{scope.get('method')} {path} {status['code']}", extra={
+                "method": scope.get("method"),
+                "path": path,
+                "status": status["code"],
+                "duration_ms": round((time.perf_counter() - start) * 1000, 3),
+                "stages": stages,
+            })
+            request_stages_var.reset(stages_token)
+            request_id_var.reset(id_token)
@@ -7,31 +7,54 @@ Features:
 - Supabase 연동으로 학습 데이터 로드
 - 실시간 추천 및 모델 재학습 API
 """
+import logging
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 
 from app.config import settings
+from app.logging_config import REQUEST_ID_HEADER, RequestContextMiddleware, setup_logging, shutdown_logging
 from app.routers import recommend, train, health
-from app.models.seat_recommender import recommender
+from app.services.postgres_reader import postgres_reader
+from app.services.supabase_client import supabase_service
+from app.services.corpus_watcher import corpus_watcher
+from app.services.startup import service_startup
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """애플리케이션 라이프사이클 관리"""
-    # 시작 시: 모델 로드 시도
-    print(f"[ML Service] Starting {settings.APP_NAME} v{settings.APP_VERSION}")
+    # 로깅은 가장 먼저 설정 (큐 리스너 시작, uvicorn 로그도 같은 형식으로)
+    # import 시점이 아니라 여기서: app을 import만 하는 도구/테스트의 루트 핸들러를 바꾸지 않음
+    setup_logging()
+    logger.info(f"[ML Service] Starting {settings.APP_NAME} v{settings.APP_VERSION}")
+
+    # 외부 클라이언트는 import 시점이 아니라 여기서 생성 (설정 누락 시에도 서비스는 시작)
     try:
-        recommender.load_model()
-        print("[ML Service] Model loaded successfully")
+        supabase_service.connect()
     except Exception as e:
-        print(f"[ML Service] No pre-trained model found: {e}")
-        print("[ML Service] Call /api/v1/train to train a new model")
+        logger.warning(f"[ML Service] Supabase client unavailable: {e}")
+
+    # 모델 로드(섀도우/A/B 포함) + 통계 조회 + 워밍업은 백그라운드에서 (완료 시 /readyz 통과)
+    service_startup.start()
+
+    # JSON 학습 코퍼스 증분 수집 시작 (워커 하나만, 첫 스캔은 워밍업이 끝난 뒤)
+    if settings.CORPUS_WATCH_ENABLED:
+        corpus_watcher.start(after=service_startup.wait())
 
     yield
 
     # 종료 시: 정리 작업
-    print("[ML Service] Shutting down...")
+    logger.info("[ML Service] Shutting down...")
+    try:
+        await service_startup.stop()
+        await corpus_watcher.stop()
+        await postgres_reader.close()
+    finally:
+        shutdown_logging()  # 남은 로그 기록 후 리스너 종료 (마지막에)
 
 
 app = FastAPI(
@@ -50,8 +73,12 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[REQUEST_ID_HEADER],
 )
 
+# 요청 ID / 단계별 시간 / 요청 요약 로그 (가장 바깥 미들웨어)
+app.add_middleware(RequestContextMiddleware)
+
 # 라우터 등록
 app.include_router(health.router, prefix="/api/v1", tags=["Health"])
 app.include_router(recommend.router, prefix="/api/v1", tags=["Recommend"])
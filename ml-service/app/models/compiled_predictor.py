@@ -0,0 +1,257 @@
+"""
+평탄화(컴파일)된 트리 앙상블 추론기
+
+sklearn GradientBoostingClassifier의 수천 개 DecisionTreeRegressor 객체를
+연속된 NumPy 배열(피처 인덱스, 임계값, 완전 이진 트리 배치, 리프 값)로 변환하고,
+로스터 전체에 대해 모든 트리를 한 번에 평가하는 벡터화 추론기
+
+sklearn 결과와 정확히 일치하도록 동일한 연산 순서를 따름:
+- 스케일링은 학습 경로(scale_in_place)와 같이 float32로 변환 후 평균 빼기 → 표준편차 나누기
+- 스케일링된 float32 입력을 임계값과 비교 (X <= threshold → 왼쪽)
+- 초기 예측값에 stage 순서대로 learning_rate * leaf_value 누적
+"""
+from typing import TYPE_CHECKING, Dict, Tuple
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from sklearn.ensemble import GradientBoostingClassifier
+    from sklearn.preprocessing import StandardScaler
+
+
+TREE_LEAF = -1
+
+
+class CompiledEnsemble:
+    """
+    GradientBoostingClassifier의 평탄화 표현
+
+    모든 트리를 깊이 D의 완전 이진 트리(힙 순서)로 패딩하여
+    자식 노드 포인터 없이 인덱스 연산(2i+1, 2i+2)만으로 순회
+    - feature: (n_trees, 2^D - 1) 내부 노드의 피처 인덱스
+    - threshold: (n_trees, 2^D - 1) float32 임계값 (float64 원본을 내림 → 비교 결과 동일)
+    - leaf_value: (n_trees, 2^D) 리프 값
+    깊이 D 이전에 끝나는 리프는 임계값 +inf(항상 왼쪽)로 패딩하고 값을 아래로 전파
+    """
+
+    ARRAY_KEYS = ("feature", "threshold", "leaf_value", "init_raw", "classes", "params")
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        self.feature = arrays["feature"]
+        self.threshold = arrays["threshold"]
+        self.leaf_value = arrays["leaf_value"]
+        self.init_raw = arrays["init_raw"]
+        self.classes = arrays["classes"]
+        self.params = arrays["params"]  # [learning_rate, n_stages, n_trees_per_stage, depth]
+
+        self.learning_rate = float(self.params[0])
+        self.n_stages = int(self.params[1])
+        self.n_trees_per_stage = int(self.params[2])
+        self.depth = int(self.params[3])
+
+    @classmethod
+    def from_sklearn(cls, model: "GradientBoostingClassifier") -> "CompiledEnsemble":
+        """학습된 sklearn 모델을 평탄화"""
+        n_stages, k = model.estimators_.shape
+
+        # stage 우선, 클래스 순서로 트리 나열 (estimators_[stage, k])
+        trees = [model.estimators_[stage, class_idx].tree_
+                 for stage in range(n_stages) for class_idx in range(k)]
+        depth = max(tree.max_depth for tree in trees)
+
+        # 전체 트리의 노드를 하나의 배열로 연결 (리프는 자기 자신을 자식으로 가리킴)
+        features, thresholds, lefts, rights, values, is_leaf, roots = [], [], [], [], [], [], []
+        offset = 0
+        for tree in trees:
+            node_ids = np.arange(tree.node_count)
+            leaf = tree.children_left == TREE_LEAF
+            features.append(tree.feature)
+            thresholds.append(tree.threshold)
+            lefts.append(np.where(leaf, node_ids, tree.children_left) + offset)
+            rights.append(np.where(leaf, node_ids, tree.children_right) + offset)
+            values.append(tree.value.reshape(tree.node_count, -1)[:, 0])
+            is_leaf.append(leaf)
+            roots.append(offset)
+            offset += tree.node_count
+
+        feature_all = np.concatenate(features)
+        threshold_all = np.concatenate(thresholds).astype(np.float64)
+        left_all = np.concatenate(lefts)
+        right_all = np.concatenate(rights)
+        value_all = np.concatenate(values).astype(np.float64)
+        leaf_all = np.concatenate(is_leaf)
+
+        # 깊이 단위로 완전 이진 트리 위치에 노드 배치
+        n_trees = len(trees)
+        current = np.array(roots, dtype=np.intp)[:, np.newaxis]
+        level_features, level_thresholds = [], []
+        for _ in range(depth):
+            leaf = leaf_all[current]
+            level_features.append(np.where(leaf, 0, feature_all[current]))
+            level_thresholds.append(np.where(leaf, np.inf, threshold_all[current]))
+
+            children = np.empty((n_trees, current.shape[1] * 2), dtype=np.intp)
+            children[:, 0::2] = left_all[current]
+            children[:, 1::2] = right_all[current]
+            current = children
+
+        feature = (
+            np.concatenate(level_features, axis=1) if depth else np.zeros((n_trees, 0))
+        ).astype(np.int32)
+        threshold = (
+            np.concatenate(level_thresholds, axis=1) if depth else np.zeros((n_trees, 0))
+        )
+
+        # init 추정기(사전 확률)의 raw 예측값은 입력과 무관한 상수
+        n_features = model.n_features_in_
+        init_raw = model._raw_predict_init(np.zeros((1, n_features), dtype=np.float32))[0]
+
+        return cls({
+            "feature": np.ascontiguousarray(feature),
+            "threshold": np.ascontiguousarray(_round_down_to_float32(threshold)),
+            "leaf_value": np.ascontiguousarray(value_all[current]),
+            "init_raw": np.asarray(init_raw, dtype=np.float64),
+            "classes": np.asarray(model.classes_),
+            "params": np.array([model.learning_rate, n_stages, k, depth], dtype=np.float64),
+        })
+
+    def to_arrays(self, prefix: str) -> Dict[str, np.ndarray]:
+        """저장용 배열 딕셔너리"""
+        return {f"{prefix}_{key}": getattr(self, key) for key in self.ARRAY_KEYS}
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray], prefix: str) -> "CompiledEnsemble":
+        """저장된 배열 딕셔너리에서 복원"""
+        return cls({key: arrays[f"{prefix}_{key}"] for key in cls.ARRAY_KEYS})
+
+    @property
+    def n_trees(self) -> int:
+        return self.feature.shape[0]
+
+    @property
+    def nbytes(self) -> int:
+        return sum(getattr(self, key).nbytes for key in self.ARRAY_KEYS)
+
+    def leaf_values(self, X: np.ndarray) -> np.ndarray:
+        """모든 트리의 리프 값 (n_stages, n_trees_per_stage, n_samples)"""
+        X32 = np.ascontiguousarray(X, dtype=np.float32)
+        n_samples = X32.shape[0]
+        n_internal = self.feature.shape[1]
+
+        # 피처-우선으로 펼친 입력에서 (feature * n_samples + sample) 위치를 한 번에 조회
+        X_flat = np.ascontiguousarray(X32.T).ravel()
+        feature_offset = self.feature.ravel().astype(np.intp) * n_samples
+        threshold = self.threshold.ravel()
+        sample_idx = np.arange(n_samples, dtype=np.intp)[np.newaxis, :]
+
+        # (n_trees, n_samples) 노드 위치를 깊이 단위로 동시에 전진
+        # 평탄 인덱스 = base + local, 자식 = base + 2 * local + 1 + go_right
+        base = np.arange(self.n_trees, dtype=np.intp)[:, np.newaxis] * n_internal
+        step = 1 - base
+        nodes = np.repeat(base, n_samples, axis=1)
+        for _ in range(self.depth):
+            go_right = X_flat[feature_offset[nodes] + sample_idx] > threshold[nodes]
+            nodes *= 2
+            nodes += step
+            nodes += go_right
+
+        leaf_base = np.arange(self.n_trees, dtype=np.intp)[:, np.newaxis] * (n_internal + 1)
+        leaves = self.leaf_value.ravel()[nodes - base - n_internal + leaf_base]
+        return leaves.reshape(self.n_stages, self.n_trees_per_stage, n_samples)
+
+    def decision_function(self, X: np.ndarray) -> np.ndarray:
+        """raw 예측값 (n_samples, n_trees_per_stage)"""
+        n_samples = X.shape[0]
+        terms = np.empty((self.n_stages + 1, self.n_trees_per_stage, n_samples), dtype=np.float64)
+        terms[0] = self.init_raw[:, np.newaxis]
+        np.multiply(self.leaf_values(X), self.learning_rate, out=terms[1:])
+
+        # sklearn과 동일한 누적 순서 (init + stage 순차 합산)
+        return np.cumsum(terms, axis=0)[-1].T
+
+    def predict(self, X: np.ndarray) -> np.ndarray:
+        """클래스 예측"""
+        raw = self.decision_function(X)
+        if raw.shape[1] == 1:
+            encoded = (raw[:, 0] >= 0).astype(int)
+        else:
+            encoded = np.argmax(raw, axis=1)
+        return self.classes[encoded]
+
+
+def _round_down_to_float32(values: np.ndarray) -> np.ndarray:
+    """
+    float64 임계값을 float32로 내림
+
+    float32 입력 x에 대해 x <= t (float64) 와 x <= round_down(t) (float32)는 동치
+    """
+    rounded = values.astype(np.float32)
+    too_large = rounded.astype(np.float64) > values
+    rounded[too_large] = np.nextafter(rounded[too_large], np.float32(-np.inf))
+    return rounded
+
+
+class CompiledSeatModel:
+    """스케일러 + 행/열 앙상블의 평탄화 묶음"""
+
+    def __init__(
+        self,
+        scaler_mean: np.ndarray,
+        scaler_scale: np.ndarray,
+        row: CompiledEnsemble,
+        col: CompiledEnsemble,
+    ):
+        self.scaler_mean = scaler_mean
+        self.scaler_scale = scaler_scale
+        self.row = row
+        self.col = col
+
+    @classmethod
+    def from_sklearn(
+        cls,
+        scaler: "StandardScaler",
+        row_model: "GradientBoostingClassifier",
+        col_model: "GradientBoostingClassifier",
+    ) -> "CompiledSeatModel":
+        n_features = row_model.n_features_in_
+        mean = scaler.mean_ if scaler.mean_ is not None else np.zeros(n_features)
+        scale = scaler.scale_ if scaler.scale_ is not None else np.ones(n_features)
+        return cls(
+            np.asarray(mean, dtype=np.float64),
+            np.asarray(scale, dtype=np.float64),
+            CompiledEnsemble.from_sklearn(row_model),
+            CompiledEnsemble.from_sklearn(col_model),
+        )
+
+    def to_arrays(self) -> Dict[str, np.ndarray]:
+        return {
+            "scaler_mean": self.scaler_mean,
+            "scaler_scale": self.scaler_scale,
+            **self.row.to_arrays("row"),
+            **self.col.to_arrays("col"),
+        }
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "CompiledSeatModel":
+        return cls(
+            arrays["scaler_mean"],
+            arrays["scaler_scale"],
+            CompiledEnsemble.from_arrays(arrays, "row"),
+            CompiledEnsemble.from_arrays(arrays, "col"),
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return self.scaler_mean.nbytes + self.scaler_scale.nbytes + self.row.nbytes + self.col.nbytes
+
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        """학습 경로(scale_in_place)와 같은 float32 스케일링 (입력은 바꾸지 않음)"""
+        X_scaled = np.array(X, dtype=np.float32)
+        X_scaled -= self.scaler_mean.astype(np.float32)
+        X_scaled /= self.scaler_scale.astype(np.float32)
+        return X_scaled
+
+    def predict(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """스케일링 전 피처 행렬로 (행, 열) 예측"""
+        X_scaled = self.transform(X)
+        return self.row.predict(X_scaled), self.col.predict(X_scaled)
@@ -0,0 +1,40 @@
+"""
+프로세스 메모리 사용량 (학습 메트릭용)
+
+- 최대 RSS는 /proc/self/status의 VmHWM (Linux), 없으면 getrusage의 ru_maxrss
+- reset_peak_rss()로 최대 RSS를 현재 RSS로 초기화하면 이후 구간(학습 데이터 로드 + 학습)의 최대치만 측정 가능
+  (/proc/self/clear_refs 미지원 환경에서는 프로세스 시작 이후 최대치)
+"""
+import resource
+import sys
+from typing import Optional
+
+
+def _proc_status_mb(field: str) -> Optional[float]:
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def reset_peak_rss() -> bool:
+    """최대 RSS 초기화 (Linux 4.0+), 성공 여부 반환"""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def peak_rss_mb() -> float:
+    """최대 RSS (MB)"""
+    peak = _proc_status_mb("VmHWM")
+    if peak is not None:
+        return peak
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss / (1024 * 1024) if sys.platform == "darwin" else maxrss / 1024
@@ -0,0 +1,98 @@
+"""
+모델 운영 지표 (용량 계획용, /model/status)
+
+- 번들 크기 (전체 / mmap 서빙 번들)
+- 메모리: 앙상블별 sklearn 트리 / 평탄화 배열, 통계 스냅샷, 상주 추정치
+- 앙상블별 stage/트리/노드/리프 수, 클래스 수
+- 마지막 로드 시각 / 방식 / 소요 시간, 학습 시간
+- 로스터 1회 추론 지연 (PROFILE_ROSTER_SIZES명, 중앙값)
+
+모델을 로드(또는 학습/저장)할 때마다 한 번 계산해 load_info에 캐시 (상태 조회는 캐시만 반환)
+"""
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.models.seat_recommender import SeatRecommender, serving_bundle_path
+
+
+PROFILE_ROSTER_SIZES = (50, 100, 200)
+PROFILE_REPEATS = 5
+PROFILE_PART_PATTERN = ["SOPRANO", "SOPRANO", "ALTO", "ALTO", "TENOR", "BASS"]
+
+
+def _file_size(path: Optional[str]) -> Optional[int]:
+    if path and os.path.exists(path):
+        return os.path.getsize(path)
+    return None
+
+
+def _roster_features(model: SeatRecommender, size: int) -> np.ndarray:
+    """통계 없는 합성 로스터의 피처 행렬 (recommend와 같은 컨텍스트 계산)"""
+    parts: List[str] = [PROFILE_PART_PATTERN[i % len(PROFILE_PART_PATTERN)] for i in range(size)]
+    context = {
+        "total_members": size,
+        **{f"{part.lower()}_ratio": parts.count(part) / size for part in ("SOPRANO", "ALTO", "TENOR", "BASS")},
+    }
+    return np.vstack([model.extract_features({"part": part}, None, context) for part in parts])
+
+
+def measure_predict_latency(model: SeatRecommender, repeats: int = PROFILE_REPEATS) -> Dict[str, float]:
+    """로스터 크기별 1회 추론(predict_batch) 지연 (워밍업 1회 후 중앙값, ms)"""
+    latencies = {}
+    for size in PROFILE_ROSTER_SIZES:
+        X = _roster_features(model, size)
+        model.predict_batch(X)
+        samples = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            model.predict_batch(X)
+            samples.append((time.perf_counter() - start) * 1000)
+        latencies[str(size)] = round(float(np.median(samples)), 3)
+    return latencies
+
+
+def model_profile(model: SeatRecommender) -> Optional[Dict[str, Any]]:
+    """모델 운영 지표 (로드/학습 이후 처음 호출할 때 계산, 이후 캐시)"""
+    if not model.is_trained:
+        return None
+
+    cached = model.load_info.get("profile")
+    if cached is not None:
+        return cached
+
+    path = model.load_info.get("path")
+    compiled = model.compiled
+    estimators = {}
+    for name, summary in model.estimator_summaries().items():
+        estimators[name] = {
+            **summary,
+            "compiled_bytes": getattr(compiled, name).nbytes if compiled is not None else None,
+        }
+
+    metrics = model.metadata.get("metrics") or {}
+    profile = {
+        "artifact": {
+            "path": path,
+            "bundle_bytes": _file_size(path),
+            "serving_bundle_bytes": _file_size(serving_bundle_path(path)) if path else None,
+        },
+        "load": {key: model.load_info.get(key) for key in ("mode", "loaded_at", "load_seconds")},
+        "memory": {
+            "resident_estimate_bytes": model.footprint_bytes(),
+            "compiled_bytes": compiled.nbytes if compiled is not None else None,
+            "stats_snapshot_bytes": model.stats_snapshot.nbytes if model.stats_snapshot is not None else None,
+        },
+        "estimators": estimators,
+        "predict_latency_ms": measure_predict_latency(model),
+        "training": {
+            "fit_seconds": model.metadata.get("fit_seconds"),
+            "estimator_fit_seconds": metrics.get("estimator_fit_seconds"),
+            "samples_used": metrics.get("samples_used"),
+        },
+        "profiled_at": time.time(),
+    }
+    model.load_info["profile"] = profile
+    return profile
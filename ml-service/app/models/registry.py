@@ -0,0 +1,201 @@
+"""
+모델 레지스트리
+
+디스크 기반으로 최근 N개의 모델 번들과 메타데이터를 보관
+- 번들: <MODEL_REGISTRY_DIR>/<version>.joblib (+ mmap 서빙 번들 <version>.serving.joblib)
+- 인덱스: <MODEL_REGISTRY_DIR>/index.json (버전별 메타데이터 + primary 버전)
+- 버전 ID: 학습 시각(초 단위) + 코퍼스 지문 앞 8자, 이미 있는 ID면 -2, -3 ... 접미사
+- 인덱스 갱신(등록 / primary 변경 / 정리)은 프로세스 간 파일 잠금(<MODEL_REGISTRY_DIR>.lock) 안에서 수행
+  (여러 워커가 동시에 읽고-고쳐-쓰면 한쪽의 변경이 사라짐)
+"""
+import json
+import logging
+import os
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.models.seat_recommender import SeatRecommender, serving_bundle_path
+from app.services.file_lock import file_lock
+
+logger = logging.getLogger(__name__)
+
+
+INDEX_FILENAME = "index.json"
+
+
+class ModelRegistry:
+    """최근 모델 번들 보관소"""
+
+    def __init__(self, root: Optional[str] = None, keep: Optional[int] = None):
+        self.root = root or settings.MODEL_REGISTRY_DIR
+        self.keep = max(1, keep or settings.MODEL_REGISTRY_KEEP)
+        self._lock = threading.Lock()
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.root, INDEX_FILENAME)
+
+    @property
+    def lock_path(self) -> str:
+        """프로세스 간 잠금 파일 (레지스트리 디렉토리 밖)"""
+        return os.path.normpath(self.root) + ".lock"
+
+    def path_for(self, version: str) -> str:
+        """버전별 번들 경로"""
+        return os.path.join(self.root, f"{version}.joblib")
+
+    def _read_index(self) -> Dict[str, Any]:
+        if not os.path.exists(self.index_path):
+            return {"primary": None, "versions": []}
+        with open(self.index_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_index(self, index: Dict[str, Any]):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.index_path)
+
+    def list_versions(self) -> List[Dict[str, Any]]:
+        """보관 중인 버전 목록 (최신순)"""
+        return list(reversed(self._read_index()["versions"]))
+
+    def get(self, version: str) -> Optional[Dict[str, Any]]:
+        """버전 메타데이터 조회"""
+        for meta in self._read_index()["versions"]:
+            if meta["version"] == version:
+                return meta
+        return None
+
+    @property
+    def primary_version(self) -> Optional[str]:
+        return self._read_index().get("primary")
+
+    def register(
+        self,
+        model: SeatRecommender,
+        metrics: Dict[str, float],
+        fingerprint: Optional[str],
+        fit_seconds: float,
+        promote: bool = True,
+        protected: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """
+        학습된 모델을 새 버전으로 등록
+
+        Args:
+            model: 학습 완료된 모델
+            metrics: 학습 메트릭
+            fingerprint: 학습 코퍼스 지문
+            fit_seconds: 학습 소요 시간 (초)
+            promote: primary 버전으로 지정할지 여부
+            protected: 정리 대상에서 제외할 버전 (섀도우/A/B 라우팅 중인 버전)
+        """
+        trained_at = datetime.now(timezone.utc)
+        base_version = trained_at.strftime("%Y%m%dT%H%M%S")
+        if fingerprint:
+            base_version = f"{base_version}-{fingerprint[:8]}"
+
+        with self._lock, file_lock(self.lock_path):
+            version = self._unique_version(base_version, self._read_index())
+            model.metadata.update({
+                "version": version,
+                "fingerprint": fingerprint,
+                "metrics": metrics,
+                "fit_seconds": round(fit_seconds, 3),
+                "trained_at": trained_at.isoformat(),
+            })
+
+            bundle_path = self.path_for(version)
+            model.save_model(bundle_path)
+
+            meta = {
+                **model.metadata,
+                "size_bytes": os.path.getsize(bundle_path),
+            }
+            serving_path = serving_bundle_path(bundle_path)
+            if os.path.exists(serving_path):
+                meta["serving_size_bytes"] = os.path.getsize(serving_path)
+
+            index = self._read_index()
+            index["versions"].append(meta)
+            if promote or not index.get("primary"):
+                index["primary"] = version
+
+            # 방금 등록한 버전은 오래된 버전이 모두 보호 대상이어도 삭제하지 않음
+            self._prune(index, set(protected or []) | {version})
+            self._write_index(index)
+
+        logger.info(f"[Registry] Registered model {version} (primary: {index['primary']})")
+        return meta
+
+    def _unique_version(self, base_version: str, index: Dict[str, Any]) -> str:
+        """
+        등록된 버전 / 남아 있는 번들과 겹치지 않는 버전 ID
+
+        같은 초에 같은 코퍼스로 두 번 학습하면 (force 재학습, 여러 워커) 기본 ID가 겹쳐
+        이전 번들을 덮어쓰므로 -2, -3 ... 접미사를 붙임
+        """
+        taken = {meta["version"] for meta in index["versions"]}
+        version, n = base_version, 1
+        while version in taken or os.path.exists(self.path_for(version)):
+            n += 1
+            version = f"{base_version}-{n}"
+        return version
+
+    def set_primary(self, version: str):
+        """primary 버전 변경"""
+        with self._lock, file_lock(self.lock_path):
+            index = self._read_index()
+            if not any(v["version"] == version for v in index["versions"]):
+                raise ValueError(f"등록되지 않은 모델 버전입니다: {version}")
+            index["primary"] = version
+            self._write_index(index)
+
+    def load(self, version: str) -> SeatRecommender:
+        """
+        버전별 모델 로드
+
+        Raises:
+            ValueError: 등록되지 않은 버전
+            FileNotFoundError: 인덱스에는 있지만 번들 파일이 없음 (정리 / 수동 삭제)
+        """
+        if self.get(version) is None:
+            raise ValueError(f"등록되지 않은 모델 버전입니다: {version}")
+
+        path = self.path_for(version)
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"모델 번들이 없습니다: {version}")
+
+        model = SeatRecommender()
+        model.load_model(path)
+        return model
+
+    def _prune(self, index: Dict[str, Any], protected: set):
+        """최근 keep개를 초과한 오래된 번들 삭제 (primary/보호 버전 제외)"""
+        protected = protected | {index.get("primary")}
+        versions = index["versions"]
+        excess = len(versions) - self.keep
+
+        kept = []
+        for meta in versions:
+            if excess > 0 and meta["version"] not in protected:
+                excess -= 1
+                bundle_path = self.path_for(meta["version"])
+                for path in (bundle_path, serving_bundle_path(bundle_path)):
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+                logger.info(f"[Registry] Pruned model {meta['version']}")
+                continue
+            kept.append(meta)
+
+        index["versions"] = kept
+
+
+# 싱글톤 인스턴스
+model_registry = ModelRegistry()
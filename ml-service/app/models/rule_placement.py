@@ -0,0 +1,184 @@
+"""
+규칙 기반 좌석 배치 엔진 (NumPy 정렬 / 마스크)
+
+학습된 모델 없이 PART_RULES의 파트 영역을 채움
+- 모델이 없을 때(콜드 스타트), 요청이 engine="rules"를 지정할 때, 지연 예산 초과 시 사용
+- 벤치마크의 기준선 (scripts/bench_rule_engine.py)
+
+배치 순서 (단계마다 허용 행이 적은 파트부터: ALTO → SOPRANO, TENOR / BASS)
+1. 선호 행의 파트 쪽 절반 (행마다 왼쪽/오른쪽)
+2. 선호 행의 반대쪽 절반 — 허용 행(overflow)으로 넘어가기 전에 선호 행을 모두 채움
+3. 허용 행의 파트 쪽 절반
+4. 허용 행의 반대쪽 절반
+5. 그래도 남은 대원은 교환: 허용 행의 좌석을 다른 허용 행에 빈 좌석이 있는 대원에게서 넘겨받음
+   (예: 4행 ALTO 자리를 차지한 SOPRANO를 5-6행 빈 좌석으로) — 행 규칙 안에서 앉힐 수 있는 대원은 모두 배치
+선호 행이 앞인 대원부터 앞 행에, 같은 행에서는 선호 열 순으로 왼쪽부터 앉힘
+(선호 행/열은 대원 통계, 없으면 PART_DEFAULT_VALUES)
+
+1-4단계는 대원 단위 반복 없이 파트 × 단계의 배열 연산만 수행 (충돌 탐색 없음)
+5단계는 남은 대원만 반복 (행 규칙상 자리가 부족할 때만 발생)
+"""
+from typing import Any, Dict, List, Mapping, Tuple
+
+import numpy as np
+
+from app.models.seat_recommender import PART_DEFAULT_VALUES, PART_RULES
+from app.models.stats_snapshot import stats_column
+
+
+PARTS = list(PART_RULES)
+PART_CODES = {part: code for code, part in enumerate(PARTS)}
+DEFAULT_ROWS = np.array([PART_DEFAULT_VALUES[part]["preferred_row"] for part in PARTS], dtype=np.float64)
+DEFAULT_COLS = np.array([PART_DEFAULT_VALUES[part]["preferred_col"] for part in PARTS], dtype=np.float64)
+# 단계마다 좌석을 받는 순서: 허용 행이 적은(선택지가 좁은) 파트부터
+FILL_ORDER = sorted(PARTS, key=lambda part: len(PART_RULES[part]["preferred_rows"] + PART_RULES[part]["overflow_rows"]))
+
+
+def _rule_rows(part: str, n_rows: int, key: str) -> np.ndarray:
+    """파트 규칙의 행 (key: preferred_rows / overflow_rows, 0-based, 그리드 밖 제외)"""
+    return np.array([r - 1 for r in PART_RULES[part][key] if r - 1 < n_rows], dtype=np.intp)
+
+
+def member_preferences(
+    members: List[Dict[str, Any]],
+    member_stats: Mapping[str, Dict[str, Any]],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(파트 코드, 선호 행, 선호 열) 배열 — 통계가 없으면 파트 기본값"""
+    codes = np.array([PART_CODES.get(m.get("part"), 0) for m in members], dtype=np.intp)
+    member_ids = [m["id"] for m in members]
+    pref_rows = stats_column(member_stats, member_ids, "preferred_row")
+    pref_cols = stats_column(member_stats, member_ids, "preferred_col")
+    pref_rows = np.where(np.isnan(pref_rows), DEFAULT_ROWS[codes], pref_rows)
+    pref_cols = np.where(np.isnan(pref_cols), DEFAULT_COLS[codes], pref_cols)
+    return codes, pref_rows, pref_cols
+
+
+def rule_based_recommend(
+    members: List[Dict[str, Any]],
+    member_stats: Mapping[str, Dict[str, Any]],
+    grid_layout: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    """규칙 기반 좌석 추천 (SeatRecommender.recommend와 같은 결과 형식, 1-based 행/열, 입력 순서)"""
+    rows = grid_layout.get("rows", 6)
+    capacities = np.asarray(grid_layout.get("row_capacities", [15] * rows)[:rows], dtype=np.intp)
+    if not members or len(capacities) == 0:
+        return []
+    n_rows = len(capacities)
+
+    # 좌석 마스크 (행 × 최대 열): 그리드 안 / 파트 쪽 절반 (왼쪽 [0, mid), 오른쪽 [mid, 정원))
+    cols = np.arange(int(capacities.max()))
+    in_grid = cols[None, :] < capacities[:, None]
+    left = in_grid & (cols[None, :] < (capacities // 2)[:, None])
+    side_masks = {"left": left, "right": in_grid & ~left}
+    free = in_grid.copy()
+
+    codes, pref_rows, pref_cols = member_preferences(members, member_stats)
+
+    # 파트별 대원 (선호 행 순, 동률은 입력 순서) — 앞에서부터 좌석을 받음
+    queues: Dict[str, np.ndarray] = {}
+    for code, part in enumerate(PARTS):
+        indices = np.flatnonzero(codes == code)
+        if len(indices):
+            queues[part] = indices[np.argsort(pref_rows[indices], kind="stable")]
+    taken = dict.fromkeys(queues, 0)
+    seats: Dict[str, List[Tuple[np.ndarray, np.ndarray, np.ndarray]]] = {part: [] for part in queues}
+
+    def take(part: str, row_order: np.ndarray, mask: np.ndarray, group_base: int):
+        """row_order 행에서 mask의 빈 좌석을 앞 행 / 왼쪽 열부터 남은 대원 수만큼 차지"""
+        remaining = len(queues[part]) - taken[part]
+        if remaining <= 0 or len(row_order) == 0:
+            return
+        rank, seat_cols = np.nonzero(free[row_order] & mask[row_order])
+        rank, seat_cols = rank[:remaining], seat_cols[:remaining]
+        seat_rows = row_order[rank]
+        free[seat_rows, seat_cols] = False
+        seats[part].append((seat_rows, seat_cols, group_base + rank))  # 그룹: 단계 + 행
+        taken[part] += len(rank)
+
+    fill_order = [part for part in FILL_ORDER if part in queues]
+    preferred = {part: _rule_rows(part, n_rows, "preferred_rows") for part in queues}
+    overflow = {part: _rule_rows(part, n_rows, "overflow_rows") for part in queues}
+    own_side = {part: side_masks[PART_RULES[part]["side"]] for part in queues}
+    stages = [
+        (preferred, lambda part: own_side[part]),
+        (preferred, lambda part: in_grid & ~own_side[part]),
+        (overflow, lambda part: own_side[part]),
+        (overflow, lambda part: in_grid & ~own_side[part]),
+    ]
+    for stage, (rule_rows, mask) in enumerate(stages):
+        for part in fill_order:
+            take(part, rule_rows[part], mask(part), stage * n_rows)
+
+    # 대원별 좌석 (같은 그룹(단계 / 행)에 앉는 대원끼리 선호 열 순으로 재배열, 좌석은 열 오름차순)
+    member_rows = np.full(len(members), -1, dtype=np.intp)
+    member_cols = np.full(len(members), -1, dtype=np.intp)
+    for part, chunks in seats.items():
+        if not chunks:
+            continue
+        seat_rows = np.concatenate([chunk[0] for chunk in chunks])
+        groups = np.concatenate([chunk[2] for chunk in chunks])
+        assigned = queues[part][:len(seat_rows)]
+        order = np.lexsort((np.arange(len(assigned)), pref_cols[assigned], groups))
+        member_rows[assigned[order]] = seat_rows
+        member_cols[assigned[order]] = np.concatenate([chunk[1] for chunk in chunks])
+
+    unplaced = [i for part in fill_order for i in queues[part][taken[part]:]]
+    if unplaced:
+        _swap_into_allowed_rows(unplaced, codes, member_rows, member_cols, free, own_side, n_rows)
+
+    placed = np.flatnonzero(member_rows >= 0)
+    return [
+        {
+            "member_id": members[i]["id"],
+            "member_name": members[i]["name"],
+            "part": PARTS[codes[i]],
+            "row": row,
+            "col": col,
+        }
+        for i, row, col in zip(placed.tolist(), (member_rows[placed] + 1).tolist(), (member_cols[placed] + 1).tolist())
+    ]
+
+
+def _swap_into_allowed_rows(
+    unplaced: List[int],
+    codes: np.ndarray,
+    member_rows: np.ndarray,
+    member_cols: np.ndarray,
+    free: np.ndarray,
+    own_side: Dict[str, np.ndarray],
+    n_rows: int,
+):
+    """
+    허용 행이 가득 찬 대원 배치 (5단계, 제자리 갱신)
+
+    허용 행의 좌석 중, 앉은 대원이 자기 허용 행의 빈 좌석으로 옮길 수 있는 좌석을 넘겨받음
+    (옮기는 대원은 자기 쪽 절반 우선) — 파트 규칙의 행 집합이 중첩되어 있어 한 번의 교환이면 충분
+    """
+    allowed = np.zeros((len(PARTS), n_rows), dtype=bool)
+    for code, part in enumerate(PARTS):
+        allowed[code, _rule_rows(part, n_rows, "preferred_rows")] = True
+        allowed[code, _rule_rows(part, n_rows, "overflow_rows")] = True
+
+    owner = np.full(free.shape, -1, dtype=np.intp)
+    placed = np.flatnonzero(member_rows >= 0)
+    owner[member_rows[placed], member_cols[placed]] = placed
+
+    for i in unplaced:
+        movable = (allowed & free.any(axis=1)[None, :]).any(axis=1)  # 허용 행에 빈 좌석이 있는 파트
+        seat_owners = owner[allowed[codes[i]]]
+        candidates = np.flatnonzero((seat_owners >= 0) & movable[codes[np.maximum(seat_owners, 0)]])
+        if len(candidates) == 0:
+            continue  # 행 규칙 안에서는 자리가 없음
+        row_index, col = np.unravel_index(candidates[0], seat_owners.shape)
+        row = np.flatnonzero(allowed[codes[i]])[row_index]
+        moved = owner[row, col]
+
+        target = free & allowed[codes[moved]][:, None]
+        preferred_target = target & own_side.get(PARTS[codes[moved]], target)
+        new_row, new_col = np.argwhere(preferred_target if preferred_target.any() else target)[0]
+
+        free[new_row, new_col] = False
+        owner[new_row, new_col] = moved
+        member_rows[moved], member_cols[moved] = new_row, new_col
+        owner[row, col] = i
+        member_rows[i], member_cols[i] = row, col
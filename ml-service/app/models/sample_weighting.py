@@ -0,0 +1,167 @@
+"""
+학습 샘플 중복 제거 / 가중치
+
+매주 같은 자리에 앉는 고정석 대원처럼 피처·레이블이 같은 행이 반복되므로
+같은 행을 가중치(반복 횟수)를 가진 샘플 하나로 합쳐 sample_weight로 학습
+- 컨텍스트 피처(총 인원, 파트 비율)는 SAMPLE_DEDUP_CONTEXT_STEP 단위로 묶어 비교 가능 (0이면 완전 일치만)
+  묶인 행의 피처는 가중 평균으로 대표
+- 선택적으로 레이블(행, 열) 칸별 가중 비복원 추출 (코어셋 방식, 칸별 총 가중치 보존)
+"""
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+
+def _row_keys(key: np.ndarray) -> np.ndarray:
+    """행 단위 비교용 바이트 키 (np.unique 1차원 처리)"""
+    key = np.ascontiguousarray(key) + 0.0  # -0.0 → 0.0
+    return key.view(np.dtype((np.void, key.dtype.itemsize * key.shape[1]))).ravel()
+
+
+def deduplicate_samples(
+    X: np.ndarray,
+    y_row: np.ndarray,
+    y_col: np.ndarray,
+    weights: Optional[np.ndarray] = None,
+    context_columns: Optional[list] = None,
+    context_step: Union[float, np.ndarray] = 0.0,
+) -> Dict[str, np.ndarray]:
+    """
+    피처·레이블이 같은 행을 가중 샘플 하나로 합침
+
+    Args:
+        context_columns: context_step 단위로 반올림해 비교할 피처 열
+        context_step: 비교 단위 (열별 배열 가능), 0이면 모든 열 완전 일치
+
+    Returns:
+        X, y_row, y_col, weights (처음 등장한 순서)
+    """
+    n = len(X)
+    weights = np.ones(n) if weights is None else np.asarray(weights, dtype=np.float64)
+    if n == 0:
+        return {"X": X, "y_row": y_row, "y_col": y_col, "weights": weights}
+
+    # 키는 X와 같은 정밀도 (float32 학습 행렬이면 float64 사본을 만들지 않음, 레이블은 작은 정수라 손실 없음)
+    key = np.empty((n, X.shape[1] + 2), dtype=np.result_type(X.dtype, np.float32))
+    key[:, :-2] = X
+    key[:, -2] = y_row
+    key[:, -1] = y_col
+    merge_context = bool(context_columns) and np.all(np.asarray(context_step) > 0)
+    if merge_context:
+        key[:, context_columns] = np.round(key[:, context_columns] / context_step)
+
+    _, first, inverse = np.unique(_row_keys(key), return_index=True, return_inverse=True)
+    order = np.argsort(first, kind="stable")  # 처음 등장한 순서로
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    group = rank[inverse.ravel()]
+
+    group_weights = np.bincount(group, weights=weights)
+    if merge_context:
+        # 묶인 행의 가중 평균 피처 (완전 일치 행만 묶였으면 원래 값과 같음)
+        X_out = np.zeros((len(group_weights), X.shape[1]))
+        np.add.at(X_out, group, X * weights[:, None])
+        X_out /= group_weights[:, None]
+    else:
+        X_out = np.asarray(X)[first[order]]
+
+    return {
+        "X": X_out,
+        "y_row": np.asarray(y_row)[first[order]],
+        "y_col": np.asarray(y_col)[first[order]],
+        "weights": group_weights,
+    }
+
+
+def coreset_samples(
+    X: np.ndarray,
+    y_row: np.ndarray,
+    y_col: np.ndarray,
+    weights: np.ndarray,
+    fraction: float,
+    seed: int = 42,
+) -> Dict[str, np.ndarray]:
+    """
+    레이블 칸 (행, 열)별 가중 비복원 추출 (Efraimidis-Spirakis)
+
+    칸마다 ceil(fraction * 행 수)개를 가중치에 비례해 뽑고,
+    뽑힌 샘플의 가중치를 칸의 원래 총 가중치에 맞게 재조정
+    """
+    if fraction >= 1.0 or len(X) == 0:
+        return {"X": X, "y_row": y_row, "y_col": y_col, "weights": weights}
+
+    rng = np.random.default_rng(seed)
+    cell_keys = np.column_stack([y_row, y_col]).astype(np.float64)
+    _, cell = np.unique(_row_keys(cell_keys), return_inverse=True)
+    cell = cell.ravel()
+    n_cells = cell.max() + 1
+
+    cell_sizes = np.bincount(cell, minlength=n_cells)
+    quota = np.ceil(cell_sizes * fraction).astype(np.int64)
+
+    # 칸 안에서 키(u^(1/w)) 내림차순 상위 quota개
+    sample_keys = rng.random(len(X)) ** (1.0 / weights)
+    order = np.lexsort((-sample_keys, cell))
+    starts = np.concatenate([[0], np.cumsum(cell_sizes)[:-1]])
+    rank = np.arange(len(order)) - starts[cell[order]]
+    keep = np.sort(order[rank < quota[cell[order]]])
+
+    cell_total = np.bincount(cell, weights=weights, minlength=n_cells)
+    kept_total = np.bincount(cell[keep], weights=weights[keep], minlength=n_cells)
+    scale = np.divide(cell_total, kept_total, out=np.zeros(n_cells), where=kept_total > 0)
+
+    return {
+        "X": np.asarray(X)[keep],
+        "y_row": np.asarray(y_row)[keep],
+        "y_col": np.asarray(y_col)[keep],
+        "weights": weights[keep] * scale[cell[keep]],
+    }
+
+
+def reduce_training_samples(
+    X: np.ndarray,
+    y_row: np.ndarray,
+    y_col: np.ndarray,
+    dedup: bool,
+    context_columns: Optional[list] = None,
+    context_step: Union[float, np.ndarray] = 0.0,
+    coreset_fraction: float = 1.0,
+) -> Dict[str, np.ndarray]:
+    """중복 제거 → (선택) 코어셋 추출, weights는 원래 행 수 기준 가중치"""
+    samples = {"X": X, "y_row": y_row, "y_col": y_col, "weights": np.ones(len(X))}
+    if dedup:
+        samples = deduplicate_samples(X, y_row, y_col, None, context_columns, context_step)
+    if coreset_fraction < 1.0:
+        samples = coreset_samples(
+            samples["X"], samples["y_row"], samples["y_col"], samples["weights"], coreset_fraction
+        )
+    return samples
+
+
+def weighted_tree_params(params: Dict, total_weight: float) -> Dict:
+    """
+    행 수 기반 최소 샘플 제약을 가중치 기반으로 변환
+
+    합쳐진 샘플 하나가 여러 원래 행을 대표하므로 min_samples_leaf(행 수)를
+    min_weight_fraction_leaf(원래 행 수 비율)로 바꿔 같은 크기의 잎을 허용
+    """
+    params = dict(params)
+    leaf = params.pop("min_samples_leaf", 1)
+    params.pop("min_samples_split", None)
+    if total_weight > 0 and isinstance(leaf, (int, np.integer)) and leaf > 1:
+        params["min_weight_fraction_leaf"] = max(
+            params.get("min_weight_fraction_leaf", 0.0),
+            min(0.5, leaf / total_weight),
+        )
+    return params
+
+
+def reduction_summary(n_rows: int, samples: Dict[str, np.ndarray]) -> Dict[str, float]:
+    """축소 비율 메트릭"""
+    n_fit = len(samples["X"])
+    return {
+        "train_rows": float(n_rows),
+        "fit_rows": float(n_fit),
+        "sample_reduction_ratio": round(1 - n_fit / n_rows, 4) if n_rows else 0.0,
+    }
+
@@ -9,18 +9,93 @@ ML 기반 좌석 추천 모델 (v2)
 - 근접 정확도 메트릭 (±1행, ±2열)
 - 파트장 위치 피처 제외
 - 키/경력은 미래 대비용으로 유지 (현재 사용 안함)
+
+sklearn / joblib은 처음 사용할 때 import (서비스 시작 시간 단축)
+
+서빙 번들 (MODEL_MMAP_SERVING):
+- save_model은 전체 번들(.joblib) 옆에 평탄화 추론 배열만 담은 비압축 서빙 번들(.serving.joblib)을 함께 저장
+- load_model은 서빙 번들을 mmap_mode="r"로 열어 추론 배열을 페이지 캐시에서 바로 사용
+  → 여러 uvicorn/gunicorn 워커가 같은 물리 페이지를 공유 (워커별 사본 없음)
+- sklearn 추정기(행/열 모델, 스케일러, 인코더)는 학습/크기 선택 등에서 처음 접근할 때 전체 번들에서 로드
+- 서빙 번들에는 전체 번들 내용의 SHA-256을 기록하고 로드 시 비교 (짝이 맞지 않으면 전체 번들 사용)
+- 배치 크기별로 더 빠른 추론 경로(평탄화 / sklearn)를 저장 시 측정해 metadata["predict_paths"]에 기록
+  (추정기가 로드된 경우 predict_batch가 배치 크기로 경로 선택)
+- 두 번들 모두 학습에 사용한 대원 통계 스냅샷 포함 (추천 시 DB 통계 없이도 대원별 통계 사용)
 """
 import numpy as np
-import pandas as pd
-from sklearn.ensemble import GradientBoostingClassifier
-from sklearn.preprocessing import LabelEncoder, StandardScaler
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import accuracy_score
-import joblib
+import copy
+import hashlib
+import json
+import logging
 import os
-from typing import List, Dict, Tuple, Optional, Any
+import threading
+import time
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, List, Dict, Mapping, Tuple, Optional, Any
 
 from app.config import settings
+from app.models.compiled_predictor import CompiledSeatModel
+from app.models.memory_usage import peak_rss_mb
+from app.models.sample_weighting import reduce_training_samples, reduction_summary, weighted_tree_params
+from app.models.stats_snapshot import MemberStatsSnapshot, StatsOverlay, matching_db_stats
+
+if TYPE_CHECKING:
+    from sklearn.ensemble import GradientBoostingClassifier
+    from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+logger = logging.getLogger(__name__)
+
+
+class RecommendCancelled(Exception):
+    """호출 측이 결과를 더 기다리지 않아 추천을 중단함 (지연 예산 초과)"""
+
+
+def _load_stats_snapshot(bundle: Dict[str, Any]) -> Optional[MemberStatsSnapshot]:
+    """번들의 대원 통계 스냅샷 (스냅샷 도입 전 번들이면 None)"""
+    arrays = bundle.get("stats_snapshot")
+    return MemberStatsSnapshot.from_arrays(arrays) if arrays else None
+
+
+def serving_bundle_path(path: str) -> str:
+    """전체 번들 옆의 서빙 번들 경로 (models/x.joblib → models/x.serving.joblib)"""
+    return os.path.splitext(path)[0] + ".serving.joblib"
+
+
+def bundle_digest(path: str) -> str:
+    """
+    전체 번들 내용의 SHA-256 (서빙 번들이 짝이 맞는 전체 번들인지 확인용)
+
+    크기/수정 시각과 달리 같은 크기로 다시 저장하거나 복사해도 내용으로 판별
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _replace_file(write, path: str):
+    """임시 파일에 쓴 뒤 교체 (다른 워커가 mmap 중인 파일을 덮어써 SIGBUS가 나지 않도록)"""
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    try:
+        write(tmp_path)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+def copy_model_bundle(src: str, dst: str):
+    """전체 번들과 서빙 번들을 함께 복사 (서빙 번들이 없으면 대상의 이전 서빙 번들 삭제)"""
+    import shutil
+
+    os.makedirs(os.path.dirname(dst) or ".", exist_ok=True)
+    _replace_file(lambda tmp: shutil.copyfile(src, tmp), dst)
+    src_serving, dst_serving = serving_bundle_path(src), serving_bundle_path(dst)
+    if os.path.exists(src_serving):
+        _replace_file(lambda tmp: shutil.copyfile(src_serving, tmp), dst_serving)
+    elif os.path.exists(dst_serving):
+        os.remove(dst_serving)
 
 
 # 파트별 배치 규칙 (ML 데이터 분석 결과)
@@ -40,19 +115,336 @@ PART_DEFAULT_VALUES = {
 }
 
 
+# GradientBoosting 기본 하이퍼파라미터 (행/열 모델 공통)
+DEFAULT_MODEL_PARAMS = {
+    "n_estimators": 200,
+    "max_depth": 6,
+    "learning_rate": 0.1,
+    "min_samples_split": 5,
+    "min_samples_leaf": 2,
+}
+
+# 모델 크기 선택 시 평가할 앙상블 크기 (조기 종료된 크기 이하만 사용)
+SIZE_CANDIDATES = [10, 20, 30, 50, 75, 100, 150, 200, 300, 500]
+
+# 평탄화 추론기 / sklearn predict 중 빠른 경로를 측정할 배치 크기
+COMPILED_PROBE_BATCH_SIZES = [1, 16, 64, 256, 1024]
+
+
+def load_model_params(target: str) -> Dict[str, Any]:
+    """
+    모델별 하이퍼파라미터 (기본값 + 튜닝 결과)
+
+    Args:
+        target: "row" 또는 "col"
+    """
+    params = dict(DEFAULT_MODEL_PARAMS)
+    if os.path.exists(settings.TUNED_PARAMS_PATH):
+        try:
+            with open(settings.TUNED_PARAMS_PATH, "r", encoding="utf-8") as f:
+                params.update(json.load(f).get(target, {}))
+        except Exception as e:
+            logger.warning(f"[ML] Failed to load tuned params: {e}")
+    return params
+
+
+def training_config_fingerprint() -> str:
+    """학습 설정 지문 (하이퍼파라미터 + 조기 종료/크기 선택 + 통계 반감기 + 샘플 축소 설정)"""
+    config = {
+        "params": {"row": load_model_params("row"), "col": load_model_params("col")},
+        "early_stopping_rounds": settings.EARLY_STOPPING_ROUNDS,
+        "early_stopping_validation_fraction": settings.EARLY_STOPPING_VALIDATION_FRACTION,
+        "size_selection": settings.MODEL_SIZE_SELECTION,
+        "size_tolerance": settings.MODEL_SIZE_TOLERANCE,
+        "size_validation_fraction": settings.MODEL_SIZE_VALIDATION_FRACTION,
+        "latency_budget_ms": settings.PREDICT_LATENCY_BUDGET_MS,
+        "latency_budget_roster_size": settings.LATENCY_BUDGET_ROSTER_SIZE,
+        "min_training_samples": settings.MIN_TRAINING_SAMPLES,
+        "member_stats_half_life_days": settings.MEMBER_STATS_HALF_LIFE_DAYS,
+        "sample_dedup": settings.SAMPLE_DEDUP,
+        "sample_dedup_context_step": settings.SAMPLE_DEDUP_CONTEXT_STEP,
+        "sample_coreset_fraction": settings.SAMPLE_CORESET_FRACTION,
+    }
+    payload = json.dumps(config, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def feature_config_fingerprint() -> str:
+    """피처 행렬 설정 지문 (training_config_fingerprint 중 피처 값에 영향을 주는 부분: 피처 수 + 통계 반감기)"""
+    config = {
+        "n_features": N_FEATURES,
+        "member_stats_half_life_days": settings.MEMBER_STATS_HALF_LIFE_DAYS,
+    }
+    payload = json.dumps(config, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def truncate_ensemble(model: "GradientBoostingClassifier", n_stages: int) -> "GradientBoostingClassifier":
+    """앞쪽 n_stages개 stage만 남긴 앙상블 (얕은 복사)"""
+    truncated = copy.copy(model)
+    truncated.estimators_ = model.estimators_[:n_stages]
+    truncated.train_score_ = model.train_score_[:n_stages]
+    truncated.n_estimators_ = n_stages
+    truncated.n_estimators = n_stages
+    return truncated
+
+
+def ensemble_nbytes(model: "GradientBoostingClassifier") -> int:
+    """앙상블 트리 배열 크기 (노드 구조체 + 노드 값)"""
+    trees = [estimator.tree_ for estimator in model.estimators_.ravel()]
+    if not trees:
+        return 0
+    node_bytes = trees[0].__getstate__()["nodes"].dtype.itemsize
+    return sum(tree.node_count * node_bytes + tree.value.nbytes for tree in trees)
+
+
+def estimator_summary(model: "GradientBoostingClassifier") -> Dict[str, Any]:
+    """앙상블 구조 요약 (stage/트리/노드/리프 수, 최대 깊이, 클래스 수, sklearn 트리 배열 크기)"""
+    trees = [estimator.tree_ for estimator in model.estimators_.ravel()]
+    return {
+        "n_stages": int(model.n_estimators_),
+        "trees": len(trees),
+        "nodes": int(sum(tree.node_count for tree in trees)),
+        "leaves": int(sum(tree.n_leaves for tree in trees)),
+        "max_depth": int(max((tree.max_depth for tree in trees), default=0)),
+        "classes": int(len(model.classes_)),
+        "sklearn_bytes": ensemble_nbytes(model),
+    }
+
+
+def scale_in_place(X: np.ndarray, scaler: "StandardScaler") -> np.ndarray:
+    """fit된 StandardScaler로 X를 제자리 스케일링 (transform과 달리 행렬 사본을 만들지 않음)"""
+    X -= scaler.mean_.astype(X.dtype)
+    X /= scaler.scale_.astype(X.dtype)
+    return X
+
+
+def fit_scaler_in_chunks(X: np.ndarray, chunk_rows: Optional[int] = None) -> "StandardScaler":
+    """
+    청크 단위 partial_fit으로 StandardScaler 학습
+
+    fit(X)는 float32 행렬 전체의 검증 사본 / float64 임시 배열을 만들 수 있으므로
+    build_training_matrix와 같은 방식으로 청크(TRAINING_CHUNK_ROWS)씩 통계를 누적
+    """
+    from sklearn.preprocessing import StandardScaler
+
+    chunk_rows = chunk_rows or settings.TRAINING_CHUNK_ROWS
+    scaler = StandardScaler()
+    for start in range(0, len(X), chunk_rows):
+        scaler.partial_fit(X[start:start + chunk_rows])
+    return scaler
+
+
+# 피처 열 구성 (extract_features 순서)
+# 통계 피처는 대원의 전체 배치 이력에 의존하므로 학습 시점에 다시 계산해야 하고,
+# 나머지는 해당 배치만으로 결정됨
+STATS_FEATURE_COLUMNS = [3, 4, 5, 6, 7, 8]
+ARRANGEMENT_FEATURE_COLUMNS = [0, 1, 2, 9, 10, 11, 12, 13, 14, 15, 16, 17]
+CONTEXT_FEATURE_COLUMNS = [9, 10, 11, 12, 13]  # 총 인원, 파트 비율 (배치마다 조금씩 달라짐)
+N_FEATURES = 18
+
+
+def stats_features(part: str, stats: Optional[Dict[str, Any]]) -> List[float]:
+    """통계 피처 (6): pref_row, pref_col, row_cons, col_cons, is_fixed, appearances"""
+    # 파트별 기본값 적용
+    default_vals = PART_DEFAULT_VALUES.get(part, PART_DEFAULT_VALUES["SOPRANO"])
+    default_row = default_vals["preferred_row"]
+    default_col = default_vals["preferred_col"]
+
+    if not stats:
+        return [default_row, default_col, 0.5, 0.5, 0, 0]
+
+    return [
+        stats.get("preferred_row") or default_row,
+        stats.get("preferred_col") or default_col,
+        (stats.get("row_consistency", 50) or 50) / 100,
+        (stats.get("col_consistency", 50) or 50) / 100,
+        1 if stats.get("is_fixed_seat", False) else 0,
+        min(stats.get("total_appearances", 0) or 0, 50) / 50,
+    ]
+
+
+def context_features(context: Optional[Dict[str, Any]]) -> List[float]:
+    """컨텍스트 피처 (5): total, s_ratio, a_ratio, t_ratio, b_ratio"""
+    if not context:
+        return [0.8, 0.25, 0.25, 0.25, 0.25]
+
+    return [
+        min(context.get("total_members", 80), 100) / 100,  # 정규화
+        context.get("soprano_ratio", 0.25),
+        context.get("alto_ratio", 0.25),
+        context.get("tenor_ratio", 0.25),
+        context.get("bass_ratio", 0.25),
+    ]
+
+
+def rule_features(part: str) -> List[float]:
+    """파트 규칙 피처 (4): is_front, is_left, row_min, row_max"""
+    rule = PART_RULES.get(part, PART_RULES["SOPRANO"])
+    is_front_row_part = 1 if part in ["SOPRANO", "ALTO"] else 0
+    is_left_side_part = 1 if part in ["SOPRANO", "TENOR"] else 0
+    row_min = min(rule["preferred_rows"])
+    row_max = max(rule["preferred_rows"])
+
+    return [
+        is_front_row_part,
+        is_left_side_part,
+        row_min / 6,  # 정규화
+        row_max / 6,
+    ]
+
+
 class SeatRecommender:
     """GradientBoosting 기반 좌석 추천 모델 (v2)"""
 
     def __init__(self):
-        self.row_model: Optional[GradientBoostingClassifier] = None
-        self.col_model: Optional[GradientBoostingClassifier] = None
-        self.part_encoder = LabelEncoder()
-        self.scaler = StandardScaler()
+        self._row_model: Optional["GradientBoostingClassifier"] = None
+        self._col_model: Optional["GradientBoostingClassifier"] = None
+        self._part_encoder: Optional["LabelEncoder"] = None
+        self._scaler: Optional["StandardScaler"] = None
+        self._estimator_path: Optional[str] = None  # 서빙 번들로 로드한 경우 추정기를 읽을 전체 번들
+        self._estimator_digest: Optional[str] = None  # 그 전체 번들의 SHA-256 (서빙 번들에 기록된 값)
+        self.compiled: Optional[CompiledSeatModel] = None  # 평탄화된 추론기
+        self.stats_snapshot: Optional[MemberStatsSnapshot] = None  # 학습에 사용한 대원 통계
         self.is_trained = False
+        self.metadata: Dict[str, Any] = {}  # 학습 메타데이터 (지문, 메트릭, 학습 시간 등)
+        self.load_info: Dict[str, Any] = {}  # 로드 경로/방식/시각/소요 시간 (model_profile 캐시 포함)
         self._fitted_parts = ["SOPRANO", "ALTO", "TENOR", "BASS"]
+        self._set_part_classes(self._fitted_parts)
+
+    def _set_part_classes(self, classes):
+        """파트 → 인코딩 값 (LabelEncoder.classes_ 순서, 추론 시 sklearn 없이 조회)"""
+        self.part_classes = np.asarray(classes)
+        self._part_codes = {str(part): code for code, part in enumerate(self.part_classes)}
+
+    def _ensure_estimators(self):
+        """
+        서빙 번들로 로드한 경우 sklearn 추정기를 전체 번들에서 로드
+
+        그 사이 전체 번들이 교체되었으면 (평탄화 배열과 다른 모델) 전체 번들 기준으로 모델 전체를 다시 로드
+        """
+        if self._estimator_path is None:
+            return
+        path, self._estimator_path = self._estimator_path, None
+        if bundle_digest(path) != self._estimator_digest:
+            logger.warning(f"[ML] {path} changed since its serving bundle was loaded, reloading full bundle")
+            self.load_model(path, mmap=False)
+            return
+
+        import joblib
+
+        model_data = joblib.load(path)
+        self._row_model = model_data["row_model"]
+        self._col_model = model_data["col_model"]
+        self._scaler = model_data["scaler"]
+        self._part_encoder = model_data["part_encoder"]
+        logger.info(f"[ML] Estimators loaded on demand from {path}")
+
+    @property
+    def row_model(self) -> Optional["GradientBoostingClassifier"]:
+        self._ensure_estimators()
+        return self._row_model
+
+    @row_model.setter
+    def row_model(self, model: Optional["GradientBoostingClassifier"]):
+        self._row_model = model
+
+    @property
+    def col_model(self) -> Optional["GradientBoostingClassifier"]:
+        self._ensure_estimators()
+        return self._col_model
+
+    @col_model.setter
+    def col_model(self, model: Optional["GradientBoostingClassifier"]):
+        self._col_model = model
+
+    @property
+    def part_encoder(self) -> "LabelEncoder":
+        """파트 인코더 (처음 사용할 때 생성 후 사전 학습)"""
+        self._ensure_estimators()
+        if self._part_encoder is None:
+            from sklearn.preprocessing import LabelEncoder
+
+            self._part_encoder = LabelEncoder().fit(self._fitted_parts)
+        return self._part_encoder
+
+    @part_encoder.setter
+    def part_encoder(self, encoder: "LabelEncoder"):
+        self._part_encoder = encoder
+        self._set_part_classes(encoder.classes_)
+
+    @property
+    def scaler(self) -> "StandardScaler":
+        """피처 스케일러 (처음 사용할 때 생성)"""
+        self._ensure_estimators()
+        if self._scaler is None:
+            from sklearn.preprocessing import StandardScaler
+
+            self._scaler = StandardScaler()
+        return self._scaler
+
+    @scaler.setter
+    def scaler(self, scaler: "StandardScaler"):
+        self._scaler = scaler
+
+    def footprint_bytes(self) -> int:
+        """
+        로드된 모델의 메모리 추정치 (평탄화 배열 + 통계 스냅샷 + 로드된 sklearn 트리)
+
+        mmap 서빙 번들의 배열은 워커 간 공유되지만 보수적으로 모두 포함
+        """
+        total = 0
+        if self.compiled is not None:
+            total += self.compiled.nbytes
+        if self.stats_snapshot is not None:
+            total += self.stats_snapshot.nbytes
+        for model in (self._row_model, self._col_model):
+            if model is not None:
+                total += ensemble_nbytes(model)
+        return total
+
+    def estimator_summaries(self) -> Dict[str, Dict[str, Any]]:
+        """
+        행/열 앙상블 구조 요약
 
-        # 파트 인코더 사전 학습
-        self.part_encoder.fit(self._fitted_parts)
+        학습 시 기록한 metadata["estimators"]를 사용 (mmap 로드 시 sklearn 추정기를 읽지 않음)
+        기록이 없는 이전 번들은 로드된 추정기 또는 평탄화 배열에서 계산 (노드/리프 수는 추정기 필요)
+        """
+        if self.metadata.get("estimators"):
+            return self.metadata["estimators"]
+
+        summaries: Dict[str, Dict[str, Any]] = {}
+        for name, model in (("row", self._row_model), ("col", self._col_model)):
+            if model is not None:
+                summaries[name] = estimator_summary(model)
+            elif self.compiled is not None:
+                ensemble = getattr(self.compiled, name)
+                summaries[name] = {
+                    "n_stages": ensemble.n_stages,
+                    "trees": ensemble.n_trees,
+                    "nodes": None,
+                    "leaves": None,
+                    "max_depth": ensemble.depth,
+                    "classes": int(len(ensemble.classes)),
+                    "sklearn_bytes": None,
+                }
+        return summaries
+
+    def member_stats(self, db_stats: Optional[Mapping[str, Dict[str, Any]]] = None) -> Mapping[str, Dict[str, Any]]:
+        """
+        추천용 대원 통계 (모델에 포함된 스냅샷 위에 DB 통계를 덮어씀)
+
+        감쇠 통계로 학습한 모델(metadata["stats_half_life_days"])은 스냅샷 대원에
+        같은 반감기로 동기화된 DB 행만 덮어씀 (학습 때와 다른 기준의 통계 피처 방지)
+        """
+        if self.stats_snapshot is None:
+            return db_stats or {}
+        if not db_stats:
+            return self.stats_snapshot
+        half_life = self.metadata.get("stats_half_life_days")
+        if half_life is None:
+            return StatsOverlay(self.stats_snapshot, db_stats)
+        return StatsOverlay(self.stats_snapshot, matching_db_stats(self.stats_snapshot, db_stats, half_life), db_stats)
 
     def extract_features(
         self,
@@ -70,62 +462,33 @@ class SeatRecommender:
         - 파트 규칙 (4): is_front, is_left, row_min, row_max
         """
         part = member.get("part", "SOPRANO")
-        part_encoded = self.part_encoder.transform([part])[0]
+        arrangement = self.arrangement_features(member, context)
+
+        # 기본(3) + 통계(6) + 컨텍스트/파트 규칙(9) 순서
+        features = arrangement[:3] + stats_features(part, stats) + arrangement[3:]
+
+        return np.array(features).reshape(1, -1)
+
+    def arrangement_features(
+        self,
+        member: Dict[str, Any],
+        context: Optional[Dict[str, Any]] = None
+    ) -> List[float]:
+        """
+        배치 안에서 결정되는 피처 (ARRANGEMENT_FEATURE_COLUMNS 순서)
+
+        기본(3) + 컨텍스트(5) + 파트 규칙(4) — 다른 배치가 추가되어도 바뀌지 않음
+        """
+        part = member.get("part", "SOPRANO")
+        if part not in self._part_codes:
+            raise ValueError(f"y contains previously unseen labels: '{part}'")
+        part_encoded = self._part_codes[part]
 
         # 기본 피처 (키/경력은 미래 대비, 없으면 기본값)
         height = member.get("height") or 170
         experience = member.get("experience") or 0
 
-        features = [
-            part_encoded,
-            height,
-            experience,
-        ]
-
-        # 통계 피처 (파트별 기본값 적용)
-        default_vals = PART_DEFAULT_VALUES.get(part, PART_DEFAULT_VALUES["SOPRANO"])
-        default_row = default_vals["preferred_row"]
-        default_col = default_vals["preferred_col"]
-
-        if stats:
-            features.extend([
-                stats.get("preferred_row") or default_row,
-                stats.get("preferred_col") or default_col,
-                (stats.get("row_consistency", 50) or 50) / 100,
-                (stats.get("col_consistency", 50) or 50) / 100,
-                1 if stats.get("is_fixed_seat", False) else 0,
-                min(stats.get("total_appearances", 0) or 0, 50) / 50,
-            ])
-        else:
-            features.extend([default_row, default_col, 0.5, 0.5, 0, 0])
-
-        # 컨텍스트 피처
-        if context:
-            features.extend([
-                min(context.get("total_members", 80), 100) / 100,  # 정규화
-                context.get("soprano_ratio", 0.25),
-                context.get("alto_ratio", 0.25),
-                context.get("tenor_ratio", 0.25),
-                context.get("bass_ratio", 0.25),
-            ])
-        else:
-            features.extend([0.8, 0.25, 0.25, 0.25, 0.25])
-
-        # 파트 규칙 피처 (NEW)
-        rule = PART_RULES.get(part, PART_RULES["SOPRANO"])
-        is_front_row_part = 1 if part in ["SOPRANO", "ALTO"] else 0
-        is_left_side_part = 1 if part in ["SOPRANO", "TENOR"] else 0
-        row_min = min(rule["preferred_rows"])
-        row_max = max(rule["preferred_rows"])
-
-        features.extend([
-            is_front_row_part,
-            is_left_side_part,
-            row_min / 6,  # 정규화
-            row_max / 6,
-        ])
-
-        return np.array(features).reshape(1, -1)
+        return [part_encoded, height, experience] + context_features(context) + rule_features(part)
 
     def _calculate_near_accuracy(
         self,
@@ -165,14 +528,13 @@ class SeatRecommender:
             if row_ok and col_ok:
                 compliant += 1
 
-        return compliant / len(parts) if parts else 0
-
-    def train(self, training_data: List[Dict[str, Any]]) -> Dict[str, float]:
-        """학습 데이터로 모델 훈련 (개선됨)"""
-        if len(training_data) < settings.MIN_TRAINING_SAMPLES:
-            raise ValueError(f"최소 {settings.MIN_TRAINING_SAMPLES}개의 샘플이 필요합니다. (현재: {len(training_data)})")
+        return compliant / len(parts) if len(parts) else 0
 
-        # 피처 및 레이블 추출
+    def build_feature_matrix(
+        self,
+        training_data: List[Dict[str, Any]]
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, List[str]]:
+        """학습 레코드에서 (스케일링 전) 피처 행렬과 행/열 레이블 추출"""
         X, y_row, y_col, parts = [], [], [], []
 
         for record in training_data:
@@ -186,46 +548,96 @@ class SeatRecommender:
             y_col.append(record.get("seat_col", 8))
             parts.append(member.get("part", "SOPRANO"))
 
-        X = np.array(X)
-        y_row = np.array(y_row)
-        y_col = np.array(y_col)
+        return np.array(X), np.array(y_row), np.array(y_col), parts
 
-        # 스케일링
-        X = self.scaler.fit_transform(X)
+    def build_training_set(self, training_data: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """
+        학습 레코드를 학습용 배열 묶음으로 변환
+
+        Returns:
+            X (스케일링 전), y_row, y_col, parts, groups (배치 ID), member_stats
+            — 피처 저장소(feature_store.read)와 같은 열 (X는 스케일링 전 float64, scaler 없음)
+        """
+        X, y_row, y_col, parts = self.build_feature_matrix(training_data)
+        member_stats = {}
+        for record in training_data:
+            member_id = record.get("member", {}).get("id")
+            if member_id and record.get("stats"):
+                member_stats[member_id] = record["stats"]
+        return {
+            "X": X,
+            "y_row": y_row,
+            "y_col": y_col,
+            "parts": np.array(parts),
+            "groups": np.array([str(r.get("arrangement_id") or "") for r in training_data]),
+            "member_stats": member_stats,
+        }
+
+    def train(self, training_data: List[Dict[str, Any]]) -> Dict[str, float]:
+        """학습 데이터로 모델 훈련 (개선됨)"""
+        if len(training_data) < settings.MIN_TRAINING_SAMPLES:
+            raise ValueError(f"최소 {settings.MIN_TRAINING_SAMPLES}개의 샘플이 필요합니다. (현재: {len(training_data)})")
+
+        return self.train_arrays(self.build_training_set(training_data))
+
+    def train_arrays(self, dataset: Dict[str, np.ndarray]) -> Dict[str, float]:
+        """
+        학습용 배열 묶음으로 모델 훈련
+
+        Args:
+            dataset: build_training_set 또는 feature_store.read 결과
+                     (scaler가 있으면 X는 이미 스케일링된 float32 행렬로 보고 그대로 사용,
+                      없으면 float32로 변환해 제자리 스케일링: X가 이미 float32 배열이면 사본 없이
+                      dataset의 X를 바꾸고 scaler를 함께 기록해 다시 넘겨도 두 번 스케일링되지 않음)
+        """
+        from sklearn.metrics import accuracy_score
+        from sklearn.model_selection import train_test_split
+
+        X, y_row, y_col, parts = dataset["X"], dataset["y_row"], dataset["y_col"], dataset["parts"]
+        if len(X) < settings.MIN_TRAINING_SAMPLES:
+            raise ValueError(f"최소 {settings.MIN_TRAINING_SAMPLES}개의 샘플이 필요합니다. (현재: {len(X)})")
+
+        self.metadata = {}
+        self._estimator_path = None  # 새로 학습하므로 이전 번들의 추정기는 읽지 않음
+        member_stats = dataset.get("member_stats")
+        self.stats_snapshot = MemberStatsSnapshot.from_stats(member_stats) if member_stats is not None else None
+
+        # 스케일링 (float32 행렬 하나로: GradientBoosting도 내부적으로 float32를 사용)
+        if dataset.get("scaler") is not None:
+            self.scaler = dataset["scaler"]
+        else:
+            X = np.asarray(X, dtype=np.float32)
+            self.scaler = fit_scaler_in_chunks(X)
+            scale_in_place(X, self.scaler)
+            dataset["X"], dataset["scaler"] = X, self.scaler
 
-        # 학습/테스트 분리
+        # 학습/테스트 분리 (테스트 세트는 메트릭 보고에만 사용)
         X_train, X_test, y_row_train, y_row_test, y_col_train, y_col_test, parts_train, parts_test = \
             train_test_split(X, y_row, y_col, parts, test_size=0.2, random_state=42)
 
-        # 행 예측 모델 (GradientBoosting)
-        print("[ML] Training row model with GradientBoosting...")
-        self.row_model = GradientBoostingClassifier(
-            n_estimators=200,
-            max_depth=6,
-            learning_rate=0.1,
-            min_samples_split=5,
-            min_samples_leaf=2,
-            random_state=42,
-        )
-        self.row_model.fit(X_train, y_row_train)
-
-        # 열 예측 모델 (GradientBoosting)
-        print("[ML] Training col model with GradientBoosting...")
-        self.col_model = GradientBoostingClassifier(
-            n_estimators=200,
-            max_depth=6,
-            learning_rate=0.1,
-            min_samples_split=5,
-            min_samples_leaf=2,
-            random_state=42,
-        )
-        self.col_model.fit(X_train, y_col_train)
+        # 하이퍼파라미터 (기본값 + 오프라인 튜닝 결과)
+        params = {"row": load_model_params("row"), "col": load_model_params("col")}
+        self.metadata["params"] = params
+        self.metadata["config_fingerprint"] = training_config_fingerprint()
+        # 감쇠 통계로 학습한 경우 그 반감기 (서빙 시 같은 기준의 DB 통계만 사용, DB 학습은 None)
+        self.metadata["stats_half_life_days"] = dataset.get("stats_half_life_days")
 
-        self.is_trained = True
+        fit_metrics = self._fit_estimators(X_train, y_row_train, y_col_train, params)
 
         # 예측
         y_row_pred = self.row_model.predict(X_test)
         y_col_pred = self.col_model.predict(X_test)
+        self.compiled = None  # save_model 시 다시 내보냄
+        self.metadata["estimators"] = {
+            "row": estimator_summary(self.row_model),
+            "col": estimator_summary(self.col_model),
+        }
+        self.load_info = {
+            "path": None,
+            "mode": "trained",
+            "loaded_at": datetime.now(timezone.utc).isoformat(),
+            "load_seconds": None,
+        }
 
         # 정확도 계산 (다양한 메트릭)
         row_accuracy = accuracy_score(y_row_test, y_row_pred)
@@ -244,9 +656,310 @@ class SeatRecommender:
             "row_near_accuracy": round(row_near_accuracy, 4),  # ±1행
             "col_near_accuracy": round(col_near_accuracy, 4),  # ±2열
             "rule_compliance": round(rule_compliance, 4),
-            "samples_used": float(len(training_data)),
+            "samples_used": float(len(X)),
+            "training_matrix_mb": round(X.nbytes / 2**20, 2),
+            "peak_memory_mb": round(peak_rss_mb(), 1),  # 학습 데이터 로드 + 학습 구간 최대 RSS
+            "row_n_estimators": float(self.row_model.n_estimators_),
+            "col_n_estimators": float(self.col_model.n_estimators_),
+            **fit_metrics,
+        }
+
+    def _fit_estimators(
+        self,
+        X_train: np.ndarray,
+        y_row_train: np.ndarray,
+        y_col_train: np.ndarray,
+        params: Dict[str, Dict[str, Any]]
+    ) -> Dict[str, float]:
+        """
+        스케일링된 학습 분할로 행/열 앙상블 학습
+
+        1. 크기 선택용 검증 세트 분리 (MODEL_SIZE_SELECTION)
+        2. 같은 피처/레이블 행을 가중 샘플로 합침
+        3. 조기 종료 학습 (_build_model)
+        4. 근접 정확도 허용 범위 내 최소 앙상블 선택
+        /train(train_arrays)과 하이퍼파라미터 탐색의 폴드 평가(tuning)가 같은 절차를 사용
+        self.scaler는 X_train을 스케일링한 스케일러여야 함
+
+        Returns:
+            샘플 축소 / 학습 시간 / 조기 종료 / 크기 선택 메트릭
+        """
+        from sklearn.model_selection import train_test_split
+
+        # 크기 선택용 검증 세트는 학습 분할에서 따로 떼어냄 (선택에 쓴 데이터로 메트릭을 보고하지 않도록)
+        validation = None
+        if settings.MODEL_SIZE_SELECTION:
+            X_train, X_val, y_row_train, y_row_val, y_col_train, y_col_val = train_test_split(
+                X_train, y_row_train, y_col_train,
+                test_size=settings.MODEL_SIZE_VALIDATION_FRACTION, random_state=42,
+            )
+            validation = (X_val, y_row_val, y_col_val)
+
+        # 같은 피처/레이블 행을 가중 샘플로 합침 (테스트 세트는 원래 행 그대로 평가)
+        samples = reduce_training_samples(
+            X_train, y_row_train, y_col_train,
+            dedup=settings.SAMPLE_DEDUP,
+            context_columns=CONTEXT_FEATURE_COLUMNS,
+            # 비교 단위는 원래 값 기준이므로 스케일링된 열 단위로 변환
+            context_step=settings.SAMPLE_DEDUP_CONTEXT_STEP / self.scaler.scale_[CONTEXT_FEATURE_COLUMNS],
+            coreset_fraction=settings.SAMPLE_CORESET_FRACTION,
+        )
+        reduction = reduction_summary(len(X_train), samples)
+        X_fit, weights = samples["X"], samples["weights"]
+        logger.info(f"[ML] Training on {len(X_fit)} weighted samples "
+                    f"({len(X_train)} rows, reduction {reduction['sample_reduction_ratio']:.1%})")
+
+        fit_start = time.perf_counter()
+
+        # 행 예측 모델 (GradientBoosting)
+        logger.info("[ML] Training row model with GradientBoosting...")
+        self.row_model = self._build_model(samples["y_row"], params["row"], weights)
+        self.row_model.fit(X_fit, samples["y_row"], sample_weight=weights)
+        reduction["row_fit_seconds"] = round(time.perf_counter() - fit_start, 3)
+
+        # 열 예측 모델 (GradientBoosting)
+        logger.info("[ML] Training col model with GradientBoosting...")
+        col_start = time.perf_counter()
+        self.col_model = self._build_model(samples["y_col"], params["col"], weights)
+        self.col_model.fit(X_fit, samples["y_col"], sample_weight=weights)
+        reduction["col_fit_seconds"] = round(time.perf_counter() - col_start, 3)
+
+        reduction["estimator_fit_seconds"] = round(time.perf_counter() - fit_start, 3)
+        self.is_trained = True
+
+        # 조기 종료 결과 기록
+        size_metrics = {
+            "row_early_stopped_estimators": float(self.row_model.n_estimators_),
+            "col_early_stopped_estimators": float(self.col_model.n_estimators_),
         }
 
+        # 근접 정확도 허용 범위 내 최소 앙상블 선택 (지연 예산 적용)
+        if validation is not None:
+            size_metrics.update(self._select_model_size(*validation))
+
+        return {**reduction, **size_metrics}
+
+    def _build_model(
+        self,
+        y: np.ndarray,
+        params: Dict[str, Any],
+        sample_weight: Optional[np.ndarray] = None
+    ) -> "GradientBoostingClassifier":
+        """
+        GradientBoosting 모델 생성 (검증 손실 기반 조기 종료)
+
+        조기 종료용 검증 분할은 클래스 층화 분할이므로,
+        클래스별 샘플이 2개 미만이거나 검증 세트가 클래스 수보다 작으면 비활성화
+        가중 샘플이면 최소 잎 크기를 원래 행 수 기준 가중치 비율로 변환
+        """
+        from sklearn.ensemble import GradientBoostingClassifier
+
+        if sample_weight is not None and len(sample_weight) < sample_weight.sum():
+            params = weighted_tree_params(params, float(sample_weight.sum()))
+        _, class_counts = np.unique(y, return_counts=True)
+        n_validation = int(np.ceil(len(y) * settings.EARLY_STOPPING_VALIDATION_FRACTION))
+        early_stopping = (
+            settings.EARLY_STOPPING_ROUNDS > 0 and
+            class_counts.min() >= 2 and
+            len(class_counts) <= n_validation <= len(y) - len(class_counts)
+        )
+        return GradientBoostingClassifier(
+            **params,
+            n_iter_no_change=settings.EARLY_STOPPING_ROUNDS if early_stopping else None,
+            validation_fraction=settings.EARLY_STOPPING_VALIDATION_FRACTION,
+            random_state=42,
+        )
+
+    def _measure_predict_latency(
+        self,
+        row_model: "GradientBoostingClassifier",
+        col_model: "GradientBoostingClassifier",
+        X_roster: np.ndarray,
+        repeats: int = 5
+    ) -> float:
+        """평탄화 추론기로 로스터 1회 추론 지연 측정 (중앙값, ms)"""
+        compiled = CompiledSeatModel.from_sklearn(self.scaler, row_model, col_model)
+        X_raw = self.scaler.inverse_transform(X_roster)
+        compiled.predict(X_raw)  # 워밍업
+
+        samples = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            compiled.predict(X_raw)
+            samples.append((time.perf_counter() - start) * 1000)
+        return float(np.median(samples))
+
+    def _select_model_size(
+        self,
+        X_val: np.ndarray,
+        y_row_val: np.ndarray,
+        y_col_val: np.ndarray
+    ) -> Dict[str, float]:
+        """
+        근접 정확도(±1행, ±2열)가 최고치 대비 허용 범위 내인 최소 앙상블 선택
+
+        검증 세트(X_val)는 학습 분할에서 떼어낸 것 (테스트 세트 메트릭에 선택 편향이 들어가지 않음)
+        1. stage별 근접 정확도 곡선 계산 (staged_predict)
+        2. 모델별로 허용 범위 내 최소 크기 선택
+        3. 로스터 추론 지연이 예산을 넘으면 두 모델을 같은 비율로 축소
+        선택된 크기로 앙상블을 잘라내고 곡선은 metadata["size_selection"]에 기록
+        """
+        tolerance = settings.MODEL_SIZE_TOLERANCE
+        curves = {}
+        chosen = {}
+
+        for name, model, y_true, near_tol in (
+            ("row", self.row_model, y_row_val, 1),
+            ("col", self.col_model, y_col_val, 2),
+        ):
+            near = np.array([
+                self._calculate_near_accuracy(y_true, y_pred, tolerance=near_tol)
+                for y_pred in model.staged_predict(X_val)
+            ])
+            best = float(near.max())
+            sizes = sorted({n for n in SIZE_CANDIDATES if n < len(near)} | {len(near)})
+            chosen[name] = next(n for n in sizes if near[n - 1] >= best - tolerance)
+            curves[name] = [{"n_estimators": n, "near_accuracy": round(float(near[n - 1]), 4)} for n in sizes]
+
+        # 지연 예산 적용 (예산 충족 또는 최소 크기까지 축소)
+        rng = np.random.default_rng(42)
+        X_roster = X_val[rng.integers(0, len(X_val), settings.LATENCY_BUDGET_ROSTER_SIZE)]
+        budget_ms = settings.PREDICT_LATENCY_BUDGET_MS
+
+        latency_curve = []
+        for scale in (1.0, 0.75, 0.5, 0.35, 0.25, 0.15, 0.1):
+            n_row = max(1, int(chosen["row"] * scale))
+            n_col = max(1, int(chosen["col"] * scale))
+            latency_ms = self._measure_predict_latency(
+                truncate_ensemble(self.row_model, n_row),
+                truncate_ensemble(self.col_model, n_col),
+                X_roster,
+            )
+            latency_curve.append({
+                "row_n_estimators": n_row,
+                "col_n_estimators": n_col,
+                "latency_ms": round(latency_ms, 3),
+            })
+            if latency_ms <= budget_ms:
+                break
+
+        final = latency_curve[-1]
+        budget_met = final["latency_ms"] <= budget_ms
+        if not budget_met:
+            logger.warning(f"[ML] Predict latency {final['latency_ms']:.1f}ms exceeds budget {budget_ms}ms at minimum size")
+
+        self.row_model = truncate_ensemble(self.row_model, final["row_n_estimators"])
+        self.col_model = truncate_ensemble(self.col_model, final["col_n_estimators"])
+        logger.info(f"[ML] Selected ensemble size: row={final['row_n_estimators']}, col={final['col_n_estimators']} "
+                    f"({final['latency_ms']:.1f}ms / budget {budget_ms}ms)")
+
+        self.metadata["size_selection"] = {
+            "tolerance": tolerance,
+            "accuracy_curve": curves,
+            "latency_curve": latency_curve,
+            "latency_budget_ms": budget_ms,
+            "roster_size": settings.LATENCY_BUDGET_ROSTER_SIZE,
+            "budget_met": budget_met,
+            "validation_rows": len(X_val),
+        }
+
+        return {
+            "predict_latency_ms": final["latency_ms"],
+            "latency_budget_ms": budget_ms,
+            "latency_budget_met": 1.0 if budget_met else 0.0,
+            "size_selection_rows": float(len(X_val)),
+        }
+
+    def _compile(self, n_probe: int = 512) -> Optional[CompiledSeatModel]:
+        """
+        학습된 모델을 평탄화하고 검증용 입력으로 sklearn 예측과 비교
+
+        검증 입력 (결정적 시드):
+        - 스케일링된 공간의 표준정규 샘플 (앙상블만 비교)
+        - 스케일링 전 공간의 샘플: 평탄화 추론기는 원본을, sklearn은 학습 경로(scale_in_place)로
+          스케일링한 float32 행렬을 받음 (스케일링까지 포함해 비교)
+        불일치 시 None을 반환하여 sklearn 경로로 추론
+        """
+        compiled = CompiledSeatModel.from_sklearn(self.scaler, self.row_model, self.col_model)
+
+        rng = np.random.default_rng(42)
+        n_features = self.row_model.n_features_in_
+        X_probe = rng.standard_normal((n_probe, n_features))
+        X_raw = self.scaler.mean_ + self.scaler.scale_ * rng.standard_normal((n_probe, n_features)) * 2
+        X_train_scaled = scale_in_place(np.array(X_raw, dtype=np.float32), self.scaler)
+        rows, cols = compiled.predict(X_raw)
+        if not (
+            np.array_equal(compiled.row.predict(X_probe), self.row_model.predict(X_probe)) and
+            np.array_equal(compiled.col.predict(X_probe), self.col_model.predict(X_probe)) and
+            np.array_equal(rows, self.row_model.predict(X_train_scaled)) and
+            np.array_equal(cols, self.col_model.predict(X_train_scaled))
+        ):
+            logger.warning("[ML] Compiled predictor mismatch, falling back to sklearn predict")
+            return None
+
+        self.metadata["predict_paths"] = self._measure_predict_paths(compiled)
+        return compiled
+
+    def _measure_predict_paths(self, compiled: CompiledSeatModel, repeats: int = 3) -> Dict[str, str]:
+        """
+        배치 크기별로 더 빠른 추론 경로 측정 (COMPILED_PROBE_BATCH_SIZES, 중앙값 비교)
+
+        평탄화 추론기는 호출 오버헤드가 작아 작은 배치에서, sklearn은 트리 수 × 행 수가 큰 배치에서
+        빨라질 수 있으므로 (모델 크기에 따라 전환점이 다름) 저장할 때 모델별로 측정
+
+        Returns:
+            {"1": "compiled", ..., "1024": "sklearn"}
+        """
+        def median_ms(fn) -> float:
+            fn()  # 워밍업
+            samples = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                fn()
+                samples.append((time.perf_counter() - start) * 1000)
+            return float(np.median(samples))
+
+        def sklearn_predict(X_raw: np.ndarray):
+            X_scaled = scale_in_place(np.array(X_raw, dtype=np.float32), self.scaler)
+            self.row_model.predict(X_scaled)
+            self.col_model.predict(X_scaled)
+
+        rng = np.random.default_rng(0)
+        n_features = self.row_model.n_features_in_
+        paths, timings = {}, []
+        for size in COMPILED_PROBE_BATCH_SIZES:
+            X_raw = self.scaler.mean_ + self.scaler.scale_ * rng.standard_normal((size, n_features))
+            compiled_ms = median_ms(lambda: compiled.predict(X_raw))
+            sklearn_ms = median_ms(lambda: sklearn_predict(X_raw))
+            paths[str(size)] = "compiled" if compiled_ms <= sklearn_ms else "sklearn"
+            timings.append(f"{size}: {compiled_ms:.2f}/{sklearn_ms:.2f}ms")
+        logger.info(f"[ML] Predict paths by batch size: {paths} (compiled/sklearn {', '.join(timings)})")
+        return paths
+
+    def _use_compiled(self, n_rows: int) -> bool:
+        """
+        배치 크기로 추론 경로 선택
+
+        - metadata["predict_paths"]에서 n_rows 이하인 가장 큰 측정 크기의 경로
+        - 측정 전 번들(키 없음)은 항상 평탄화 추론기 (이전 동작)
+        - mmap 서빙 번들로 로드해 sklearn 추정기가 아직 없으면 평탄화 추론기
+          (작은 배치 때문에 전체 번들을 읽으면 워커 간 페이지 공유 이점이 사라짐)
+        """
+        paths = self.metadata.get("predict_paths")
+        if not paths or self._estimator_path is not None or self._row_model is None:
+            return True
+        sizes = sorted(int(size) for size in paths)
+        bucket = max((size for size in sizes if size <= n_rows), default=sizes[0])
+        return paths[str(bucket)] == "compiled"
+
+    def predict_batch(self, X: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """스케일링 전 피처 행렬로 (행, 열) 일괄 예측 (배치 크기에 따라 평탄화 추론기 / sklearn)"""
+        if self.compiled is not None and self._use_compiled(len(X)):
+            return self.compiled.predict(X)
+
+        X_scaled = scale_in_place(np.array(X, dtype=np.float32), self.scaler)  # 학습과 같은 float32 스케일링
+        return self.row_model.predict(X_scaled), self.col_model.predict(X_scaled)
+
     def _get_valid_row_range(self, part: str) -> List[int]:
         """파트별 유효 행 범위 반환 (하이브리드)"""
         rule = PART_RULES.get(part, PART_RULES["SOPRANO"])
@@ -265,8 +978,9 @@ class SeatRecommender:
     def recommend(
         self,
         members: List[Dict[str, Any]],
-        member_stats: Dict[str, Dict[str, Any]],
-        grid_layout: Dict[str, Any]
+        member_stats: Mapping[str, Dict[str, Any]],
+        grid_layout: Dict[str, Any],
+        cancel: Optional[threading.Event] = None,
     ) -> List[Dict[str, Any]]:
         """
         대원 목록에 대한 좌석 추천 (하이브리드 방식)
@@ -274,6 +988,10 @@ class SeatRecommender:
         1. 파트 규칙으로 행/열 범위 제한
         2. ML 모델로 범위 내 세부 위치 예측
         3. 충돌 해결
+
+        Args:
+            cancel: 설정되면 예측 이후 / 대원마다 확인해 RecommendCancelled로 중단
+                    (스레드에서 실행 중인 추천을 호출 측이 포기했을 때 남은 작업을 멈춤)
         """
         if not self.is_trained:
             raise ValueError("모델이 학습되지 않았습니다. /api/v1/train을 먼저 호출하세요.")
@@ -308,16 +1026,20 @@ class SeatRecommender:
             )
         )
 
-        for member in sorted_members:
-            stats = member_stats.get(member["id"], {})
-            part = member.get("part", "SOPRANO")
+        # ML 예측 (로스터 전체를 한 번에)
+        X = np.vstack([
+            self.extract_features(member, member_stats.get(member["id"], {}), context)
+            for member in sorted_members
+        ])
+        pred_rows, pred_cols = self.predict_batch(X)
 
-            features = self.extract_features(member, stats, context)
-            features_scaled = self.scaler.transform(features)
+        for i, member in enumerate(sorted_members):
+            if cancel is not None and cancel.is_set():
+                raise RecommendCancelled()
+            part = member.get("part", "SOPRANO")
 
-            # ML 예측
-            pred_row = int(self.row_model.predict(features_scaled)[0])
-            pred_col = int(self.col_model.predict(features_scaled)[0])
+            pred_row = int(pred_rows[i])
+            pred_col = int(pred_cols[i])
 
             # 1-based to 0-based 변환
             pred_row = max(0, pred_row - 1) if pred_row > 0 else pred_row
@@ -428,39 +1150,129 @@ class SeatRecommender:
         return None, None
 
     def save_model(self, path: Optional[str] = None):
-        """모델 저장"""
+        """모델 저장 (전체 번들 + 서빙 번들)"""
         if not self.is_trained:
             raise ValueError("학습된 모델이 없습니다.")
 
         save_path = path or settings.MODEL_PATH
         os.makedirs(os.path.dirname(save_path), exist_ok=True)
 
+        # 추론용 평탄화 배열 내보내기
+        if self.compiled is None:
+            self.compiled = self._compile()
+
         model_data = {
             "row_model": self.row_model,
             "col_model": self.col_model,
             "scaler": self.scaler,
             "part_encoder": self.part_encoder,
+            "compiled": self.compiled.to_arrays() if self.compiled is not None else None,
+            "stats_snapshot": self.stats_snapshot.to_arrays() if self.stats_snapshot is not None else None,
+            "metadata": self.metadata,
             "version": "2.0",  # 버전 추가
         }
-        joblib.dump(model_data, save_path)
-        print(f"[ML] Model v2 saved to {save_path}")
+        import joblib
+
+        _replace_file(lambda tmp: joblib.dump(model_data, tmp), save_path)
+        logger.info(f"[ML] Model v2 saved to {save_path}")
+        self._save_serving_bundle(save_path)
+
+        self.load_info.pop("profile", None)  # 평탄화 배열이 바뀌었을 수 있음
+        if self.load_info.get("mode") == "trained":
+            self.load_info["path"] = save_path
+
+    def _save_serving_bundle(self, path: str):
+        """평탄화 배열만 비압축으로 저장 (배열은 정렬되어 기록되므로 mmap_mode로 바로 매핑 가능)"""
+        serving_path = serving_bundle_path(path)
+        if self.compiled is None:
+            # 평탄화 검증 실패 모델은 전체 번들로만 서빙
+            if os.path.exists(serving_path):
+                os.remove(serving_path)
+            return
+
+        import joblib
+
+        serving_data = {
+            "compiled": self.compiled.to_arrays(),
+            "part_classes": self.part_classes,
+            "stats_snapshot": self.stats_snapshot.to_arrays() if self.stats_snapshot is not None else None,
+            "metadata": self.metadata,
+            "version": "2.0",
+            "bundle_sha256": bundle_digest(path),  # 짝이 맞는 전체 번들인지 확인용
+        }
+        _replace_file(lambda tmp: joblib.dump(serving_data, tmp), serving_path)
+        logger.info(f"[ML] Serving bundle saved to {serving_path}")
 
-    def load_model(self, path: Optional[str] = None):
-        """모델 로드"""
+    def load_model(self, path: Optional[str] = None, mmap: Optional[bool] = None):
+        """
+        모델 로드
+
+        Args:
+            mmap: 서빙 번들을 mmap으로 로드 (기본값 MODEL_MMAP_SERVING, 서빙 번들이 없으면 전체 번들)
+        """
         load_path = path or settings.MODEL_PATH
 
         if not os.path.exists(load_path):
             raise FileNotFoundError(f"모델 파일을 찾을 수 없습니다: {load_path}")
 
+        start = time.perf_counter()
+        if settings.MODEL_MMAP_SERVING if mmap is None else mmap:
+            if self._load_serving_bundle(load_path):
+                self._record_load(load_path, "mmap", start)
+                return
+
+        import joblib
+
         model_data = joblib.load(load_path)
+        self._estimator_path = None
         self.row_model = model_data["row_model"]
         self.col_model = model_data["col_model"]
         self.scaler = model_data["scaler"]
         self.part_encoder = model_data["part_encoder"]
+        self.metadata = model_data.get("metadata", {})
+        compiled_arrays = model_data.get("compiled")
+        self.compiled = CompiledSeatModel.from_arrays(compiled_arrays) if compiled_arrays else None
+        self.stats_snapshot = _load_stats_snapshot(model_data)
         self.is_trained = True
+        self._record_load(load_path, "full", start)
 
         version = model_data.get("version", "1.0")
-        print(f"[ML] Model v{version} loaded from {load_path}")
+        logger.info(f"[ML] Model v{version} loaded from {load_path}")
+
+    def _record_load(self, path: str, mode: str, start: float):
+        self.load_info = {
+            "path": path,
+            "mode": mode,
+            "loaded_at": datetime.now(timezone.utc).isoformat(),
+            "load_seconds": round(time.perf_counter() - start, 4),
+        }
+
+    def _load_serving_bundle(self, path: str) -> bool:
+        """서빙 번들을 mmap으로 로드, 없거나 전체 번들과 짝이 맞지 않으면 False"""
+        serving_path = serving_bundle_path(path)
+        if not os.path.exists(serving_path):
+            return False
+
+        import joblib
+
+        serving_data = joblib.load(serving_path, mmap_mode="r")
+        if serving_data.get("bundle_sha256") != bundle_digest(path):
+            logger.warning(f"[ML] Serving bundle {serving_path} does not match {path}, loading full bundle")
+            return False
+
+        self._row_model = self._col_model = None
+        self._scaler = self._part_encoder = None
+        self._estimator_path = path
+        self._estimator_digest = serving_data["bundle_sha256"]
+        self._set_part_classes(serving_data["part_classes"])
+        self.compiled = CompiledSeatModel.from_arrays(serving_data["compiled"])
+        self.stats_snapshot = _load_stats_snapshot(serving_data)
+        self.metadata = serving_data.get("metadata", {})
+        self.is_trained = True
+
+        version = serving_data.get("version", "1.0")
+        logger.info(f"[ML] Model v{version} loaded from {serving_path} (memory-mapped, estimators on demand)")
+        return True
 
 
 # 싱글톤 인스턴스
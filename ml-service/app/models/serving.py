@@ -0,0 +1,301 @@
+"""
+모델 서빙 라우팅
+
+- primary 모델 + 선택적 섀도우 모델
+- 섀도우 모델은 샘플링된 요청에 대해 응답 이후(백그라운드) 평가
+  비교 기준은 항상 primary (A/B 버전이 응답한 요청이면 primary 결과를 다시 계산)
+- 버전별 가중치 기반 A/B 라우팅
+- 현재 primary는 model_server.primary (seat_recommender.recommender는 시작 시의 빈 인스턴스)
+"""
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.models.registry import ModelRegistry, model_registry
+from app.models.seat_recommender import SeatRecommender, recommender
+from app.models.stats_snapshot import MemberStatsSnapshot, StatsOverlay
+
+logger = logging.getLogger(__name__)
+
+
+PRIMARY_ALIAS = "primary"
+LATENCY_WINDOW = 1000  # 섀도우 지연 시간 통계용 최근 샘플 수
+
+
+class ShadowStats:
+    """섀도우 평가 누적 통계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.requests = 0
+        self.errors = 0
+        self.members_compared = 0
+        self.disagreements = 0
+        self.baseline_recomputed = 0  # A/B 버전이 응답해 primary 결과를 다시 계산한 요청
+        self.skipped = 0  # 비교 기준(학습된 primary)이 없어 건너뛴 요청
+        self.latencies_ms: deque = deque(maxlen=LATENCY_WINDOW)
+
+    def record(self, latency_ms: float, compared: int, disagreements: int, baseline_recomputed: bool = False):
+        with self._lock:
+            self.requests += 1
+            self.baseline_recomputed += int(baseline_recomputed)
+            self.members_compared += compared
+            self.disagreements += disagreements
+            self.latencies_ms.append(latency_ms)
+
+    def record_error(self):
+        with self._lock:
+            self.errors += 1
+
+    def record_skipped(self):
+        with self._lock:
+            self.skipped += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            latencies = np.array(self.latencies_ms) if self.latencies_ms else None
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "skipped": self.skipped,
+                "baseline_version": PRIMARY_ALIAS,
+                "baseline_recomputed": self.baseline_recomputed,
+                "members_compared": self.members_compared,
+                "disagreement_rate": (
+                    round(self.disagreements / self.members_compared, 4)
+                    if self.members_compared else None
+                ),
+                "latency_ms": {
+                    "mean": round(float(latencies.mean()), 2),
+                    "p50": round(float(np.percentile(latencies, 50)), 2),
+                    "p95": round(float(np.percentile(latencies, 95)), 2),
+                } if latencies is not None else None,
+            }
+
+
+def default_grid_layout(total: int) -> Dict[str, Any]:
+    """요청에 그리드가 없을 때의 기본 레이아웃 (인원수 기반 추론)"""
+    rows = 6 if total > 55 else 5
+    capacity = (total + rows - 1) // rows
+    return {
+        "rows": rows,
+        "row_capacities": [capacity] * rows,
+        "zigzag_pattern": "even",
+    }
+
+
+def request_db_stats(member_stats: Mapping[str, Dict[str, Any]]) -> Mapping[str, Dict[str, Any]]:
+    """응답 모델의 추천용 통계에서 요청 시 조회한 DB 통계만 분리 (다른 모델은 자기 스냅샷 위에 덮어씀)"""
+    if isinstance(member_stats, StatsOverlay):
+        return member_stats.db_rows
+    if isinstance(member_stats, MemberStatsSnapshot):
+        return {}
+    return member_stats
+
+
+def count_disagreements(
+    served: List[Dict[str, Any]],
+    shadow: List[Dict[str, Any]],
+) -> Tuple[int, int]:
+    """대원별 좌석 불일치 수 계산 (비교 대원 수, 불일치 수)"""
+    served_seats = {r["member_id"]: (r["row"], r["col"]) for r in served}
+    shadow_seats = {r["member_id"]: (r["row"], r["col"]) for r in shadow}
+    member_ids = served_seats.keys() | shadow_seats.keys()
+    disagreements = sum(
+        1 for member_id in member_ids
+        if served_seats.get(member_id) != shadow_seats.get(member_id)
+    )
+    return len(member_ids), disagreements
+
+
+class ModelServer:
+    """primary/섀도우/A/B 모델 선택기"""
+
+    def __init__(self, primary: SeatRecommender, registry: ModelRegistry):
+        self.primary = primary
+        self.registry = registry
+        self.shadow_version: Optional[str] = settings.SHADOW_MODEL_VERSION
+        self.shadow_sample_rate: float = settings.SHADOW_SAMPLE_RATE
+        self.ab_weights: Dict[str, float] = dict(settings.AB_ROUTING_WEIGHTS)
+        self.shadow_stats = ShadowStats()
+        self._variants: Dict[str, SeatRecommender] = {}
+        self._rng = random.Random()
+        self._lock = threading.Lock()
+
+    def set_primary(self, model: SeatRecommender):
+        """
+        primary 모델 교체 (학습 / 로드가 끝난 새 인스턴스로 참조만 바꿈)
+
+        진행 중인 요청은 select()로 받은 이전 모델로 끝까지 처리되어 학습 중인 상태를 보지 않음
+        """
+        self.primary = model
+        with self._lock:
+            self._variants.pop(self.primary_version, None)
+
+    @property
+    def primary_version(self) -> str:
+        return self.primary.metadata.get("version") or PRIMARY_ALIAS
+
+    def _is_primary(self, version: str) -> bool:
+        return version in (PRIMARY_ALIAS, self.primary_version)
+
+    def _get(self, version: str) -> SeatRecommender:
+        """버전별 모델 (primary 외에는 레지스트리에서 지연 로드)"""
+        if self._is_primary(version):
+            return self.primary
+
+        with self._lock:
+            model = self._variants.get(version)
+            if model is None:
+                model = self.registry.load(version)
+                self._variants[version] = model
+            return model
+
+    def configure(
+        self,
+        shadow_version: Optional[str] = None,
+        shadow_sample_rate: Optional[float] = None,
+        ab_weights: Optional[Dict[str, float]] = None,
+    ):
+        """서빙 설정 변경 (필요한 버전은 즉시 로드하여 검증)"""
+        if ab_weights is not None:
+            if any(w < 0 for w in ab_weights.values()):
+                raise ValueError("A/B 가중치는 0 이상이어야 합니다.")
+            for version in ab_weights:
+                self._get(version)
+            self.ab_weights = dict(ab_weights)
+
+        if shadow_version is not None:
+            if shadow_version:
+                self._get(shadow_version)
+            self.shadow_version = shadow_version or None
+            self.shadow_stats.reset()
+
+        if shadow_sample_rate is not None:
+            self.shadow_sample_rate = min(1.0, max(0.0, shadow_sample_rate))
+
+        # 더 이상 라우팅되지 않는 버전 해제
+        in_use = set(self.ab_weights) | {self.shadow_version}
+        with self._lock:
+            for version in list(self._variants):
+                if version not in in_use:
+                    del self._variants[version]
+
+    def load_configured(self):
+        """시작 시 설정된 섀도우/A/B 버전 로드 (실패한 버전은 제외)"""
+        for version in list(self.ab_weights):
+            try:
+                self._get(version)
+            except Exception as e:
+                logger.warning(f"[Serving] Failed to load A/B version {version}: {e}")
+                del self.ab_weights[version]
+
+        if self.shadow_version:
+            try:
+                self._get(self.shadow_version)
+            except Exception as e:
+                logger.warning(f"[Serving] Failed to load shadow version {self.shadow_version}: {e}")
+                self.shadow_version = None
+
+    def loaded_models(self) -> List[Tuple[str, SeatRecommender]]:
+        """현재 서빙 가능한 (버전, 모델) 목록 (primary + 로드된 A/B·섀도우 버전)"""
+        with self._lock:
+            variants = list(self._variants.items())
+        models = [(self.primary_version, self.primary)] + variants
+        return [(version, model) for version, model in models if model.is_trained]
+
+    @property
+    def protected_versions(self) -> List[str]:
+        """레지스트리 정리에서 제외해야 하는 버전"""
+        versions = [v for v in self.ab_weights if not self._is_primary(v)]
+        if self.shadow_version:
+            versions.append(self.shadow_version)
+        return versions
+
+    def select(self) -> Tuple[str, SeatRecommender]:
+        """가중치 기반으로 서빙할 모델 선택"""
+        weights = {v: w for v, w in self.ab_weights.items() if w > 0}
+        if not weights:
+            return self.primary_version, self.primary
+
+        versions = list(weights)
+        version = self._rng.choices(versions, weights=[weights[v] for v in versions])[0]
+        if self._is_primary(version):
+            return self.primary_version, self.primary
+        return version, self._get(version)
+
+    def should_shadow(self) -> bool:
+        """이번 요청을 섀도우 평가할지 여부 (샘플링)"""
+        return bool(self.shadow_version) and self._rng.random() < self.shadow_sample_rate
+
+    def run_shadow(
+        self,
+        members: List[Dict[str, Any]],
+        member_stats: Mapping[str, Dict[str, Any]],
+        grid_layout: Dict[str, Any],
+        served: List[Dict[str, Any]],
+        served_version: Optional[str] = None,
+    ):
+        """
+        섀도우 모델 평가 (응답 이후 백그라운드에서 실행)
+
+        Args:
+            member_stats: 응답 모델이 사용한 추천용 통계 (각 모델은 요청의 DB 통계를 자기 스냅샷 위에 덮어씀)
+            served: 응답한 배치 결과
+            served_version: 응답한 모델 버전 (primary가 아니면 primary 결과를 다시 계산해 비교 기준으로 사용)
+        """
+        if not self.shadow_version:
+            return
+
+        db_stats = request_db_stats(member_stats)
+        baseline, recomputed = served, False
+        if served_version is not None and not self._is_primary(served_version):
+            primary = self.primary
+            if not primary.is_trained:
+                self.shadow_stats.record_skipped()
+                return
+            try:
+                baseline = primary.recommend(members, primary.member_stats(db_stats), grid_layout)
+                recomputed = True
+            except Exception as e:
+                logger.warning(f"[Serving] Shadow baseline failed: {e}")
+                self.shadow_stats.record_error()
+                return
+
+        try:
+            shadow_model = self._get(self.shadow_version)
+            start = time.perf_counter()
+            shadow_recs = shadow_model.recommend(members, shadow_model.member_stats(db_stats), grid_layout)
+            latency_ms = (time.perf_counter() - start) * 1000
+        except Exception as e:
+            logger.warning(f"[Serving] Shadow evaluation failed: {e}")
+            self.shadow_stats.record_error()
+            return
+
+        compared, disagreements = count_disagreements(baseline, shadow_recs)
+        self.shadow_stats.record(latency_ms, compared, disagreements, recomputed)
+
+    def status(self) -> Dict[str, Any]:
+        """서빙 상태"""
+        return {
+            "primary_version": self.primary_version,
+            "ab_weights": self.ab_weights,
+            "shadow": {
+                "version": self.shadow_version,
+                "sample_rate": self.shadow_sample_rate,
+                **self.shadow_stats.snapshot(),
+            },
+        }
+
+
+# 싱글톤 인스턴스
+model_server = ModelServer(recommender, model_registry)
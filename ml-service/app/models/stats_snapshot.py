@@ -0,0 +1,175 @@
+"""
+모델 번들에 포함하는 대원 통계 스냅샷
+
+학습에 사용한 대원별 통계를 대원 ID 정렬 배열 + 통계 열 배열로 보관
+- 추천 시 DB 왕복 없이 바로 사용 (Supabase가 느리거나 장애여도 파트 기본값으로 떨어지지 않음)
+- DB 통계가 도착하면 StatsOverlay로 스냅샷 위에 덮어씀 (DB 행이 있는 대원은 DB 값)
+  감쇠 통계로 학습한 모델은 같은 반감기로 계산된 DB 행만 덮어씀 (학습/서빙 통계 기준 일치)
+- 배열만 담으므로 서빙 번들에서는 mmap으로 워커 간 공유
+"""
+import math
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterator, Mapping, Optional, Sequence
+
+import numpy as np
+
+
+# 통계 피처에 쓰는 열 (member_seat_statistics와 같은 이름)
+SNAPSHOT_COLUMNS = (
+    "preferred_row", "preferred_col", "row_consistency", "col_consistency",
+    "is_fixed_seat", "total_appearances",
+)
+INTEGER_COLUMNS = ("preferred_row", "preferred_col", "total_appearances")
+
+
+class MemberStatsSnapshot(Mapping):
+    """대원 ID → 통계 행 (읽기 전용, member_stats 딕셔너리 대신 사용)"""
+
+    def __init__(self, member_ids: np.ndarray, columns: Dict[str, np.ndarray], as_of: Optional[str] = None):
+        self.member_ids = member_ids  # 정렬된 대원 ID
+        self.columns = columns  # 열 -> float64 배열 (값 없음은 NaN)
+        self.as_of = as_of  # 스냅샷 생성 시각 (ISO 8601)
+
+    @classmethod
+    def from_stats(cls, member_stats: Mapping[str, Dict[str, Any]]) -> "MemberStatsSnapshot":
+        """대원별 통계 딕셔너리에서 생성 (학습 데이터 통계)"""
+        member_ids = sorted(str(member_id) for member_id in member_stats if member_id)
+        columns = {}
+        for column in SNAPSHOT_COLUMNS:
+            values = [member_stats[member_id].get(column) for member_id in member_ids]
+            columns[column] = np.array([np.nan if v is None else float(v) for v in values], dtype=np.float64)
+        return cls(
+            np.array(member_ids, dtype=str),
+            columns,
+            as_of=datetime.now(timezone.utc).isoformat(),
+        )
+
+    def to_arrays(self) -> Dict[str, Any]:
+        """저장용 배열 딕셔너리"""
+        return {"member_id": self.member_ids, "as_of": self.as_of, **self.columns}
+
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, Any]) -> "MemberStatsSnapshot":
+        """저장된 배열 딕셔너리에서 복원 (mmap 배열은 복사하지 않음)"""
+        return cls(
+            arrays["member_id"],
+            {column: arrays[column] for column in SNAPSHOT_COLUMNS},
+            as_of=arrays.get("as_of"),
+        )
+
+    @property
+    def nbytes(self) -> int:
+        return self.member_ids.nbytes + sum(values.nbytes for values in self.columns.values())
+
+    def lookup(self, member_ids: Sequence[str], column: str) -> np.ndarray:
+        """대원 ID 목록의 열 값을 한 번에 조회 (없는 대원 / 값은 NaN)"""
+        ids = np.asarray(member_ids, dtype=str)
+        if len(self.member_ids) == 0:
+            return np.full(len(ids), np.nan)
+        positions = np.minimum(np.searchsorted(self.member_ids, ids), len(self.member_ids) - 1)
+        found = self.member_ids[positions] == ids
+        return np.where(found, self.columns[column][positions], np.nan)
+
+    def contains(self, member_ids: Sequence[str]) -> np.ndarray:
+        """대원 ID 목록이 스냅샷에 있는지 한 번에 확인 (bool 배열)"""
+        ids = np.asarray(member_ids, dtype=str)
+        if len(self.member_ids) == 0:
+            return np.zeros(len(ids), dtype=bool)
+        positions = np.minimum(np.searchsorted(self.member_ids, ids), len(self.member_ids) - 1)
+        return self.member_ids[positions] == ids
+
+    def __getitem__(self, member_id: str) -> Dict[str, Any]:
+        i = int(np.searchsorted(self.member_ids, member_id))
+        if i >= len(self.member_ids) or self.member_ids[i] != member_id:
+            raise KeyError(member_id)
+
+        row: Dict[str, Any] = {"member_id": member_id}
+        for column, values in self.columns.items():
+            value = float(values[i])
+            if np.isnan(value):
+                row[column] = None
+            elif column == "is_fixed_seat":
+                row[column] = bool(value)
+            elif column in INTEGER_COLUMNS:
+                row[column] = int(value)
+            else:
+                row[column] = value
+        return row
+
+    def __iter__(self) -> Iterator[str]:
+        return (str(member_id) for member_id in self.member_ids)
+
+    def __len__(self) -> int:
+        return len(self.member_ids)
+
+
+class StatsOverlay(Mapping):
+    """스냅샷 위에 최신 통계(DB)를 덮어쓴 읽기 전용 뷰"""
+
+    def __init__(
+        self,
+        base: Mapping[str, Dict[str, Any]],
+        overlay: Mapping[str, Dict[str, Any]],
+        db_rows: Optional[Mapping[str, Dict[str, Any]]] = None,
+    ):
+        self.base = base
+        self.overlay = overlay
+        self.db_rows = overlay if db_rows is None else db_rows  # 거르기 전 DB 통계 (섀도 모델용)
+
+    def __getitem__(self, member_id: str) -> Dict[str, Any]:
+        if member_id in self.overlay:
+            return self.overlay[member_id]
+        return self.base[member_id]
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self.overlay
+        for member_id in self.base:
+            if member_id not in self.overlay:
+                yield member_id
+
+    def __len__(self) -> int:
+        return len(self.overlay) + sum(1 for member_id in self.base if member_id not in self.overlay)
+
+
+def matching_db_stats(
+    snapshot: MemberStatsSnapshot,
+    db_stats: Mapping[str, Dict[str, Any]],
+    half_life_days: float,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    스냅샷에 덮어쓸 DB 통계 행 선택
+
+    - 스냅샷에 있는 대원: 같은 반감기로 계산된 행(stats_half_life_days)만
+      (트리거 통계는 감쇠 없음 = 반감기 0으로 봄)
+    - 스냅샷에 없는 대원: 기준이 달라도 DB 행 사용 (파트 기본값보다 나음)
+    """
+    member_ids = list(db_stats)
+    known = snapshot.contains(member_ids)
+    matched = {}
+    for member_id, in_snapshot in zip(member_ids, known.tolist()):
+        row = db_stats[member_id]
+        if in_snapshot:
+            row_half_life = float(row.get("stats_half_life_days") or 0.0)
+            if not math.isclose(row_half_life, float(half_life_days)):
+                continue
+        matched[member_id] = row
+    return matched
+
+
+def stats_column(member_stats: Mapping[str, Dict[str, Any]], member_ids: Sequence[str], column: str) -> np.ndarray:
+    """대원 통계의 한 열을 대원 ID 순서대로 (float64, 없으면 NaN, 스냅샷은 벡터 조회)"""
+    if isinstance(member_stats, MemberStatsSnapshot):
+        return member_stats.lookup(member_ids, column)
+
+    if isinstance(member_stats, StatsOverlay):
+        values = stats_column(member_stats.base, member_ids, column)
+        rows = [(i, member_stats.overlay.get(member_id)) for i, member_id in enumerate(member_ids)]
+    else:
+        values = np.full(len(member_ids), np.nan)
+        rows = [(i, member_stats.get(member_id)) for i, member_id in enumerate(member_ids)]
+
+    for i, row in rows:
+        if row is not None:
+            value = row.get(column)
+            values[i] = np.nan if value is None else float(value)
+    return values
@@ -0,0 +1,219 @@
+"""
+테넌트(성가대/교회)별 모델 서빙
+
+한 서비스가 여러 테넌트의 모델을 서빙하되, 모든 모델을 상주시키지 않음
+- 번들: <TENANT_MODELS_DIR>/<tenant_id>/seat_recommender.joblib (+ mmap 서빙 번들)
+- 요청 시 지연 로드 → 메모리 예산(TENANT_MODEL_CACHE_MB) 안에서 LRU 보관
+- 크기 기반 제거: 새 모델을 넣은 뒤 예산을 넘으면 가장 오래 사용하지 않은 모델부터 제거
+  (예산보다 큰 모델 하나는 단독으로 보관)
+- 같은 테넌트의 동시 로드는 하나로 합침 (single-flight, 나머지는 완료를 기다림)
+- 번들 파일이 바뀌면(mtime/크기) 다음 요청에서 다시 로드
+"""
+import asyncio
+import logging
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import settings
+from app.models.seat_recommender import SeatRecommender
+
+logger = logging.getLogger(__name__)
+
+
+TENANT_ID_PATTERN = re.compile(r"^[A-Za-z0-9][A-Za-z0-9_-]{0,63}$")
+BUNDLE_FILENAME = "seat_recommender.joblib"
+
+
+def validate_tenant_id(tenant_id: str) -> str:
+    """테넌트 ID 검증 (경로 조작 방지: 영문/숫자/-/_ 64자 이하)"""
+    if not TENANT_ID_PATTERN.match(tenant_id or ""):
+        raise ValueError(f"잘못된 테넌트 ID입니다: {tenant_id!r}")
+    return tenant_id
+
+
+class _Entry:
+    """캐시에 보관 중인 테넌트 모델"""
+
+    def __init__(self, model: SeatRecommender, size_bytes: int, file_state: Tuple[int, int]):
+        self.model = model
+        self.size_bytes = size_bytes
+        self.file_state = file_state  # (mtime_ns, 크기) — 번들 교체 감지용
+        self.loaded_at = time.time()
+        self.last_used = self.loaded_at
+
+
+class _Flight:
+    """진행 중인 로드 (같은 테넌트 요청이 결과를 공유)"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.model: Optional[SeatRecommender] = None
+        self.error: Optional[BaseException] = None
+
+
+class TenantModelCache:
+    """메모리 예산이 있는 테넌트 모델 LRU"""
+
+    def __init__(self, root: Optional[str] = None, budget_mb: Optional[float] = None):
+        self.root = root or settings.TENANT_MODELS_DIR
+        budget_mb = settings.TENANT_MODEL_CACHE_MB if budget_mb is None else budget_mb
+        self.budget_bytes = int(budget_mb * 1024 * 1024)
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()  # 오래 사용하지 않은 순
+        self._flights: Dict[str, _Flight] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.coalesced = 0  # 진행 중인 로드를 기다린 요청
+        self.load_errors = 0
+
+    def path_for(self, tenant_id: str) -> str:
+        return os.path.join(self.root, validate_tenant_id(tenant_id), BUNDLE_FILENAME)
+
+    @property
+    def resident_bytes(self) -> int:
+        return sum(entry.size_bytes for entry in self._entries.values())
+
+    def _file_state(self, path: str) -> Tuple[int, int]:
+        stat = os.stat(path)
+        return stat.st_mtime_ns, stat.st_size
+
+    def _lookup(self, tenant_id: str, path: str) -> Optional[SeatRecommender]:
+        """캐시 적중 시 모델 (lock 안에서 호출, 번들이 바뀌었으면 제거 후 None)"""
+        entry = self._entries.get(tenant_id)
+        if entry is None:
+            return None
+        try:
+            current = self._file_state(path)
+        except FileNotFoundError:
+            current = None
+        if current != entry.file_state:
+            del self._entries[tenant_id]
+            return None
+
+        self._entries.move_to_end(tenant_id)
+        entry.last_used = time.time()
+        self.hits += 1
+        return entry.model
+
+    def get_cached(self, tenant_id: str) -> Optional[SeatRecommender]:
+        """로드 없이 캐시에 있는 모델만 반환 (이벤트 루프에서 바로 호출 가능)"""
+        path = self.path_for(tenant_id)
+        with self._lock:
+            return self._lookup(tenant_id, path)
+
+    def get(self, tenant_id: str) -> SeatRecommender:
+        """
+        테넌트 모델 (없으면 로드, 블로킹)
+
+        Raises:
+            ValueError: 잘못된 테넌트 ID
+            FileNotFoundError: 테넌트 모델 번들 없음
+        """
+        path = self.path_for(tenant_id)
+        with self._lock:
+            model = self._lookup(tenant_id, path)
+            if model is not None:
+                return model
+
+            flight = self._flights.get(tenant_id)
+            leader = flight is None
+            if leader:
+                flight = _Flight()
+                self._flights[tenant_id] = flight
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.model
+
+        try:
+            flight.model = self._load(tenant_id, path)
+            return flight.model
+        except BaseException as e:
+            flight.error = e
+            with self._lock:
+                self.load_errors += 1
+            raise
+        finally:
+            with self._lock:
+                del self._flights[tenant_id]
+            flight.done.set()
+
+    async def aget(self, tenant_id: str) -> SeatRecommender:
+        """적중이면 바로, 아니면 스레드에서 로드 (이벤트 루프를 막지 않음)"""
+        model = self.get_cached(tenant_id)
+        if model is not None:
+            return model
+        return await asyncio.to_thread(self.get, tenant_id)
+
+    def _load(self, tenant_id: str, path: str) -> SeatRecommender:
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"테넌트 모델이 없습니다: {tenant_id}")
+
+        file_state = self._file_state(path)
+        model = SeatRecommender()
+        model.load_model(path)
+        entry = _Entry(model, model.footprint_bytes(), file_state)
+
+        with self._lock:
+            self._entries[tenant_id] = entry
+            self._entries.move_to_end(tenant_id)
+            self._evict(keep=tenant_id)
+        logger.info(f"[Tenants] Loaded model for {tenant_id} ({entry.size_bytes / 2**20:.1f} MB, "
+                    f"{len(self._entries)} resident, {self.resident_bytes / 2**20:.1f} MB)")
+        return model
+
+    def _evict(self, keep: str):
+        """예산을 넘는 동안 가장 오래 사용하지 않은 모델 제거 (lock 안에서 호출)"""
+        while self.resident_bytes > self.budget_bytes and len(self._entries) > 1:
+            tenant_id = next(iter(self._entries))
+            if tenant_id == keep:
+                self._entries.move_to_end(tenant_id)
+                continue
+            entry = self._entries.pop(tenant_id)
+            self.evictions += 1
+            logger.info(f"[Tenants] Evicted model for {tenant_id} ({entry.size_bytes / 2**20:.1f} MB)")
+
+    def evict(self, tenant_id: str) -> bool:
+        """테넌트 모델을 캐시에서 제거 (다음 요청에서 다시 로드)"""
+        with self._lock:
+            return self._entries.pop(validate_tenant_id(tenant_id), None) is not None
+
+    def status(self) -> Dict[str, Any]:
+        """캐시 적중/실패/제거 수와 상주 모델"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "budget_mb": round(self.budget_bytes / 2**20, 1),
+                "resident_mb": round(self.resident_bytes / 2**20, 2),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+                "evictions": self.evictions,
+                "coalesced_loads": self.coalesced,
+                "load_errors": self.load_errors,
+                "loading": sorted(self._flights),
+                "models": [
+                    {
+                        "tenant_id": tenant_id,
+                        "version": entry.model.metadata.get("version"),
+                        "size_mb": round(entry.size_bytes / 2**20, 2),
+                        "loaded_at": entry.loaded_at,
+                        "last_used": entry.last_used,
+                    }
+                    for tenant_id, entry in reversed(self._entries.items())
+                ],
+            }
+
+
+# 싱글톤 인스턴스
+tenant_models = TenantModelCache()
@@ -0,0 +1,235 @@
+"""
+하이퍼파라미터 탐색 (오프라인)
+
+- 스케일링 전 float32 피처 행렬을 코퍼스 해시 + 피처 설정 지문별로 디스크에 캐시
+- 배치(arrangement) 단위 그룹 k-fold 교차 검증 (같은 주일의 좌석이 폴드 간에 새지 않도록)
+- 폴드마다 학습 폴드로만 스케일러를 학습하고 /train과 같은 절차로 학습
+  (가중 샘플 축소, 조기 종료, 크기 선택: SeatRecommender._fit_estimators)
+- 파라미터 그리드 × 폴드를 joblib 워커로 병렬 평가
+- 결과 리포트와 최적 설정(TUNED_PARAMS_PATH) 저장 → /train에서 사용
+"""
+import hashlib
+import itertools
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from joblib import Parallel, delayed
+from sklearn.metrics import accuracy_score
+from sklearn.model_selection import GroupKFold
+
+from app.config import settings
+from app.models.seat_recommender import (
+    DEFAULT_MODEL_PARAMS,
+    SeatRecommender,
+    feature_config_fingerprint,
+    fit_scaler_in_chunks,
+    scale_in_place,
+)
+
+logger = logging.getLogger(__name__)
+
+
+# 기본 탐색 그리드 (DEFAULT_MODEL_PARAMS 위에 덮어씀)
+PARAM_GRID: Dict[str, List[Any]] = {
+    "n_estimators": [50, 100, 200],
+    "max_depth": [3, 4, 6],
+    "learning_rate": [0.05, 0.1],
+    "min_samples_leaf": [2, 5],
+}
+
+
+def expand_grid(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """그리드를 파라미터 조합 목록으로 펼침"""
+    keys = sorted(grid)
+    return [
+        {**DEFAULT_MODEL_PARAMS, **dict(zip(keys, values))}
+        for values in itertools.product(*(grid[k] for k in keys))
+    ]
+
+
+def feature_cache_path(fingerprint: str) -> str:
+    """
+    피처 캐시 파일 경로
+
+    코퍼스 지문만으로는 통계 반감기 등 피처 설정이 바뀌어도 이전 행렬을 재사용하므로
+    피처 설정 지문을 함께 키로 사용 (하이퍼파라미터만 바뀐 경우는 캐시 유지)
+    "unscaled": 전체 데이터로 스케일링한 행렬을 캐시하던 이전 형식과 구분
+    """
+    key = hashlib.sha256(f"{fingerprint}:{feature_config_fingerprint()}:unscaled".encode("utf-8")).hexdigest()
+    return os.path.join(settings.FEATURE_CACHE_DIR, f"features-{key[:16]}.npz")
+
+
+def load_feature_cache(
+    dataset: Dict[str, np.ndarray],
+    fingerprint: str,
+) -> Dict[str, np.ndarray]:
+    """
+    스케일링 전 피처 행렬 로드 (캐시 미스 시 생성 후 저장)
+
+    스케일러는 폴드마다 학습 폴드로만 학습하므로 (테스트 폴드 통계가 새지 않도록) 캐시는 스케일링 전 값
+
+    Args:
+        dataset: 학습용 배열 묶음 (feature_store.read 또는 build_training_set 결과)
+        fingerprint: 코퍼스 지문 (캐시 키에 피처 설정 지문과 함께 사용)
+
+    Returns:
+        X (스케일링 전 float32), y_row, y_col, parts, groups (배치 ID 또는 번호)
+    """
+    cache_path = feature_cache_path(fingerprint)
+    if os.path.exists(cache_path):
+        logger.info(f"[Tuning] Feature cache hit: {cache_path}")
+        with np.load(cache_path, allow_pickle=False) as cached:
+            return dict(cached)
+
+    scaler = dataset.get("scaler")
+    if scaler is not None:
+        # 피처 저장소가 전체 데이터로 스케일링한 행렬 → 원래 값으로 되돌림
+        X = dataset["X"] * scaler.scale_.astype(np.float32)
+        X += scaler.mean_.astype(np.float32)
+    else:
+        X = np.asarray(dataset["X"], dtype=np.float32)
+    arrays = {
+        "X": X,
+        "y_row": np.asarray(dataset["y_row"]),
+        "y_col": np.asarray(dataset["y_col"]),
+        "parts": np.asarray(dataset["parts"]),
+        "groups": np.asarray(dataset["groups"]),
+    }
+
+    os.makedirs(settings.FEATURE_CACHE_DIR, exist_ok=True)
+    np.savez(cache_path, **arrays)
+    logger.info(f"[Tuning] Feature cache saved: {cache_path}")
+    return arrays
+
+
+def _evaluate_fold(
+    params: Dict[str, Any],
+    X: np.ndarray,
+    y_row: np.ndarray,
+    y_col: np.ndarray,
+    parts: np.ndarray,
+    train_idx: np.ndarray,
+    test_idx: np.ndarray,
+) -> Dict[str, float]:
+    """
+    단일 (파라미터, 폴드) 평가
+
+    /train과 같은 절차: 학습 폴드로만 스케일러 학습 → 제자리 float32 스케일링 →
+    가중 샘플 축소 + 조기 종료 학습 + 크기 선택 (SeatRecommender._fit_estimators)
+    """
+    scorer = SeatRecommender()
+    X_train = np.asarray(X[train_idx], dtype=np.float32)  # 인덱싱 사본을 제자리 스케일링
+    scorer.scaler = fit_scaler_in_chunks(X_train)
+    scale_in_place(X_train, scorer.scaler)
+    X_test = scale_in_place(np.asarray(X[test_idx], dtype=np.float32), scorer.scaler)
+
+    fit_metrics = scorer._fit_estimators(X_train, y_row[train_idx], y_col[train_idx], {"row": params, "col": params})
+    result: Dict[str, float] = {}
+    predictions = {}
+
+    for name, model, y, near_tol in (("row", scorer.row_model, y_row, 1), ("col", scorer.col_model, y_col, 2)):
+        result[f"{name}_fit_seconds"] = fit_metrics[f"{name}_fit_seconds"]
+        result[f"{name}_n_estimators"] = float(model.n_estimators_)
+
+        start = time.perf_counter()
+        y_pred = model.predict(X_test)
+        result[f"{name}_predict_ms"] = (time.perf_counter() - start) * 1000
+
+        result[f"{name}_accuracy"] = accuracy_score(y[test_idx], y_pred)
+        result[f"{name}_near_accuracy"] = scorer._calculate_near_accuracy(y[test_idx], y_pred, near_tol)
+        predictions[name] = y_pred
+
+    result["rule_compliance"] = scorer._calculate_rule_compliance(
+        predictions["row"], predictions["col"], list(parts[test_idx])
+    )
+    return result
+
+
+def run_search(
+    dataset: Dict[str, np.ndarray],
+    fingerprint: str,
+    grid: Optional[Dict[str, List[Any]]] = None,
+    n_folds: int = 5,
+    n_jobs: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    그룹 k-fold 교차 검증으로 파라미터 그리드 평가
+
+    행/열 모델은 각각 근접 정확도(±1행, ±2열) 평균이 가장 높은 설정을 선택
+    (동률이면 학습 시간이 짧은 설정)
+    """
+    data = load_feature_cache(dataset, fingerprint)
+    X, y_row, y_col, parts, groups = (
+        data["X"], data["y_row"], data["y_col"], data["parts"], data["groups"]
+    )
+
+    n_groups = len(np.unique(groups))
+    n_folds = min(n_folds, n_groups)
+    if n_folds < 2:
+        raise ValueError(f"교차 검증에는 2개 이상의 배치가 필요합니다. (현재: {n_groups})")
+
+    folds = list(GroupKFold(n_splits=n_folds).split(X, y_row, groups))
+    candidates = expand_grid(grid or PARAM_GRID)
+    logger.info(f"[Tuning] {len(candidates)} configs × {n_folds} folds ({n_groups} arrangements)")
+
+    start = time.perf_counter()
+    fold_results = Parallel(n_jobs=n_jobs or settings.TUNING_N_JOBS)(
+        delayed(_evaluate_fold)(params, X, y_row, y_col, parts, train_idx, test_idx)
+        for params in candidates
+        for train_idx, test_idx in folds
+    )
+    elapsed = time.perf_counter() - start
+
+    results = []
+    for i, params in enumerate(candidates):
+        per_fold = fold_results[i * n_folds:(i + 1) * n_folds]
+        summary = {
+            key: round(float(np.mean([r[key] for r in per_fold])), 4)
+            for key in per_fold[0]
+        }
+        results.append({"params": params, "metrics": summary})
+
+    best = {
+        name: max(
+            results,
+            key=lambda r: (r["metrics"][f"{name}_near_accuracy"], -r["metrics"][f"{name}_fit_seconds"]),
+        )
+        for name in ("row", "col")
+    }
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "fingerprint": fingerprint,
+        "samples": int(len(X)),
+        "arrangements": n_groups,
+        "folds": n_folds,
+        "elapsed_seconds": round(elapsed, 2),
+        "best": best,
+        "results": sorted(
+            results,
+            key=lambda r: -(r["metrics"]["row_near_accuracy"] + r["metrics"]["col_near_accuracy"]),
+        ),
+    }
+    return report
+
+
+def save_results(report: Dict[str, Any]):
+    """리포트와 최적 설정 저장"""
+    for path in (settings.TUNING_REPORT_PATH, settings.TUNED_PARAMS_PATH):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    with open(settings.TUNING_REPORT_PATH, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    tuned = {name: best["params"] for name, best in report["best"].items()}
+    tuned["fingerprint"] = report["fingerprint"]
+    with open(settings.TUNED_PARAMS_PATH, "w", encoding="utf-8") as f:
+        json.dump(tuned, f, ensure_ascii=False, indent=2)
+
+    logger.info(f"[Tuning] Report saved to {settings.TUNING_REPORT_PATH}")
+    logger.info(f"[Tuning] Tuned params saved to {settings.TUNED_PARAMS_PATH}")
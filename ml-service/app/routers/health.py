@@ -2,24 +2,25 @@
 헬스체크 라우터
 서비스 상태 확인 API
 """
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 
 from app.config import settings
 from app.schemas.request_response import HealthResponse
-from app.models.seat_recommender import recommender
+from app.models.serving import model_server
 from app.services.supabase_client import supabase_service
+from app.services.startup import service_startup
 
 router = APIRouter()
 
 
 @router.get("/health", response_model=HealthResponse)
 async def health_check():
-    """서비스 헬스체크"""
+    """서비스 헬스체크 (upstreams: Supabase 조회별 회로 차단기, 하나라도 차단 중이면 degraded)"""
     db_connected = await supabase_service.health_check()
-    model_loaded = recommender.is_trained
+    model_loaded = model_server.primary.is_trained
 
     # 상태 결정
-    if db_connected and model_loaded:
+    if db_connected and model_loaded and not supabase_service.circuits_open:
         status = "healthy"
     elif db_connected or model_loaded:
         status = "degraded"
@@ -31,4 +32,13 @@ async def health_check():
         version=settings.APP_VERSION,
         model_loaded=model_loaded,
         database_connected=db_connected,
+        upstreams=supabase_service.circuit_status(),
     )
+
+
+@router.get("/readyz")
+async def readiness_check(response: Response):
+    """준비 상태 (백그라운드 모델 로드 + 워밍업 완료 전에는 503)"""
+    if not service_startup.ready:
+        response.status_code = 503
+    return {**service_startup.status(), "upstreams": supabase_service.circuit_status()}
@@ -1,9 +1,17 @@
 """
 추천 라우터
 AI 기반 좌석 배치 추천 API
+- 기본 서빙: primary/A/B/섀도우 모델
+- 테넌트 서빙: X-Tenant-ID 헤더 또는 /tenants/{tenant_id}/recommend 경로
+- 지연 예산: latencyBudgetMs 또는 X-Latency-Budget-Ms 헤더 (초과 예상 시 규칙 기반 배치, metadata.degraded)
+- 규칙 기반 배치: 모델이 없을 때(503 대신) 또는 engine="rules" 요청 (metadata.engine)
 """
-from fastapi import APIRouter, HTTPException
-from typing import Dict
+import asyncio
+import threading
+import time
+
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Request
+from typing import Any, Awaitable, Dict, List, Mapping, Optional, Tuple
 
 from app.schemas.request_response import (
     RecommendRequest,
@@ -11,11 +19,26 @@ from app.schemas.request_response import (
     SeatRecommendation,
     GridLayout,
 )
-from app.models.seat_recommender import recommender
+from app.config import settings
+from app.logging_config import stage_timer
+from app.models.rule_placement import rule_based_recommend
+from app.models.seat_recommender import SeatRecommender
+from app.models.serving import default_grid_layout, model_server
+from app.models.tenant_models import tenant_models
+from app.services.latency_budget import (
+    DEGRADED_ESTIMATE,
+    DEGRADED_MODEL_LOAD,
+    DEGRADED_TIMEOUT,
+    Deadline,
+    latency_budget,
+    resolve_budget_ms,
+)
 from app.services.supabase_client import supabase_service
 
 router = APIRouter()
 
+DEGRADED_NO_MODEL = "no_model"  # 학습된 모델이 없어 규칙 기반 배치 (콜드 스타트)
+
 
 def calculate_quality_metrics(
     recommendations: list,
@@ -50,96 +73,305 @@ def calculate_quality_metrics(
     }
 
 
+def request_deadline(request: RecommendRequest, http_request: Request) -> Optional[Deadline]:
+    """요청 지연 예산 (없으면 None, 잘못된 헤더는 400)"""
+    try:
+        budget_ms = resolve_budget_ms(
+            request.latency_budget_ms, http_request.headers.get(settings.LATENCY_BUDGET_HEADER)
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Deadline(budget_ms) if budget_ms is not None else None
+
+
+async def within_budget(awaitable: Awaitable, deadline: Deadline):
+    """
+    남은 예산 안에서 결과를 기다림 (규칙 기반 배치 시간은 남겨 둠)
+
+    예산을 넘기면 asyncio.TimeoutError, 작업 자체는 취소하지 않음 (통계 캐시 / 테넌트 모델을 채움)
+    """
+    task = asyncio.ensure_future(awaitable)
+    task.add_done_callback(lambda t: t.cancelled() or t.exception())  # 버려진 작업의 예외 경고 방지
+    return await asyncio.wait_for(
+        asyncio.shield(task),
+        timeout=deadline.remaining_seconds(settings.RECOMMEND_FALLBACK_RESERVE_MS),
+    )
+
+
+def _recommend_ml(
+    model: SeatRecommender,
+    members: List[Dict[str, Any]],
+    member_stats: Mapping[str, Dict[str, Any]],
+    grid_layout: Dict[str, Any],
+    cancel: Optional[threading.Event] = None,
+) -> List[Dict[str, Any]]:
+    """ML 추천 (지연을 예산 추정치에 반영, 중단된 호출은 중단 시점까지의 지연을 하한으로 반영)"""
+    start = time.perf_counter()
+    try:
+        with stage_timer("recommend"):
+            recommendations = model.recommend(members, member_stats, grid_layout, cancel=cancel)
+    finally:
+        latency_budget.observe_recommend(len(members), (time.perf_counter() - start) * 1000)
+    return recommendations
+
+
+async def place_members(
+    model: Optional[SeatRecommender],
+    members: List[Dict[str, Any]],
+    member_stats: Mapping[str, Dict[str, Any]],
+    grid_layout: Dict[str, Any],
+    deadline: Optional[Deadline],
+    degraded_reason: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    좌석 배치 (예산이 있으면 ML 단계에 남은 예산 적용)
+
+    model이 None이면 규칙 기반 배치 (degraded_reason: 대체한 이유, engine="rules" 요청이면 None)
+
+    Returns:
+        (배치 결과, 규칙 기반 배치로 대체한 이유 또는 None)
+    """
+    if model is not None and deadline is None:
+        return _recommend_ml(model, members, member_stats, grid_layout), None
+
+    if model is not None:
+        remaining_ms = deadline.remaining_ms(settings.RECOMMEND_FALLBACK_RESERVE_MS)
+        if remaining_ms <= 0:
+            degraded_reason = DEGRADED_ESTIMATE
+        elif latency_budget.estimate_recommend_ms(len(members)) > remaining_ms:
+            # 건너뛸 때마다 추정치를 워밍업 기준값 쪽으로 감쇠 (느린 관측 한 번으로 ML이 계속 꺼지지 않도록)
+            degraded_reason = DEGRADED_ESTIMATE
+            latency_budget.skip_recommend()
+        else:
+            # 예산을 넘기면 기다리지 않고, 스레드의 추천도 다음 대원에서 중단 (CPU / 스레드 반환)
+            cancel = threading.Event()
+            try:
+                recommendations = await asyncio.wait_for(
+                    asyncio.to_thread(_recommend_ml, model, members, member_stats, grid_layout, cancel),
+                    timeout=remaining_ms / 1000,
+                )
+                return recommendations, None
+            except asyncio.TimeoutError:
+                cancel.set()
+                degraded_reason = DEGRADED_TIMEOUT
+
+    with stage_timer("rules"):
+        return rule_based_recommend(members, member_stats, grid_layout), degraded_reason
+
+
+async def build_recommendation(
+    request: RecommendRequest,
+    model: Optional[SeatRecommender],
+    member_stats: Mapping[str, Dict[str, Any]],
+    metadata: Dict[str, Any],
+    background_tasks: Optional[BackgroundTasks] = None,
+    deadline: Optional[Deadline] = None,
+    degraded_reason: Optional[str] = None,
+) -> RecommendResponse:
+    """추천 생성 + 응답 구성 (기본 서빙 / 테넌트 공통, model이 None이면 규칙 기반 배치)"""
+    # 대원 데이터 변환
+    members = [
+        {
+            "id": m.id,
+            "name": m.name,
+            "part": m.part.value,
+            "height": m.height,
+            "experience": m.experience,
+            "is_leader": m.is_leader,
+        }
+        for m in request.members
+    ]
+
+    # 그리드 레이아웃 설정
+    if request.grid_layout:
+        grid_layout = {
+            "rows": request.grid_layout.rows,
+            "row_capacities": request.grid_layout.row_capacities,
+            "zigzag_pattern": request.grid_layout.zigzag_pattern,
+        }
+    else:
+        # 기본 레이아웃: 인원수 기반 추론
+        grid_layout = default_grid_layout(len(members))
+
+    # 추천 생성 (예산 안에 끝나지 않으면 규칙 기반 배치)
+    recommendations, degraded_reason = await place_members(
+        model, members, member_stats, grid_layout, deadline, degraded_reason
+    )
+    engine = "ml" if model is not None and degraded_reason is None else "rules"
+
+    # 섀도우 평가 (기본 서빙의 ML 응답 중 샘플링된 요청만, 응답 이후 실행)
+    if background_tasks is not None and engine == "ml" and model_server.should_shadow():
+        background_tasks.add_task(
+            model_server.run_shadow, members, member_stats, grid_layout, recommendations,
+            metadata.get("modelVersion"),
+        )
+
+    # 품질 메트릭 계산
+    metrics = calculate_quality_metrics(recommendations, members, grid_layout)
+
+    # 품질 점수
+    quality_score = (
+        metrics["placementRate"] * 0.5 +
+        metrics["partBalance"] * 0.3 +
+        0.8 * 0.2
+    )
+
+    # 미배치 대원
+    placed_ids = {r["member_id"] for r in recommendations}
+    unassigned = [m["id"] for m in members if m["id"] not in placed_ids]
+
+    response = RecommendResponse(
+        seats=[
+            SeatRecommendation(
+                member_id=r["member_id"],
+                member_name=r["member_name"],
+                part=r["part"],
+                row=r["row"],
+                col=r["col"],
+            )
+            for r in recommendations
+        ],
+        grid_layout=GridLayout(
+            rows=grid_layout["rows"],
+            row_capacities=grid_layout["row_capacities"],
+            zigzag_pattern=grid_layout["zigzag_pattern"],
+        ),
+        quality_score=quality_score,
+        metrics=metrics,
+        metadata={
+            "totalMembers": len(members),
+            "placedMembers": len(recommendations),
+            "statsLoaded": len(member_stats),
+            "engine": engine,
+            "degraded": degraded_reason is not None,
+            "degradedReason": degraded_reason,
+            "latencyBudgetMs": deadline.budget_ms if deadline is not None else None,
+            **metadata,
+        },
+        unassigned_members=unassigned,
+        source="python-ml",
+    )
+    if deadline is not None:
+        latency_budget.record(deadline, degraded_reason)
+    return response
+
+
 @router.post("/recommend", response_model=RecommendResponse)
-async def get_recommendation(request: RecommendRequest):
-    """좌석 배치 추천"""
+async def get_recommendation(
+    request: RecommendRequest,
+    background_tasks: BackgroundTasks,
+    http_request: Request,
+):
+    """좌석 배치 추천 (테넌트 헤더가 있으면 해당 테넌트 모델)"""
+    tenant_id = http_request.headers.get(settings.TENANT_HEADER)
+    if tenant_id:
+        return await recommend_for_tenant(tenant_id, request, http_request)
+
+    deadline = request_deadline(request, http_request)
 
-    # 모델 확인
-    if not recommender.is_trained:
+    # 서빙 모델 선택 (A/B 라우팅)
+    model_version, model = model_server.select()
+
+    # 모델 확인 (engine="ml"을 지정한 요청만 503, 그 외에는 규칙 기반 배치)
+    if not model.is_trained and request.engine == "ml":
         raise HTTPException(
             status_code=503,
             detail="모델이 학습되지 않았습니다. /api/v1/train을 먼저 호출하세요."
         )
+    use_rules = request.engine == "rules" or not model.is_trained
+    degraded_reason = DEGRADED_NO_MODEL if not model.is_trained and request.engine is None else None
 
     try:
-        # 대원 통계 조회
-        db_stats = await supabase_service.get_member_statistics()
-        member_stats = {stat["member_id"]: stat for stat in db_stats}
+        # 대원 통계: 모델 번들의 스냅샷이 있으면 DB 조회를 기다리지 않음
+        # (캐시된 DB 통계만 덮어쓰고, 캐시가 없거나 오래되면 백그라운드로 갱신)
+        # 스냅샷이 없으면 DB 조회를 남은 예산 안에서만 기다림 (초과 시 통계 없이 진행)
+        # DB 조회 실패 / 회로 차단 중에는 마지막 정상 통계 (statsAgeSeconds가 그 경과 시간)
+        stats_age = None
+        stats_timed_out = False
+        with stage_timer("stats"):
+            if model.stats_snapshot is not None:
+                db_stats, stats_age = supabase_service.peek_member_statistics()
+            elif deadline is None:
+                db_stats = await supabase_service.get_member_statistics()
+            else:
+                try:
+                    db_stats = await within_budget(supabase_service.get_member_statistics(), deadline)
+                except asyncio.TimeoutError:
+                    db_stats = None
+                    stats_timed_out = True
+                    latency_budget.record_stats_timeout()
+            if model.stats_snapshot is None and db_stats:
+                stats_age = supabase_service.member_stats_age()
+            member_stats = model.member_stats({stat["member_id"]: stat for stat in db_stats or []})
+        stats_source = "+".join(
+            name for name, present in (("snapshot", model.stats_snapshot is not None), ("db", bool(db_stats)))
+            if present
+        ) or "none"
 
-        # 대원 데이터 변환
-        members = [
+        return await build_recommendation(
+            request,
+            None if use_rules else model,
+            member_stats,
             {
-                "id": m.id,
-                "name": m.name,
-                "part": m.part.value,
-                "height": m.height,
-                "experience": m.experience,
-                "is_leader": m.is_leader,
-            }
-            for m in request.members
-        ]
-
-        # 그리드 레이아웃 설정
-        if request.grid_layout:
-            grid_layout = {
-                "rows": request.grid_layout.rows,
-                "row_capacities": request.grid_layout.row_capacities,
-                "zigzag_pattern": request.grid_layout.zigzag_pattern,
-            }
-        else:
-            # 기본 레이아웃: 인원수 기반 추론
-            total = len(members)
-            rows = 6 if total > 55 else 5
-            capacity = (total + rows - 1) // rows
-            grid_layout = {
-                "rows": rows,
-                "row_capacities": [capacity] * rows,
-                "zigzag_pattern": "even",
-            }
-
-        # 추천 생성
-        recommendations = recommender.recommend(members, member_stats, grid_layout)
-
-        # 품질 메트릭 계산
-        metrics = calculate_quality_metrics(recommendations, members, grid_layout)
-
-        # 품질 점수
-        quality_score = (
-            metrics["placementRate"] * 0.5 +
-            metrics["partBalance"] * 0.3 +
-            0.8 * 0.2
+                "statsSource": stats_source,
+                "statsAgeSeconds": round(stats_age, 1) if stats_age is not None else None,
+                "statsTimedOut": stats_timed_out,
+                "statsCircuit": supabase_service.circuit_state("member_statistics"),
+                "modelVersion": None if use_rules else model_version,
+            },
+            background_tasks,
+            deadline,
+            degraded_reason,
         )
 
-        # 미배치 대원
-        placed_ids = {r["member_id"] for r in recommendations}
-        unassigned = [m["id"] for m in members if m["id"] not in placed_ids]
-
-        return RecommendResponse(
-            seats=[
-                SeatRecommendation(
-                    member_id=r["member_id"],
-                    member_name=r["member_name"],
-                    part=r["part"],
-                    row=r["row"],
-                    col=r["col"],
-                )
-                for r in recommendations
-            ],
-            grid_layout=GridLayout(
-                rows=grid_layout["rows"],
-                row_capacities=grid_layout["row_capacities"],
-                zigzag_pattern=grid_layout["zigzag_pattern"],
-            ),
-            quality_score=quality_score,
-            metrics=metrics,
-            metadata={
-                "totalMembers": len(members),
-                "placedMembers": len(recommendations),
-                "statsLoaded": len(member_stats),
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/tenants/{tenant_id}/recommend", response_model=RecommendResponse)
+async def recommend_for_tenant(tenant_id: str, request: RecommendRequest, http_request: Request):
+    """
+    테넌트(성가대/교회)별 좌석 배치 추천
+
+    테넌트 모델은 요청 시 로드되어 메모리 예산 안에서 LRU로 보관
+    대원 통계는 테넌트 모델 번들의 스냅샷만 사용 (member_seat_statistics는 기본 테넌트 전용)
+    지연 예산 안에 모델 로드가 끝나지 않으면 규칙 기반 배치 (로드는 계속되어 다음 요청부터 사용)
+    engine="rules"면 모델 번들이 없어도 규칙 기반 배치
+    """
+    deadline = request_deadline(request, http_request)
+    model: Optional[SeatRecommender] = None
+    degraded_reason = None
+    try:
+        with stage_timer("model_load"):
+            if request.engine == "rules":
+                # 규칙 기반 배치는 모델을 로드하지 않음 (캐시에 있으면 통계 스냅샷만 사용)
+                model = tenant_models.get_cached(tenant_id)
+            elif deadline is None:
+                model = await tenant_models.aget(tenant_id)
+            else:
+                try:
+                    model = await within_budget(tenant_models.aget(tenant_id), deadline)
+                except asyncio.TimeoutError:
+                    degraded_reason = DEGRADED_MODEL_LOAD
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+    use_rules = request.engine == "rules" or model is None
+    try:
+        return await build_recommendation(
+            request,
+            None if use_rules else model,
+            model.member_stats() if model is not None else {},
+            {
+                "statsSource": "snapshot" if model is not None and model.stats_snapshot is not None else "none",
+                "statsAgeSeconds": None,
+                "modelVersion": None if use_rules else model.metadata.get("version"),
+                "tenantId": tenant_id,
             },
-            unassigned_members=unassigned,
-            source="python-ml",
+            deadline=deadline,
+            degraded_reason=degraded_reason,
         )
-
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -6,292 +6,363 @@
 - 대원별 실제 통계 계산 (고정석 패턴, 선호 행/열)
 - 컨텍스트 피처 추가 (파트 비율, 총 인원)
 """
+import asyncio
+import hashlib
 import json
+import logging
 import os
-from pathlib import Path
-from collections import Counter, defaultdict
-from typing import Dict, List, Any, Tuple
+import time
+from typing import Dict, Iterator, List, Any, Optional, Tuple
+
+import numpy as np
 from fastapi import APIRouter, HTTPException
 
-from app.schemas.request_response import TrainRequest, TrainResponse
-from app.models.seat_recommender import recommender
-from app.services.supabase_client import supabase_service
+from app.schemas.request_response import TrainRequest, TrainResponse, ServingConfigRequest
+from app.models.seat_recommender import (
+    SeatRecommender,
+    context_features,
+    copy_model_bundle,
+    training_config_fingerprint,
+)
+from app.models.memory_usage import reset_peak_rss
+from app.models.model_profile import model_profile
+from app.models.registry import model_registry
+from app.models.serving import model_server
+from app.models.tenant_models import tenant_models
+from app.services.supabase_client import STATS_COLUMNS, supabase_service
+from app.services.postgres_reader import postgres_reader
+from app.services.corpus_loader import corpus_loader
+from app.services.feature_store import (
+    arrangement_feature_matrix,
+    build_training_matrix,
+    encode_parts,
+    feature_store,
+)
+from app.services.corpus_watcher import JSON_TRAINING_DATA_PATH, corpus_watcher
+from app.services.member_stats_engine import member_stats_engine
+from app.services.latency_budget import latency_budget
+from app.services.startup import service_startup
 from app.config import settings
+from app.logging_config import stage_timer
 
-router = APIRouter()
-
-# JSON 학습 데이터 경로 (ml-service 기준 상대 경로)
-JSON_TRAINING_DATA_PATH = Path(__file__).parent.parent.parent.parent / "training_data" / "ml_output"
+logger = logging.getLogger(__name__)
 
+router = APIRouter()
 
-VALID_PARTS = {"SOPRANO", "ALTO", "TENOR", "BASS"}
-
-# 고정석 판정 임계값
-FIXED_SEAT_CONFIG = {
-    "MIN_APPEARANCES": 3,      # 최소 3회 이상 출석
-    "HIGH_CONSISTENCY": 0.8,   # 80% 이상이면 고정석
-    "COL_TOLERANCE": 2,        # 열 일관성 계산 시 ±2열 허용
-}
+# 학습은 스레드에서 실행되므로 동시 /train / 버전 승격 요청은 하나씩 처리 (레지스트리 / primary 교체 순서 보장)
+_train_lock = asyncio.Lock()
 
 
-def calculate_member_statistics_from_json() -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+def load_training_set_from_json() -> Optional[Dict[str, np.ndarray]]:
     """
-    모든 JSON 파일에서 대원별 통계 계산
-
-    Returns:
-        member_stats: 대원별 통계 딕셔너리
-        member_parts: 대원별 파트 딕셔너리
+    JSON 코퍼스로 학습용 배열 묶음 생성 (피처 저장소 경유)
+    - 코퍼스 감시자가 이미 반영한 상태를 사용 (새로 추가/변경된 파일만 파싱)
+    - 대원 통계 / 피처 저장소는 코퍼스가 바뀐 경우에만 갱신되고 나머지 열은 memmap으로 사용
     """
-    member_history: Dict[str, List[Dict[str, int]]] = defaultdict(list)
-    member_parts: Dict[str, str] = {}
-
     if not JSON_TRAINING_DATA_PATH.exists():
-        return {}, {}
-
-    json_files = list(JSON_TRAINING_DATA_PATH.glob("ml_*.json"))
-
-    # 1단계: 모든 배치 기록 수집
-    for json_file in json_files:
-        try:
-            with open(json_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            for seat in data.get("seats", []):
-                member_id = seat.get("member_id")
-                part = seat.get("part")
-
-                if not member_id or part not in VALID_PARTS:
-                    continue
-
-                member_history[member_id].append({
-                    "row": seat.get("row"),
-                    "col": seat.get("col")
-                })
-                member_parts[member_id] = part
-
-        except Exception as e:
-            print(f"[Stats] Error processing {json_file}: {e}")
-            continue
-
-    # 2단계: 통계 계산
-    member_stats: Dict[str, Dict[str, Any]] = {}
-
-    for member_id, history in member_history.items():
-        if len(history) < 1:
-            continue
-
-        rows = [h["row"] for h in history]
-        cols = [h["col"] for h in history]
-
-        # 최빈 행 (가장 많이 앉은 행)
-        row_counts = Counter(rows)
-        preferred_row = row_counts.most_common(1)[0][0]
-        row_consistency = row_counts[preferred_row] / len(rows)
-
-        # 평균 열 및 열 일관성
-        avg_col = sum(cols) / len(cols)
-        preferred_col = round(avg_col)
-        cols_in_range = sum(1 for c in cols if abs(c - avg_col) <= FIXED_SEAT_CONFIG["COL_TOLERANCE"])
-        col_consistency = cols_in_range / len(cols)
-
-        # 고정석 판정
-        is_fixed_seat = (
-            len(history) >= FIXED_SEAT_CONFIG["MIN_APPEARANCES"] and
-            row_consistency >= FIXED_SEAT_CONFIG["HIGH_CONSISTENCY"] and
-            col_consistency >= FIXED_SEAT_CONFIG["HIGH_CONSISTENCY"]
-        )
-
-        member_stats[member_id] = {
-            "preferred_row": preferred_row,
-            "preferred_col": preferred_col,
-            "row_consistency": round(row_consistency * 100, 1),
-            "col_consistency": round(col_consistency * 100, 1),
-            "is_fixed_seat": is_fixed_seat,
-            "total_appearances": len(history),
+        logger.warning(f"[Train] JSON training data path not found: {JSON_TRAINING_DATA_PATH}")
+        return None
+
+    snapshot = corpus_watcher.refresh(JSON_TRAINING_DATA_PATH)
+    arrangements = snapshot["arrangements"]
+    logger.info(f"[Train] Found {len(arrangements)} JSON training files "
+                f"({corpus_loader.last_parsed} parsed, {len(snapshot['member_stats'])} members)")
+    if not arrangements:
+        return None
+
+    dataset = feature_store.read(snapshot["member_stats"])
+    dataset["stats_half_life_days"] = member_stats_engine.half_life  # 코퍼스 감시자의 감쇠 통계 기준
+    return dataset
+
+
+def member_stats_from_samples(sample_columns: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+    """학습 샘플 열에서 대원별 통계 행 추출 (member_serving_statistics 조회 결과와 같은 형식)"""
+    member_ids, first = np.unique(sample_columns["member_id"], return_index=True)
+    return [
+        {
+            "member_id": member_id,
+            **dict(zip(STATS_COLUMNS, sample_columns["stats"][i].tolist())),
+            "updated_at": sample_columns["stats_updated_at"][i],
+        }
+        for member_id, i in zip(member_ids.tolist(), first.tolist())
+        if sample_columns["has_stats"][i]
+    ]
+
+
+def db_training_chunks(
+    seat_columns: Dict[str, np.ndarray],
+    chunk_rows: int
+) -> Iterator[Dict[str, np.ndarray]]:
+    """DB 좌석 열을 chunk_rows행씩 학습 행렬 청크(배치 내 피처 포함)로 변환"""
+    has_context = "context" in seat_columns
+    for start in range(0, len(seat_columns["id"]), chunk_rows):
+        rows = slice(start, start + chunk_rows)
+        part_codes = encode_parts(seat_columns["part"][rows])
+        n = len(part_codes)
+
+        if has_context:
+            context = seat_columns["context"][rows].copy()
+            context[:, 0] = np.minimum(context[:, 0], 100) / 100  # 총 인원 정규화 (context_features와 동일)
+        else:
+            context = context_features(None)
+
+        yield {
+            "arrangement_id": seat_columns["arrangement_id"][rows],
+            "member_id": seat_columns["member_id"][rows],
+            "part": part_codes,
+            "features": arrangement_feature_matrix(
+                part_codes,
+                seat_columns["height"][rows],
+                np.zeros(n),  # 경력 컬럼은 DB에서 삭제됨
+                context,
+            ),
+            "seat_row": seat_columns["seat_row"][rows],
+            "seat_col": seat_columns["seat_col"][rows],
         }
-
-    fixed_count = sum(1 for s in member_stats.values() if s["is_fixed_seat"])
-    print(f"[Stats] Calculated stats for {len(member_stats)} members ({fixed_count} fixed seats)")
-
-    return member_stats, member_parts
 
 
-def calculate_arrangement_context(seats: List[Dict]) -> Dict[str, Any]:
+def build_db_training_set(
+    seat_columns: Dict[str, np.ndarray],
+    stats_map: Dict[str, Dict[str, Any]]
+) -> Dict[str, Any]:
     """
-    배치 컨텍스트 계산 (파트 비율, 총 인원 등)
+    DB 좌석 열 + 대원 통계로 학습용 배열 묶음 생성 (float32 행렬을 청크 단위로 채움)
+
+    - 학습 샘플 RPC 결과면 DB에서 집계한 배치 컨텍스트 사용 (JSON 경로와 같은 피처)
+    - 원본 좌석 열이면 기본 컨텍스트
+    - 통계가 없는 대원은 파트별 기본값
     """
-    total = len(seats)
-    if total == 0:
-        return {
-            "total_members": 0,
-            "soprano_ratio": 0.25,
-            "alto_ratio": 0.25,
-            "tenor_ratio": 0.25,
-            "bass_ratio": 0.25,
-        }
+    return build_training_matrix(
+        db_training_chunks(seat_columns, settings.TRAINING_CHUNK_ROWS),
+        len(seat_columns["id"]),
+        stats_map,
+        default_stats=None,
+    )
 
-    part_counts = Counter(s.get("part") for s in seats if s.get("part") in VALID_PARTS)
 
-    return {
-        "total_members": total,
-        "soprano_ratio": part_counts.get("SOPRANO", 0) / total,
-        "alto_ratio": part_counts.get("ALTO", 0) / total,
-        "tenor_ratio": part_counts.get("TENOR", 0) / total,
-        "bass_ratio": part_counts.get("BASS", 0) / total,
-        "soprano_count": part_counts.get("SOPRANO", 0),
-        "alto_count": part_counts.get("ALTO", 0),
-        "tenor_count": part_counts.get("TENOR", 0),
-        "bass_count": part_counts.get("BASS", 0),
-    }
+def _hash_entries(source: str, entries: List[Tuple]) -> str:
+    """정렬된 (식별자, 타임스탬프...) 목록의 SHA-256"""
+    digest = hashlib.sha256(source.encode("utf-8"))
+    for entry in sorted(entries):
+        digest.update(("\x1f".join(str(v) for v in entry) + "\n").encode("utf-8"))
+    return digest.hexdigest()
 
 
-def load_training_data_from_json() -> list:
+def fingerprint_json_corpus() -> Optional[str]:
     """
-    JSON 파일에서 학습 데이터 로드 (개선됨)
-    - 대원별 실제 통계 포함
-    - 배치 컨텍스트 피처 포함
-    """
-    training_data = []
-    skipped_count = 0
+    JSON 학습 코퍼스 지문 (파일을 파싱하지 않고 파일명/크기/수정 시각만 사용)
 
+    파일명은 배치 ID, 수정 시각은 배치 갱신 시각에 대응
+    """
     if not JSON_TRAINING_DATA_PATH.exists():
-        print(f"[Train] JSON training data path not found: {JSON_TRAINING_DATA_PATH}")
-        return training_data
+        return None
+
+    entries = []
+    for json_file in JSON_TRAINING_DATA_PATH.glob("ml_*.json"):
+        stat = json_file.stat()
+        entries.append((json_file.name, stat.st_size, stat.st_mtime_ns))
+    return _hash_entries("json", entries) if entries else None
+
+
+def fingerprint_db_corpus(
+    seat_columns: Dict[str, np.ndarray],
+    member_stats: List[Dict[str, Any]]
+) -> str:
+    """DB 학습 코퍼스 지문 (좌석/배치 ID + 배치 갱신 시각 + 통계 갱신 시각)"""
+    entries = [
+        ("seat", seat_id, arrangement_id, updated_at)
+        for seat_id, arrangement_id, updated_at in zip(
+            seat_columns["id"].tolist(),
+            seat_columns["arrangement_id"].tolist(),
+            seat_columns["updated_at"].tolist(),
+        )
+    ]
+    entries.extend(
+        ("stats", stat.get("member_id"), stat.get("updated_at"))
+        for stat in member_stats
+    )
+    return _hash_entries("db", entries)
 
-    # 1. 먼저 모든 파일에서 대원별 통계 계산
-    print("[Train] Calculating member statistics from all files...")
-    member_stats, member_parts = calculate_member_statistics_from_json()
 
-    # 2. 학습 데이터 생성
-    json_files = sorted(JSON_TRAINING_DATA_PATH.glob("ml_*.json"))
-    print(f"[Train] Found {len(json_files)} JSON training files")
+def find_model_for_corpus(fingerprint: Optional[str], promote: bool) -> Optional[Dict[str, Any]]:
+    """
+    같은 코퍼스·같은 학습 설정으로 학습된 기존 모델 메타데이터 조회
 
-    for json_file in json_files:
-        try:
-            with open(json_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            seats = data.get("seats", [])
-
-            # 배치 컨텍스트 계산
-            context = calculate_arrangement_context(seats)
-
-            for seat in seats:
-                part = seat.get("part")
-                member_id = seat.get("member_id")
-
-                # 유효한 파트만 포함 (UNKNOWN, SPECIAL 등 제외)
-                if part not in VALID_PARTS:
-                    skipped_count += 1
-                    continue
-
-                # 대원 통계 조회 (없으면 기본값)
-                stats = member_stats.get(member_id, {
-                    "preferred_row": 3,
-                    "preferred_col": 8,
-                    "row_consistency": 50,
-                    "col_consistency": 50,
-                    "is_fixed_seat": False,
-                    "total_appearances": 0,
-                })
-
-                training_data.append({
-                    "member": {
-                        "id": member_id,
-                        "name": seat.get("member_name"),
-                        "part": part,
-                        "height": seat.get("height"),  # 미래 대비
-                        "experience": seat.get("experience_years", 0),  # 미래 대비
-                    },
-                    "stats": stats,
-                    "context": context,  # 배치 컨텍스트 추가
-                    "seat_row": seat.get("row"),
-                    "seat_col": seat.get("col"),
-                })
-        except Exception as e:
-            print(f"[Train] Error loading {json_file}: {e}")
-            continue
+    promote=true면 현재 primary만, false면 레지스트리 전체에서 조회
+    """
+    if not fingerprint:
+        return None
 
-    if skipped_count > 0:
-        print(f"[Train] Skipped {skipped_count} records with invalid parts")
+    config_fingerprint = training_config_fingerprint()
 
-    return training_data
+    def matches(meta: Dict[str, Any]) -> bool:
+        return (
+            meta.get("fingerprint") == fingerprint and
+            meta.get("config_fingerprint") == config_fingerprint and
+            bool(meta.get("metrics"))
+        )
+
+    primary = model_server.primary
+    if primary.is_trained and matches(primary.metadata):
+        return primary.metadata
+    if not promote:
+        return next((meta for meta in model_registry.list_versions() if matches(meta)), None)
+    return None
+
+
+def _unchanged_response(meta: Dict[str, Any]) -> TrainResponse:
+    """코퍼스 미변경 시 기존 모델 메트릭 응답"""
+    logger.info(f"[Train] Corpus unchanged ({meta['fingerprint'][:12]}), reusing model {meta.get('version')}")
+    return TrainResponse(
+        success=True,
+        message="학습 코퍼스가 변경되지 않아 기존 모델을 유지합니다. (rebuild=true로 강제 재학습)",
+        samples_used=int(meta["metrics"].get("samples_used", 0)),
+        metrics=meta["metrics"],
+        model_version=meta.get("version"),
+        fingerprint=meta["fingerprint"],
+        skipped=True,
+        size_selection=meta.get("size_selection"),
+    )
+
+
+def _fit_and_register(
+    model: SeatRecommender,
+    dataset: Dict[str, np.ndarray],
+    fingerprint: Optional[str],
+    promote: bool,
+) -> Tuple[Dict[str, float], Dict[str, Any], float]:
+    """학습 + 레지스트리 등록 (+ primary 저장), 스레드에서 실행 — (메트릭, 레지스트리 메타데이터, 학습 시간)"""
+    fit_start = time.perf_counter()
+    with stage_timer("fit"):
+        metrics = model.train_arrays(dataset)
+    fit_seconds = time.perf_counter() - fit_start
+
+    with stage_timer("register"):
+        meta = model_registry.register(
+            model,
+            metrics,
+            fingerprint=fingerprint,
+            fit_seconds=fit_seconds,
+            promote=promote,
+            protected=model_server.protected_versions,
+        )
+        if promote:
+            model.save_model()
+    return metrics, meta, fit_seconds
 
 
 @router.post("/train", response_model=TrainResponse)
 async def train_model(request: TrainRequest):
-    """모델 학습"""
+    """
+    모델 학습
+
+    학습 데이터 구성 / 학습 / 저장은 스레드에서 실행 (학습 중에도 /recommend가 지연 예산 안에 응답)
+    """
+    await service_startup.wait()  # 백그라운드 모델 로드가 학습 결과를 덮어쓰지 않도록
+
+    async with _train_lock:
+        return await _train(request)
 
-    # 기존 모델이 있고 force가 아니면 에러
-    if recommender.is_trained and not request.force:
+
+async def _train(request: TrainRequest) -> TrainResponse:
+    """/train 본문 (_train_lock 안에서 실행)"""
+    # 기존 모델이 있고 force가 아니면 에러 (primary 교체 시에만)
+    if request.promote and model_server.primary.is_trained and not request.force:
         raise HTTPException(
             status_code=400,
             detail="모델이 이미 학습되어 있습니다. force=true로 덮어쓸 수 있습니다."
         )
 
+    reset_peak_rss()  # 메트릭의 peak_memory_mb는 학습 데이터 로드부터의 최대 RSS
+
     try:
-        training_data = []
+        dataset: Optional[Dict[str, np.ndarray]] = None  # 학습용 배열 묶음 (DB 스트리밍 또는 피처 저장소)
         data_source = "none"
+        fingerprint = None
 
-        # 1. DB에서 학습 데이터 로드 시도
-        print("[Train] Loading training data from DB...")
+        # 1. DB에서 학습 데이터 로드 시도 (키셋 페이지 스트리밍, 행 수 제한 없음)
+        logger.info("[Train] Loading training data from DB...")
         try:
-            seats_data = await supabase_service.get_all_seats()
-            member_stats = await supabase_service.get_member_statistics()
-
-            if seats_data and len(seats_data) > 0:
+            # 직접 연결(COPY) → DB 집계 RPC 순으로 시도 (통계/컨텍스트 포함)
+            # 마이그레이션 전 DB면 원본 좌석 + 통계 조회
+            seat_columns = await postgres_reader.load_training_samples()
+            if seat_columns is None:
+                seat_columns = await supabase_service.load_training_samples()
+            if seat_columns is not None:
+                member_stats = member_stats_from_samples(seat_columns)
+            else:
+                seat_columns = await supabase_service.load_training_seats()
+                member_stats = await supabase_service.load_all_member_statistics()
+
+            if len(seat_columns["id"]) > 0:
                 stats_map = {stat["member_id"]: stat for stat in member_stats}
-
-                for seat in seats_data:
-                    member = seat.get("members", {})
-                    if not member:
-                        continue
-
-                    training_data.append({
-                        "member": {
-                            "id": member.get("id"),
-                            "name": member.get("name"),
-                            "part": member.get("part"),
-                            "height": member.get("height"),
-                            "experience": member.get("experience"),
-                        },
-                        "stats": stats_map.get(member.get("id"), {}),
-                        "seat_row": seat.get("seat_row"),
-                        "seat_col": seat.get("seat_column"),
-                    })
+                dataset = await asyncio.to_thread(build_db_training_set, seat_columns, stats_map)
                 data_source = "db"
-                print(f"[Train] Loaded {len(training_data)} samples from DB")
+                fingerprint = fingerprint_db_corpus(seat_columns, member_stats)
+                logger.info(f"[Train] Loaded {len(dataset['X'])} samples from DB")
         except Exception as db_error:
-            print(f"[Train] DB load failed: {db_error}")
+            logger.warning(f"[Train] DB load failed: {db_error}")
 
         # 2. DB 데이터가 부족하면 JSON 파일에서 로드
-        if len(training_data) < settings.MIN_TRAINING_SAMPLES:
-            print(f"[Train] DB data insufficient ({len(training_data)}), loading from JSON files...")
-            json_data = load_training_data_from_json()
-            if json_data:
-                training_data = json_data  # JSON 데이터로 대체
+        n_db_samples = len(dataset["X"]) if dataset is not None else 0
+        if n_db_samples < settings.MIN_TRAINING_SAMPLES:
+            logger.info(f"[Train] DB data insufficient ({n_db_samples}), loading from JSON files...")
+
+            # 파싱 전에 지문만으로 미변경 여부 확인
+            json_fingerprint = fingerprint_json_corpus()
+            existing = None if request.rebuild else find_model_for_corpus(json_fingerprint, request.promote)
+            if existing:
+                return _unchanged_response(existing)
+
+            json_dataset = await asyncio.to_thread(load_training_set_from_json)
+            if json_dataset is not None and len(json_dataset["X"]) > 0:
+                dataset = json_dataset  # JSON 데이터로 대체
                 data_source = "json"
-                print(f"[Train] Loaded {len(training_data)} samples from JSON files")
+                fingerprint = json_fingerprint
+                logger.info(f"[Train] Loaded {len(dataset['X'])} samples from JSON files")
+        elif not request.rebuild:
+            existing = find_model_for_corpus(fingerprint, request.promote)
+            if existing:
+                return _unchanged_response(existing)
+
+        # 항상 새 인스턴스에 학습 (서빙 중인 primary는 학습이 끝난 뒤 참조만 교체)
+        model = SeatRecommender()
+        n_samples = len(dataset["X"]) if dataset is not None else 0
 
-        print(f"[Train] Total training samples: {len(training_data)} (source: {data_source})")
+        logger.info(f"[Train] Total training samples: {n_samples} (source: {data_source})")
 
-        if len(training_data) < settings.MIN_TRAINING_SAMPLES:
+        if n_samples < settings.MIN_TRAINING_SAMPLES:
             raise HTTPException(
                 status_code=400,
-                detail=f"최소 {settings.MIN_TRAINING_SAMPLES}개의 샘플이 필요합니다. (현재: {len(training_data)})"
+                detail=f"최소 {settings.MIN_TRAINING_SAMPLES}개의 샘플이 필요합니다. (현재: {n_samples})"
             )
 
-        # 모델 학습
-        metrics = recommender.train(training_data)
-
-        # 모델 저장
-        recommender.save_model()
+        # 학습 → 레지스트리 등록 및 primary 저장 (이벤트 루프를 막지 않도록 스레드에서)
+        metrics, meta, fit_seconds = await asyncio.to_thread(
+            _fit_and_register, model, dataset, fingerprint, request.promote
+        )
+        if request.promote:
+            model_server.set_primary(model)
+        logger.info(f"[Train] Trained model {meta['version']}", extra={
+            "model_version": meta["version"],
+            "samples": n_samples,
+            "data_source": data_source,
+            "fit_seconds": round(fit_seconds, 3),
+            "promoted": request.promote,
+        })
 
         return TrainResponse(
             success=True,
-            message="모델 학습이 완료되었습니다.",
-            samples_used=len(training_data),
+            message=(
+                "모델 학습이 완료되었습니다."
+                if request.promote
+                else "모델 학습이 완료되었습니다. (레지스트리에만 등록됨)"
+            ),
+            samples_used=n_samples,
             metrics=metrics,
+            model_version=meta["version"],
+            fingerprint=fingerprint,
+            size_selection=model.metadata.get("size_selection"),
         )
 
     except HTTPException:
@@ -302,8 +373,105 @@ async def train_model(request: TrainRequest):
 
 @router.get("/model/status")
 async def model_status():
-    """모델 상태 확인"""
+    """
+    모델 상태 확인
+
+    profile: 번들 크기, 앙상블별 메모리/트리/노드/클래스 수, 마지막 로드, 로스터 크기별 추론 지연, 학습 시간
+    (로드/학습 이후 한 번 계산해 캐시)
+    latency_budget: /recommend 지연 예산 결과 (예산 내 ML / 규칙 기반 대체 / 초과)
+    """
+    primary = model_server.primary
     return {
-        "is_trained": recommender.is_trained,
+        "is_trained": primary.is_trained,
         "model_path": settings.MODEL_PATH,
+        "model_version": primary.metadata.get("version"),
+        "fingerprint": primary.metadata.get("fingerprint"),
+        "trained_at": primary.metadata.get("trained_at"),
+        "profile": await asyncio.to_thread(model_profile, primary),
+        "serving": model_server.status(),
+        "tenants": tenant_models.status(),
+        "latency_budget": latency_budget.status(),
+        "startup": service_startup.status(),
+    }
+
+
+@router.get("/corpus/status")
+async def corpus_status():
+    """JSON 학습 코퍼스 증분 수집 상태 (수집 지연, 반영 건수, 피처 저장소)"""
+    return corpus_watcher.status()
+
+
+@router.post("/stats/sync")
+async def sync_member_statistics():
+    """
+    JSON 코퍼스 기반 감쇠 대원 통계를 member_seat_statistics의 decayed_* 열에 반영
+
+    마지막 동기화 이후 통계가 바뀐 대원만 배치 단위로 업서트
+    트리거가 관리하는 통계 / 원시 집계 열은 건드리지 않음 (추천/학습은 member_serving_statistics로 조회)
+    """
+    await asyncio.to_thread(corpus_watcher.refresh, JSON_TRAINING_DATA_PATH)
+    rows = member_stats_engine.dirty_rows()
+    upserted = await supabase_service.upsert_member_statistics(rows)
+    member_stats_engine.mark_clean(upserted)
+
+    return {
+        "changed": len(rows),
+        "upserted": len(upserted),
+        "failed": len(rows) - len(upserted),
+        "half_life_days": member_stats_engine.half_life,
+    }
+
+
+@router.get("/model/versions")
+async def model_versions():
+    """레지스트리에 보관 중인 모델 버전 목록"""
+    return {
+        "primary": model_registry.primary_version,
+        "versions": model_registry.list_versions(),
     }
+
+
+@router.post("/model/versions/{version}/promote")
+async def promote_model_version(version: str):
+    """레지스트리 버전을 primary로 지정"""
+    if model_registry.get(version) is None:
+        raise HTTPException(status_code=404, detail=f"등록되지 않은 모델 버전입니다: {version}")
+
+    await service_startup.wait()
+    # /train의 primary 교체와 겹치지 않도록 (MODEL_PATH 복사 → 인덱스 → 서빙 교체 순서 보장)
+    async with _train_lock:
+        try:
+            # 새 인스턴스에 로드한 뒤 교체 (서빙 중인 primary를 로드 도중 상태로 두지 않음)
+            model = await asyncio.to_thread(model_registry.load, version)
+            await asyncio.to_thread(copy_model_bundle, model_registry.path_for(version), settings.MODEL_PATH)
+            await asyncio.to_thread(model_registry.set_primary, version)
+            model_server.set_primary(model)
+        except FileNotFoundError as e:
+            raise HTTPException(status_code=404, detail=str(e))
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"모델 전환 중 오류 발생: {str(e)}")
+
+    return {"primary": version}
+
+
+@router.put("/model/serving")
+async def configure_serving(request: ServingConfigRequest):
+    """
+    섀도우/A/B 라우팅 설정 변경
+
+    번들이 없는 버전(정리 / 삭제)은 404, 등록되지 않은 버전 / 잘못된 가중치는 400
+    """
+    try:
+        # 새 버전 로드(디스크 읽기)는 스레드에서
+        await asyncio.to_thread(
+            model_server.configure,
+            shadow_version=request.shadow_version,
+            shadow_sample_rate=request.shadow_sample_rate,
+            ab_weights=request.ab_weights,
+        )
+    except FileNotFoundError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    return model_server.status()
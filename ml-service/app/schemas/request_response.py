@@ -12,6 +12,9 @@ from enum import Enum
 import re
 
 
+MAX_LATENCY_BUDGET_MS = 60_000  # 요청 지연 예산 상한 (ms)
+
+
 class Part(str, Enum):
     """파트 enum"""
     SOPRANO = "SOPRANO"
@@ -75,6 +78,17 @@ class RecommendRequest(BaseModel):
         max_length=200  # 최대 200명 제한
     )
     grid_layout: Optional[GridLayout] = Field(default=None, alias="gridLayout")
+    latency_budget_ms: Optional[float] = Field(
+        default=None,
+        alias="latencyBudgetMs",
+        gt=0,
+        le=MAX_LATENCY_BUDGET_MS,
+        description="지연 예산 (ms, 초과 예상 시 규칙 기반 배치로 응답, X-Latency-Budget-Ms 헤더로도 지정)"
+    )
+    engine: Optional[Literal["ml", "rules"]] = Field(
+        default=None,
+        description="배치 엔진 (기본: 모델이 있으면 ml, 없으면 rules / ml 지정 시 모델이 없으면 503)"
+    )
 
     class Config:
         populate_by_name = True
@@ -109,6 +123,14 @@ class RecommendResponse(BaseModel):
 class TrainRequest(BaseModel):
     """학습 요청"""
     force: bool = Field(default=False, description="기존 모델 덮어쓰기")
+    promote: bool = Field(
+        default=True,
+        description="학습된 모델을 primary로 지정 (false면 레지스트리에만 등록)"
+    )
+    rebuild: bool = Field(
+        default=False,
+        description="학습 코퍼스가 변경되지 않았어도 강제로 재학습"
+    )
 
 
 class TrainResponse(BaseModel):
@@ -117,6 +139,36 @@ class TrainResponse(BaseModel):
     message: str
     samples_used: int = Field(alias="samplesUsed")
     metrics: Optional[Dict[str, float]] = None
+    model_version: Optional[str] = Field(default=None, alias="modelVersion")
+    fingerprint: Optional[str] = Field(default=None, description="학습 코퍼스 지문")
+    skipped: bool = Field(default=False, description="코퍼스 미변경으로 재학습을 생략했는지 여부")
+    size_selection: Optional[Dict[str, Any]] = Field(
+        default=None,
+        alias="sizeSelection",
+        description="앙상블 크기 선택 결과 (정확도/지연 곡선, 예산 충족 여부)"
+    )
+
+    class Config:
+        populate_by_name = True
+        protected_namespaces = ()  # model_ 접두사 경고 무시
+
+
+class ServingConfigRequest(BaseModel):
+    """서빙 설정 변경 요청 (지정한 필드만 변경)"""
+    shadow_version: Optional[str] = Field(
+        default=None,
+        alias="shadowVersion",
+        max_length=100,
+        description="섀도우 모델 버전 (빈 문자열이면 해제)"
+    )
+    shadow_sample_rate: Optional[float] = Field(
+        default=None, alias="shadowSampleRate", ge=0, le=1
+    )
+    ab_weights: Optional[Dict[str, float]] = Field(
+        default=None,
+        alias="abWeights",
+        description='버전별 라우팅 가중치 (예: {"primary": 0.9, "<version>": 0.1})'
+    )
 
     class Config:
         populate_by_name = True
@@ -128,6 +180,7 @@ class HealthResponse(BaseModel):
     version: str
     model_loaded: bool = Field(alias="modelLoaded")
     database_connected: bool = Field(alias="databaseConnected")
+    upstreams: Dict[str, Any] = Field(default_factory=dict)  # 조회별 회로 차단기 상태
 
     class Config:
         populate_by_name = True
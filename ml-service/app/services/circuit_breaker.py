@@ -0,0 +1,150 @@
+"""
+외부 호출별 회로 차단기 (Supabase 요청 경로 조회)
+
+- closed: 호출마다 짧은 타임아웃(SUPABASE_CALL_TIMEOUT_SECONDS) + 지터를 준 지수 백오프 재시도
+  재시도까지 실패한 호출이 연속 SUPABASE_BREAKER_FAILURES번이면 open
+- open: 호출하지 않고 바로 CircuitOpenError (호출 측은 마지막 정상 응답을 사용)
+  SUPABASE_BREAKER_RESET_SECONDS가 지나면 half_open
+- half_open: 시험 호출 1개만 보냄 (재시도 없음), 성공하면 closed / 실패하면 다시 open
+
+동기 SDK 호출은 스레드에서 실행하고 타임아웃이 지나면 기다리지 않음
+(스레드는 클라이언트 타임아웃까지 남을 수 있지만, 차단 중에는 새 호출을 보내지 않으므로 쌓이지 않음)
+상태는 이벤트 루프 스레드에서만 바뀜 (lock 불필요)
+"""
+import asyncio
+import logging
+import random
+import time
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """차단 중이라 호출하지 않음"""
+
+
+class CircuitBreaker:
+    """외부 호출 하나의 회로 차단기"""
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: Optional[int] = None,
+        reset_seconds: Optional[float] = None,
+        timeout: Optional[float] = None,
+        retries: Optional[int] = None,
+        backoff: Optional[float] = None,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold or settings.SUPABASE_BREAKER_FAILURES
+        self.reset_seconds = settings.SUPABASE_BREAKER_RESET_SECONDS if reset_seconds is None else reset_seconds
+        self.timeout = timeout or settings.SUPABASE_CALL_TIMEOUT_SECONDS
+        self.retries = settings.SUPABASE_CALL_RETRIES if retries is None else retries
+        self.backoff = settings.SUPABASE_RETRY_BACKOFF_SECONDS if backoff is None else backoff
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.last_error: Optional[str] = None
+        self._probe_in_flight = False
+
+        self.calls = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.retried = 0
+        self.rejected = 0  # 차단 중이라 바로 반환한 호출
+        self.times_opened = 0
+
+    def _acquire(self) -> bool:
+        """호출 허용 여부 확인 (시험 호출이면 True, 차단 중이면 CircuitOpenError)"""
+        if self.state == OPEN and time.monotonic() - self.opened_at >= self.reset_seconds:
+            self.state = HALF_OPEN
+        if self.state == OPEN or (self.state == HALF_OPEN and self._probe_in_flight):
+            self.rejected += 1
+            raise CircuitOpenError(f"{self.name} circuit open")
+        if self.state == HALF_OPEN:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def _on_success(self):
+        if self.state != CLOSED:
+            logger.info(f"[Circuit] {self.name} closed (upstream recovered)")
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+
+    def _on_failure(self, error: BaseException):
+        self.failures += 1
+        self.consecutive_failures += 1
+        self.last_error = type(error).__name__
+        if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.times_opened += 1
+                logger.warning(
+                    f"[Circuit] {self.name} open after {self.consecutive_failures} failures ({self.last_error})",
+                    extra={"circuit": self.name, "last_error": self.last_error},
+                )
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+
+    async def call(self, fn: Callable[[], T]) -> T:
+        """
+        fn(동기)을 스레드에서 타임아웃 / 재시도와 함께 실행
+
+        Raises:
+            CircuitOpenError: 차단 중
+            Exception: 재시도까지 실패한 마지막 예외 (타임아웃은 asyncio.TimeoutError)
+        """
+        probe = self._acquire()
+        self.calls += 1
+        attempts = 1 if probe else self.retries + 1
+        error: Optional[BaseException] = None
+        try:
+            for attempt in range(attempts):
+                try:
+                    result = await asyncio.wait_for(asyncio.to_thread(fn), timeout=self.timeout)
+                except asyncio.TimeoutError as e:
+                    self.timeouts += 1
+                    error = e
+                except Exception as e:
+                    error = e
+                else:
+                    self._on_success()
+                    return result
+
+                if attempt + 1 < attempts:
+                    # 지수 백오프 + full jitter (동시에 실패한 요청들이 같은 시점에 재시도하지 않도록)
+                    self.retried += 1
+                    await asyncio.sleep(random.uniform(0, self.backoff * 2 ** attempt))
+            self._on_failure(error)
+            raise error
+        finally:
+            if probe:
+                self._probe_in_flight = False
+
+    def status(self) -> Dict[str, Any]:
+        retry_in = None
+        if self.state == OPEN:
+            retry_in = round(max(0.0, self.reset_seconds - (time.monotonic() - self.opened_at)), 1)
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "retry_in_seconds": retry_in,
+            "last_error": self.last_error,
+            "calls": self.calls,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "retries": self.retried,
+            "rejected": self.rejected,
+            "times_opened": self.times_opened,
+        }
@@ -0,0 +1,201 @@
+"""
+JSON 학습 코퍼스 로더
+
+training_data/ml_output/ml_*.json 파일을 한 번만 파싱하여 메모리 배치 테이블로 유지
+- 파일 읽기(I/O)만 스레드 풀에서 미리 수행하고 JSON 파싱은 호출 스레드에서 순차 수행
+  (json.loads는 GIL을 잡고 있어 스레드로 나눠도 빨라지지 않음, 읽기와 파싱만 겹침)
+- 파일별 (수정 시각, 크기)로 캐시 무효화 → 변경/추가된 파일만 다시 파싱
+- 대원 통계, 배치 컨텍스트, 학습 샘플은 모두 이 테이블에서 파생
+"""
+import json
+import logging
+import threading
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+FileKey = Tuple[int, int]  # (st_mtime_ns, st_size)
+
+VALID_PARTS = {"SOPRANO", "ALTO", "TENOR", "BASS"}
+
+# 통계가 없는 대원의 학습용 기본 통계
+DEFAULT_MEMBER_STATS = {
+    "preferred_row": 3,
+    "preferred_col": 8,
+    "row_consistency": 50,
+    "col_consistency": 50,
+    "is_fixed_seat": False,
+    "total_appearances": 0,
+}
+
+
+def calculate_arrangement_context(seats: List[Dict]) -> Dict[str, Any]:
+    """
+    배치 컨텍스트 계산 (파트 비율, 총 인원 등)
+    """
+    total = len(seats)
+    if total == 0:
+        return {
+            "total_members": 0,
+            "soprano_ratio": 0.25,
+            "alto_ratio": 0.25,
+            "tenor_ratio": 0.25,
+            "bass_ratio": 0.25,
+        }
+
+    part_counts = Counter(s.get("part") for s in seats if s.get("part") in VALID_PARTS)
+
+    return {
+        "total_members": total,
+        "soprano_ratio": part_counts.get("SOPRANO", 0) / total,
+        "alto_ratio": part_counts.get("ALTO", 0) / total,
+        "tenor_ratio": part_counts.get("TENOR", 0) / total,
+        "bass_ratio": part_counts.get("BASS", 0) / total,
+        "soprano_count": part_counts.get("SOPRANO", 0),
+        "alto_count": part_counts.get("ALTO", 0),
+        "tenor_count": part_counts.get("TENOR", 0),
+        "bass_count": part_counts.get("BASS", 0),
+    }
+
+
+def seat_columns(seats: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    통계용 좌석 열 (대원 ID가 있고 유효한 파트인 좌석만, 배치 내 순서 유지)
+
+    파싱 시 한 번 만들어 두고 대원 통계 계산에서는 배치별 배열을 이어 붙이기만 함
+    """
+    valid = [s for s in seats if s.get("member_id") and s.get("part") in VALID_PARTS]
+    if not valid:
+        return {
+            "member_id": np.empty(0, dtype=object),
+            "part": np.empty(0, dtype=object),
+            "row": np.empty(0, dtype=np.int64),
+            "col": np.empty(0, dtype=np.int64),
+        }
+    return {
+        "member_id": np.array([s["member_id"] for s in valid], dtype=object),
+        "part": np.array([s["part"] for s in valid], dtype=object),
+        "row": np.array([s.get("row") for s in valid]),
+        "col": np.array([s.get("col") for s in valid]),
+    }
+
+
+def read_arrangement_file(path: Path) -> Optional[bytes]:
+    """ml_*.json 파일 내용 (읽기 실패 시 None, 스레드 풀에서 호출)"""
+    try:
+        return path.read_bytes()
+    except OSError as e:
+        logger.warning(f"[Corpus] Error loading {path}: {e}")
+        return None
+
+
+def parse_arrangement_file(path: Path, raw: Optional[bytes] = None) -> Optional[Dict[str, Any]]:
+    """
+    ml_*.json 파일 하나를 배치 레코드로 파싱 (실패 시 None)
+
+    Args:
+        raw: 미리 읽은 파일 내용 (없으면 여기서 읽음)
+    """
+    if raw is None:
+        raw = read_arrangement_file(path)
+        if raw is None:
+            return None
+    try:
+        data = json.loads(raw.decode("utf-8"))
+    except Exception as e:
+        logger.warning(f"[Corpus] Error loading {path}: {e}")
+        return None
+
+    seats = data.get("seats", [])
+    return {
+        "arrangement_id": data.get("arrangement_id") or path.stem,
+        "file": path.name,
+        "date": data.get("date"),
+        "seats": seats,
+        "seat_columns": seat_columns(seats),
+    }
+
+
+class CorpusLoader:
+    """mtime 기반 캐시를 가진 코퍼스 로더 (파일 읽기는 스레드 풀, 파싱은 순차)"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or settings.CORPUS_LOADER_WORKERS
+        self._cache: Dict[Path, Tuple[FileKey, Optional[Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+        self.last_parsed = 0  # 마지막 load()에서 실제로 파싱한 파일 수
+        self.last_changed: List[Tuple[str, int]] = []  # 마지막 load()에서 새로 읽은 (파일명, 수정 시각 ns)
+        self.last_removed = 0  # 마지막 load()에서 캐시에서 제거한 삭제 파일 수
+        self.generation = 0  # 코퍼스 내용이 바뀔 때마다 증가 (파생 데이터 캐시 키)
+
+    def load(self, directory: Path) -> List[Dict[str, Any]]:
+        """
+        디렉토리의 모든 배치 레코드 (파일명 순)
+
+        변경되지 않은 파일은 캐시된 파싱 결과를 재사용
+        """
+        if not directory.exists():
+            return []
+
+        with self._lock:
+            files = sorted(directory.glob("ml_*.json"))
+            keys: Dict[Path, FileKey] = {}
+            for path in files:
+                stat = path.stat()
+                keys[path] = (stat.st_mtime_ns, stat.st_size)
+
+            stale = [
+                path for path in files
+                if path not in self._cache or self._cache[path][0] != keys[path]
+            ]
+
+            if stale:
+                workers = max(1, min(self.max_workers, len(stale)))
+                with ThreadPoolExecutor(max_workers=workers) as pool:
+                    # 스레드는 뒤쪽 파일을 미리 읽고, 파싱은 읽힌 순서대로 이 스레드에서
+                    contents = pool.map(read_arrangement_file, stale)
+                    parsed = [
+                        parse_arrangement_file(path, raw) if raw is not None else None
+                        for path, raw in zip(stale, contents)
+                    ]
+                for path, record in zip(stale, parsed):
+                    if record is not None:
+                        # 파일 버전 식별자 (피처 저장소가 변경된 배치를 판별하는 데 사용)
+                        record["source_key"] = f"{path.name}:{keys[path][0]}:{keys[path][1]}"
+                    self._cache[path] = (keys[path], record)
+
+            # 삭제된 파일 정리 (같은 디렉토리 범위만)
+            removed = [
+                path for path in self._cache
+                if path.parent == directory and path not in keys
+            ]
+            for path in removed:
+                del self._cache[path]
+
+            if stale or removed:
+                self.generation += 1
+            self.last_parsed = len(stale)
+            self.last_changed = [(path.name, keys[path][0]) for path in stale]
+            self.last_removed = len(removed)
+            return [
+                self._cache[path][1] for path in files
+                if self._cache[path][1] is not None
+            ]
+
+    def invalidate(self):
+        """캐시 전체 무효화"""
+        with self._lock:
+            self._cache.clear()
+            self.generation += 1
+
+
+# 싱글톤 인스턴스
+corpus_loader = CorpusLoader()
@@ -0,0 +1,202 @@
+"""
+JSON 학습 코퍼스 디렉토리 감시 (증분 수집)
+
+training_data/ml_output/을 주기적으로 확인하여 새로 추가/변경된 ml_*.json만 파싱
+- 파일 변경 감지는 수정 시각/크기 폴링 (코퍼스 로더 캐시 키와 동일, 추가 의존성 없음)
+- 변경이 있을 때만 대원 통계 엔진(시간 감쇠, 새 배치는 증분)과 피처 저장소에 변경 배치만 반영
+- /train과 통계 갱신은 감시자가 유지하는 최신 상태를 그대로 사용 (이력 재파싱 없음)
+- 수집 지연(파일 수정 → 반영 완료)과 누적 건수 제공
+- 워커가 여럿이면 감시 잠금(<FEATURE_STORE_DIR>.watch.lock)을 잡은 워커 하나만 백그라운드 폴링
+  (다른 워커는 /train, /stats/sync 호출 시에만 refresh, 피처 저장소 쓰기는 파일 잠금으로 직렬화)
+- 첫 스캔(전체 파싱 + 통계 재계산)은 시작 작업(모델 로드 + 워밍업)이 끝난 뒤 실행
+"""
+import asyncio
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import IO, Any, Awaitable, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.services.corpus_loader import corpus_loader
+from app.services.feature_store import feature_store
+from app.services.file_lock import try_hold
+from app.services.member_stats_engine import member_stats_engine
+
+logger = logging.getLogger(__name__)
+
+
+# JSON 학습 데이터 경로 (ml-service 기준 상대 경로)
+JSON_TRAINING_DATA_PATH = Path(__file__).parent.parent.parent.parent / "training_data" / "ml_output"
+
+
+class CorpusWatcher:
+    """코퍼스 디렉토리 폴링 + 대원 통계 / 피처 저장소 증분 갱신"""
+
+    def __init__(self, directory: Path = JSON_TRAINING_DATA_PATH, interval: Optional[float] = None):
+        self.directory = directory
+        self.interval = interval or settings.CORPUS_WATCH_INTERVAL_SECONDS
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+        self._watch_lock: Optional[IO] = None  # 감시 담당 워커만 보유
+
+        # 마지막으로 반영한 코퍼스 상태: (디렉토리, 로더 세대) 기준
+        self._state_key: Optional[Tuple[Path, int]] = None
+        self.arrangements: List[Dict[str, Any]] = []
+        self.member_stats: Dict[str, Dict[str, Any]] = {}
+        self.member_parts: Dict[str, str] = {}
+
+        # 수집 지표
+        self.scans = 0
+        self.ingests = 0  # 변경이 반영된 스캔 수
+        self.files_ingested = 0
+        self.files_removed = 0
+        self.errors = 0
+        self.last_scan_at: Optional[float] = None
+        self.last_ingest_at: Optional[float] = None
+        self.last_ingest_seconds = 0.0  # 파싱 + 통계 + 피처 저장소 반영 소요 시간
+        self.last_lag_seconds: Optional[float] = None  # 마지막 반영 파일 중 최대 (반영 시각 - 수정 시각)
+        self.max_lag_seconds = 0.0
+        self.last_error: Optional[str] = None
+
+    def refresh(self, directory: Optional[Path] = None) -> Dict[str, Any]:
+        """
+        디렉토리를 한 번 확인하고 변경분을 반영한 뒤 최신 상태 반환
+
+        변경이 없으면 파일 stat만 수행하고 캐시된 배치/통계를 그대로 반환
+
+        Returns:
+            {"arrangements", "member_stats", "member_parts", "changed"}
+        """
+        directory = directory or self.directory
+        with self._lock:
+            start = time.time()
+            arrangements = corpus_loader.load(directory)
+            self.scans += 1
+            self.last_scan_at = start
+
+            key = (directory, corpus_loader.generation)
+            changed = key != self._state_key
+            if changed:
+                stats_mode = member_stats_engine.sync(arrangements)
+                member_stats = member_stats_engine.stats()
+                member_parts = member_stats_engine.parts()
+                store_stats = feature_store.sync(arrangements)
+                now = time.time()
+
+                self._state_key = key
+                self.arrangements = arrangements
+                self.member_stats = member_stats
+                self.member_parts = member_parts
+
+                self.ingests += 1
+                self.files_ingested += len(corpus_loader.last_changed)
+                self.files_removed += corpus_loader.last_removed
+                self.last_ingest_at = now
+                self.last_ingest_seconds = now - start
+                if corpus_loader.last_changed:
+                    lag = now - min(mtime_ns for _, mtime_ns in corpus_loader.last_changed) / 1e9
+                    self.last_lag_seconds = lag
+                    self.max_lag_seconds = max(self.max_lag_seconds, lag)
+
+                logger.info(f"[Corpus] Ingested {len(corpus_loader.last_changed)} changed / "
+                            f"{corpus_loader.last_removed} removed files in {self.last_ingest_seconds:.2f}s "
+                            f"({len(arrangements)} arrangements, {len(member_stats)} members [{stats_mode}], "
+                            f"{store_stats['live_rows']} feature rows)")
+
+            return {
+                "arrangements": self.arrangements,
+                "member_stats": self.member_stats,
+                "member_parts": self.member_parts,
+                "changed": changed,
+            }
+
+    @property
+    def watch_lock_path(self) -> str:
+        return os.path.normpath(settings.FEATURE_STORE_DIR) + ".watch.lock"
+
+    async def _run(self, after: Optional[Awaitable] = None):
+        """interval초마다 refresh (블로킹 작업은 스레드에서, after가 있으면 완료 후 시작)"""
+        if after is not None:
+            try:
+                await after
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                pass  # 시작 작업 실패와 무관하게 감시는 진행
+        while True:
+            try:
+                await asyncio.to_thread(self.refresh)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+                logger.error(f"[Corpus] Watch error: {self.last_error}")
+            await asyncio.sleep(self.interval)
+
+    def start(self, after: Optional[Awaitable] = None) -> bool:
+        """
+        백그라운드 감시 시작 (이벤트 루프 안에서 호출)
+
+        Args:
+            after: 첫 스캔 전에 기다릴 작업 (시작 작업의 워밍업과 겹치지 않도록)
+
+        Returns:
+            감시를 맡았는지 (다른 워커가 감시 잠금을 잡고 있으면 False)
+        """
+        if self._task is not None and not self._task.done():
+            return True
+        if self._watch_lock is None:
+            self._watch_lock = try_hold(self.watch_lock_path)
+            if self._watch_lock is None:
+                logger.info("[Corpus] Another worker is watching the corpus, polling disabled in this worker")
+                if asyncio.iscoroutine(after):
+                    after.close()
+                return False
+        self._task = asyncio.create_task(self._run(after))
+        logger.info(f"[Corpus] Watching {self.directory} every {self.interval:g}s")
+        return True
+
+    async def stop(self):
+        """백그라운드 감시 중지"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watch_lock is not None:
+            self._watch_lock.close()
+            self._watch_lock = None
+
+    def status(self) -> Dict[str, Any]:
+        """수집 지연 및 건수"""
+        now = time.time()
+        return {
+            "directory": str(self.directory),
+            "watching": self._task is not None and not self._task.done(),
+            "watch_owner": self._watch_lock is not None,
+            "interval_seconds": self.interval,
+            "arrangements": len(self.arrangements),
+            "members": len(self.member_stats),
+            "scans": self.scans,
+            "ingests": self.ingests,
+            "files_ingested": self.files_ingested,
+            "files_removed": self.files_removed,
+            "errors": self.errors,
+            "last_error": self.last_error,
+            "seconds_since_last_scan": (now - self.last_scan_at) if self.last_scan_at else None,
+            "seconds_since_last_ingest": (now - self.last_ingest_at) if self.last_ingest_at else None,
+            "last_ingest_seconds": self.last_ingest_seconds,
+            "last_lag_seconds": self.last_lag_seconds,
+            "max_lag_seconds": self.max_lag_seconds,
+            "member_stats": member_stats_engine.status(),
+            "feature_store": feature_store.status(),
+        }
+
+
+# 싱글톤 인스턴스
+corpus_watcher = CorpusWatcher()
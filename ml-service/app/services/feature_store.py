@@ -0,0 +1,438 @@
+"""
+열 기반 학습 피처 저장소
+
+배치(arrangement) 단위로 좌석별 원본 열과 배치 내 피처를 .npy 세그먼트에 누적 저장
+- 세그먼트: <FEATURE_STORE_DIR>/seg-NNNNNN/<열>.npy (추가만 하고 기존 세그먼트는 다시 쓰지 않음)
+- 매니페스트: <FEATURE_STORE_DIR>/manifest.json (세그먼트 목록 + 배치별 소속 세그먼트/버전)
+- 학습 시 열을 mmap_mode="r"로 열어 JSON 파싱·복사 없이 사용
+  (살아있는 행 수를 먼저 세고 float32 학습 행렬 하나에 청크 단위로 채움)
+- 여러 워커 프로세스가 같은 디렉토리를 쓰므로 <FEATURE_STORE_DIR>.lock 파일 잠금으로 보호
+  (동기화/압축은 배타 잠금, 읽기는 공유 잠금 → 읽는 중인 세그먼트를 다른 워커가 지우지 않음)
+
+대원 통계 피처(6개)는 전체 배치 이력에 의존하므로 저장하지 않고,
+읽을 때 (대원, 파트)별로 한 번 계산해 인덱스로 채움
+→ 새 배치가 추가되어도 기존 세그먼트는 그대로 유효
+"""
+import json
+import logging
+import os
+import shutil
+import threading
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.services.file_lock import file_lock
+from app.models.seat_recommender import (
+    ARRANGEMENT_FEATURE_COLUMNS,
+    N_FEATURES,
+    STATS_FEATURE_COLUMNS,
+    context_features,
+    rule_features,
+    scale_in_place,
+    stats_features,
+)
+from app.services.corpus_loader import (
+    DEFAULT_MEMBER_STATS,
+    VALID_PARTS,
+    calculate_arrangement_context,
+)
+
+logger = logging.getLogger(__name__)
+
+
+MANIFEST_FILENAME = "manifest.json"
+SCHEMA_VERSION = 1
+
+# 세그먼트별 저장 열
+COLUMNS = (
+    "arrangement_id",  # 배치 ID (문자열)
+    "member_id",       # 대원 ID (문자열, 없으면 "")
+    "part",            # 파트 코드 (part_encoder 순서)
+    "height",          # 원본 키 (없으면 NaN)
+    "experience",      # 원본 경력 (없으면 NaN)
+    "seat_row",        # 레이블: 행
+    "seat_col",        # 레이블: 열
+    "features",        # (n, 12) 배치 내 피처 (ARRANGEMENT_FEATURE_COLUMNS 순서)
+)
+
+
+# 파트 인코딩 (SeatRecommender.part_encoder와 같은 순서: LabelEncoder.classes_는 정렬된 파트)
+PART_CLASSES = np.array(sorted(VALID_PARTS))
+_RULE_TABLE = np.array([rule_features(part) for part in PART_CLASSES], dtype=np.float64)
+
+
+def encode_parts(parts: Sequence[str]) -> np.ndarray:
+    """파트 이름 → part_encoder 코드 (유효한 파트만 전달해야 함)"""
+    return np.searchsorted(PART_CLASSES, np.asarray(parts, dtype=str)).astype(np.intp)
+
+
+def arrangement_feature_matrix(
+    part_codes: np.ndarray,
+    heights: np.ndarray,
+    experiences: np.ndarray,
+    context: np.ndarray,
+) -> np.ndarray:
+    """
+    배치 내 피처 행렬 (n, 12) — SeatRecommender.arrangement_features의 벡터화 버전
+
+    Args:
+        part_codes: 파트 코드
+        heights, experiences: 원본 값 (NaN/0이면 기본값 170/0)
+        context: (5,) 또는 (n, 5) 컨텍스트 피처
+    """
+    n = len(part_codes)
+    heights = np.asarray(heights, dtype=np.float64)
+    experiences = np.asarray(experiences, dtype=np.float64)
+    return np.column_stack([
+        part_codes.astype(np.float64),
+        np.where(np.isnan(heights) | (heights == 0), 170, heights),  # 기본 피처 (없으면 기본값)
+        np.where(np.isnan(experiences), 0, experiences),
+        np.broadcast_to(np.asarray(context, dtype=np.float64), (n, 5)),
+        _RULE_TABLE[part_codes],
+    ]).reshape(n, len(ARRANGEMENT_FEATURE_COLUMNS))
+
+
+def stats_feature_rows(
+    member_ids: np.ndarray,
+    part_codes: np.ndarray,
+    member_stats: Dict[str, Dict[str, Any]],
+    default_stats: Optional[Dict[str, Any]] = DEFAULT_MEMBER_STATS,
+    cache: Optional[Dict[Tuple[str, int], List[float]]] = None,
+) -> np.ndarray:
+    """
+    행별 통계 피처 (n, 6) — (대원, 파트) 조합별로 한 번만 계산
+
+    Args:
+        cache: 청크 간 공유하는 (대원, 파트 코드) → 통계 피처 캐시
+    """
+    cache = {} if cache is None else cache
+    member_ids, member_idx = np.unique(member_ids, return_inverse=True)
+    n_parts = len(PART_CLASSES)
+    keys, key_idx = np.unique(member_idx.ravel() * n_parts + part_codes, return_inverse=True)
+
+    rows = []
+    for key in keys.tolist():
+        cache_key = (str(member_ids[key // n_parts]), key % n_parts)
+        if cache_key not in cache:
+            cache[cache_key] = stats_features(
+                PART_CLASSES[cache_key[1]],
+                member_stats.get(cache_key[0], default_stats),
+            )
+        rows.append(cache[cache_key])
+    table = np.array(rows, dtype=np.float64).reshape(len(keys), len(STATS_FEATURE_COLUMNS))
+    return table[key_idx.ravel()]
+
+
+def build_training_matrix(
+    chunks: Iterable[Dict[str, np.ndarray]],
+    n_rows: int,
+    member_stats: Dict[str, Dict[str, Any]],
+    default_stats: Optional[Dict[str, Any]] = DEFAULT_MEMBER_STATS,
+) -> Dict[str, Any]:
+    """
+    열 묶음 청크로 스케일링된 float32 학습 행렬 생성 (대용량 코퍼스용)
+
+    행 수를 먼저 센 뒤(n_rows) float32 행렬 하나만 할당하고 청크별로 채움
+    - float64 전체 행렬, 세그먼트 연결 사본, fit_transform 사본을 만들지 않음
+    - 스케일링 통계는 청크마다 StandardScaler.partial_fit으로 누적하고, 다 채운 뒤 제자리 스케일링
+
+    Args:
+        chunks: arrangement_id, member_id, part(코드), features(n, 12), seat_row, seat_col 열 묶음
+        n_rows: 전체 행 수 (청크 행 수의 합과 같아야 함)
+        member_stats: 대원별 통계 (통계 피처 계산용)
+        default_stats: 통계가 없는 대원의 통계 (None이면 파트별 기본값)
+
+    Returns:
+        X (float32, 스케일링됨), scaler, y_row, y_col, parts, groups (배치 번호),
+        member_stats (모델 번들의 통계 스냅샷용)
+    """
+    from sklearn.preprocessing import StandardScaler
+
+    X = np.empty((n_rows, N_FEATURES), dtype=np.float32)
+    y_row = np.empty(n_rows, dtype=np.int64)
+    y_col = np.empty(n_rows, dtype=np.int64)
+    part_codes = np.empty(n_rows, dtype=np.int8)
+    groups = np.empty(n_rows, dtype=np.int32)
+    group_codes: Dict[str, int] = {}
+    stats_cache: Dict[Tuple[str, int], List[float]] = {}
+    scaler = StandardScaler()
+
+    start = 0
+    for chunk in chunks:
+        n = len(chunk["part"])
+        if n == 0:
+            continue
+        if start + n > n_rows:
+            raise ValueError(f"청크 행 수가 예상 행 수({n_rows})를 초과합니다.")
+        end = start + n
+        codes = np.asarray(chunk["part"], dtype=np.intp)
+
+        block = X[start:end]
+        block[:, ARRANGEMENT_FEATURE_COLUMNS] = chunk["features"]
+        block[:, STATS_FEATURE_COLUMNS] = stats_feature_rows(
+            chunk["member_id"], codes, member_stats, default_stats, stats_cache
+        )
+        scaler.partial_fit(block)
+
+        y_row[start:end] = chunk["seat_row"]
+        y_col[start:end] = chunk["seat_col"]
+        part_codes[start:end] = codes
+        arrangement_ids, inverse = np.unique(chunk["arrangement_id"], return_inverse=True)
+        ids = np.array([group_codes.setdefault(str(a), len(group_codes)) for a in arrangement_ids.tolist()],
+                       dtype=np.int32)
+        groups[start:end] = ids[inverse.ravel()]
+        start = end
+
+    if start != n_rows:
+        raise ValueError(f"청크 행 수({start})가 예상 행 수({n_rows})와 다릅니다.")
+    if n_rows:
+        scale_in_place(X, scaler)
+
+    return {
+        "X": X,
+        "scaler": scaler if n_rows else None,
+        "y_row": y_row,
+        "y_col": y_col,
+        "parts": PART_CLASSES[part_codes],
+        "groups": groups,
+        "member_stats": member_stats,
+    }
+
+
+class FeatureStore:
+    """추가 전용 .npy 세그먼트 기반 피처 저장소"""
+
+    def __init__(self, root: Optional[str] = None, max_segments: Optional[int] = None):
+        self.root = root or settings.FEATURE_STORE_DIR
+        self.max_segments = max_segments or settings.FEATURE_STORE_MAX_SEGMENTS
+        self._lock = threading.Lock()
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.root, MANIFEST_FILENAME)
+
+    @property
+    def lock_path(self) -> str:
+        """프로세스 간 잠금 파일 (저장소 디렉토리 밖: 스키마 변경 시 디렉토리를 지워도 유지)"""
+        return os.path.normpath(self.root) + ".lock"
+
+    def _read_manifest(self, writable: bool = False) -> Dict[str, Any]:
+        """매니페스트 읽기 (스키마가 바뀐 저장소는 빈 저장소로 보고, writable이면 디렉토리 삭제)"""
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                manifest = json.load(f)
+            if manifest.get("schema") == SCHEMA_VERSION:
+                return manifest
+            if writable:
+                logger.info(f"[FeatureStore] Schema changed, rebuilding {self.root}")
+                self._clear()
+        return {"schema": SCHEMA_VERSION, "next_segment": 1, "segments": [], "live": {}}
+
+    def _write_manifest(self, manifest: Dict[str, Any]):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(manifest, f, ensure_ascii=False)
+        os.replace(tmp_path, self.manifest_path)
+
+    def _clear(self):
+        if os.path.isdir(self.root):
+            shutil.rmtree(self.root)
+
+    def _encode_arrangement(self, arrangement_id: str, records: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """
+        배치 하나의 좌석을 열 배열로 변환 (유효한 파트만)
+
+        배치 내 피처는 SeatRecommender.arrangement_features와 같은 값을 배치 단위로 벡터화해 계산
+        """
+        pieces = []
+        for record in records or [{"seats": []}]:
+            seats = record["seats"]
+            valid = [seat for seat in seats if seat.get("part") in VALID_PARTS]
+            heights = np.array([seat.get("height") for seat in valid], dtype=np.float64)
+            experiences = np.array([seat.get("experience_years", 0) for seat in valid], dtype=np.float64)
+            part_codes = encode_parts([seat["part"] for seat in valid])
+            context = context_features(calculate_arrangement_context(seats))
+
+            pieces.append({
+                "member_id": np.array([seat.get("member_id") or "" for seat in valid], dtype=str),
+                "part": part_codes.astype(np.int8),
+                "height": heights,
+                "experience": experiences,
+                "seat_row": np.array([seat.get("row") for seat in valid], dtype=np.int64),
+                "seat_col": np.array([seat.get("col") for seat in valid], dtype=np.int64),
+                "features": arrangement_feature_matrix(part_codes, heights, experiences, context),
+            })
+
+        columns = {
+            column: np.concatenate([p[column] for p in pieces])
+            for column in COLUMNS if column != "arrangement_id"
+        }
+        columns["arrangement_id"] = np.array([arrangement_id] * len(columns["part"]), dtype=str)
+        return columns
+
+    def _write_segment(self, name: str, columns: Dict[str, np.ndarray]):
+        seg_dir = os.path.join(self.root, name)
+        os.makedirs(seg_dir, exist_ok=True)
+        for column in COLUMNS:
+            np.save(os.path.join(seg_dir, f"{column}.npy"), columns[column])
+
+    def _open_segment(self, name: str) -> Dict[str, np.ndarray]:
+        seg_dir = os.path.join(self.root, name)
+        return {
+            column: np.load(os.path.join(seg_dir, f"{column}.npy"), mmap_mode="r")
+            for column in COLUMNS
+        }
+
+    def sync(self, arrangements: List[Dict[str, Any]]) -> Dict[str, int]:
+        """
+        코퍼스 배치 레코드와 저장소 동기화
+
+        새로 추가/변경된 배치만 새 세그먼트로 추가하고,
+        변경·삭제된 배치의 이전 행은 매니페스트에서 제외 (읽을 때 건너뜀)
+        죽은 행 비율이 높거나 세그먼트가 많아지면 한 세그먼트로 압축
+        """
+        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        for record in arrangements:
+            grouped.setdefault(str(record["arrangement_id"]), []).append(record)
+        wanted = {
+            arrangement_id: "|".join(r.get("source_key", "") for r in records)
+            for arrangement_id, records in grouped.items()
+        }
+
+        with self._lock, file_lock(self.lock_path):
+            manifest = self._read_manifest(writable=True)
+            live = manifest["live"]  # 배치 ID -> [세그먼트, 버전]
+
+            added = [
+                arrangement_id for arrangement_id, key in wanted.items()
+                if arrangement_id not in live or live[arrangement_id][1] != key
+            ]
+            removed = [arrangement_id for arrangement_id in live if arrangement_id not in wanted]
+
+            if added:
+                name = f"seg-{manifest['next_segment']:06d}"
+                encoded = [self._encode_arrangement(a, grouped[a]) for a in added]
+                columns = {
+                    column: np.concatenate([e[column] for e in encoded])
+                    for column in COLUMNS
+                }
+                self._write_segment(name, columns)
+                manifest["next_segment"] += 1
+                manifest["segments"].append({"name": name, "rows": int(len(columns["part"]))})
+                for arrangement_id in added:
+                    live[arrangement_id] = [name, wanted[arrangement_id]]
+                logger.info(f"[FeatureStore] Appended {len(added)} arrangements ({len(columns['part'])} rows) as {name}")
+
+            for arrangement_id in removed:
+                del live[arrangement_id]
+
+            if added or removed:
+                self._write_manifest(manifest)
+
+            stats = self._stats(manifest)
+            if len(manifest["segments"]) > self.max_segments or stats["dead_rows"] > stats["live_rows"] * 0.25:
+                self._compact(manifest)
+                stats = self._stats(manifest)
+
+        stats.update({"added": len(added), "removed": len(removed)})
+        return stats
+
+    def _live_mask(self, name: str, arrangement_ids: np.ndarray, live: Dict[str, List[str]]) -> Optional[np.ndarray]:
+        """세그먼트의 살아있는 행 마스크 (모든 행이 살아있으면 None)"""
+        ids, inverse = np.unique(arrangement_ids, return_inverse=True)
+        alive = np.array([live.get(a, [None])[0] == name for a in ids], dtype=bool)
+        if alive.all():
+            return None
+        return alive[inverse]
+
+    def _stats(self, manifest: Dict[str, Any]) -> Dict[str, int]:
+        total = sum(seg["rows"] for seg in manifest["segments"])
+        live_rows = 0
+        for seg in manifest["segments"]:
+            arrangement_ids = self._open_segment(seg["name"])["arrangement_id"]
+            mask = self._live_mask(seg["name"], arrangement_ids, manifest["live"])
+            live_rows += seg["rows"] if mask is None else int(mask.sum())
+        return {
+            "segments": len(manifest["segments"]),
+            "arrangements": len(manifest["live"]),
+            "live_rows": live_rows,
+            "dead_rows": total - live_rows,
+        }
+
+    def _gather(self, manifest: Dict[str, Any]) -> Dict[str, np.ndarray]:
+        """살아있는 행의 열 (단일 세그먼트이고 죽은 행이 없으면 memmap 그대로)"""
+        pieces = []
+        for seg in manifest["segments"]:
+            columns = self._open_segment(seg["name"])
+            mask = self._live_mask(seg["name"], columns["arrangement_id"], manifest["live"])
+            if mask is not None:
+                columns = {column: values[mask] for column, values in columns.items()}
+            pieces.append(columns)
+
+        if len(pieces) == 1:
+            return pieces[0]
+        if not pieces:
+            return self._encode_arrangement("", [])
+        return {column: np.concatenate([p[column] for p in pieces]) for column in COLUMNS}
+
+    def _compact(self, manifest: Dict[str, Any]):
+        """살아있는 행만 새 세그먼트 하나로 다시 쓰고 기존 세그먼트 삭제"""
+        name = f"seg-{manifest['next_segment']:06d}"
+        columns = self._gather(manifest)
+        self._write_segment(name, columns)
+
+        old_segments = [seg["name"] for seg in manifest["segments"]]
+        manifest["next_segment"] += 1
+        manifest["segments"] = [{"name": name, "rows": int(len(columns["part"]))}]
+        for entry in manifest["live"].values():
+            entry[0] = name
+        self._write_manifest(manifest)
+
+        for old in old_segments:
+            shutil.rmtree(os.path.join(self.root, old), ignore_errors=True)
+        logger.info(f"[FeatureStore] Compacted {len(old_segments)} segments into {name}")
+
+    def _iter_chunks(self, manifest: Dict[str, Any], chunk_rows: int) -> Iterator[Dict[str, np.ndarray]]:
+        """살아있는 행을 세그먼트 memmap에서 chunk_rows행씩 읽음 (세그먼트를 연결하지 않음)"""
+        for seg in manifest["segments"]:
+            columns = self._open_segment(seg["name"])
+            mask = self._live_mask(seg["name"], columns["arrangement_id"], manifest["live"])
+            for start in range(0, seg["rows"], chunk_rows):
+                end = start + chunk_rows
+                if mask is None:
+                    yield {column: values[start:end] for column, values in columns.items()}
+                else:
+                    keep = mask[start:end]
+                    yield {column: values[start:end][keep] for column, values in columns.items()}
+
+    def read(self, member_stats: Dict[str, Dict[str, Any]], chunk_rows: Optional[int] = None) -> Dict[str, Any]:
+        """
+        학습용 배열 묶음 (float32 행렬을 세그먼트 청크 단위로 채움)
+
+        Args:
+            member_stats: 대원별 통계 (통계 피처 계산용, 없으면 기본 통계)
+            chunk_rows: 청크 크기 (기본: TRAINING_CHUNK_ROWS)
+
+        Returns:
+            X (float32, 스케일링됨), scaler, y_row, y_col, parts, groups (배치 번호)
+        """
+        with self._lock, file_lock(self.lock_path, shared=True):
+            manifest = self._read_manifest()
+            n_rows = self._stats(manifest)["live_rows"]  # 첫 번째 패스: 살아있는 행 수
+            return build_training_matrix(
+                self._iter_chunks(manifest, chunk_rows or settings.TRAINING_CHUNK_ROWS),
+                n_rows,
+                member_stats,
+            )
+
+    def status(self) -> Dict[str, int]:
+        """저장소 현황 (세그먼트/배치/행 수)"""
+        with self._lock, file_lock(self.lock_path, shared=True):
+            return self._stats(self._read_manifest())
+
+
+# 싱글톤 인스턴스
+feature_store = FeatureStore()
@@ -0,0 +1,55 @@
+"""
+프로세스 간 파일 잠금 (fcntl.flock)
+
+여러 uvicorn 워커가 같은 디렉토리(피처 저장소, 모델 레지스트리)를 함께 쓸 때 사용
+- file_lock: 읽기는 공유 잠금, 쓰기(매니페스트 교체 / 세그먼트 삭제 / 인덱스 갱신)는 배타 잠금
+- try_hold: 비차단 배타 잠금을 프로세스가 끝날 때까지 유지 (단일 작성자 선출)
+- 잠금 파일은 보호 대상 디렉토리 밖에 둠 (디렉토리를 통째로 지워도 잠금이 유지되도록)
+- fcntl이 없는 플랫폼(Windows)에서는 잠그지 않음 (단일 프로세스 개발 환경)
+"""
+import os
+from contextlib import contextmanager
+from typing import IO, Iterator, Optional
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+def _open_lock_file(path: str) -> IO:
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    return open(path, "a+")
+
+
+@contextmanager
+def file_lock(path: str, shared: bool = False) -> Iterator[None]:
+    """path 잠금 파일로 프로세스 간 잠금 (shared=True면 공유 잠금, 블로킹)"""
+    with _open_lock_file(path) as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+
+
+def try_hold(path: str) -> Optional[IO]:
+    """
+    비차단 배타 잠금 시도
+
+    Returns:
+        잠금을 잡은 파일 객체 (닫을 때까지 유지), 다른 프로세스가 잡고 있으면 None
+    """
+    f = _open_lock_file(path)
+    if fcntl is None:
+        return f
+    try:
+        fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        f.close()
+        return None
+    return f
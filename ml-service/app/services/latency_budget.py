@@ -0,0 +1,174 @@
+"""
+추천 요청 지연 예산 (deadline)
+
+- 요청 본문 latencyBudgetMs 또는 헤더(LATENCY_BUDGET_HEADER)로 예산 지정
+  (둘 다 없으면 RECOMMEND_LATENCY_BUDGET_MS, 그것도 없으면 예산 없음)
+- 단계마다 남은 시간 확인
+  stats: 남은 예산 안에서만 DB 통계를 기다림 (초과 시 스냅샷 / 통계 없이 진행, 조회는 계속되어 캐시를 채움)
+  recommend: 최근 ML 추천 지연(대원당 EWMA)으로 예산 안에 끝나지 않을 것 같으면 실행하지 않고,
+             실행 중 예산을 넘기면 기다리지 않음 → 규칙 기반 배치로 응답 (metadata.degraded)
+             추정치로 건너뛸 때마다 추정치를 워밍업 기준값 쪽으로 감쇠
+             (한 번의 느린 호출(GC, 콜드 캐시)로 추정치가 예산을 넘어도 ML 실행이 다시 시도됨)
+- 규칙 기반 배치 + 응답 구성 시간은 RECOMMEND_FALLBACK_RESERVE_MS로 남겨 둠
+- 결과별 카운터와 예산 대비 응답 시간 (/model/status latency_budget)
+"""
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from app.config import settings
+from app.schemas.request_response import MAX_LATENCY_BUDGET_MS
+
+
+EWMA_ALPHA = 0.2  # 대원당 추천 지연 이동 평균 가중치
+ELAPSED_WINDOW = 1000  # 응답 시간 분위수 계산용 최근 샘플 수
+
+# 규칙 기반 배치로 대체한 이유
+DEGRADED_ESTIMATE = "estimate"  # 예상 ML 지연이 남은 예산보다 큼 (실행하지 않음)
+DEGRADED_TIMEOUT = "timeout"  # ML 추천이 남은 예산 안에 끝나지 않음
+DEGRADED_MODEL_LOAD = "model_load"  # 테넌트 모델 로드가 남은 예산 안에 끝나지 않음
+
+
+class Deadline:
+    """요청 하나의 지연 예산"""
+
+    def __init__(self, budget_ms: float):
+        self.budget_ms = budget_ms
+        self.start = time.perf_counter()
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.start) * 1000
+
+    def remaining_ms(self, reserve_ms: float = 0.0) -> float:
+        """남은 예산 (reserve_ms를 뺀 값, 음수면 0)"""
+        return max(0.0, self.budget_ms - self.elapsed_ms - reserve_ms)
+
+    def remaining_seconds(self, reserve_ms: float = 0.0) -> float:
+        return self.remaining_ms(reserve_ms) / 1000
+
+
+def resolve_budget_ms(body_value: Optional[float], header_value: Optional[str]) -> Optional[float]:
+    """
+    요청 예산 결정 (본문 > 헤더 > 설정 기본값)
+
+    Raises:
+        ValueError: 헤더 값이 숫자가 아니거나 범위를 벗어남
+    """
+    if body_value is not None:
+        return body_value
+    if header_value:
+        try:
+            budget_ms = float(header_value)
+        except ValueError:
+            raise ValueError(f"{settings.LATENCY_BUDGET_HEADER} 값이 숫자가 아닙니다: {header_value!r}")
+        if not 0 < budget_ms <= MAX_LATENCY_BUDGET_MS:
+            raise ValueError(f"{settings.LATENCY_BUDGET_HEADER}는 0 초과 {MAX_LATENCY_BUDGET_MS} 이하여야 합니다")
+        return budget_ms
+    return settings.RECOMMEND_LATENCY_BUDGET_MS
+
+
+class LatencyBudgetStats:
+    """ML 추천 지연 추정 + 예산 결과 누적 통계"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.ms_per_member: Optional[float] = None  # ML 추천 지연 EWMA (대원당 ms)
+        self.baseline_ms_per_member: Optional[float] = None  # 워밍업에서 측정한 대원당 ms (감쇠 목표)
+        self.skipped = 0  # 추정치로 ML을 건너뛴 횟수 (추정치 감쇠 횟수)
+        self.requests = 0
+        self.met = 0  # ML 결과로 예산 안에 응답
+        self.degraded: Dict[str, int] = {}  # 대체 이유별 규칙 기반 응답 수
+        self.stats_timeouts = 0  # DB 통계를 기다리지 않고 진행
+        self.exceeded = 0  # 예산을 넘긴 응답 (규칙 기반 대체 포함)
+        self.budget_ratios: deque = deque(maxlen=ELAPSED_WINDOW)  # 응답 시간 / 예산
+
+    def observe_recommend(self, n_members: int, elapsed_ms: float, baseline: bool = False):
+        """
+        ML 추천 1회 지연 반영 (예산 없는 요청 포함)
+
+        Args:
+            baseline: 워밍업 측정값 (추정치 감쇠 목표로도 기록)
+        """
+        if n_members <= 0:
+            return
+        per_member = elapsed_ms / n_members
+        with self._lock:
+            if baseline:
+                self.baseline_ms_per_member = per_member
+            if self.ms_per_member is None:
+                self.ms_per_member = per_member
+            else:
+                self.ms_per_member += EWMA_ALPHA * (per_member - self.ms_per_member)
+
+    def estimate_recommend_ms(self, n_members: int) -> float:
+        """로스터 크기의 예상 ML 추천 지연 (관측 전이면 0 → 실행하되 예산에서 끊음)"""
+        return (self.ms_per_member or 0.0) * n_members
+
+    def skip_recommend(self):
+        """
+        추정치로 ML을 건너뜀 → 추정치를 워밍업 기준값(없으면 0) 쪽으로 한 단계 감쇠
+
+        건너뛴 요청은 새 관측을 만들지 않으므로 감쇠하지 않으면 추정치가 재시작 전까지 고정됨
+        """
+        with self._lock:
+            self.skipped += 1
+            if self.ms_per_member is not None:
+                target = self.baseline_ms_per_member or 0.0
+                if self.ms_per_member > target:
+                    self.ms_per_member += EWMA_ALPHA * (target - self.ms_per_member)
+
+    def record_stats_timeout(self):
+        with self._lock:
+            self.stats_timeouts += 1
+
+    def record(self, deadline: Deadline, degraded_reason: Optional[str]):
+        """예산이 있는 요청 1건의 결과"""
+        elapsed_ms = deadline.elapsed_ms
+        with self._lock:
+            self.requests += 1
+            if degraded_reason is not None:
+                self.degraded[degraded_reason] = self.degraded.get(degraded_reason, 0) + 1
+            if elapsed_ms > deadline.budget_ms:
+                self.exceeded += 1
+            elif degraded_reason is None:
+                self.met += 1
+            self.budget_ratios.append(elapsed_ms / deadline.budget_ms)
+
+    def status(self) -> Dict[str, Any]:
+        with self._lock:
+            ratios = np.array(self.budget_ratios) if self.budget_ratios else None
+            degraded_total = sum(self.degraded.values())
+            return {
+                "default_budget_ms": settings.RECOMMEND_LATENCY_BUDGET_MS,
+                "fallback_reserve_ms": settings.RECOMMEND_FALLBACK_RESERVE_MS,
+                "recommend_ms_per_member": (
+                    round(self.ms_per_member, 4) if self.ms_per_member is not None else None
+                ),
+                "baseline_ms_per_member": (
+                    round(self.baseline_ms_per_member, 4) if self.baseline_ms_per_member is not None else None
+                ),
+                "estimate_skips": self.skipped,
+                "requests": self.requests,
+                "met": self.met,
+                "degraded": degraded_total,
+                "degraded_by_reason": dict(self.degraded),
+                "degraded_rate": round(degraded_total / self.requests, 4) if self.requests else None,
+                "stats_timeouts": self.stats_timeouts,
+                "exceeded": self.exceeded,
+                "budget_used": {
+                    "p50": round(float(np.percentile(ratios, 50)), 3),
+                    "p99": round(float(np.percentile(ratios, 99)), 3),
+                    "max": round(float(ratios.max()), 3),
+                } if ratios is not None else None,
+            }
+
+
+# 싱글톤 인스턴스
+latency_budget = LatencyBudgetStats()
@@ -0,0 +1,398 @@
+"""
+시간 감쇠 대원 통계 엔진 (증분)
+
+대원별로 지수 감쇠된 행 히스토그램 / 열 히스토그램 / 열 모멘트를 유지
+- 새 배치 반영은 좌석(=대원 출석)당 O(1): 마지막 반영 시각 기준으로 한 번 감쇠 후 누적
+- 반감기(MEMBER_STATS_HALF_LIFE_DAYS)가 지난 출석은 가중치 1/2 → 최근 자리 이동이 빠르게 반영
+- 반감기 0(기본)이면 감쇠 없음 (DB 트리거 / 이전 루프 구현과 같은 통계)
+- 전체 재계산은 대원 샤드별로 병렬 수행 (벡터화)
+- 변경된 대원만 모아 member_seat_statistics의 decayed_* 열 업서트 행으로 변환
+  (트리거가 관리하는 통계 / 원시 집계 열은 건드리지 않음)
+
+통계 딕셔너리 형식은 member_seat_statistics 행과 동일 (피처/추천 코드 변경 없음)
+"""
+import math
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.services.corpus_loader import seat_columns
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# 고정석 판정 임계값
+FIXED_SEAT_CONFIG = {
+    "MIN_APPEARANCES": 3,      # 최소 3회 이상 출석
+    "HIGH_CONSISTENCY": 0.8,   # 80% 이상이면 고정석
+    "COL_TOLERANCE": 2,        # 열 일관성 계산 시 ±2열 허용
+}
+
+WEEK_DAYS = 7.0  # 날짜가 없는 배치는 직전 배치 + 1주로 간주
+DECAYED_PREFIX = "decayed_"  # supabase/migrations/20261019000001_add_decayed_member_statistics.sql
+
+
+def arrangement_day(arrangement: Dict[str, Any]) -> Optional[float]:
+    """배치 날짜 → 일 단위 시각 (date.toordinal), 해석할 수 없으면 None"""
+    value = arrangement.get("date")
+    if not value:
+        return None
+    try:
+        return float(datetime.fromisoformat(str(value)).toordinal())
+    except ValueError:
+        try:
+            return float(date.fromisoformat(str(value)[:10]).toordinal())
+        except ValueError:
+            return None
+
+
+def arrangement_days(arrangements: List[Dict[str, Any]], start: float = 0.0) -> np.ndarray:
+    """배치별 시각 (날짜가 없으면 직전 배치 + 1주, 첫 배치의 직전 시각은 start)"""
+    days = np.empty(len(arrangements))
+    previous = start
+    for i, arrangement in enumerate(arrangements):
+        day = arrangement_day(arrangement)
+        previous = day if day is not None else previous + WEEK_DAYS
+        days[i] = previous
+    return days
+
+
+class MemberState:
+    """
+    대원 1명의 누적 상태
+
+    감쇠 누적값은 last_day 시점 기준 (다음 반영 시 경과 일수만큼 한 번에 감쇠)
+    """
+
+    __slots__ = (
+        "weight", "row_weights", "col_weights", "col_moment",
+        "count", "last_day", "part",
+    )
+
+    def __init__(self):
+        self.weight = 0.0
+        self.row_weights: Dict[int, float] = {}
+        self.col_weights: Dict[int, float] = {}
+        self.col_moment = 0.0  # 감쇠 가중 열 합 (평균 = col_moment / weight)
+        self.count = 0
+        self.last_day = -math.inf
+        self.part: Optional[str] = None
+
+    def add(self, row: int, col: int, day: float, half_life: float, part: str):
+        """출석 1회 반영 (O(1))"""
+        if half_life > 0 and day != self.last_day and self.count:
+            if day > self.last_day:
+                # 누적값을 새 시각으로 감쇠
+                factor = 0.5 ** ((day - self.last_day) / half_life)
+                self.weight *= factor
+                self.col_moment *= factor
+                for key in self.row_weights:
+                    self.row_weights[key] *= factor
+                for key in self.col_weights:
+                    self.col_weights[key] *= factor
+                w = 1.0
+            else:
+                # 과거 배치가 늦게 들어온 경우: 새 관측만 감쇠해서 더함
+                w = 0.5 ** ((self.last_day - day) / half_life)
+        else:
+            w = 1.0
+
+        self.weight += w
+        self.row_weights[row] = self.row_weights.get(row, 0.0) + w
+        self.col_weights[col] = self.col_weights.get(col, 0.0) + w
+        self.col_moment += w * col
+
+        self.count += 1
+
+        if day >= self.last_day:
+            self.last_day = day
+            self.part = part
+
+    def stats(self) -> Dict[str, Any]:
+        """대원 통계 (동률 행은 먼저 앉은 행 — Counter.most_common과 동일)"""
+        preferred_row = max(self.row_weights, key=self.row_weights.__getitem__)
+        row_consistency = self.row_weights[preferred_row] / self.weight
+
+        avg_col = self.col_moment / self.weight
+        in_range = sum(
+            w for c, w in self.col_weights.items()
+            if abs(c - avg_col) <= FIXED_SEAT_CONFIG["COL_TOLERANCE"]
+        )
+        col_consistency = in_range / self.weight
+
+        return {
+            "preferred_row": preferred_row,
+            "preferred_col": round(avg_col),
+            "row_consistency": round(row_consistency * 100, 1),
+            "col_consistency": round(col_consistency * 100, 1),
+            "is_fixed_seat": (
+                self.count >= FIXED_SEAT_CONFIG["MIN_APPEARANCES"] and
+                row_consistency >= FIXED_SEAT_CONFIG["HIGH_CONSISTENCY"] and
+                col_consistency >= FIXED_SEAT_CONFIG["HIGH_CONSISTENCY"]
+            ),
+            "total_appearances": self.count,
+        }
+
+
+def _build_states(frame: "pd.DataFrame", half_life: float) -> Dict[str, MemberState]:
+    """
+    좌석 프레임(시간순)에서 대원 상태를 벡터화로 일괄 계산
+
+    가중치 = 0.5 ** ((대원의 마지막 시각 - 좌석 시각) / 반감기) → MemberState.add를 반복한 결과와 같음
+    """
+    import pandas as pd
+
+    states: Dict[str, MemberState] = {}
+    if frame.empty:
+        return states
+
+    member_codes, member_ids = pd.factorize(frame["member_id"])
+    n_members = len(member_ids)
+    rows = frame["row"].to_numpy(dtype=np.int64)
+    cols = frame["col"].to_numpy(dtype=np.int64)
+    days = frame["day"].to_numpy(dtype=np.float64)
+
+    last_seat = np.zeros(n_members, dtype=np.intp)
+    np.maximum.at(last_seat, member_codes, np.arange(len(frame)))
+    last_day = days[last_seat]
+    if half_life > 0:
+        weights = np.exp2(-(last_day[member_codes] - days) / half_life)
+    else:
+        weights = np.ones(len(frame))
+
+    weight = np.bincount(member_codes, weights=weights, minlength=n_members)
+    col_moment = np.bincount(member_codes, weights=weights * cols, minlength=n_members)
+    count = np.bincount(member_codes, minlength=n_members)
+    last_parts = frame["part"].to_numpy()[last_seat]
+
+    for i, member_id in enumerate(member_ids.tolist()):
+        state = MemberState()
+        state.weight = float(weight[i])
+        state.col_moment = float(col_moment[i])
+        state.count = int(count[i])
+        state.last_day = float(last_day[i])
+        state.part = last_parts[i]
+        states[member_id] = state
+    ordered = list(states.values())
+
+    # (대원, 값) 쌍별 감쇠 가중치 (factorize 순서 = 먼저 앉은 순서)
+    for values, weight_attr in ((rows, "row_weights"), (cols, "col_weights")):
+        span = int(values.max()) + 1
+        pair_codes, pair_keys = pd.factorize(member_codes * span + values)
+        pair_weights = np.bincount(pair_codes, weights=weights)
+        for key, w in zip(pair_keys.tolist(), pair_weights.tolist()):
+            getattr(ordered[key // span], weight_attr)[key % span] = w
+
+    return states
+
+
+class MemberStatsEngine:
+    """대원별 감쇠 통계 저장소 (배치 단위 증분 반영 + 병렬 전체 재계산)"""
+
+    def __init__(self, half_life_days: Optional[float] = None, workers: Optional[int] = None):
+        self.half_life = settings.MEMBER_STATS_HALF_LIFE_DAYS if half_life_days is None else half_life_days
+        self.workers = workers or settings.MEMBER_STATS_WORKERS
+        self.updates = 0  # 증분 반영한 배치 수
+        self.rebuilds = 0
+        self.last_rebuild_seconds = 0.0
+        self._lock = threading.RLock()  # 감시자 스레드와 API 요청이 함께 사용
+        self._reset()
+
+    def _reset(self):
+        self._members: Dict[str, MemberState] = {}
+        self.source_keys: Set[str] = set()  # 반영된 배치 버전 (코퍼스 로더 source_key)
+        self.dirty: Set[str] = set()  # DB 업서트 대기 대원
+        self._last_day = 0.0
+
+    def __len__(self) -> int:
+        return len(self._members)
+
+    def update(self, arrangement: Dict[str, Any], day: Optional[float] = None) -> int:
+        """
+        배치 1개 증분 반영 (출석 좌석당 O(1))
+
+        Returns:
+            반영한 좌석 수
+        """
+        if day is None:
+            day = arrangement_day(arrangement)
+        columns = arrangement.get("seat_columns") or seat_columns(arrangement["seats"])
+
+        with self._lock:
+            if day is None:
+                day = self._last_day + WEEK_DAYS
+            self._last_day = max(self._last_day, day)
+
+            for member_id, part, row, col in zip(
+                columns["member_id"].tolist(),
+                columns["part"].tolist(),
+                columns["row"].tolist(),
+                columns["col"].tolist(),
+            ):
+                state = self._members.get(member_id)
+                if state is None:
+                    state = self._members[member_id] = MemberState()
+                state.add(row, col, day, self.half_life, part)
+                self.dirty.add(member_id)
+
+            if arrangement.get("source_key"):
+                self.source_keys.add(arrangement["source_key"])
+            self.updates += 1
+        return len(columns["member_id"])
+
+    def rebuild(self, arrangements: List[Dict[str, Any]]):
+        """
+        전체 이력으로 재계산 (대원 샤드별 병렬)
+
+        배치는 날짜순으로 정렬해 반영 (같은 날짜는 입력 순서)
+        """
+        import pandas as pd
+
+        start = time.perf_counter()
+        days = arrangement_days(arrangements)
+        order = np.argsort(days, kind="stable")
+        arrangements = [arrangements[i] for i in order]
+        days = days[order]
+
+        columns = [a.get("seat_columns") or seat_columns(a["seats"]) for a in arrangements]
+        lengths = [len(c["member_id"]) for c in columns]
+        frame = pd.DataFrame({
+            "member_id": np.concatenate([c["member_id"] for c in columns]) if columns else np.empty(0, dtype=object),
+            "part": np.concatenate([c["part"] for c in columns]) if columns else np.empty(0, dtype=object),
+            "row": np.concatenate([c["row"] for c in columns]) if columns else np.empty(0, dtype=np.int64),
+            "col": np.concatenate([c["col"] for c in columns]) if columns else np.empty(0, dtype=np.int64),
+            "day": np.repeat(days, lengths),
+        })
+
+        # 대원 단위로 샤드 분할 (같은 대원의 좌석은 한 샤드에, 시간순 유지)
+        codes, _ = pd.factorize(frame["member_id"])
+        n_shards = max(1, min(self.workers, len(frame) // 50_000 + 1))
+        shards = [frame[codes % n_shards == s] for s in range(n_shards)]
+        with ThreadPoolExecutor(max_workers=n_shards) as pool:
+            results = list(pool.map(lambda shard: _build_states(shard, self.half_life), shards))
+
+        # 대원 순서는 처음 등장한 순서
+        merged: Dict[str, MemberState] = {}
+        for states in results:
+            merged.update(states)
+
+        with self._lock:
+            self._members = {member_id: merged[member_id] for member_id in pd.unique(frame["member_id"])}
+            self.source_keys = {a["source_key"] for a in arrangements if a.get("source_key")}
+            self.dirty = set(self._members)
+            self._last_day = float(days[-1]) if len(days) else 0.0
+            self.rebuilds += 1
+            self.last_rebuild_seconds = time.perf_counter() - start
+
+    def sync(self, arrangements: List[Dict[str, Any]]) -> str:
+        """
+        코퍼스 상태에 맞춰 갱신
+
+        새 배치만 추가되었으면 증분 반영, 삭제/수정된 배치가 있으면 전체 재계산
+
+        Returns:
+            "unchanged" | "incremental" | "rebuild"
+        """
+        with self._lock:
+            current = {a["source_key"] for a in arrangements if a.get("source_key")}
+            if len(current) != len(arrangements) or not self.source_keys <= current:
+                if arrangements:
+                    self.rebuild(arrangements)
+                else:
+                    self._reset()
+                return "rebuild"
+
+            new = [a for a in arrangements if a["source_key"] not in self.source_keys]
+            if not new:
+                return "unchanged"
+            days = arrangement_days(new, start=self._last_day)
+            for i in np.argsort(days, kind="stable"):
+                self.update(new[i], float(days[i]))
+            return "incremental"
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """대원별 통계 (처음 등장한 순서, member_seat_statistics 행과 같은 형식)"""
+        with self._lock:
+            return {member_id: state.stats() for member_id, state in self._members.items()}
+
+    def parts(self) -> Dict[str, str]:
+        """대원별 파트 (가장 최근 배치 기준)"""
+        with self._lock:
+            return {member_id: state.part for member_id, state in self._members.items()}
+
+    def upsert_rows(self, member_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """
+        member_seat_statistics 업서트 행 (decayed_* 열 + 반감기만)
+
+        트리거 통계(preferred_row 등) / 원시 집계(row_counts, col_sum 등)는 포함하지 않음
+        → 다음 좌석 변경 시 트리거가 감쇠값을 원시값처럼 누적하지 않음
+        """
+        with self._lock:
+            rows = []
+            for member_id in member_ids:
+                state = self._members.get(member_id)
+                if state is None:
+                    continue
+                rows.append({
+                    "member_id": member_id,
+                    **{f"{DECAYED_PREFIX}{key}": value for key, value in state.stats().items()},
+                    "decayed_half_life_days": self.half_life,
+                })
+            return rows
+
+    def dirty_rows(self) -> List[Dict[str, Any]]:
+        """
+        DB 업서트 대기 행 (변경된 대원만)
+
+        DB 대원 ID(UUID)가 아닌 대원(unknown_* 등)은 업서트 대상에서 제외
+        """
+        with self._lock:
+            for member_id in list(self.dirty):
+                try:
+                    uuid.UUID(member_id)
+                except ValueError:
+                    self.dirty.discard(member_id)
+            return self.upsert_rows(sorted(self.dirty))
+
+    def mark_clean(self, member_ids: Iterable[str]):
+        """업서트 완료된 대원을 대기 목록에서 제거"""
+        with self._lock:
+            self.dirty.difference_update(member_ids)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "half_life_days": self.half_life,
+            "members": len(self._members),
+            "arrangements": len(self.source_keys),
+            "dirty": len(self.dirty),
+            "updates": self.updates,
+            "rebuilds": self.rebuilds,
+            "last_rebuild_seconds": self.last_rebuild_seconds,
+        }
+
+
+def rebuild_member_statistics(
+    arrangements: List[Dict[str, Any]],
+    half_life_days: Optional[float] = None,
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+    """
+    배치 목록으로 대원별 통계 / 파트 일괄 계산 (새 엔진의 전체 재계산, 서비스 엔진 상태와 무관)
+
+    Returns:
+        member_stats: 대원별 통계 (처음 등장한 순서)
+        member_parts: 대원별 파트 (가장 최근 배치 기준)
+    """
+    engine = MemberStatsEngine(half_life_days=half_life_days)
+    engine.rebuild(arrangements)
+    return engine.stats(), engine.parts()
+
+
+# 싱글톤 인스턴스
+member_stats_engine = MemberStatsEngine()
@@ -0,0 +1,254 @@
+"""
+직접 Postgres 읽기 경로 (선택)
+
+DATABASE_URL이 설정되어 있으면 Supabase Postgres에 asyncpg 커넥션 풀로 직접 연결하여
+학습 샘플을 `COPY (...) TO STDOUT` CSV 스트림으로 받아 바로 NumPy 열 배열로 변환
+- PostgREST의 JSON 인코딩 / HTTP 왕복 / 페이지당 1000행 제한이 없음
+- 결과 열 구성과 값은 get_training_samples RPC 경로(training_sample_columns)와 동일
+- DATABASE_URL이 없거나 asyncpg가 설치되지 않았거나 실패하면 None → PostgREST 경로 사용
+"""
+import asyncio
+import io
+import logging
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.config import settings
+from app.services.supabase_client import (
+    CONTEXT_COLUMNS,
+    STATS_COLUMNS,
+    training_sample_columns,
+    uuid_key_ranges,
+)
+
+logger = logging.getLogger(__name__)
+
+COPY_BLOCK_BYTES = 4 * 1024 * 1024  # CSV를 이 크기 단위로 잘라 열 배열로 변환 (메모리 상한)
+
+# get_training_samples RPC와 같은 정의 (컨텍스트는 배치의 전체 좌석, seats.part 기준, 통계는 member_serving_statistics)
+# 시각은 to_json으로 PostgREST와 같은 ISO 형식 문자열로 내보냄 (코퍼스 지문 호환)
+TRAINING_SAMPLES_COPY_QUERY = """
+WITH range_seats AS (
+  SELECT s.id, s.arrangement_id, s.member_id, s.part, s.seat_row, s.seat_column
+  FROM seats s
+  WHERE ($1::uuid IS NULL OR s.id >= $1::uuid)
+    AND ($2::uuid IS NULL OR s.id < $2::uuid)
+),
+context AS (
+  SELECT
+    s.arrangement_id,
+    COUNT(*) AS total_members,
+    COUNT(*) FILTER (WHERE s.part = 'SOPRANO') AS soprano_count,
+    COUNT(*) FILTER (WHERE s.part = 'ALTO') AS alto_count,
+    COUNT(*) FILTER (WHERE s.part = 'TENOR') AS tenor_count,
+    COUNT(*) FILTER (WHERE s.part = 'BASS') AS bass_count
+  FROM seats s
+  WHERE s.arrangement_id IN (SELECT DISTINCT rs.arrangement_id FROM range_seats rs)
+  GROUP BY s.arrangement_id
+)
+SELECT
+  rs.id,
+  rs.arrangement_id,
+  rs.member_id,
+  rs.part,
+  m.height_cm,
+  rs.seat_row,
+  rs.seat_column,
+  to_json(a.updated_at) #>> '{}',
+  st.preferred_row,
+  st.preferred_col,
+  st.row_consistency::DOUBLE PRECISION,
+  st.col_consistency::DOUBLE PRECISION,
+  st.is_fixed_seat,
+  st.total_appearances,
+  to_json(st.updated_at) #>> '{}',
+  c.total_members,
+  c.soprano_count::DOUBLE PRECISION / c.total_members,
+  c.alto_count::DOUBLE PRECISION / c.total_members,
+  c.tenor_count::DOUBLE PRECISION / c.total_members,
+  c.bass_count::DOUBLE PRECISION / c.total_members
+FROM range_seats rs
+JOIN context c ON c.arrangement_id = rs.arrangement_id
+JOIN arrangements a ON a.id = rs.arrangement_id
+LEFT JOIN members m ON m.id = rs.member_id
+LEFT JOIN member_serving_statistics st ON st.member_id = rs.member_id
+WHERE rs.part IN ('SOPRANO', 'ALTO', 'TENOR', 'BASS')
+ORDER BY rs.id
+"""
+
+COPY_COLUMNS = [
+    "id", "arrangement_id", "member_id", "part", "height_cm", "seat_row", "seat_col",
+    "arrangement_updated_at", *STATS_COLUMNS, "stats_updated_at", *CONTEXT_COLUMNS,
+]
+COPY_DTYPES = {
+    "id": str,
+    "arrangement_id": str,
+    "member_id": str,
+    "part": str,
+    "height_cm": np.float64,
+    "seat_row": np.int64,
+    "seat_col": np.int64,
+    "arrangement_updated_at": str,
+    "preferred_row": "Int64",
+    "preferred_col": "Int64",
+    "row_consistency": np.float64,
+    "col_consistency": np.float64,
+    "is_fixed_seat": "boolean",
+    "total_appearances": "Int64",
+    "stats_updated_at": str,
+    **{name: np.float64 for name in CONTEXT_COLUMNS},
+}
+
+
+def copy_block_columns(block: bytes) -> Dict[str, np.ndarray]:
+    """
+    COPY CSV 블록(완전한 줄만)을 학습 샘플 열 배열로 변환
+
+    열 구성/타입은 training_sample_columns와 동일 (NULL 통계는 None, has_stats=False)
+    """
+    import pandas as pd
+
+    if not block:
+        return training_sample_columns([])
+
+    frame = pd.read_csv(
+        io.BytesIO(block),
+        header=None,
+        names=COPY_COLUMNS,
+        dtype=COPY_DTYPES,
+        keep_default_na=False,
+        na_values={name: [""] for name in COPY_COLUMNS},
+        true_values=["t"],
+        false_values=["f"],
+    )
+    has_stats = frame["total_appearances"].notna().to_numpy()
+    stats = frame[list(STATS_COLUMNS)].astype(object)
+    stats = stats.where(stats.notna(), None).to_numpy()
+
+    return {
+        "id": frame["id"].to_numpy(dtype=object),
+        "arrangement_id": frame["arrangement_id"].fillna("").to_numpy(dtype=str),
+        "member_id": frame["member_id"].fillna("").to_numpy(dtype=str),
+        "part": frame["part"].to_numpy(dtype=str),
+        "height": frame["height_cm"].to_numpy(dtype=np.float64),
+        "seat_row": frame["seat_row"].to_numpy(dtype=np.int64),
+        "seat_col": frame["seat_col"].to_numpy(dtype=np.int64),
+        "updated_at": frame["arrangement_updated_at"].fillna("").to_numpy(dtype=object),
+        "context": frame[list(CONTEXT_COLUMNS)].to_numpy(dtype=np.float64),
+        "has_stats": has_stats,
+        "stats": stats,
+        "stats_updated_at": frame["stats_updated_at"].fillna("").to_numpy(dtype=object),
+    }
+
+
+def concat_columns(blocks: List[Dict[str, np.ndarray]]) -> Dict[str, np.ndarray]:
+    """열 배열 블록을 이어 붙임 (빈 목록이면 빈 열 구성)"""
+    blocks = [b for b in blocks if len(b["id"])]
+    if not blocks:
+        return training_sample_columns([])
+    return {name: np.concatenate([b[name] for b in blocks]) for name in blocks[0]}
+
+
+class PostgresReader:
+    """asyncpg 커넥션 풀 기반 벌크 학습 데이터 읽기 (DATABASE_URL 설정 시에만 사용)"""
+
+    def __init__(self, dsn: Optional[str] = None):
+        self.dsn = dsn if dsn is not None else settings.DATABASE_URL
+        self._pool = None
+        self._pool_lock = asyncio.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.dsn)
+
+    async def _get_pool(self):
+        """첫 사용 시 풀 생성 (asyncpg는 선택 의존성이므로 여기서 import)"""
+        async with self._pool_lock:
+            if self._pool is None:
+                import asyncpg
+
+                self._pool = await asyncpg.create_pool(
+                    self.dsn,
+                    min_size=settings.DB_POOL_MIN_SIZE,
+                    max_size=settings.DB_POOL_MAX_SIZE,
+                    # Supabase 풀러(트랜잭션 모드)는 prepared statement 캐시를 지원하지 않음
+                    statement_cache_size=0,
+                )
+            return self._pool
+
+    async def _copy_range(
+        self,
+        pool,
+        low: Optional[str],
+        high: Optional[str],
+        block_bytes: int,
+    ) -> List[Dict[str, np.ndarray]]:
+        """키 구간 하나를 COPY로 스트리밍하며 block_bytes 단위로 열 배열 변환"""
+        blocks: List[Dict[str, np.ndarray]] = []
+        buffer = bytearray()
+
+        async def sink(chunk: bytes):
+            buffer.extend(chunk)
+            if len(buffer) >= block_bytes:
+                cut = buffer.rfind(b"\n") + 1
+                if cut:
+                    block = bytes(buffer[:cut])
+                    del buffer[:cut]
+                    blocks.append(await asyncio.to_thread(copy_block_columns, block))
+
+        async with pool.acquire() as conn:
+            await conn.copy_from_query(
+                TRAINING_SAMPLES_COPY_QUERY, low, high, output=sink, format="csv"
+            )
+        if buffer:
+            blocks.append(await asyncio.to_thread(copy_block_columns, bytes(buffer)))
+        return blocks
+
+    async def load_training_samples(
+        self,
+        n_ranges: Optional[int] = None,
+        block_bytes: int = COPY_BLOCK_BYTES,
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        학습 샘플 전체를 COPY 스트림으로 조회 (get_training_samples RPC와 같은 열 구성, id 순)
+
+        UUID 키 공간을 n_ranges개 구간으로 나눠 풀 커넥션에서 동시에 COPY
+
+        Returns:
+            열 배열 묶음, 직접 연결을 사용할 수 없으면 None (PostgREST 경로로 대체)
+        """
+        if not self.enabled:
+            return None
+
+        n_ranges = max(1, min(n_ranges or settings.SEAT_PAGE_PREFETCH, settings.DB_POOL_MAX_SIZE))
+        try:
+            pool = await self._get_pool()
+            results = await asyncio.gather(*[
+                self._copy_range(pool, low, high, block_bytes)
+                for low, high in uuid_key_ranges(n_ranges)
+            ])
+        except Exception as e:
+            logger.warning(f"[Postgres] COPY training samples failed: {type(e).__name__}")
+            return None
+
+        # 구간은 키 순서이고 구간 내부는 ORDER BY id → 이어 붙이면 id 순
+        return concat_columns([block for blocks in results for block in blocks])
+
+    async def close(self):
+        """풀 종료 (애플리케이션 종료 시)"""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+
+    def status(self) -> Dict[str, Any]:
+        """직접 연결 사용 여부 및 풀 상태"""
+        return {
+            "enabled": self.enabled,
+            "pool_open": self._pool is not None,
+            "pool_size": self._pool.get_size() if self._pool is not None else 0,
+        }
+
+
+# 싱글톤 인스턴스
+postgres_reader = PostgresReader()
@@ -0,0 +1,187 @@
+"""
+서비스 시작 준비 (백그라운드 모델 로드 → 워밍업 추론 → 준비 완료)
+
+lifespan은 작업만 시작하고 바로 요청을 받음 (헬스체크 start-period 안에 응답)
+- 모델 로드(joblib 파일 첫 접근 page fault 포함)와 추천용 대원 통계 조회를 동시에 수행
+- 합성 로스터(MODEL_WARMUP_ROSTER_SIZES)로 서빙 중인 모든 모델의 recommend를 미리 실행해
+  sklearn 입력 검증 / 평탄화 추론기 / 피처 생성 경로를 데움
+- 완료 전까지 /readyz는 503 → 배포 직후 첫 요청 지연이 정상 상태와 같아짐
+- 워밍업 지연으로 /recommend 지연 예산의 ML 추천 지연 추정치를 초기화
+- 준비 전에 primary 모델 운영 지표(/model/status profile)를 계산해 캐시
+- 단계별 소요 시간과 워밍업 회차별 지연(첫 회 / 마지막 회) 제공
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from app.config import settings
+from app.models.model_profile import model_profile
+from app.models.seat_recommender import SeatRecommender
+from app.models.serving import default_grid_layout, model_server
+from app.services.latency_budget import latency_budget
+from app.services.supabase_client import supabase_service
+
+logger = logging.getLogger(__name__)
+
+
+# 워밍업 로스터 파트 구성 (소프라노/알토가 많은 일반적인 비율)
+WARMUP_PART_PATTERN = ["SOPRANO", "SOPRANO", "ALTO", "ALTO", "TENOR", "BASS"]
+
+
+def synthetic_roster(size: int, member_ids: List[str]) -> List[Dict[str, Any]]:
+    """워밍업용 합성 로스터 (통계가 있는 대원 ID를 먼저 사용해 통계 피처 경로도 실행)"""
+    return [
+        {
+            "id": member_ids[i] if i < len(member_ids) else f"warmup-{i:03d}",
+            "name": f"warmup-{i:03d}",
+            "part": WARMUP_PART_PATTERN[i % len(WARMUP_PART_PATTERN)],
+            "height": None,
+            "experience": None,
+            "is_leader": False,
+        }
+        for i in range(size)
+    ]
+
+
+def _round(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds, 3) if seconds is not None else None
+
+
+class ServiceStartup:
+    """백그라운드 시작 작업과 준비 상태"""
+
+    def __init__(self):
+        self.state = "pending"  # pending → loading → warming → ready
+        self.model_loaded = False
+        self.started_at: Optional[float] = None
+        self.ready_at: Optional[float] = None
+        self.model_load_seconds: Optional[float] = None
+        self.stats_prefetch_seconds: Optional[float] = None
+        self.stats_prefetched = 0
+        self.warmup_seconds: Optional[float] = None
+        self.warmup_latency_ms: Dict[str, Dict[str, Dict[str, float]]] = {}  # 버전 -> 로스터 크기 -> 지연
+        self.error: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.state == "ready"
+
+    def _load_models(self):
+        """primary + 설정된 섀도우/A/B 버전 로드 (모델이 없어도 서비스는 준비 완료)"""
+        start = time.perf_counter()
+        try:
+            model = SeatRecommender()
+            model.load_model()
+            model_server.set_primary(model)
+            logger.info("[ML Service] Model loaded successfully")
+        except Exception as e:
+            logger.warning(f"[ML Service] No pre-trained model found: {e}")
+            logger.info("[ML Service] Call /api/v1/train to train a new model")
+
+        model_server.load_configured()
+        self.model_loaded = model_server.primary.is_trained
+        self.model_load_seconds = time.perf_counter() - start
+
+    async def _prefetch_stats(self) -> Dict[str, Dict[str, Any]]:
+        """추천용 대원 통계를 미리 조회해 캐시 (첫 요청이 DB 왕복을 기다리지 않도록)"""
+        start = time.perf_counter()
+        rows = await supabase_service.get_member_statistics()
+        self.stats_prefetch_seconds = time.perf_counter() - start
+        self.stats_prefetched = len(rows)
+        return {row["member_id"]: row for row in rows}
+
+    def _warm_up(self, member_stats: Dict[str, Dict[str, Any]]):
+        """서빙 중인 모델마다 합성 로스터로 recommend 반복 실행"""
+        start = time.perf_counter()
+        member_ids = list(member_stats)
+        for version, model in model_server.loaded_models():
+            # 추천 라우터와 같은 통계 (번들 스냅샷 + DB 통계)
+            model_stats = model.member_stats(member_stats)
+            roster_ids = member_ids or list(model_stats)
+            latencies: Dict[str, Dict[str, float]] = {}
+            for size in settings.MODEL_WARMUP_ROSTER_SIZES:
+                roster = synthetic_roster(size, roster_ids)
+                grid_layout = default_grid_layout(size)
+                samples = []
+                for _ in range(max(1, settings.MODEL_WARMUP_ROUNDS)):
+                    call_start = time.perf_counter()
+                    model.recommend(roster, model_stats, grid_layout)
+                    samples.append((time.perf_counter() - call_start) * 1000)
+                latencies[str(size)] = {"first": round(samples[0], 2), "last": round(samples[-1], 2)}
+                # 지연 예산 추정치 초기값 (첫 요청부터 예산 안에 끝날지 판단)
+                latency_budget.observe_recommend(size, samples[-1], baseline=True)
+            self.warmup_latency_ms[version] = latencies
+        self.warmup_seconds = time.perf_counter() - start
+
+    async def run(self):
+        """모델 로드 + 통계 조회 (동시) → 워밍업 → 준비 완료"""
+        self.started_at = time.time()
+        start = time.perf_counter()
+        try:
+            self.state = "loading"
+            _, member_stats = await asyncio.gather(
+                asyncio.to_thread(self._load_models),
+                self._prefetch_stats(),
+            )
+
+            if settings.MODEL_WARMUP_ENABLED and self.model_loaded:
+                self.state = "warming"
+                await asyncio.to_thread(self._warm_up, member_stats)
+
+            # /model/status 운영 지표 (워밍업 이후 측정한 추론 지연 포함) 미리 계산
+            if self.model_loaded:
+                await asyncio.to_thread(model_profile, model_server.primary)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # 부가 버전 로드 / 워밍업 실패는 준비를 막지 않음 (첫 요청이 느릴 뿐)
+            self.error = f"{type(e).__name__}: {e}"
+            logger.error(f"[Startup] Startup task failed: {self.error}")
+
+        self.state = "ready"
+        self.ready_at = time.time()
+        logger.info(f"[Startup] Ready in {time.perf_counter() - start:.2f}s "
+                    f"(model load {self.model_load_seconds or 0:.2f}s, "
+                    f"stats prefetch {self.stats_prefetch_seconds or 0:.2f}s [{self.stats_prefetched}], "
+                    f"warm-up {self.warmup_seconds or 0:.2f}s)")
+
+    def start(self):
+        """백그라운드 시작 작업 실행 (이벤트 루프 안에서 호출)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def wait(self):
+        """시작 작업 완료 대기 (모델을 교체하는 작업이 백그라운드 로드와 겹치지 않도록)"""
+        if self._task is not None:
+            await asyncio.shield(self._task)
+
+    async def stop(self):
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+
+    def status(self) -> Dict[str, Any]:
+        """준비 상태와 단계별 소요 시간"""
+        return {
+            "ready": self.ready,
+            "state": self.state,
+            "model_loaded": self.model_loaded,
+            "startup_seconds": (
+                round(self.ready_at - self.started_at, 3) if self.ready_at and self.started_at else None
+            ),
+            "model_load_seconds": _round(self.model_load_seconds),
+            "stats_prefetch_seconds": _round(self.stats_prefetch_seconds),
+            "stats_prefetched": self.stats_prefetched,
+            "warmup_seconds": _round(self.warmup_seconds),
+            "warmup_latency_ms": self.warmup_latency_ms,
+            "error": self.error,
+        }
+
+
+# 싱글톤 인스턴스
+service_startup = ServiceStartup()
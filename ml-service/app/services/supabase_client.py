@@ -5,69 +5,272 @@ Supabase 클라이언트 서비스
 보안 참고:
 - Supabase Python SDK는 parameterized queries를 사용하여 SQL Injection 방지
 - 입력값 검증을 추가하여 DoS 및 잘못된 요청 방지
+
+클라이언트는 import 시점이 아니라 lifespan(connect) 또는 첫 조회 때 생성
+(supabase SDK import 비용과 환경 변수 누락 시 시작 실패를 피함)
+
+요청 경로 조회(대원 통계 / 행 패턴 / 이력 / 헬스체크)는 조회별 회로 차단기를 거침
+- 짧은 타임아웃 + 지터 재시도, 연속 실패 시 차단 → DB 장애 중에도 요청이 클라이언트 타임아웃을 기다리지 않음
+- 실패 / 차단 중에는 마지막 정상 응답을 반환 (대원 통계는 경과 시간을 추천 metadata.statsAgeSeconds로)
+학습용 스트리밍 조회 / 업서트는 긴 작업이라 차단기를 거치지 않음
 """
-from supabase import create_client, Client
-from typing import List, Dict, Optional, Any
+from typing import TYPE_CHECKING, AsyncIterator, Callable, List, Dict, Optional, Any, Tuple
 from functools import lru_cache
+import asyncio
 import logging
+import time
+
+import numpy as np
 
 from app.config import settings
+from app.services.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.services.corpus_loader import VALID_PARTS
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 # 보안: 에러 로깅 설정 (프로덕션에서 상세 에러 숨김)
 logger = logging.getLogger(__name__)
 
 # 입력값 검증 상수
-MAX_LIMIT = 1000  # 최대 조회 제한
+MAX_LIMIT = 1000  # 최대 조회 제한 (PostgREST max-rows와 동일)
 DEFAULT_LIMIT = 100
 
+# 학습용 좌석 조회 컬럼 (필요한 열만)
+SEAT_TRAINING_COLUMNS = (
+    "id, arrangement_id, member_id, seat_row, seat_column, "
+    "members(part, height_cm), arrangements(updated_at)"
+)
+TRAINING_SAMPLES_RPC = "get_training_samples"  # supabase/migrations/20261019000000_add_training_samples_rpc.sql
+STATS_COLUMNS = (
+    "preferred_row", "preferred_col", "row_consistency", "col_consistency",
+    "is_fixed_seat", "total_appearances",
+)
+CONTEXT_COLUMNS = ("total_members", "soprano_ratio", "alto_ratio", "tenor_ratio", "bass_ratio")
+MEMBER_STATISTICS_COLUMNS = (
+    "id, member_id, preferred_row, preferred_col, row_consistency, col_consistency, "
+    "is_fixed_seat, total_appearances, stats_half_life_days, updated_at"
+)
+# 학습/추천 공통 대원 통계 (감쇠 통계가 있으면 decayed_*, 없으면 트리거 통계)
+# supabase/migrations/20261019000001_add_decayed_member_statistics.sql
+SERVING_STATISTICS_VIEW = "member_serving_statistics"
+
+
+# 회로 차단기를 거치는 조회
+BREAKER_CALLS = ("member_statistics", "row_patterns", "ml_history", "health")
+
+
+# (low, high, after, page_size) -> 행 목록
+PageFetcher = Callable[[Optional[str], Optional[str], Optional[str], int], List[Dict[str, Any]]]
+
+
+def uuid_key_ranges(n_ranges: int) -> List[tuple]:
+    """UUID 키 공간을 n개의 [하한, 상한) 구간으로 균등 분할 (None = 열린 끝)"""
+    bounds = [
+        f"{i * 16 ** 8 // n_ranges:08x}-0000-0000-0000-000000000000"
+        for i in range(1, n_ranges)
+    ]
+    lows = [None] + bounds
+    highs = bounds + [None]
+    return list(zip(lows, highs))
+
+
+def seat_page_columns(rows: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    좌석 페이지를 학습용 열 배열로 변환
+
+    대원 정보가 없거나 유효하지 않은 파트의 좌석은 제외
+    """
+    rows = [r for r in rows if (r.get("members") or {}).get("part") in VALID_PARTS]
+    return {
+        "id": np.array([r["id"] for r in rows], dtype=object),
+        "arrangement_id": np.array([r.get("arrangement_id") or "" for r in rows], dtype=str),
+        "member_id": np.array([r.get("member_id") or "" for r in rows], dtype=str),
+        "part": np.array([r["members"]["part"] for r in rows], dtype=str),
+        "height": np.array([r["members"].get("height_cm") for r in rows], dtype=np.float64),
+        "seat_row": np.array([r.get("seat_row") for r in rows], dtype=np.int64),
+        "seat_col": np.array([r.get("seat_column") for r in rows], dtype=np.int64),
+        "updated_at": np.array(
+            [(r.get("arrangements") or {}).get("updated_at") or "" for r in rows], dtype=object
+        ),
+    }
+
 
 @lru_cache()
-def get_supabase_client() -> Client:
-    """Supabase 클라이언트 싱글톤"""
+def get_supabase_client() -> "Client":
+    """Supabase 클라이언트 싱글톤 (설정이 없으면 RuntimeError, 실패는 캐시되지 않음)"""
+    if not settings.SUPABASE_URL or not settings.SUPABASE_SERVICE_ROLE_KEY:
+        raise RuntimeError("SUPABASE_URL / SUPABASE_SERVICE_ROLE_KEY가 설정되지 않았습니다.")
+
+    from supabase import create_client
+
     return create_client(
         settings.SUPABASE_URL,
         settings.SUPABASE_SERVICE_ROLE_KEY
     )
 
 
+def training_sample_columns(rows: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+    """
+    get_training_samples 페이지를 학습용 열 배열로 변환
+
+    유효하지 않은 파트(SPECIAL)의 좌석은 제외 (컨텍스트 집계에는 DB에서 이미 포함됨)
+    - context: (n, 5) total_members, soprano/alto/tenor/bass 비율
+    - stats: 대원 통계 열 (통계가 없으면 has_stats=False)
+    """
+    rows = [r for r in rows if r.get("part") in VALID_PARTS]
+    return {
+        "id": np.array([r["id"] for r in rows], dtype=object),
+        "arrangement_id": np.array([r.get("arrangement_id") or "" for r in rows], dtype=str),
+        "member_id": np.array([r.get("member_id") or "" for r in rows], dtype=str),
+        "part": np.array([r["part"] for r in rows], dtype=str),
+        "height": np.array([r.get("height_cm") for r in rows], dtype=np.float64),
+        "seat_row": np.array([r.get("seat_row") for r in rows], dtype=np.int64),
+        "seat_col": np.array([r.get("seat_col") for r in rows], dtype=np.int64),
+        "updated_at": np.array([r.get("arrangement_updated_at") or "" for r in rows], dtype=object),
+        "context": np.array(
+            [[r.get(c) for c in CONTEXT_COLUMNS] for r in rows], dtype=np.float64
+        ).reshape(len(rows), len(CONTEXT_COLUMNS)),
+        "has_stats": np.array([r.get("total_appearances") is not None for r in rows], dtype=bool),
+        "stats": np.array([[r.get(c) for c in STATS_COLUMNS] for r in rows], dtype=object)
+        .reshape(len(rows), len(STATS_COLUMNS)),
+        "stats_updated_at": np.array([r.get("stats_updated_at") or "" for r in rows], dtype=object),
+    }
+
+
 class SupabaseService:
     """Supabase 데이터 서비스"""
 
     def __init__(self):
-        self.client = get_supabase_client()
+        self._client: Optional["Client"] = None
+        self._member_stats_cache: Optional[tuple] = None  # (조회 시각, 통계 행) — 마지막 정상 응답
+        self._member_stats_invalidated = False  # 업서트 이후: 다음 조회는 새로 (실패 시에는 이전 값 사용)
+        self._member_stats_refresh: Optional[asyncio.Task] = None  # 진행 중인 백그라운드 조회
+        self._breakers = {name: CircuitBreaker(name) for name in BREAKER_CALLS}
+        self._last_good: Dict[str, tuple] = {}  # 조회 키 -> (조회 시각, 결과)
+
+    def connect(self) -> "Client":
+        """클라이언트 생성 (lifespan에서 호출, 호출 전 조회 시 자동 생성)"""
+        if self._client is None:
+            self._client = get_supabase_client()
+        return self._client
+
+    @property
+    def client(self) -> "Client":
+        return self.connect()
 
-    async def get_member_statistics(self) -> List[Dict[str, Any]]:
-        """대원별 좌석 통계 조회"""
+    async def _call_with_fallback(self, name: str, key: str, fn: Callable[[], Any], default: Any) -> Any:
+        """회로 차단기를 거친 조회 (실패 / 차단 중이면 key의 마지막 정상 응답, 없으면 default)"""
         try:
-            response = (
-                self.client.table("member_seat_statistics")
-                .select("*")
-                .gt("total_appearances", 0)
-                .limit(MAX_LIMIT)
-                .execute()
-            )
-            return response.data or []
+            result = await self._breakers[name].call(fn)
+        except CircuitOpenError:
+            last = self._last_good.get(key)
+            return last[1] if last is not None else default
         except Exception as e:
-            logger.error(f"[Supabase] Error fetching member statistics: {type(e).__name__}")
-            return []
+            logger.error(f"[Supabase] Error fetching {name}: {type(e).__name__}")
+            last = self._last_good.get(key)
+            return last[1] if last is not None else default
+        self._last_good[key] = (time.monotonic(), result)
+        return result
+
+    async def get_member_statistics(self, max_age: Optional[float] = None) -> List[Dict[str, Any]]:
+        """
+        대원별 좌석 통계 조회 (member_serving_statistics: 학습 샘플과 같은 통계 기준)
+
+        Args:
+            max_age: 이 시간(초) 이내에 조회한 결과가 있으면 재사용 (기본: MEMBER_STATS_CACHE_SECONDS)
+                     시작 시 미리 조회해 두면 첫 추천 요청도 캐시를 사용
+
+        조회 실패 / 차단 중에는 마지막 정상 응답 (경과 시간은 member_stats_age)
+        """
+        max_age = settings.MEMBER_STATS_CACHE_SECONDS if max_age is None else max_age
+        cached = self._member_stats_cache
+        if (
+            cached is not None
+            and not self._member_stats_invalidated
+            and time.monotonic() - cached[0] <= max_age
+        ):
+            return cached[1]
 
-    async def get_row_patterns(self) -> List[Dict[str, Any]]:
-        """행 분배 패턴 조회"""
         try:
-            response = (
-                self.client.table("row_distribution_patterns")
+            response = await self._breakers["member_statistics"].call(
+                lambda: self.client.table(SERVING_STATISTICS_VIEW)
                 .select("*")
                 .limit(MAX_LIMIT)
                 .execute()
             )
-            return response.data or []
+        except CircuitOpenError:
+            return cached[1] if cached is not None else []
         except Exception as e:
-            logger.error(f"[Supabase] Error fetching row patterns: {type(e).__name__}")
-            return []
+            logger.error(f"[Supabase] Error fetching member statistics: {type(e).__name__}")
+            return cached[1] if cached is not None else []
+
+        rows = response.data or []
+        self._member_stats_cache = (time.monotonic(), rows)
+        self._member_stats_invalidated = False
+        return rows
+
+    def member_stats_age(self) -> Optional[float]:
+        """마지막으로 받은 대원 통계의 경과 시간 (초, 없으면 None)"""
+        cached = self._member_stats_cache
+        return time.monotonic() - cached[0] if cached is not None else None
+
+    def peek_member_statistics(self) -> Tuple[Optional[List[Dict[str, Any]]], Optional[float]]:
+        """
+        캐시된 대원 통계를 기다리지 않고 반환 (이벤트 루프 안에서 호출)
+
+        캐시가 없거나 MEMBER_STATS_CACHE_SECONDS보다 오래되었거나 무효화되었으면 백그라운드 조회를 시작하고
+        (진행 중이면 새로 시작하지 않음) 지금은 가진 결과만 반환
+
+        Returns:
+            (통계 행 또는 None, 캐시 경과 시간(초) 또는 None)
+        """
+        cached = self._member_stats_cache
+        age = self.member_stats_age()
+        if age is None or age > settings.MEMBER_STATS_CACHE_SECONDS or self._member_stats_invalidated:
+            if self._member_stats_refresh is None or self._member_stats_refresh.done():
+                self._member_stats_refresh = asyncio.create_task(self.get_member_statistics(max_age=0))
+        return (cached[1] if cached is not None else None), age
+
+    def invalidate_member_statistics(self):
+        """통계 캐시 무효화 (통계 upsert 이후, 새로 조회하기 전까지는 이전 값을 마지막 정상 응답으로 유지)"""
+        self._member_stats_invalidated = True
+
+    def circuit_status(self) -> Dict[str, Any]:
+        """조회별 회로 차단기 상태 (헬스체크용)"""
+        return {
+            **{name: breaker.status() for name, breaker in self._breakers.items()},
+            "member_statistics_age_seconds": (
+                round(self.member_stats_age(), 1) if self._member_stats_cache is not None else None
+            ),
+        }
+
+    def circuit_state(self, name: str) -> str:
+        """조회 하나의 회로 차단기 상태 (closed / open / half_open)"""
+        return self._breakers[name].state
+
+    @property
+    def circuits_open(self) -> bool:
+        """차단 중(open / half_open)인 조회가 있는지"""
+        return any(breaker.state != "closed" for breaker in self._breakers.values())
+
+    async def get_row_patterns(self) -> List[Dict[str, Any]]:
+        """행 분배 패턴 조회 (실패 / 차단 중이면 마지막 정상 응답)"""
+        response = await self._call_with_fallback(
+            "row_patterns",
+            "row_patterns",
+            lambda: self.client.table("row_distribution_patterns")
+            .select("*")
+            .limit(MAX_LIMIT)
+            .execute()
+            .data,
+            [],
+        )
+        return response or []
 
     async def get_ml_history(self, limit: int = DEFAULT_LIMIT) -> List[Dict[str, Any]]:
         """
-        ML 학습 이력 조회
+        ML 학습 이력 조회 (실패 / 차단 중이면 마지막 정상 응답)
 
         Args:
             limit: 조회할 최대 레코드 수 (1-1000, 기본값 100)
@@ -77,47 +280,219 @@ class SupabaseService:
         if limit != validated_limit:
             logger.warning(f"[Supabase] limit adjusted: {limit} -> {validated_limit}")
 
+        response = await self._call_with_fallback(
+            "ml_history",
+            f"ml_history:{validated_limit}",
+            lambda: self.client.table("ml_arrangement_history")
+            .select("*")
+            .order("created_at", desc=True)
+            .limit(validated_limit)
+            .execute()
+            .data,
+            [],
+        )
+        return response or []
+
+    def _table_fetcher(
+        self,
+        table: str,
+        columns: str,
+        apply_filters: Optional[Callable] = None,
+    ) -> PageFetcher:
+        """테이블 id 키셋 페이지 조회 함수 (low <= id < high, id > after)"""
+        def fetch(low: Optional[str], high: Optional[str], after: Optional[str], page_size: int):
+            query = self.client.table(table).select(columns)
+            if apply_filters:
+                query = apply_filters(query)
+            if low:
+                query = query.gte("id", low)
+            if high:
+                query = query.lt("id", high)
+            if after:
+                query = query.gt("id", after)
+            return query.order("id").limit(page_size).execute().data or []
+        return fetch
+
+    def _fetch_training_samples(
+        self,
+        low: Optional[str],
+        high: Optional[str],
+        after: Optional[str],
+        page_size: int,
+    ) -> List[Dict[str, Any]]:
+        """get_training_samples RPC 페이지 1개 조회"""
+        params = {"p_after": after, "p_limit": page_size, "p_low": low, "p_high": high}
+        return self.client.rpc(TRAINING_SAMPLES_RPC, params).execute().data or []
+
+    async def iter_pages(
+        self,
+        fetch: PageFetcher,
+        convert: Callable[[List[Dict[str, Any]]], Any],
+        page_size: Optional[int] = None,
+        prefetch: Optional[int] = None,
+    ) -> AsyncIterator[Any]:
+        """
+        id 키셋 페이지네이션 스트리밍 (OFFSET 없이 id > 마지막 id)
+
+        - UUID 키 공간을 prefetch개 구간으로 나눠 구간별 페이지를 동시에 미리 조회
+        - 조회한 페이지는 바로 convert로 변환하고 원본 행은 버림
+        - 변환된 페이지는 최대 prefetch개까지만 대기 (메모리 상한)
+        - 페이지 순서는 구간 간 뒤섞일 수 있음 (필요하면 호출 측에서 id로 정렬)
+        """
+        page_size = max(1, min(page_size or settings.SEAT_PAGE_SIZE, MAX_LIMIT))
+        prefetch = max(1, prefetch or settings.SEAT_PAGE_PREFETCH)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=prefetch)
+        done = object()
+
+        async def produce(low: Optional[str], high: Optional[str]):
+            after = None
+            try:
+                while True:
+                    rows = await asyncio.to_thread(fetch, low, high, after, page_size)
+                    if rows:
+                        await queue.put(convert(rows))
+                    if len(rows) < page_size:
+                        break
+                    after = rows[-1]["id"]
+            except Exception as e:
+                await queue.put(e)  # 소비 측에서 다시 발생시키고 나머지 구간은 취소
+                return
+            await queue.put(done)
+
+        producers = [
+            asyncio.create_task(produce(low, high))
+            for low, high in uuid_key_ranges(prefetch)
+        ]
         try:
-            response = (
-                self.client.table("ml_arrangement_history")
-                .select("*")
-                .order("created_at", desc=True)
-                .limit(validated_limit)
-                .execute()
+            remaining = len(producers)
+            while remaining:
+                item = await queue.get()
+                if item is done:
+                    remaining -= 1
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    yield item
+        finally:
+            for task in producers:
+                task.cancel()
+
+    async def _collect_columns(
+        self,
+        fetch: PageFetcher,
+        convert: Callable[[List[Dict[str, Any]]], Dict[str, np.ndarray]],
+        page_size: Optional[int],
+        prefetch: Optional[int],
+    ) -> Dict[str, np.ndarray]:
+        """열 배열 페이지를 모두 받아 id 순으로 이어 붙임 (빈 결과도 같은 열 구성)"""
+        pages = [page async for page in self.iter_pages(fetch, convert, page_size, prefetch)]
+        if not pages:
+            return convert([])
+
+        columns = {name: np.concatenate([p[name] for p in pages]) for name in pages[0]}
+        order = np.argsort(columns["id"].astype(str), kind="stable")
+        return {name: values[order] for name, values in columns.items()}
+
+    async def load_training_samples(
+        self,
+        page_size: Optional[int] = None,
+        prefetch: Optional[int] = None,
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        DB에서 집계된 학습 샘플 전체를 열 배열로 조회 (get_training_samples RPC)
+
+        좌석별 파트/통계/배치 컨텍스트가 이미 포함되어 있어 파이썬 조인이 필요 없음
+
+        Returns:
+            열 배열 묶음 (id 순), RPC를 사용할 수 없으면 None
+        """
+        try:
+            return await self._collect_columns(
+                self._fetch_training_samples, training_sample_columns, page_size, prefetch
             )
-            return response.data or []
         except Exception as e:
-            logger.error(f"[Supabase] Error fetching ML history: {type(e).__name__}")
-            return []
+            logger.warning(f"[Supabase] Training samples RPC unavailable: {type(e).__name__}")
+            return None
 
-    async def get_all_seats(self, limit: int = MAX_LIMIT) -> List[Dict[str, Any]]:
+    async def load_training_seats(
+        self,
+        page_size: Optional[int] = None,
+        prefetch: Optional[int] = None,
+    ) -> Dict[str, np.ndarray]:
         """
-        모든 좌석 배치 데이터 조회 (학습용)
+        모든 학습용 좌석을 열 배열로 조회 (행 수 제한 없음, id 순)
 
-        Args:
-            limit: 조회할 최대 레코드 수 (1-1000, 기본값 1000)
+        get_training_samples RPC가 없는 DB용 경로
+        페이지는 seat_page_columns로 변환된 상태로만 유지되므로
+        응답 JSON 전체를 메모리에 올리지 않음
         """
-        # 입력값 검증: limit 범위 제한 (DoS 방지)
-        validated_limit = max(1, min(limit, MAX_LIMIT))
-
         try:
-            response = (
-                self.client.table("seats")
-                .select("*, members(id, name, part, height, experience), arrangements(date)")
-                .limit(validated_limit)
-                .execute()
+            return await self._collect_columns(
+                self._table_fetcher("seats", SEAT_TRAINING_COLUMNS),
+                seat_page_columns,
+                page_size,
+                prefetch,
             )
-            return response.data or []
         except Exception as e:
-            logger.error(f"[Supabase] Error fetching seats: {type(e).__name__}")
+            logger.error(f"[Supabase] Error streaming seats: {type(e).__name__}")
+            return seat_page_columns([])
+
+    async def load_all_member_statistics(
+        self,
+        page_size: Optional[int] = None,
+        prefetch: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """대원별 좌석 통계 전체 조회 (학습용, 행 수 제한 없음, member_serving_statistics)"""
+        fetch = self._table_fetcher(SERVING_STATISTICS_VIEW, MEMBER_STATISTICS_COLUMNS)
+        stats: List[Dict[str, Any]] = []
+        try:
+            async for page in self.iter_pages(fetch, lambda rows: rows, page_size, prefetch):
+                stats.extend(page)
+        except Exception as e:
+            logger.error(f"[Supabase] Error streaming member statistics: {type(e).__name__}")
             return []
+        return stats
+
+    async def upsert_member_statistics(
+        self,
+        rows: List[Dict[str, Any]],
+        batch_size: Optional[int] = None,
+    ) -> List[str]:
+        """
+        대원 통계 행을 member_seat_statistics에 배치 단위로 업서트 (member_id 기준)
+
+        행에 포함된 열만 갱신 (/stats/sync는 decayed_* 열만 보냄)
+
+        Returns:
+            업서트에 성공한 member_id 목록 (실패한 배치는 제외)
+        """
+        batch_size = max(1, min(batch_size or settings.MEMBER_STATS_UPSERT_BATCH, MAX_LIMIT))
+        upserted: List[str] = []
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start:start + batch_size]
+            try:
+                await asyncio.to_thread(
+                    lambda: self.client.table("member_seat_statistics")
+                    .upsert(batch, on_conflict="member_id")
+                    .execute()
+                )
+                upserted.extend(row["member_id"] for row in batch)
+            except Exception as e:
+                logger.error(f"[Supabase] Error upserting member statistics batch: {type(e).__name__}")
+        if upserted:
+            self.invalidate_member_statistics()
+        return upserted
 
     async def health_check(self) -> bool:
-        """데이터베이스 연결 확인"""
+        """데이터베이스 연결 확인 (차단 중이면 조회 없이 False)"""
         try:
             # 간단한 쿼리로 연결 확인
-            self.client.table("members").select("id").limit(1).execute()
+            await self._breakers["health"].call(
+                lambda: self.client.table("members").select("id").limit(1).execute()
+            )
             return True
+        except CircuitOpenError:
+            return False
         except Exception as e:
             logger.warning(f"[Supabase] Health check failed: {type(e).__name__}")
             return False
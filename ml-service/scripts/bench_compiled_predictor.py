@@ -0,0 +1,124 @@
+"""
+평탄화 추론기 벤치마크
+sklearn predict 경로와 평탄화(CompiledSeatModel) 경로의 지연 시간과 상주 메모리 비교
+
+사용법 (ml-service 디렉토리에서):
+    python -m scripts.bench_compiled_predictor [--model models/seat_recommender.joblib]
+"""
+import argparse
+import multiprocessing as mp
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from scripts.benchmark_utils import current_rss_mb, load_synthetic_training_set, make_roster
+
+
+ROSTER_SIZES = [1, 50, 100, 200]
+REPEATS = 50
+
+
+def _measure_load_rss(path: str, compiled_only: bool, queue):
+    """별도 프로세스에서 모델 로드 후 RSS 증가량 측정 (라이브러리 import 비용 제외)"""
+    if compiled_only:
+        from app.models.compiled_predictor import CompiledSeatModel
+
+        before = current_rss_mb()
+        with np.load(path) as arrays:
+            kept = CompiledSeatModel.from_arrays(dict(arrays))
+    else:
+        import joblib
+        import sklearn.ensemble  # noqa: F401
+
+        before = current_rss_mb()
+        kept = joblib.load(path)
+
+    queue.put(current_rss_mb() - before)
+    del kept
+
+
+def measure_rss(path: str, compiled_only: bool) -> float:
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_measure_load_rss, args=(path, compiled_only, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def timed(fn, repeats: int = REPEATS) -> float:
+    """반복 실행 중앙값 (ms)"""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return float(np.median(samples))
+
+
+def main():
+    from app.models.seat_recommender import SeatRecommender, scale_in_place
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", help="벤치마크할 모델 번들 (없으면 합성 데이터로 학습)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model = SeatRecommender()
+        model_path = args.model
+        if model_path:
+            model.load_model(model_path)
+        else:
+            model.train_arrays(load_synthetic_training_set(Path(tmp)))
+            model_path = str(Path(tmp) / "model.joblib")
+            model.save_model(model_path)
+
+        if model.compiled is None:
+            raise SystemExit("평탄화 추론기를 사용할 수 없습니다 (sklearn 결과 불일치)")
+
+        print(f"\nTrees: row={model.row_model.estimators_.size}, col={model.col_model.estimators_.size}, "
+              f"depth={model.compiled.row.depth}/{model.compiled.col.depth}, "
+              f"predict_paths={model.metadata.get('predict_paths')}")
+        print(f"{'members':>8} {'sklearn/member':>15} {'sklearn batch':>14} {'compiled':>10} {'match':>6}")
+
+        for n in ROSTER_SIZES:
+            roster = make_roster(n)
+            X = np.vstack([model.extract_features(m) for m in roster])
+            X_scaled = scale_in_place(X.astype(np.float32), model.scaler)
+
+            def sklearn_per_member():
+                for i in range(n):
+                    row = X_scaled[i:i + 1]
+                    model.row_model.predict(row)
+                    model.col_model.predict(row)
+
+            def sklearn_batch():
+                Xs = scale_in_place(X.astype(np.float32), model.scaler)
+                model.row_model.predict(Xs)
+                model.col_model.predict(Xs)
+
+            def compiled():
+                model.compiled.predict(X)
+
+            rows, cols = model.compiled.predict(X)
+            match = (
+                np.array_equal(rows, model.row_model.predict(X_scaled)) and
+                np.array_equal(cols, model.col_model.predict(X_scaled))
+            )
+            repeats = max(3, REPEATS // n) if n > 1 else REPEATS
+            print(f"{n:>8} {timed(sklearn_per_member, repeats):>13.2f}ms {timed(sklearn_batch):>12.2f}ms "
+                  f"{timed(compiled):>8.2f}ms {str(match):>6}")
+
+        compiled_path = str(Path(tmp) / "compiled.npz")
+        np.savez(compiled_path, **model.compiled.to_arrays())
+
+        print(f"\nCompiled arrays: {model.compiled.nbytes / 1024 / 1024:.2f} MB")
+        print(f"RSS growth on load (sklearn bundle): {measure_rss(model_path, compiled_only=False):.1f} MB")
+        print(f"RSS growth on load (compiled only):  {measure_rss(compiled_path, compiled_only=True):.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+대원 통계 계산 벤치마크
+이전 방식(대원별 파이썬 리스트 + Counter)과 대원 통계 엔진 전체 재계산(벡터화, 반감기 0)의 소요 시간 비교
+(엔진은 코퍼스 로더가 파싱 시 만들어 둔 배치별 좌석 열을 사용)
+결과가 완전히 같은지도 함께 확인
+
+사용법 (ml-service 디렉토리에서):
+    python -m scripts.bench_member_statistics [--sizes 1x100 5x500 10x2000]
+    (크기 = 연수x대원 수, 매주 1회 배치 기준)
+"""
+import argparse
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Tuple
+
+from app.services.corpus_loader import VALID_PARTS, seat_columns
+from app.services.member_stats_engine import FIXED_SEAT_CONFIG, rebuild_member_statistics
+from scripts.benchmark_utils import PART_LAYOUT, make_synthetic_arrangements
+
+
+DEFAULT_SIZES = ["1x100", "5x500", "10x1000", "10x2000"]
+BASE_MEMBERS = sum(count for _, _, count in PART_LAYOUT.values())
+
+
+def legacy_member_statistics(
+    arrangements: List[Dict[str, Any]]
+) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, str]]:
+    """이전 구현 (대원별 이력 리스트 + Counter) — 비교 기준"""
+    member_history: Dict[str, List[Dict[str, int]]] = defaultdict(list)
+    member_parts: Dict[str, str] = {}
+
+    for arrangement in arrangements:
+        for seat in arrangement["seats"]:
+            member_id = seat.get("member_id")
+            part = seat.get("part")
+            if not member_id or part not in VALID_PARTS:
+                continue
+            member_history[member_id].append({"row": seat.get("row"), "col": seat.get("col")})
+            member_parts[member_id] = part
+
+    member_stats: Dict[str, Dict[str, Any]] = {}
+    for member_id, history in member_history.items():
+        rows = [h["row"] for h in history]
+        cols = [h["col"] for h in history]
+
+        row_counts = Counter(rows)
+        preferred_row = row_counts.most_common(1)[0][0]
+        row_consistency = row_counts[preferred_row] / len(rows)
+
+        avg_col = sum(cols) / len(cols)
+        cols_in_range = sum(1 for c in cols if abs(c - avg_col) <= FIXED_SEAT_CONFIG["COL_TOLERANCE"])
+        col_consistency = cols_in_range / len(cols)
+
+        member_stats[member_id] = {
+            "preferred_row": preferred_row,
+            "preferred_col": round(avg_col),
+            "row_consistency": round(row_consistency * 100, 1),
+            "col_consistency": round(col_consistency * 100, 1),
+            "is_fixed_seat": (
+                len(history) >= FIXED_SEAT_CONFIG["MIN_APPEARANCES"] and
+                row_consistency >= FIXED_SEAT_CONFIG["HIGH_CONSISTENCY"] and
+                col_consistency >= FIXED_SEAT_CONFIG["HIGH_CONSISTENCY"]
+            ),
+            "total_appearances": len(history),
+        }
+
+    return member_stats, member_parts
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, (time.perf_counter() - start) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES, help="연수x대원 수 목록")
+    args = parser.parse_args()
+
+    print(f"{'years':>5} {'members':>8} {'seats':>10} {'legacy':>10} {'columnize*':>11} "
+          f"{'engine':>9} {'speedup':>8} {'identical':>9}")
+
+    for size in args.sizes:
+        years, members = (int(v) for v in size.lower().split("x"))
+        arrangements = make_synthetic_arrangements(
+            n_arrangements=52 * years,
+            members_per_part_scale=members / BASE_MEMBERS,
+        )
+        n_seats = sum(len(a["seats"]) for a in arrangements)
+
+        expected, legacy_ms = timed(lambda: legacy_member_statistics(arrangements))
+
+        # 파일 파싱 시 1회 (코퍼스 로더 캐시에 보관)
+        def columnize():
+            for arrangement in arrangements:
+                arrangement["seat_columns"] = seat_columns(arrangement["seats"])
+        _, columnize_ms = timed(columnize)
+
+        actual, engine_ms = timed(lambda: rebuild_member_statistics(arrangements, half_life_days=0))
+
+        # 값, 타입, 대원 순서까지 동일해야 함
+        identical = (
+            actual == expected and
+            list(actual[0]) == list(expected[0]) and
+            all(
+                type(v) is type(expected[0][m][k])
+                for m, stats in actual[0].items() for k, v in stats.items()
+            )
+        )
+        speedup = legacy_ms / engine_ms
+        print(f"{years:>5} {len(expected[0]):>8} {n_seats:>10} {legacy_ms:>8.0f}ms {columnize_ms:>9.0f}ms "
+              f"{engine_ms:>7.0f}ms {speedup:>7.1f}x {str(identical):>9}")
+
+    print("\n* columnize: 파일 파싱 시 1회만 발생 (코퍼스 로더가 파일별로 캐시), speedup에서 제외")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+규칙 기반 배치 엔진 벤치마크 (ML 추천의 기준선)
+
+합성 코퍼스의 앞부분으로 모델 / 대원 통계를 만들고 남겨 둔 배치(홀드아웃)에서
+- 실제 좌석 대비 근접 정확도 (행 ±1, 열 ±2), 배치율: 규칙 기반 vs ML
+- 로스터 크기별 지연 (중앙값): 규칙 기반 vs ML recommend
+
+사용법 (ml-service 디렉토리에서):
+    python -m scripts.bench_rule_engine [--arrangements 60] [--holdout 8]
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+import numpy as np
+
+from scripts.benchmark_utils import load_synthetic_training_set, make_roster, make_synthetic_arrangements
+
+
+ROSTER_SIZES = [50, 100, 200]
+REPEATS = 50
+
+
+def timed(fn: Callable[[], Any], repeats: int = REPEATS) -> float:
+    """반복 실행 중앙값 (ms)"""
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return float(np.median(samples))
+
+
+def holdout_case(arrangement: Dict[str, Any]):
+    """홀드아웃 배치 → (로스터, 그리드, 실제 좌석)"""
+    seats = arrangement["seats"]
+    members = [
+        {"id": s["member_id"], "name": s["member_name"], "part": s["part"],
+         "height": None, "experience": None, "is_leader": False}
+        for s in seats
+    ]
+    rows = max(s["row"] for s in seats)
+    capacities = [max([s["col"] for s in seats if s["row"] == r], default=1) for r in range(1, rows + 1)]
+    grid_layout = {"rows": rows, "row_capacities": capacities, "zigzag_pattern": "even"}
+    actual = {s["member_id"]: (s["row"], s["col"]) for s in seats}
+    return members, grid_layout, actual
+
+
+def score(recommendations: List[Dict[str, Any]], actual: Dict[str, Any]) -> Dict[str, float]:
+    """실제 좌석 대비 근접 정확도 (배치된 대원 기준) + 배치율"""
+    if not recommendations:
+        return {"row_near": 0.0, "col_near": 0.0, "placed": 0.0}
+    row_err = np.array([abs(r["row"] - actual[r["member_id"]][0]) for r in recommendations])
+    col_err = np.array([abs(r["col"] - actual[r["member_id"]][1]) for r in recommendations])
+    return {
+        "row_near": float(np.mean(row_err <= 1)),
+        "col_near": float(np.mean(col_err <= 2)),
+        "placed": len(recommendations) / len(actual),
+    }
+
+
+def main():
+    from app.models.rule_placement import rule_based_recommend
+    from app.models.seat_recommender import SeatRecommender
+    from app.models.serving import default_grid_layout
+    from app.services.member_stats_engine import rebuild_member_statistics
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--arrangements", type=int, default=60, help="합성 배치 수")
+    parser.add_argument("--holdout", type=int, default=8, help="평가용으로 남겨 둘 최근 배치 수")
+    args = parser.parse_args()
+
+    arrangements = make_synthetic_arrangements(n_arrangements=args.arrangements)
+    train_set, holdout = arrangements[:-args.holdout], arrangements[-args.holdout:]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model = SeatRecommender()
+        model.train_arrays(load_synthetic_training_set(Path(tmp), train_set))
+
+    member_stats, _ = rebuild_member_statistics(train_set)
+    engines = {
+        "rules": lambda members, grid: rule_based_recommend(members, member_stats, grid),
+        "ml": lambda members, grid: model.recommend(members, member_stats, grid),
+    }
+
+    print(f"\nHoldout: {len(holdout)} arrangements (train {len(train_set)})")
+    print(f"{'engine':<8} {'row±1':>7} {'col±2':>7} {'placed':>7}")
+    for name, engine in engines.items():
+        scores = [score(engine(members, grid), actual) for members, grid, actual in map(holdout_case, holdout)]
+        print(f"{name:<8} {np.mean([s['row_near'] for s in scores]):>7.4f} "
+              f"{np.mean([s['col_near'] for s in scores]):>7.4f} {np.mean([s['placed'] for s in scores]):>7.1%}")
+
+    print(f"\n{'members':>8} {'rules':>10} {'ml':>10} {'speedup':>8}")
+    for n in ROSTER_SIZES:
+        roster = make_roster(n)
+        grid = default_grid_layout(n)
+        rules_ms = timed(lambda: engines["rules"](roster, grid))
+        ml_ms = timed(lambda: engines["ml"](roster, grid), repeats=max(5, REPEATS // 5))
+        print(f"{n:>8} {rules_ms:>8.3f}ms {ml_ms:>8.2f}ms {ml_ms / rules_ms:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
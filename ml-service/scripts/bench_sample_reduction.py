@@ -0,0 +1,74 @@
+"""
+학습 샘플 축소 벤치마크
+중복 제거(완전 일치 / 컨텍스트 묶음)와 코어셋 추출 설정별 학습 행 수, 모델 학습 시간, 근접 정확도 비교
+근접 정확도 하락이 SAMPLE_CORESET_TOLERANCE 이내인 설정 중 가장 빠른 설정을 추천
+
+사용법 (ml-service 디렉토리에서):
+    python -m scripts.bench_sample_reduction [--arrangements 104] [--scale 1.0]
+"""
+import argparse
+import tempfile
+from pathlib import Path
+
+from app.config import settings
+from app.models.seat_recommender import SeatRecommender
+from scripts.benchmark_utils import load_synthetic_training_set
+
+
+# (이름, SAMPLE_DEDUP, SAMPLE_DEDUP_CONTEXT_STEP, SAMPLE_CORESET_FRACTION)
+CONFIGS = [
+    ("raw", False, 0.0, 1.0),
+    ("dedup", True, 0.0, 1.0),
+    ("dedup ctx 0.02", True, 0.02, 1.0),
+    ("dedup ctx 0.05", True, 0.05, 1.0),
+    ("dedup ctx 0.02 + coreset 0.5", True, 0.02, 0.5),
+    ("dedup ctx 0.02 + coreset 0.25", True, 0.02, 0.25),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--arrangements", type=int, default=104, help="합성 배치 수 (매주 1회 기준 2년)")
+    parser.add_argument("--scale", type=float, default=1.0, help="파트별 인원 배율")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dataset = load_synthetic_training_set(
+            Path(tmp), n_arrangements=args.arrangements, members_per_part_scale=args.scale
+        )
+
+    # 모델 크기 선택은 학습 시간 비교에서 제외
+    settings.MODEL_SIZE_SELECTION = False
+    tolerance = settings.SAMPLE_CORESET_TOLERANCE
+
+    print(f"{'config':<32} {'fit rows':>9} {'reduction':>10} {'fit(s)':>8} {'saving':>7} "
+          f"{'row±1':>7} {'col±2':>7} {'ok':>3}")
+
+    results = []
+    baseline = None
+    for name, dedup, step, fraction in CONFIGS:
+        settings.SAMPLE_DEDUP = dedup
+        settings.SAMPLE_DEDUP_CONTEXT_STEP = step
+        settings.SAMPLE_CORESET_FRACTION = fraction
+
+        metrics = SeatRecommender().train_arrays(dataset)
+        if baseline is None:
+            baseline = metrics
+
+        saving = 1 - metrics["estimator_fit_seconds"] / baseline["estimator_fit_seconds"]
+        within = (
+            metrics["row_near_accuracy"] >= baseline["row_near_accuracy"] - tolerance and
+            metrics["col_near_accuracy"] >= baseline["col_near_accuracy"] - tolerance
+        )
+        results.append((name, metrics, within))
+        print(f"{name:<32} {int(metrics['fit_rows']):>9} {metrics['sample_reduction_ratio']:>9.1%} "
+              f"{metrics['estimator_fit_seconds']:>8.2f} {saving:>6.0%} "
+              f"{metrics['row_near_accuracy']:>7.4f} {metrics['col_near_accuracy']:>7.4f} "
+              f"{'y' if within else 'n':>3}")
+
+    best = min((r for r in results if r[2]), key=lambda r: r[1]["estimator_fit_seconds"])
+    print(f"\n허용 하락폭 {tolerance} 이내 최단 학습 설정: {best[0]}")
+
+
+if __name__ == "__main__":
+    main()
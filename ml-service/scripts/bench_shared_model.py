@@ -0,0 +1,94 @@
+"""
+워커 간 모델 공유 메모리 벤치마크
+uvicorn/gunicorn 워커 N개(1, 4, 8)가 같은 모델을 로드했을 때 워커별 메모리 비교
+- full: 전체 번들을 joblib.load (워커마다 sklearn 추정기 + 추론 배열 사본)
+- mmap: 서빙 번들을 mmap_mode="r"로 로드 (추론 배열은 페이지 캐시를 공유)
+
+워커는 모두 모델 로드 + 추천 1회 후 동시에 살아 있는 상태에서 측정
+(RSS는 공유 페이지도 워커마다 전부 세므로, 실제 점유량은 PSS / private로 비교)
+
+사용법 (ml-service 디렉토리에서):
+    python -m scripts.bench_shared_model [--model models/seat_recommender.joblib] [--workers 1 4 8]
+"""
+import argparse
+import multiprocessing as mp
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from scripts.benchmark_utils import load_synthetic_training_set, make_roster, memory_rollup_mb
+
+
+ROSTER_SIZE = 100
+
+
+def _worker(path: str, mmap: bool, barrier, queue):
+    """별도 프로세스(워커)에서 모델 로드 → 추천 1회 → 모든 워커가 로드한 뒤 메모리 측정"""
+    from app.models.seat_recommender import SeatRecommender
+    from app.models.serving import default_grid_layout
+
+    import sklearn.ensemble  # noqa: F401  (라이브러리 import 비용은 두 방식 공통으로 제외)
+
+    before = memory_rollup_mb()
+    model = SeatRecommender()
+    model.load_model(path, mmap=mmap)
+    roster = make_roster(ROSTER_SIZE)
+    model.recommend(roster, {}, default_grid_layout(ROSTER_SIZE))
+
+    barrier.wait()  # 모든 워커가 모델을 올린 상태에서 측정 (PSS가 공유 수를 반영)
+    after = memory_rollup_mb()
+    queue.put({key: after[key] - before[key] for key in after})
+    barrier.wait()
+    del model
+
+
+def measure(path: str, mmap: bool, n_workers: int) -> dict:
+    """워커 평균 메모리 증가량 (모델 로드 + 추천)"""
+    ctx = mp.get_context("spawn")
+    barrier = ctx.Barrier(n_workers)
+    queue = ctx.Queue()
+    procs = [ctx.Process(target=_worker, args=(path, mmap, barrier, queue)) for _ in range(n_workers)]
+    for proc in procs:
+        proc.start()
+    results = [queue.get() for _ in procs]
+    for proc in procs:
+        proc.join()
+    return {key: float(np.mean([r[key] for r in results])) for key in results[0]}
+
+
+def main():
+    from app.config import settings
+    from app.models.seat_recommender import SeatRecommender, serving_bundle_path
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--model", help="벤치마크할 모델 번들 (없으면 합성 데이터로 학습)")
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8], help="워커 수")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        model_path = args.model
+        if not model_path:
+            # 크기 선택 없이 기본 크기 앙상블 (워커별 사본 크기가 드러나도록)
+            settings.MODEL_SIZE_SELECTION = False
+            model = SeatRecommender()
+            model.train_arrays(load_synthetic_training_set(Path(tmp)))
+            model_path = str(Path(tmp) / "model.joblib")
+            model.save_model(model_path)
+
+        serving_path = serving_bundle_path(model_path)
+        if not Path(serving_path).exists():
+            raise SystemExit(f"서빙 번들이 없습니다: {serving_path} (save_model로 다시 저장 필요)")
+        print(f"\nFull bundle: {Path(model_path).stat().st_size / 2**20:.1f} MB, "
+              f"serving bundle: {Path(serving_path).stat().st_size / 2**20:.1f} MB")
+
+        print(f"{'workers':>7} {'load':>5} {'RSS/worker':>11} {'PSS/worker':>11} {'private':>8} {'total PSS':>10}")
+        for n in args.workers:
+            for label, mmap in (("full", False), ("mmap", True)):
+                result = measure(model_path, mmap, n)
+                print(f"{n:>7} {label:>5} {result['rss']:>9.1f}MB {result['pss']:>9.1f}MB "
+                      f"{result['private']:>6.1f}MB {result['pss'] * n:>8.1f}MB")
+
+
+if __name__ == "__main__":
+    main()
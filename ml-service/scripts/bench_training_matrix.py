@@ -0,0 +1,92 @@
+"""
+학습 행렬 생성 메모리 벤치마크
+세그먼트를 연결해 float64 행렬을 만들고 fit_transform하던 경로와
+float32 행렬 하나를 청크 단위로 채우고 제자리 스케일링하는 경로(feature_store.read)의
+최대 RSS 증가량과 소요 시간 비교 (각 경로는 별도 프로세스에서 측정)
+
+사용법 (ml-service 디렉토리에서):
+    python -m scripts.bench_training_matrix [--arrangements 520] [--scale 10]
+"""
+import argparse
+import multiprocessing as mp
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from scripts.benchmark_utils import current_rss_mb, write_synthetic_corpus
+
+
+def _build_legacy(store, member_stats):
+    """이전 방식: 세그먼트 연결 → float64 행렬 → fit_transform 사본"""
+    from sklearn.preprocessing import StandardScaler
+
+    from app.models.seat_recommender import ARRANGEMENT_FEATURE_COLUMNS, N_FEATURES, STATS_FEATURE_COLUMNS
+    from app.services.feature_store import stats_feature_rows
+
+    columns = store._gather(store._read_manifest())
+    X = np.empty((len(columns["part"]), N_FEATURES), dtype=np.float64)
+    X[:, ARRANGEMENT_FEATURE_COLUMNS] = columns["features"]
+    X[:, STATS_FEATURE_COLUMNS] = stats_feature_rows(
+        columns["member_id"], np.asarray(columns["part"], dtype=np.intp), member_stats
+    )
+    return StandardScaler().fit_transform(X)
+
+
+def _measure(corpus_dir: str, store_dir: str, method: str, queue):
+    """별도 프로세스에서 학습 행렬 생성 구간의 최대 RSS 증가량 측정 (코퍼스/통계 로드 제외)"""
+    from app.models.memory_usage import peak_rss_mb, reset_peak_rss
+    from app.services.corpus_loader import corpus_loader
+    from app.services.feature_store import FeatureStore
+    from app.services.member_stats_engine import MemberStatsEngine
+
+    engine = MemberStatsEngine()
+    engine.sync(corpus_loader.load(Path(corpus_dir)))
+    member_stats = engine.stats()
+    store = FeatureStore(root=store_dir)
+
+    reset_peak_rss()
+    before = current_rss_mb()
+    start = time.perf_counter()
+    if method == "legacy":
+        X = _build_legacy(store, member_stats)
+    else:
+        X = store.read(member_stats)["X"]
+    seconds = time.perf_counter() - start
+    queue.put((peak_rss_mb() - before, seconds, X.nbytes / 2**20, len(X)))
+
+
+def measure(corpus_dir: str, store_dir: str, method: str):
+    ctx = mp.get_context("spawn")
+    queue = ctx.Queue()
+    proc = ctx.Process(target=_measure, args=(corpus_dir, store_dir, method, queue))
+    proc.start()
+    result = queue.get()
+    proc.join()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--arrangements", type=int, default=520, help="합성 배치 수 (매주 1회 기준 10년)")
+    parser.add_argument("--scale", type=float, default=10.0, help="파트별 인원 배율")
+    args = parser.parse_args()
+
+    from app.services.corpus_loader import corpus_loader
+    from app.services.feature_store import FeatureStore
+
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_dir = Path(tmp) / "corpus"
+        store_dir = str(Path(tmp) / "store")
+        write_synthetic_corpus(corpus_dir, n_arrangements=args.arrangements, members_per_part_scale=args.scale)
+        FeatureStore(root=store_dir).sync(corpus_loader.load(corpus_dir))
+
+        print(f"{'path':<10} {'rows':>9} {'matrix MB':>10} {'peak +MB':>9} {'seconds':>8}")
+        for method in ("legacy", "chunked"):
+            peak, seconds, matrix_mb, rows = measure(str(corpus_dir), store_dir, method)
+            print(f"{method:<10} {rows:>9} {matrix_mb:>10.1f} {peak:>9.1f} {seconds:>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
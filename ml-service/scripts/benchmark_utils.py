@@ -0,0 +1,163 @@
+"""
+벤치마크 공용 유틸리티
+- 합성 학습 코퍼스 생성 (ml_*.json 형식)
+- 프로세스 상주 메모리(RSS, 공유 페이지를 나눈 PSS) 측정
+"""
+import json
+import random
+import resource
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+
+PART_LAYOUT = {
+    # part: (기준 행, 기준 열, 인원)
+    "SOPRANO": (1, 2, 30),
+    "ALTO": (1, 10, 22),
+    "TENOR": (4, 2, 14),
+    "BASS": (4, 9, 14),
+}
+
+
+def make_synthetic_arrangements(
+    n_arrangements: int = 40,
+    members_per_part_scale: float = 1.0,
+    seed: int = 42,
+) -> List[Dict[str, Any]]:
+    """합성 배치 목록 생성 (대원별 선호석 주변에 출석률 80%로 배치)"""
+    rng = random.Random(seed)
+    members = []
+    for part, (base_row, base_col, count) in PART_LAYOUT.items():
+        for i in range(int(count * members_per_part_scale)):
+            members.append({
+                "member_id": f"{part.lower()}-{i:04d}",
+                "member_name": f"{part[0]}{i}",
+                "part": part,
+                "row": base_row + rng.randint(0, 2),
+                "col": base_col + rng.randint(0, 5),
+            })
+
+    arrangements = []
+    for a in range(n_arrangements):
+        seats = [
+            {
+                "member_id": m["member_id"],
+                "member_name": m["member_name"],
+                "part": m["part"],
+                "height": None,
+                "experience_years": 0,
+                "is_part_leader": False,
+                "row": m["row"] + (1 if rng.random() < 0.2 else 0),
+                "col": max(1, m["col"] + rng.randint(-1, 1)),
+            }
+            for m in members
+            if rng.random() < 0.8
+        ]
+        arrangements.append({
+            "arrangement_id": f"synthetic_{a:05d}",
+            "date": f"{2020 + a // 52}-W{a % 52:02d}",
+            "seats": seats,
+        })
+    return arrangements
+
+
+def write_synthetic_corpus(directory: Path, **kwargs) -> List[Path]:
+    """합성 배치를 ml_*.json 파일로 저장"""
+    return write_arrangements(directory, make_synthetic_arrangements(**kwargs))
+
+
+def write_arrangements(directory: Path, arrangements: List[Dict[str, Any]]) -> List[Path]:
+    """배치 목록을 ml_*.json 파일로 저장"""
+    directory.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for arrangement in arrangements:
+        path = directory / f"ml_{arrangement['arrangement_id']}.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(arrangement, f, ensure_ascii=False)
+        paths.append(path)
+    return paths
+
+
+def make_roster(n_members: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """추천 요청용 합성 로스터"""
+    rng = random.Random(seed)
+    parts = list(PART_LAYOUT)
+    weights = [count for _, _, count in PART_LAYOUT.values()]
+    return [
+        {
+            "id": f"roster-{i:04d}",
+            "name": f"R{i}",
+            "part": rng.choices(parts, weights=weights)[0],
+            "height": None,
+            "experience": None,
+            "is_leader": False,
+        }
+        for i in range(n_members)
+    ]
+
+
+def current_rss_mb() -> float:
+    """현재 프로세스 RSS (MB), /proc 미지원 시 최대 RSS"""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def memory_rollup_mb() -> Dict[str, float]:
+    """
+    /proc/self/smaps_rollup 기준 메모리 (MB, Linux 4.14+)
+
+    rss: 공유 페이지 포함 상주 메모리, pss: 공유 페이지를 공유 프로세스 수로 나눈 값,
+    private: 이 프로세스만 쓰는 페이지, shared: 다른 프로세스와 공유 중인 페이지
+    """
+    fields = {}
+    try:
+        with open("/proc/self/smaps_rollup", "r") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == "kB":
+                    fields[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    except OSError:
+        rss = current_rss_mb()
+        return {"rss": rss, "pss": rss, "private": rss, "shared": 0.0}
+    return {
+        "rss": fields.get("Rss", 0.0),
+        "pss": fields.get("Pss", 0.0),
+        "private": fields.get("Private_Clean", 0.0) + fields.get("Private_Dirty", 0.0),
+        "shared": fields.get("Shared_Clean", 0.0) + fields.get("Shared_Dirty", 0.0),
+    }
+
+
+def load_synthetic_training_set(root: Path, arrangements: Optional[List[Dict[str, Any]]] = None, **kwargs) -> Dict[str, Any]:
+    """
+    합성 코퍼스로 학습용 배열 묶음 생성 (load_training_set_from_json과 같은 경로)
+
+    root/ml_output에 코퍼스를 저장하고 root/features의 임시 피처 저장소를 거침
+    (서비스의 코퍼스 감시자 / 피처 저장소 싱글톤은 건드리지 않음)
+
+    Args:
+        arrangements: 저장할 배치 목록 (없으면 make_synthetic_arrangements(**kwargs))
+    """
+    from app.services.corpus_loader import CorpusLoader
+    from app.services.feature_store import FeatureStore
+    from app.services.member_stats_engine import MemberStatsEngine
+
+    corpus = root / "ml_output"
+    if arrangements is None:
+        write_synthetic_corpus(corpus, **kwargs)
+    else:
+        write_arrangements(corpus, arrangements)
+    loaded = CorpusLoader().load(corpus)
+
+    engine = MemberStatsEngine()
+    engine.rebuild(loaded)
+    store = FeatureStore(root=str(root / "features"))
+    store.sync(loaded)
+    dataset = store.read(engine.stats())
+    dataset["stats_half_life_days"] = engine.half_life
+    return dataset
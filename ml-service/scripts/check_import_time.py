@@ -0,0 +1,117 @@
+"""
+서비스 import 시간 예산 검사
+새 인터프리터에서 app.main을 import하는 시간(중앙값)이 예산을 넘거나,
+처음 사용할 때 import해야 하는 무거운 라이브러리(sklearn, pandas, supabase 등)가
+import 시점에 로드되면 실패 (종료 코드 1)
+
+Docker HEALTHCHECK start-period(5s) 안에 import + lifespan이 끝나야 하므로
+import는 예산(IMPORT_TIME_BUDGET_MS, 기본 1000ms) 이하로 유지
+같은 검사를 tests/test_import_time.py가 pytest로 수행 (이 스크립트는 측정 / 프로파일 출력용)
+
+사용법 (ml-service 디렉토리에서):
+    python -m scripts.check_import_time [--budget-ms 1000] [--runs 5] [--profile]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+
+SERVICE_DIR = Path(__file__).resolve().parents[1]
+
+# import 시점에 로드되면 안 되는 모듈 (처음 사용할 때 import)
+LAZY_MODULES = ("sklearn", "scipy", "pandas", "joblib", "supabase", "asyncpg")
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "ms": elapsed * 1000,
+    "loaded": [m for m in {lazy!r} if m in sys.modules],
+}}))
+"""
+
+
+def probe_env() -> dict:
+    """Supabase 설정이 없어도 import가 되어야 하므로 관련 환경 변수 제거"""
+    env = dict(os.environ)
+    env.pop("SUPABASE_URL", None)
+    env.pop("SUPABASE_SERVICE_ROLE_KEY", None)
+    env["PYTHONPATH"] = str(SERVICE_DIR)
+    return env
+
+
+def measure_once() -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(lazy=LAZY_MODULES)],
+        cwd=SERVICE_DIR,
+        env=probe_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def importtime_rows() -> List[Tuple[int, str]]:
+    """python -X importtime -c "import app.main"의 (누적 µs, 모듈) 목록 (모듈명 앞 공백은 중첩 깊이)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=SERVICE_DIR,
+        env=probe_env(),
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        parts = line.split("|")
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            rows.append((int(parts[1]), parts[2].rstrip()))
+    return rows
+
+
+def print_profile(top: int = 15):
+    """-X importtime 누적 시간 상위 모듈"""
+    print(f"\n{'cumulative ms':>14}  module")
+    for cumulative_us, module in sorted(importtime_rows(), reverse=True)[:top]:
+        print(f"{cumulative_us / 1000:>14.1f}  {module}")
+
+
+def main():
+    from app.config import settings
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=settings.IMPORT_TIME_BUDGET_MS,
+                        help="import 시간 예산 (중앙값, ms)")
+    parser.add_argument("--runs", type=int, default=5, help="측정 횟수")
+    parser.add_argument("--profile", action="store_true", help="누적 import 시간 상위 모듈 출력")
+    args = parser.parse_args()
+
+    measure_once()  # 바이트코드 캐시 준비
+    results = [measure_once() for _ in range(args.runs)]
+    median_ms = statistics.median(r["ms"] for r in results)
+    loaded = sorted({m for r in results for m in r["loaded"]})
+
+    print(f"import app.main: median {median_ms:.0f}ms "
+          f"(min {min(r['ms'] for r in results):.0f}ms, budget {args.budget_ms:.0f}ms, {args.runs} runs)")
+    print(f"lazy modules loaded at import: {', '.join(loaded) if loaded else 'none'}")
+
+    failed = median_ms > args.budget_ms or bool(loaded)
+    if args.profile or failed:
+        print_profile()
+
+    if failed:
+        print("\nFAIL: import 시간 예산 초과 또는 무거운 모듈이 import 시점에 로드됨")
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+하이퍼파라미터 탐색 명령
+
+JSON 학습 데이터로 그룹 k-fold 교차 검증을 실행하고
+리포트(TUNING_REPORT_PATH)와 최적 설정(TUNED_PARAMS_PATH)을 저장
+저장된 설정은 다음 /train 호출부터 사용됨
+
+사용법 (ml-service 디렉토리에서):
+    python -m scripts.tune_hyperparameters [--folds 5] [--n-jobs -1]
+"""
+import argparse
+
+from app.logging_config import setup_logging
+from app.models.tuning import run_search, save_results
+from app.routers.train import fingerprint_json_corpus, load_training_set_from_json
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--folds", type=int, default=5, help="교차 검증 폴드 수")
+    parser.add_argument("--n-jobs", type=int, default=None, help="joblib 워커 수 (기본: TUNING_N_JOBS)")
+    parser.add_argument("--dry-run", action="store_true", help="리포트만 출력하고 설정은 저장하지 않음")
+    args = parser.parse_args()
+    setup_logging(fmt="text")  # 탐색 진행 로그를 콘솔에서 읽기 쉽게
+
+    dataset = load_training_set_from_json()
+    if dataset is None or len(dataset["X"]) == 0:
+        raise SystemExit("학습 데이터가 없습니다.")
+
+    report = run_search(
+        dataset,
+        fingerprint=fingerprint_json_corpus(),
+        n_folds=args.folds,
+        n_jobs=args.n_jobs,
+    )
+
+    print(f"\n{'config':<60} {'row±1':>7} {'col±2':>7} {'rule':>6} {'fit(s)':>7}")
+    for result in report["results"][:10]:
+        params = result["params"]
+        label = ", ".join(f"{k}={params[k]}" for k in ("n_estimators", "max_depth", "learning_rate", "min_samples_leaf"))
+        m = result["metrics"]
+        print(f"{label:<60} {m['row_near_accuracy']:>7.4f} {m['col_near_accuracy']:>7.4f} "
+              f"{m['rule_compliance']:>6.3f} {m['row_fit_seconds'] + m['col_fit_seconds']:>7.2f}")
+
+    for name, best in report["best"].items():
+        print(f"\nBest {name}: {best['params']}")
+
+    if not args.dry_run:
+        save_results(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+테스트 공통 설정
+
+ml-service 디렉토리에서 실행: python -m pytest tests
+"""
+import json
+import random
+from typing import Any, Dict, List
+
+import pytest
+
+from app.config import settings
+from app.models.seat_recommender import PART_RULES, SeatRecommender
+from app.services.corpus_loader import CorpusLoader
+from app.services.feature_store import FeatureStore
+from app.services.member_stats_engine import rebuild_member_statistics
+from scripts.benchmark_utils import write_synthetic_corpus
+
+
+PARTS = list(PART_RULES)
+
+# 테스트 학습용 작은 앙상블 (tuned_params 형식)
+TEST_MODEL_PARAMS = {
+    "row": {"n_estimators": 20, "max_depth": 3},
+    "col": {"n_estimators": 20, "max_depth": 3},
+}
+
+
+def make_members(n: int, seed: int = 0, parts: List[str] = PARTS) -> List[Dict[str, Any]]:
+    """무작위 파트의 로스터"""
+    rng = random.Random(seed)
+    return [
+        {"id": f"m{i:04d}", "name": f"M{i}", "part": rng.choice(parts),
+         "height": None, "experience": None, "is_leader": False}
+        for i in range(n)
+    ]
+
+
+@pytest.fixture(scope="session", autouse=True)
+def isolated_model_paths(tmp_path_factory):
+    """모델/캐시 경로를 임시 디렉토리로 돌리고 작은 하이퍼파라미터로 학습"""
+    root = tmp_path_factory.mktemp("models")
+    tuned_path = root / "tuned_params.json"
+    tuned_path.write_text(json.dumps(TEST_MODEL_PARAMS), encoding="utf-8")
+
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(settings, "TUNED_PARAMS_PATH", str(tuned_path))
+        mp.setattr(settings, "MODEL_PATH", str(root / "seat_recommender.joblib"))
+        for name in ("MODEL_REGISTRY_DIR", "FEATURE_STORE_DIR", "FEATURE_CACHE_DIR", "TENANT_MODELS_DIR"):
+            mp.setattr(settings, name, str(root / name.lower()))
+        yield root
+
+
+@pytest.fixture(scope="session")
+def training_set(tmp_path_factory) -> Dict[str, Any]:
+    """작은 합성 코퍼스의 학습용 배열 묶음 (피처 저장소 경유, 스케일링된 float32 X)"""
+    root = tmp_path_factory.mktemp("corpus")
+    write_synthetic_corpus(root / "ml_output", n_arrangements=12, members_per_part_scale=0.5)
+    arrangements = CorpusLoader(max_workers=1).load(root / "ml_output")
+    member_stats, _ = rebuild_member_statistics(arrangements)
+
+    store = FeatureStore(root=str(root / "features"))
+    store.sync(arrangements)
+    return store.read(member_stats)
+
+
+@pytest.fixture(scope="session")
+def trained_model(training_set) -> SeatRecommender:
+    """training_set으로 학습한 모델 (테스트 간 공유, 변경하지 말 것)"""
+    model = SeatRecommender()
+    model.train_arrays(dict(training_set))
+    return model
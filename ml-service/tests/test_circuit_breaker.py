@@ -0,0 +1,168 @@
+"""
+회로 차단기 (app/services/circuit_breaker.py)
+
+closed → (연속 실패) open → (대기 후) half_open → 시험 호출 성공 closed / 실패 open
+차단 중 조회는 마지막 정상 응답 사용 (SupabaseService._call_with_fallback)
+"""
+import asyncio
+import threading
+import time
+
+import pytest
+
+from app.services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from app.services.supabase_client import SupabaseService
+
+
+RESET_SECONDS = 0.05
+
+
+class Upstream:
+    """호출 횟수를 세고, 설정에 따라 실패하는 동기 호출"""
+
+    def __init__(self, fail: bool = False):
+        self.fail = fail
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("upstream down")
+        return "ok"
+
+
+def make_breaker(**kwargs) -> CircuitBreaker:
+    params = {"failure_threshold": 2, "reset_seconds": RESET_SECONDS, "timeout": 1.0, "retries": 0, "backoff": 0.0}
+    return CircuitBreaker("test", **{**params, **kwargs})
+
+
+async def fail_until_open(breaker: CircuitBreaker, upstream: Upstream):
+    for _ in range(breaker.failure_threshold):
+        with pytest.raises(ConnectionError):
+            await breaker.call(upstream)
+
+
+def test_opens_after_consecutive_failures():
+    breaker = make_breaker(retries=2, reset_seconds=30.0)
+    upstream = Upstream(fail=True)
+
+    async def run():
+        with pytest.raises(ConnectionError):
+            await breaker.call(upstream)
+        assert breaker.state == CLOSED
+        await breaker.call(Upstream())  # 성공하면 연속 실패 수 초기화
+        assert breaker.consecutive_failures == 0
+        await fail_until_open(breaker, upstream)
+
+    asyncio.run(run())
+    status = breaker.status()
+    assert breaker.state == OPEN
+    assert upstream.calls == 3 * 3  # 호출마다 재시도 포함 3회
+    assert (status["failures"], status["retries"], status["times_opened"]) == (3, 6, 1)
+    assert status["last_error"] == "ConnectionError"
+    assert 29 < status["retry_in_seconds"] <= 30
+
+
+def test_open_rejects_without_calling():
+    breaker = make_breaker()
+    upstream = Upstream(fail=True)
+
+    async def run():
+        await fail_until_open(breaker, upstream)
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(upstream)
+
+    asyncio.run(run())
+    assert upstream.calls == 2
+    assert breaker.rejected == 1
+
+
+def test_half_open_probe_success_closes():
+    breaker = make_breaker(retries=3)
+    upstream = Upstream(fail=True)
+
+    async def run():
+        await fail_until_open(breaker, upstream)
+        await asyncio.sleep(RESET_SECONDS)
+        upstream.fail = False
+        return await breaker.call(upstream)
+
+    assert asyncio.run(run()) == "ok"
+    assert breaker.state == CLOSED
+    assert breaker.consecutive_failures == 0
+    assert breaker.status()["retry_in_seconds"] is None
+
+
+def test_half_open_probe_failure_reopens_without_retry():
+    breaker = make_breaker()
+    upstream = Upstream(fail=True)
+
+    async def run():
+        await fail_until_open(breaker, upstream)
+        await asyncio.sleep(RESET_SECONDS)
+        breaker.retries = 3  # 시험 호출은 재시도하지 않음
+        with pytest.raises(ConnectionError):
+            await breaker.call(upstream)
+
+    asyncio.run(run())
+    assert upstream.calls == 3
+    assert breaker.state == OPEN
+    assert breaker.times_opened == 2
+
+
+def test_half_open_allows_single_probe():
+    breaker = make_breaker()
+    release = threading.Event()
+
+    def slow_probe():
+        release.wait(1)
+        return "ok"
+
+    async def run():
+        await fail_until_open(breaker, Upstream(fail=True))
+        await asyncio.sleep(RESET_SECONDS)
+        probe = asyncio.create_task(breaker.call(slow_probe))
+        await asyncio.sleep(0.01)
+        assert breaker.state == HALF_OPEN
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(Upstream())
+        release.set()
+        return await probe
+
+    assert asyncio.run(run()) == "ok"
+    assert breaker.state == CLOSED
+
+
+def test_timeout_then_retry_success():
+    breaker = make_breaker(timeout=0.05, retries=1)
+    attempts = []
+
+    def hangs_once():
+        attempts.append(time.monotonic())
+        if len(attempts) == 1:
+            time.sleep(0.2)
+        return "ok"
+
+    assert asyncio.run(breaker.call(hangs_once)) == "ok"
+    assert (breaker.timeouts, breaker.retried, breaker.failures) == (1, 1, 0)
+    assert breaker.state == CLOSED
+
+
+def test_fallback_serves_last_good_response():
+    service = SupabaseService()
+    breaker = service._breakers["row_patterns"]
+    breaker.failure_threshold, breaker.retries, breaker.backoff = 1, 0, 0.0
+    upstream = Upstream()
+
+    async def run():
+        fresh = await service._call_with_fallback("row_patterns", "k", upstream, default=[])
+        upstream.fail = True
+        failed = await service._call_with_fallback("row_patterns", "k", upstream, default=[])
+        rejected = await service._call_with_fallback("row_patterns", "k", upstream, default=[])
+        other_key = await service._call_with_fallback("row_patterns", "other", upstream, default=[])
+        return fresh, failed, rejected, other_key
+
+    assert asyncio.run(run()) == ("ok", "ok", "ok", [])
+    assert upstream.calls == 2
+    assert service.circuit_state("row_patterns") == OPEN
+    assert service.circuits_open
@@ -0,0 +1,152 @@
+"""
+평탄화 트리 앙상블 추론기 (app/models/compiled_predictor.py)
+
+sklearn GradientBoostingClassifier와 raw 예측값 / 확률 / 클래스가 같은지 확인
+(임계값과 정확히 같은 입력 포함: X <= threshold 경계)
+스케일링은 학습 경로(scale_in_place, float32)와 비트 단위로 같아야 함
+predict_batch는 저장 시 배치 크기별로 측정한 빠른 경로(predict_paths)를 사용
+"""
+import copy
+
+import numpy as np
+import pytest
+from sklearn.ensemble import GradientBoostingClassifier
+from sklearn.preprocessing import StandardScaler
+
+from app.models.compiled_predictor import CompiledEnsemble, CompiledSeatModel
+from app.models.seat_recommender import COMPILED_PROBE_BATCH_SIZES, SeatRecommender, scale_in_place
+
+
+def softmax(raw: np.ndarray) -> np.ndarray:
+    exp = np.exp(raw - raw.max(axis=1, keepdims=True))
+    return exp / exp.sum(axis=1, keepdims=True)
+
+
+def predict_proba(ensemble: CompiledEnsemble, X: np.ndarray) -> np.ndarray:
+    """평탄화 raw 예측값 → sklearn log-loss 확률 (이진: 시그모이드, 다중: 소프트맥스)"""
+    raw = ensemble.decision_function(X)
+    if raw.shape[1] == 1:
+        positive = 1 / (1 + np.exp(-raw[:, 0]))
+        return np.column_stack([1 - positive, positive])
+    return softmax(raw)
+
+
+def probe_matrix(model: GradientBoostingClassifier, X: np.ndarray, seed: int = 0) -> np.ndarray:
+    """무작위 행 + 학습 행 + 트리 임계값과 정확히 같은 값을 가진 행"""
+    rng = np.random.default_rng(seed)
+    probes = [rng.standard_normal((200, X.shape[1])) * 2, X[:100]]
+
+    boundary = np.repeat(X[:1], 50, axis=0)
+    tree = model.estimators_[0, 0].tree_
+    internal = np.flatnonzero(tree.children_left != -1)[:50]
+    boundary[np.arange(len(internal)), tree.feature[internal]] = tree.threshold[internal]
+    probes.append(boundary)
+    return np.vstack(probes)
+
+
+@pytest.mark.parametrize("n_classes, max_depth", [(2, 3), (5, 2), (7, 4)])
+def test_ensemble_matches_sklearn(n_classes, max_depth):
+    rng = np.random.default_rng(n_classes)
+    X = rng.standard_normal((300, 8))
+    y = (X[:, 0] * 3 + X[:, 1] + rng.standard_normal(300)).round().astype(int) % n_classes
+    model = GradientBoostingClassifier(n_estimators=25, max_depth=max_depth, random_state=0).fit(X, y)
+    ensemble = CompiledEnsemble.from_sklearn(model)
+    X_probe = probe_matrix(model, X)
+
+    np.testing.assert_allclose(
+        ensemble.decision_function(X_probe).reshape(len(X_probe), -1),
+        model.decision_function(X_probe).reshape(len(X_probe), -1),
+        rtol=1e-12, atol=1e-12,
+    )
+    np.testing.assert_allclose(predict_proba(ensemble, X_probe), model.predict_proba(X_probe), atol=1e-12)
+    assert np.array_equal(ensemble.predict(X_probe), model.predict(X_probe))
+
+
+def test_seat_model_applies_scaler():
+    rng = np.random.default_rng(1)
+    X_raw = rng.standard_normal((300, 6)) * [1, 10, 100, 1, 5, 50] + [0, 170, 0, 3, 1, 10]
+    scaler = StandardScaler().fit(X_raw)
+    X = scale_in_place(X_raw.astype(np.float32), scaler)  # 학습 경로와 같은 스케일링
+    row_model = GradientBoostingClassifier(n_estimators=15, max_depth=3, random_state=0).fit(X, (X[:, 0] > 0) + 1)
+    col_model = GradientBoostingClassifier(n_estimators=15, max_depth=3, random_state=0).fit(
+        X, np.digitize(X[:, 1], [-1, 0, 1]) + 1
+    )
+
+    compiled = CompiledSeatModel.from_sklearn(scaler, row_model, col_model)
+    restored = CompiledSeatModel.from_arrays(compiled.to_arrays())
+
+    for predictor in (compiled, restored):
+        np.testing.assert_array_equal(predictor.transform(X_raw), X)
+        rows, cols = predictor.predict(X_raw)
+        assert np.array_equal(rows, row_model.predict(X))
+        assert np.array_equal(cols, col_model.predict(X))
+
+
+def test_saved_model_serves_compiled_predictions(tmp_path, trained_model, training_set):
+    model = copy.deepcopy(trained_model)
+    path = str(tmp_path / "model.joblib")
+    model.save_model(path)
+
+    loaded = SeatRecommender()
+    loaded.load_model(path, mmap=False)
+    assert loaded.compiled is not None
+
+    X_raw = model.scaler.inverse_transform(training_set["X"][:200])
+    rows, cols = loaded.predict_batch(X_raw)
+    X_scaled = scale_in_place(X_raw.astype(np.float32), model.scaler)
+    assert np.array_equal(rows, model.row_model.predict(X_scaled))
+    assert np.array_equal(cols, model.col_model.predict(X_scaled))
+    np.testing.assert_allclose(
+        predict_proba(loaded.compiled.col, X_scaled), model.col_model.predict_proba(X_scaled), atol=1e-12
+    )
+
+
+def test_sklearn_path_scales_like_training(trained_model, training_set):
+    model = copy.deepcopy(trained_model)
+    model.compiled = None
+    X_raw = model.scaler.inverse_transform(training_set["X"][:200])
+
+    rows, cols = model.predict_batch(X_raw)
+    compiled = CompiledSeatModel.from_sklearn(model.scaler, model.row_model, model.col_model)
+    compiled_rows, compiled_cols = compiled.predict(X_raw)
+
+    assert np.array_equal(rows, compiled_rows)
+    assert np.array_equal(cols, compiled_cols)
+
+
+def test_predict_batch_picks_path_by_batch_size(tmp_path, trained_model, training_set):
+    model = copy.deepcopy(trained_model)
+    path = str(tmp_path / "model.joblib")
+    model.save_model(path)
+    paths = model.metadata["predict_paths"]
+    assert sorted(int(size) for size in paths) == COMPILED_PROBE_BATCH_SIZES
+    assert set(paths.values()) <= {"compiled", "sklearn"}
+
+    loaded = SeatRecommender()
+    loaded.load_model(path, mmap=False)
+    assert loaded.metadata["predict_paths"] == paths
+
+    calls = []
+    compiled_predict = loaded.compiled.predict
+    loaded.compiled.predict = lambda X: calls.append(len(X)) or compiled_predict(X)
+    X_raw = model.scaler.inverse_transform(training_set["X"][:200])
+
+    # 작은 배치는 sklearn, 큰 배치는 평탄화 (측정 크기 사이는 아래쪽 측정값을 따름)
+    loaded.metadata["predict_paths"] = {"1": "sklearn", "16": "sklearn", "64": "compiled"}
+    small = loaded.predict_batch(X_raw[:10])
+    large = loaded.predict_batch(X_raw)
+    assert calls == [200]
+    assert np.array_equal(small[0], large[0][:10]) and np.array_equal(small[1], large[1][:10])
+
+    # 반대 방향 (큰 배치에서 sklearn이 빠른 모델)
+    loaded.metadata["predict_paths"] = {"1": "compiled", "64": "sklearn"}
+    loaded.predict_batch(X_raw[:10])
+    loaded.predict_batch(X_raw)
+    assert calls == [200, 10]
+
+    # mmap 서빙 번들: 작은 배치 때문에 sklearn 추정기를 읽지 않음
+    mapped = SeatRecommender()
+    mapped.load_model(path, mmap=True)
+    mapped.metadata["predict_paths"] = {"1": "sklearn", "64": "compiled"}
+    mapped.predict_batch(X_raw[:10])
+    assert mapped._row_model is None
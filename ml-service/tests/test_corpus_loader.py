@@ -0,0 +1,30 @@
+"""
+JSON 코퍼스 로더 (app/services/corpus_loader.py)
+
+- 스레드 풀로 미리 읽고 순차 파싱한 결과 = 파일별 단독 파싱 결과 (파일명 순)
+- 깨진 파일은 건너뛰고, 바뀐 파일만 다시 파싱
+"""
+import numpy as np
+
+from app.services.corpus_loader import CorpusLoader, parse_arrangement_file
+from scripts.benchmark_utils import write_synthetic_corpus
+
+
+def test_prefetched_parse_matches_single_file_parse(tmp_path):
+    corpus = tmp_path / "ml_output"
+    paths = write_synthetic_corpus(corpus, n_arrangements=6, members_per_part_scale=0.3)
+    (corpus / "ml_broken.json").write_text("{", encoding="utf-8")
+
+    loader = CorpusLoader(max_workers=4)
+    records = loader.load(corpus)
+
+    expected = [parse_arrangement_file(path) for path in sorted(paths)]
+    assert [r["arrangement_id"] for r in records] == [r["arrangement_id"] for r in expected]
+    for record, single in zip(records, expected):
+        assert record["seats"] == single["seats"]
+        np.testing.assert_array_equal(record["seat_columns"]["member_id"], single["seat_columns"]["member_id"])
+    assert loader.last_parsed == len(paths) + 1
+
+    sorted(paths)[0].write_text(sorted(paths)[0].read_text(encoding="utf-8") + " ", encoding="utf-8")
+    assert len(loader.load(corpus)) == len(paths)
+    assert loader.last_parsed == 1
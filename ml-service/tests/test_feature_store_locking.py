@@ -0,0 +1,64 @@
+"""
+여러 워커 프로세스가 같은 피처 저장소 / 코퍼스 감시자를 쓰는 경우
+
+- 동기화(세그먼트 추가 + 압축)와 읽기가 다른 프로세스에서 동시에 일어나도
+  읽는 중인 세그먼트가 지워지거나 매니페스트가 섞이지 않음
+- 코퍼스 감시는 감시 잠금을 잡은 감시자 하나만
+"""
+import asyncio
+import multiprocessing
+from pathlib import Path
+
+from app.config import settings
+from app.services.corpus_loader import CorpusLoader
+from app.services.corpus_watcher import CorpusWatcher
+from app.services.feature_store import FeatureStore
+from scripts.benchmark_utils import write_synthetic_corpus
+
+
+def churn(root: str, corpus: str, worker: int, rounds: int) -> None:
+    """배치 구성을 바꿔 가며 동기화(매번 압축)하고 읽기 (다른 프로세스와 동시 실행)"""
+    arrangements = CorpusLoader(max_workers=1).load(Path(corpus))
+    store = FeatureStore(root=root, max_segments=1)
+    for i in range(rounds):
+        subset = arrangements[(i + worker) % 3:]
+        store.sync(subset)
+        dataset = store.read({})
+        assert len(dataset["X"]) == len(dataset["y_row"])
+
+
+def test_concurrent_sync_and_read_across_processes(tmp_path):
+    corpus = tmp_path / "ml_output"
+    write_synthetic_corpus(corpus, n_arrangements=8, members_per_part_scale=0.3)
+    root = str(tmp_path / "features")
+
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=churn, args=(root, str(corpus), w, 12)) for w in range(3)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(timeout=120)
+
+    assert [process.exitcode for process in workers] == [0, 0, 0]
+    status = FeatureStore(root=root).status()
+    assert status["segments"] == 1
+
+
+def test_single_watcher_elected(tmp_path, monkeypatch):
+    monkeypatch.setattr(settings, "FEATURE_STORE_DIR", str(tmp_path / "features"))
+    first, second = CorpusWatcher(tmp_path / "ml_output"), CorpusWatcher(tmp_path / "ml_output")
+
+    async def scenario():
+        blocker = asyncio.Event()  # 첫 스캔이 시작 작업을 기다리는 동안 중지
+        assert first.start(after=blocker.wait()) is True
+        assert second.start(after=blocker.wait()) is False
+        assert second.status()["watching"] is False
+        await asyncio.sleep(0)
+
+        await first.stop()
+        assert second.start(after=blocker.wait()) is True
+        assert second.status()["watch_owner"] is True
+        await asyncio.sleep(0)
+        await second.stop()
+
+    asyncio.run(scenario())
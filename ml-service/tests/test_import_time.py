@@ -0,0 +1,23 @@
+"""서비스 import 시간 예산 (scripts/check_import_time.py와 같은 측정)"""
+from app.config import settings
+from scripts.check_import_time import importtime_rows, measure_once
+
+RUNS = 3
+
+
+def app_main_import_ms() -> float:
+    """-X importtime의 app.main 누적 import 시간 (ms)"""
+    return next(cumulative_us for cumulative_us, module in importtime_rows() if module == " app.main") / 1000
+
+
+def test_import_time_within_budget():
+    measure_once()  # 바이트코드 캐시 준비
+    fastest_ms = min(app_main_import_ms() for _ in range(RUNS))
+    assert fastest_ms <= settings.IMPORT_TIME_BUDGET_MS, (
+        f"import app.main {fastest_ms:.0f}ms > budget {settings.IMPORT_TIME_BUDGET_MS:.0f}ms "
+        "(python -m scripts.check_import_time --profile 로 원인 확인)"
+    )
+
+
+def test_heavy_modules_not_loaded_at_import():
+    assert measure_once()["loaded"] == []
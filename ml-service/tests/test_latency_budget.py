@@ -0,0 +1,71 @@
+"""
+추천 지연 예산 (app/services/latency_budget.py, app/routers/recommend.py place_members)
+
+- 느린 관측 한 번으로 추정치가 예산을 넘어도, 건너뛸 때마다 워밍업 기준값 쪽으로 감쇠해 ML 실행이 재개됨
+- 예산이 없는 요청은 항상 ML
+"""
+import asyncio
+
+import pytest
+
+from app.config import settings
+from app.routers.recommend import place_members
+from app.services.latency_budget import DEGRADED_ESTIMATE, Deadline, latency_budget
+from tests.conftest import make_members
+
+
+GRID = {"rows": 6, "row_capacities": [15] * 6, "zigzag_pattern": "even"}
+
+
+@pytest.fixture(autouse=True)
+def fresh_budget(monkeypatch):
+    monkeypatch.setattr(settings, "RECOMMEND_FALLBACK_RESERVE_MS", 0.0)
+    latency_budget.reset()
+    yield
+    latency_budget.reset()
+
+
+def test_skip_decays_toward_warmup_baseline():
+    latency_budget.observe_recommend(100, 10.0, baseline=True)  # 0.1ms/대원
+    latency_budget.observe_recommend(100, 50_000.0)  # 느린 호출 한 번
+
+    slow = latency_budget.ms_per_member
+    for _ in range(60):
+        latency_budget.skip_recommend()
+
+    assert latency_budget.ms_per_member < slow
+    assert latency_budget.ms_per_member == pytest.approx(0.1, rel=0.1)
+    assert latency_budget.status()["estimate_skips"] == 60
+
+    # 기준값 아래로는 내려가지 않음
+    latency_budget.ms_per_member = 0.05
+    latency_budget.skip_recommend()
+    assert latency_budget.ms_per_member == 0.05
+
+
+def test_estimate_recovers_after_one_slow_observation(trained_model):
+    members = make_members(30)
+    latency_budget.observe_recommend(len(members), 0.05 * len(members), baseline=True)
+    latency_budget.observe_recommend(len(members), 500.0 * len(members))
+    assert latency_budget.estimate_recommend_ms(len(members)) > 1000
+
+    reasons = []
+    for _ in range(50):
+        _, reason = asyncio.run(place_members(trained_model, members, {}, GRID, Deadline(1000)))
+        reasons.append(reason)
+        if reason is None:
+            break
+
+    assert reasons[0] == DEGRADED_ESTIMATE
+    assert reasons[-1] is None  # 감쇠 후 ML 재실행
+    # 실제 ML 관측이 추정치에 다시 반영됨
+    assert latency_budget.estimate_recommend_ms(len(members)) < 1000
+
+
+def test_unbudgeted_request_always_runs_ml(trained_model):
+    members = make_members(20)
+    latency_budget.observe_recommend(len(members), 1e9)
+
+    _, reason = asyncio.run(place_members(trained_model, members, {}, GRID, None))
+
+    assert reason is None
@@ -0,0 +1,49 @@
+"""
+로깅 설정 수명 (app/logging_config.py, app/main.py lifespan)
+
+- app.main import만으로는 루트 핸들러를 바꾸거나 큐 리스너를 시작하지 않음
+- setup_logging → shutdown_logging 후 리스너 스레드가 멈추고 루트 / uvicorn 로거 설정이 복원됨
+"""
+import logging
+import subprocess
+import sys
+import threading
+
+from app import logging_config
+
+
+def test_importing_app_leaves_logging_alone():
+    code = (
+        "import logging, threading\n"
+        "before = list(logging.getLogger().handlers)\n"
+        "import app.main\n"
+        "from app import logging_config\n"
+        "assert logging.getLogger().handlers == before\n"
+        "assert logging_config._listener is None\n"
+        "assert threading.active_count() == 1\n"
+    )
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+
+
+def test_shutdown_stops_listener_and_restores_handlers():
+    root = logging.getLogger()
+    uvicorn_error = logging.getLogger("uvicorn.error")
+    before = (list(root.handlers), root.level, list(uvicorn_error.handlers), uvicorn_error.propagate)
+    threads = threading.active_count()
+
+    logging_config.setup_logging(level="INFO", fmt="text")
+    try:
+        assert isinstance(root.handlers[0], logging_config._QueueHandler)
+        assert threading.active_count() == threads + 1
+    finally:
+        logging_config.shutdown_logging()
+
+    assert logging_config._listener is None
+    assert threading.active_count() == threads
+    assert (list(root.handlers), root.level, list(uvicorn_error.handlers), uvicorn_error.propagate) == before
+
+    # 다시 시작할 수 있음 (테스트 클라이언트 / 재시작)
+    logging_config.setup_logging(level="INFO", fmt="text")
+    logging_config.shutdown_logging()
+    assert list(root.handlers) == before[0]
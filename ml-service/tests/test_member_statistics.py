@@ -0,0 +1,89 @@
+"""
+대원별 좌석 통계 (app/services/member_stats_engine.py, 반감기 0)
+
+벡터화 전체 재계산(rebuild)과 배치별 증분 반영(update)이
+이전 루프 구현(scripts/bench_member_statistics.legacy_member_statistics)과
+값 / 타입 / 대원 순서까지 같은지 확인
+"""
+import pytest
+
+from app.services.corpus_loader import seat_columns
+from app.services.member_stats_engine import MemberStatsEngine, rebuild_member_statistics
+from scripts.bench_member_statistics import legacy_member_statistics
+from scripts.benchmark_utils import make_synthetic_arrangements
+
+
+def seat(member_id, part, row, col):
+    return {"member_id": member_id, "part": part, "row": row, "col": col}
+
+
+def arrangement(*seats):
+    return {"seats": list(seats)}
+
+
+def incremental_member_statistics(arrangements):
+    engine = MemberStatsEngine(half_life_days=0)
+    for record in arrangements:
+        engine.update(record)
+    return engine.stats(), engine.parts()
+
+
+@pytest.fixture(params=["rebuild", "incremental"])
+def compute(request):
+    if request.param == "rebuild":
+        return lambda arrangements: rebuild_member_statistics(arrangements, half_life_days=0)
+    return incremental_member_statistics
+
+
+def assert_same_as_legacy(compute, arrangements):
+    expected_stats, expected_parts = legacy_member_statistics(arrangements)
+    stats, parts = compute(arrangements)
+
+    assert stats == expected_stats
+    assert parts == expected_parts
+    assert list(stats) == list(expected_stats)
+    assert list(parts) == list(expected_parts)
+    for member_id, member_stats in stats.items():
+        for key, value in member_stats.items():
+            assert type(value) is type(expected_stats[member_id][key]), (member_id, key)
+
+
+@pytest.mark.parametrize("n_arrangements, scale, seed", [(1, 0.2, 0), (20, 1.0, 1), (60, 0.5, 2)])
+def test_matches_legacy_on_synthetic_corpus(compute, n_arrangements, scale, seed):
+    assert_same_as_legacy(compute, make_synthetic_arrangements(n_arrangements, scale, seed))
+
+
+def test_matches_legacy_with_parsed_seat_columns(compute):
+    arrangements = make_synthetic_arrangements(10, 0.5)
+    for record in arrangements:
+        record["seat_columns"] = seat_columns(record["seats"])
+
+    assert_same_as_legacy(compute, arrangements)
+
+
+def test_edge_cases_match_legacy(compute):
+    arrangements = [
+        # 행 동률: 먼저 앉은 행이 최빈 행 (Counter.most_common)
+        arrangement(seat("tie", "ALTO", 3, 4), seat("skip", "SPECIAL", 1, 1), seat(None, "SOPRANO", 1, 1)),
+        arrangement(seat("tie", "ALTO", 1, 8), seat("moved", "TENOR", 4, 2)),
+        arrangement(seat("tie", "ALTO", 1, 9), seat("moved", "BASS", 5, 2), seat("", "BASS", 5, 3)),
+        arrangement(seat("tie", "ALTO", 3, 4)),
+        # 평균 열이 .5 (은행원 반올림) / 열 허용 범위 경계
+        arrangement(seat("half", "SOPRANO", 2, 1), seat("fixed", "TENOR", 4, 5)),
+        arrangement(seat("half", "SOPRANO", 2, 2), seat("fixed", "TENOR", 4, 5)),
+        arrangement(seat("fixed", "TENOR", 4, 5)),
+        arrangement(),
+    ]
+    assert_same_as_legacy(compute, arrangements)
+
+    stats, parts = compute(arrangements)
+    assert stats["tie"]["preferred_row"] == 3
+    assert stats["half"]["preferred_col"] == 2
+    assert stats["fixed"]["is_fixed_seat"] is True
+    assert parts["moved"] == "BASS"
+    assert "skip" not in stats and "" not in stats
+
+
+def test_empty_corpus(compute):
+    assert compute([]) == ({}, {})
+    assert compute([arrangement(seat("x", "SPECIAL", 1, 1))]) == ({}, {})
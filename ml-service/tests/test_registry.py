@@ -0,0 +1,162 @@
+"""
+모델 레지스트리 (app/models/registry.py)
+
+- 인덱스: 등록 순서 / primary 지정
+- 정리: 최근 keep개만 보관, primary와 보호 버전(섀도우/A/B)은 제외
+- 같은 초 / 같은 지문으로 등록해도 버전 ID가 겹치지 않음
+- 여러 프로세스가 동시에 등록해도 인덱스 변경이 사라지지 않음 (파일 잠금)
+- 버전 승격(/model/versions/{version}/promote)은 /train과 같은 잠금으로 직렬화
+"""
+import asyncio
+import copy
+import multiprocessing
+import os
+from datetime import datetime
+
+import pytest
+
+from app.models import registry as registry_module
+from app.models.registry import ModelRegistry
+from app.models.seat_recommender import SeatRecommender, serving_bundle_path
+from app.models.serving import ModelServer
+
+
+METRICS = {"row_accuracy": 0.5}
+
+
+@pytest.fixture
+def model(trained_model):
+    # register()가 metadata를 바꾸므로 공유 모델의 사본 사용
+    return copy.deepcopy(trained_model)
+
+
+def register(registry, model, tag: str, **kwargs):
+    """같은 초에 등록해도 버전이 겹치지 않도록 지문으로 구분"""
+    return registry.register(model, METRICS, f"{tag * 8}", fit_seconds=0.1, **kwargs)["version"]
+
+
+def test_register_writes_index_and_bundle(tmp_path, model):
+    registry = ModelRegistry(root=str(tmp_path), keep=3)
+
+    version = register(registry, model, "a")
+
+    meta = registry.get(version)
+    assert registry.primary_version == version
+    assert meta["metrics"] == METRICS
+    assert meta["fingerprint"] == "a" * 8
+    assert meta["size_bytes"] == os.path.getsize(registry.path_for(version))
+    assert model.metadata["version"] == version
+    assert registry.load(version).metadata["version"] == version
+
+
+def test_list_versions_newest_first_and_promote(tmp_path, model):
+    registry = ModelRegistry(root=str(tmp_path), keep=3)
+
+    first = register(registry, model, "a")
+    second = register(registry, model, "b", promote=False)
+
+    assert [v["version"] for v in registry.list_versions()] == [second, first]
+    assert registry.primary_version == first
+
+    registry.set_primary(second)
+    assert registry.primary_version == second
+    with pytest.raises(ValueError):
+        registry.set_primary("missing")
+    with pytest.raises(ValueError):
+        registry.load("missing")
+
+
+def test_prune_keeps_recent_versions(tmp_path, model):
+    registry = ModelRegistry(root=str(tmp_path), keep=2)
+
+    versions = [register(registry, model, tag) for tag in "abc"]
+
+    assert [v["version"] for v in registry.list_versions()] == versions[:0:-1]
+    pruned = registry.path_for(versions[0])
+    assert not os.path.exists(pruned)
+    assert not os.path.exists(serving_bundle_path(pruned))
+    assert os.path.exists(registry.path_for(versions[-1]))
+
+
+def test_prune_skips_primary_and_protected(tmp_path, model):
+    registry = ModelRegistry(root=str(tmp_path), keep=2)
+
+    primary = register(registry, model, "a")
+    shadow = register(registry, model, "b", promote=False)
+    register(registry, model, "c", promote=False, protected=[shadow])
+    newest = register(registry, model, "d", promote=False, protected=[shadow])
+
+    kept = {v["version"] for v in registry.list_versions()}
+    # keep=2를 넘더라도 primary / 서빙 중인 버전은 남고, 보호되지 않은 오래된 버전만 삭제
+    assert kept == {primary, shadow, newest}
+    assert registry.primary_version == primary
+    for version in kept:
+        assert os.path.exists(registry.path_for(version))
+
+
+def test_same_second_registrations_get_distinct_versions(tmp_path, model, monkeypatch):
+    class FrozenDatetime(datetime):
+        @classmethod
+        def now(cls, tz=None):
+            return datetime(2026, 1, 4, 10, 0, 0, tzinfo=tz)
+
+    monkeypatch.setattr(registry_module, "datetime", FrozenDatetime)
+    registry = ModelRegistry(root=str(tmp_path), keep=5)
+
+    versions = [register(registry, copy.deepcopy(model), "a", promote=False) for _ in range(3)]
+
+    assert versions == ["20260104T100000-aaaaaaaa", "20260104T100000-aaaaaaaa-2", "20260104T100000-aaaaaaaa-3"]
+    assert [v["version"] for v in registry.list_versions()] == versions[::-1]
+    for version in versions:
+        assert registry.load(version).metadata["version"] == version
+
+
+def register_from_process(root: str, bundle: str, worker: int, rounds: int) -> None:
+    """저장된 모델을 읽어 다른 지문으로 여러 번 등록 (다른 프로세스와 동시 실행)"""
+    model = SeatRecommender()
+    model.load_model(bundle, mmap=False)
+    registry = ModelRegistry(root=root, keep=100)
+    for i in range(rounds):
+        registry.register(copy.deepcopy(model), METRICS, f"{worker}{i}" * 4, fit_seconds=0.1, promote=False)
+
+
+def test_concurrent_registrations_across_processes(tmp_path, model):
+    bundle = str(tmp_path / "source.joblib")
+    model.save_model(bundle)
+    root = str(tmp_path / "registry")
+
+    context = multiprocessing.get_context("spawn")
+    workers = [context.Process(target=register_from_process, args=(root, bundle, w, 3)) for w in range(3)]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join(timeout=120)
+
+    assert [process.exitcode for process in workers] == [0, 0, 0]
+    versions = ModelRegistry(root=root).list_versions()
+    assert len(versions) == 9
+    assert all(os.path.exists(ModelRegistry(root=root).path_for(v["version"])) for v in versions)
+
+
+def test_promote_waits_for_training(tmp_path, model, monkeypatch):
+    from app.routers import train
+
+    registry = ModelRegistry(root=str(tmp_path), keep=3)
+    primary = register(registry, model, "a")
+    candidate = register(registry, copy.deepcopy(model), "b", promote=False)
+    server = ModelServer(registry.load(primary), registry)
+    monkeypatch.setattr(train, "model_registry", registry)
+    monkeypatch.setattr(train, "model_server", server)
+    monkeypatch.setattr(train, "_train_lock", asyncio.Lock())
+
+    async def scenario():
+        async with train._train_lock:  # 학습 중
+            promote = asyncio.create_task(train.promote_model_version(candidate))
+            await asyncio.sleep(0.2)
+            assert not promote.done()
+            assert registry.primary_version == primary
+        assert await promote == {"primary": candidate}
+
+    asyncio.run(scenario())
+    assert registry.primary_version == candidate
+    assert server.primary_version == candidate
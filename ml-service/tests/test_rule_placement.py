@@ -0,0 +1,87 @@
+"""규칙 기반 배치 엔진 (app/models/rule_placement.py)"""
+import pytest
+
+from app.models.rule_placement import rule_based_recommend
+from app.models.seat_recommender import PART_RULES
+from app.models.serving import default_grid_layout
+from tests.conftest import make_members
+
+
+def rule_capacity(members, capacities) -> int:
+    """행 규칙 안에서 앉힐 수 있는 최대 인원 (TENOR/BASS 4-6행, ALTO 1-4행, SOPRANO 전체)"""
+    counts = {part: sum(m["part"] == part for m in members) for part in PART_RULES}
+
+    def seats(rows):
+        return sum(capacities[r - 1] for r in rows if r <= len(capacities))
+
+    low_voices = min(counts["TENOR"] + counts["BASS"], seats([4, 5, 6]))
+    low_voices_row4 = max(0, low_voices - seats([5, 6]))
+    altos = min(counts["ALTO"], seats([1, 2, 3, 4]) - low_voices_row4)
+    return min(len(members), low_voices + altos + counts["SOPRANO"], sum(capacities))
+
+
+def assert_valid(result, capacities):
+    seats = [(r["row"], r["col"]) for r in result]
+    assert len(set(seats)) == len(seats)
+    for r in result:
+        rule = PART_RULES[r["part"]]
+        assert r["row"] in rule["preferred_rows"] + rule["overflow_rows"]
+        assert 1 <= r["col"] <= capacities[r["row"] - 1]
+
+
+@pytest.mark.parametrize("n", [20, 30, 60, 80, 120, 200])
+@pytest.mark.parametrize("seed", range(20))
+def test_places_everyone_the_row_rules_allow(n, seed):
+    members = make_members(n, seed)
+    grid = default_grid_layout(n)
+    result = rule_based_recommend(members, {}, grid)
+
+    assert_valid(result, grid["row_capacities"])
+    assert len(result) == rule_capacity(members, grid["row_capacities"])
+
+
+@pytest.mark.parametrize("n", [12, 30, 60, 90])
+def test_places_everyone_when_roster_fits(n):
+    # 파트가 고르게 섞인 로스터는 정원 안이면 모두 배치
+    members = [
+        {"id": f"m{i}", "name": f"M{i}", "part": part}
+        for i, part in enumerate(["SOPRANO", "ALTO", "TENOR", "BASS"] * (n // 4) + ["SOPRANO"] * (n % 4))
+    ]
+    grid = {"rows": 6, "row_capacities": [n // 6 + 1] * 6}
+    assert n <= sum(grid["row_capacities"])
+
+    result = rule_based_recommend(members, {}, grid)
+
+    assert_valid(result, grid["row_capacities"])
+    assert len(result) == n
+
+
+def test_alto_takes_row_four_before_soprano_overflow():
+    # 1-3행이 가득 차면 4행만 쓸 수 있는 ALTO가 5-6행도 쓸 수 있는 SOPRANO보다 4행을 먼저 받음
+    members = make_members(10, parts=["SOPRANO"]) + [
+        {"id": f"a{i}", "name": f"A{i}", "part": "ALTO"} for i in range(8)
+    ]
+    grid = {"rows": 6, "row_capacities": [4] * 6}
+
+    result = rule_based_recommend(members, {}, grid)
+
+    assert len(result) == len(members)
+    assert all(r["row"] <= 4 for r in result if r["part"] == "ALTO")
+
+
+def test_preferred_side_and_input_order():
+    members = [
+        {"id": "s", "name": "S", "part": "SOPRANO"},
+        {"id": "a", "name": "A", "part": "ALTO"},
+        {"id": "t", "name": "T", "part": "TENOR"},
+        {"id": "b", "name": "B", "part": "BASS"},
+    ]
+    grid = {"rows": 6, "row_capacities": [8] * 6}
+
+    result = rule_based_recommend(members, {}, grid)
+
+    assert [r["member_id"] for r in result] == ["s", "a", "t", "b"]
+    by_id = {r["member_id"]: r for r in result}
+    assert by_id["s"]["col"] <= 4 and by_id["t"]["col"] <= 4
+    assert by_id["a"]["col"] > 4 and by_id["b"]["col"] > 4
+    assert by_id["s"]["row"] <= 3 and by_id["t"]["row"] >= 4
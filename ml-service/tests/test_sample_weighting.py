@@ -0,0 +1,126 @@
+"""
+학습 샘플 중복 제거 / 가중치 (app/models/sample_weighting.py)
+
+- 같은 피처·레이블 행 → 반복 횟수 가중치의 샘플 하나 (처음 등장한 순서)
+- 컨텍스트 단위 묶음의 가중 평균 피처
+- 코어셋 추출의 칸별 총 가중치 보존
+- 가중 샘플 학습이 중복 행 학습과 같은 모델을 만드는지
+"""
+import numpy as np
+import pytest
+from sklearn.ensemble import GradientBoostingClassifier
+
+from app.models.sample_weighting import (
+    coreset_samples,
+    deduplicate_samples,
+    reduce_training_samples,
+    reduction_summary,
+    weighted_tree_params,
+)
+
+
+def repeated_rows(seed: int = 0, n_unique: int = 40):
+    """고유 행을 1-5회씩 반복하고 섞은 학습 행렬"""
+    rng = np.random.default_rng(seed)
+    X_unique = rng.integers(0, 4, size=(n_unique, 5)).astype(np.float32)
+    y_row_unique = rng.integers(1, 4, size=n_unique)
+    y_col_unique = rng.integers(1, 6, size=n_unique)
+    counts = rng.integers(1, 6, size=n_unique)
+    index = rng.permutation(np.repeat(np.arange(n_unique), counts))
+    return X_unique[index], y_row_unique[index], y_col_unique[index]
+
+
+def test_exact_duplicates_become_weights():
+    X, y_row, y_col = repeated_rows()
+
+    samples = deduplicate_samples(X, y_row, y_col)
+
+    keys = [tuple(x) + (r, c) for x, r, c in zip(X.tolist(), y_row, y_col)]
+    first_seen = list(dict.fromkeys(keys))
+    assert [tuple(x) + (r, c) for x, r, c in zip(
+        samples["X"].tolist(), samples["y_row"], samples["y_col"]
+    )] == first_seen
+    assert samples["weights"].tolist() == [keys.count(k) for k in first_seen]
+    assert samples["weights"].sum() == len(X)
+    assert samples["X"].dtype == np.float32
+
+
+def test_same_features_with_different_labels_are_kept():
+    X = np.zeros((4, 3))
+    samples = deduplicate_samples(X, np.array([1, 1, 2, 1]), np.array([3, 3, 3, 4]))
+
+    assert samples["y_row"].tolist() == [1, 2, 1]
+    assert samples["y_col"].tolist() == [3, 3, 4]
+    assert samples["weights"].tolist() == [2, 1, 1]
+
+
+def test_negative_zero_matches_zero():
+    X = np.array([[0.0, 1.0], [-0.0, 1.0]])
+    samples = deduplicate_samples(X, np.array([1, 1]), np.array([1, 1]))
+
+    assert samples["weights"].tolist() == [2]
+
+
+def test_context_step_merges_with_weighted_mean():
+    X = np.array([[1.0, 0.50], [1.0, 0.51], [1.0, 0.90], [2.0, 0.50]])
+    y = np.ones(4, dtype=int)
+
+    exact = deduplicate_samples(X, y, y, context_columns=[1], context_step=0.0)
+    merged = deduplicate_samples(X, y, y, weights=np.array([1.0, 3.0, 1.0, 1.0]),
+                                 context_columns=[1], context_step=0.1)
+
+    assert len(exact["X"]) == 4
+    assert merged["weights"].tolist() == [4.0, 1.0, 1.0]
+    np.testing.assert_allclose(merged["X"][0], [1.0, (0.50 + 3 * 0.51) / 4])
+    np.testing.assert_allclose(merged["X"][1:], X[2:])
+
+
+@pytest.mark.parametrize("fraction", [0.2, 0.5])
+def test_coreset_preserves_cell_weight(fraction):
+    X, y_row, y_col = repeated_rows(seed=1, n_unique=200)
+    samples = deduplicate_samples(X, y_row, y_col)
+
+    reduced = coreset_samples(samples["X"], samples["y_row"], samples["y_col"], samples["weights"], fraction)
+
+    cells = set(zip(samples["y_row"].tolist(), samples["y_col"].tolist()))
+    for row, col in cells:
+        before = (samples["y_row"] == row) & (samples["y_col"] == col)
+        after = (reduced["y_row"] == row) & (reduced["y_col"] == col)
+        assert after.sum() == int(np.ceil(before.sum() * fraction))
+        assert reduced["weights"][after].sum() == pytest.approx(samples["weights"][before].sum())
+
+    again = coreset_samples(samples["X"], samples["y_row"], samples["y_col"], samples["weights"], fraction)
+    assert np.array_equal(again["X"], reduced["X"])
+
+
+def test_reduce_training_samples_switches():
+    X, y_row, y_col = repeated_rows(seed=2)
+
+    plain = reduce_training_samples(X, y_row, y_col, dedup=False)
+    assert plain["X"] is X
+    assert plain["weights"].tolist() == [1.0] * len(X)
+
+    reduced = reduce_training_samples(X, y_row, y_col, dedup=True, coreset_fraction=0.5)
+    assert reduced["weights"].sum() == pytest.approx(len(X))
+    assert reduction_summary(len(X), reduced)["fit_rows"] == len(reduced["X"])
+
+
+def test_weighted_fit_matches_repeated_rows():
+    X, y_row, y_col = repeated_rows(seed=3, n_unique=60)
+    samples = deduplicate_samples(X, y_row, y_col)
+    params = {"n_estimators": 15, "max_depth": 3, "random_state": 0}
+
+    full = GradientBoostingClassifier(**params).fit(X, y_col)
+    weighted = GradientBoostingClassifier(**params).fit(
+        samples["X"], samples["y_col"], sample_weight=samples["weights"]
+    )
+
+    np.testing.assert_allclose(weighted.predict_proba(X), full.predict_proba(X), atol=1e-8)
+
+
+def test_weighted_tree_params():
+    params = {"max_depth": 6, "min_samples_split": 5, "min_samples_leaf": 2}
+
+    assert weighted_tree_params(params, 1000.0) == {"max_depth": 6, "min_weight_fraction_leaf": 0.002}
+    assert weighted_tree_params({"min_samples_leaf": 2}, 2.0) == {"min_weight_fraction_leaf": 0.5}
+    assert weighted_tree_params({"min_samples_leaf": 1}, 1000.0) == {}
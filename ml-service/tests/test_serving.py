@@ -0,0 +1,188 @@
+"""
+모델 서빙 라우팅 (app/models/serving.py)
+
+- A/B 가중치 라우팅 / 설정 검증
+- 섀도우 평가 통계
+- 라우팅 중인 버전의 레지스트리 정리 보호
+- 번들이 없는 버전 설정 → 404, 등록되지 않은 버전 → 400
+"""
+import copy
+import os
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.models.registry import ModelRegistry
+from app.models.serving import PRIMARY_ALIAS, ModelServer, count_disagreements
+from tests.conftest import make_members
+
+
+@pytest.fixture
+def server(tmp_path, trained_model):
+    """primary(a) + 미승격 버전(b)이 등록된 레지스트리를 쓰는 서버"""
+    registry = ModelRegistry(root=str(tmp_path), keep=2)
+    primary = copy.deepcopy(trained_model)
+    registry.register(primary, {}, "a" * 8, fit_seconds=0.1)
+    registry.register(copy.deepcopy(trained_model), {}, "b" * 8, fit_seconds=0.1, promote=False)
+
+    server = ModelServer(primary, registry)
+    server.ab_weights = {}
+    server.shadow_version = None
+    server._rng = random.Random(0)
+    return server
+
+
+def candidate_version(server) -> str:
+    return next(v["version"] for v in server.registry.list_versions() if v["version"] != server.primary_version)
+
+
+def test_select_defaults_to_primary(server):
+    assert server.select() == (server.primary_version, server.primary)
+
+
+def test_ab_weights_route_between_versions(server):
+    candidate = candidate_version(server)
+
+    server.configure(ab_weights={candidate: 1.0, PRIMARY_ALIAS: 0.0})
+    assert {server.select()[0] for _ in range(20)} == {candidate}
+
+    server.configure(ab_weights={candidate: 1.0, PRIMARY_ALIAS: 1.0})
+    assert {server.select()[0] for _ in range(50)} == {candidate, server.primary_version}
+    assert server.select()[1] is not None
+
+
+def test_configure_validates_versions(server):
+    with pytest.raises(ValueError):
+        server.configure(ab_weights={"missing": 1.0})
+    with pytest.raises(ValueError):
+        server.configure(ab_weights={candidate_version(server): -1.0})
+    with pytest.raises(ValueError):
+        server.configure(shadow_version="missing")
+
+    assert server.ab_weights == {}
+    assert server.shadow_version is None
+
+
+def test_routed_versions_survive_pruning(server, trained_model):
+    candidate = candidate_version(server)
+    server.configure(shadow_version=candidate)
+    assert server.protected_versions == [candidate]
+
+    for tag in "cd":
+        server.registry.register(copy.deepcopy(trained_model), {}, tag * 8, fit_seconds=0.1,
+                                 promote=False, protected=server.protected_versions)
+
+    kept = {v["version"] for v in server.registry.list_versions()}
+    assert {server.primary_version, candidate} <= kept
+
+
+def test_shadow_records_comparison(server):
+    candidate = candidate_version(server)
+    server.configure(shadow_version=candidate, shadow_sample_rate=1.0)
+    members = make_members(30)
+    grid = {"rows": 6, "row_capacities": [15] * 6, "zigzag_pattern": "even"}
+
+    assert server.should_shadow()
+    served = server.primary.recommend(members, {}, grid)
+    server.run_shadow(members, {}, grid, served)
+
+    snapshot = server.status()["shadow"]
+    assert snapshot["version"] == candidate
+    assert snapshot["requests"] == 1
+    assert snapshot["errors"] == 0
+    assert snapshot["members_compared"] == len(members)
+    # 같은 학습 결과의 다른 버전이므로 배치가 같음
+    assert snapshot["disagreement_rate"] == 0.0
+
+
+def shifted(recommendations):
+    """모든 대원을 한 열 옮긴 배치 (비교 기준 확인용)"""
+    return [{**r, "col": r["col"] + 1} for r in recommendations]
+
+
+def test_shadow_baseline_is_served_primary_result(server):
+    candidate = candidate_version(server)
+    server.configure(shadow_version=candidate, shadow_sample_rate=1.0)
+    members = make_members(30)
+    grid = {"rows": 6, "row_capacities": [15] * 6, "zigzag_pattern": "even"}
+    served = shifted(server.primary.recommend(members, {}, grid))
+
+    server.run_shadow(members, {}, grid, served, server.primary_version)
+
+    snapshot = server.status()["shadow"]
+    assert snapshot["disagreement_rate"] == 1.0
+    assert snapshot["baseline_recomputed"] == 0
+
+
+def test_shadow_baseline_recomputed_when_ab_version_served(server):
+    candidate = candidate_version(server)
+    server.configure(shadow_version=candidate, shadow_sample_rate=1.0, ab_weights={candidate: 1.0})
+    members = make_members(30)
+    grid = {"rows": 6, "row_capacities": [15] * 6, "zigzag_pattern": "even"}
+    served_version, served_model = server.select()
+    assert served_version == candidate
+    # A/B 버전의 응답이 primary와 달라도 섀도우는 primary 결과와 비교
+    served = shifted(served_model.recommend(members, {}, grid))
+
+    server.run_shadow(members, {}, grid, served, served_version)
+
+    snapshot = server.status()["shadow"]
+    assert snapshot["baseline_version"] == "primary"
+    assert snapshot["baseline_recomputed"] == 1
+    assert snapshot["disagreement_rate"] == 0.0
+
+
+def test_configure_missing_bundle_is_not_found(server):
+    candidate = candidate_version(server)
+    os.remove(server.registry.path_for(candidate))
+
+    with pytest.raises(FileNotFoundError):
+        server.configure(shadow_version=candidate)
+    assert server.shadow_version is None
+
+
+def test_serving_endpoint_maps_version_errors(server, monkeypatch):
+    from app.main import app
+    from app.routers import train
+
+    monkeypatch.setattr(train, "model_server", server)
+    client = TestClient(app)
+    candidate = candidate_version(server)
+
+    assert client.put("/api/v1/model/serving", json={"shadowVersion": "missing"}).status_code == 400
+    assert client.put("/api/v1/model/serving", json={"abWeights": {candidate: -1}}).status_code == 400
+
+    os.remove(server.registry.path_for(candidate))
+    response = client.put("/api/v1/model/serving", json={"shadowVersion": candidate})
+    assert response.status_code == 404
+    assert candidate in response.json()["detail"]
+
+
+def test_unrouted_variants_released(server):
+    candidate = candidate_version(server)
+    server.configure(shadow_version=candidate)
+    assert [v for v, _ in server.loaded_models()] == [server.primary_version, candidate]
+
+    server.configure(shadow_version="")
+    assert server.shadow_version is None
+    assert [v for v, _ in server.loaded_models()] == [server.primary_version]
+
+
+def test_set_primary_drops_variant_of_same_version(server):
+    candidate = candidate_version(server)
+    server.configure(ab_weights={candidate: 1.0})
+
+    promoted = server.registry.load(candidate)
+    server.set_primary(promoted)
+
+    assert server.primary is promoted
+    assert server.select() == (candidate, promoted)
+    assert [v for v, _ in server.loaded_models()] == [candidate]
+
+
+def test_count_disagreements():
+    served = [{"member_id": "a", "row": 1, "col": 1}, {"member_id": "b", "row": 1, "col": 2}]
+    shadow = [{"member_id": "a", "row": 1, "col": 1}, {"member_id": "c", "row": 2, "col": 1}]
+
+    assert count_disagreements(served, shadow) == (3, 2)
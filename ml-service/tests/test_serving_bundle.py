@@ -0,0 +1,65 @@
+"""
+mmap 서빙 번들과 전체 번들의 짝 맞추기 (app/models/seat_recommender.py)
+
+- 서빙 번들은 전체 번들 내용의 SHA-256으로 짝을 확인 (크기가 같아도 내용이 다르면 전체 번들 사용)
+- mmap 로드 후 전체 번들이 교체되면 추정기를 읽을 때 전체 번들 기준으로 다시 로드
+"""
+import copy
+import os
+import shutil
+
+from app.models.seat_recommender import SeatRecommender, serving_bundle_path
+
+
+def save_variant(trained_model, path: str, tag: str) -> SeatRecommender:
+    """메타데이터만 다른 (번들 크기가 같은) 모델 저장"""
+    model = copy.deepcopy(trained_model)
+    model.metadata["variant"] = tag
+    model.save_model(path)
+    return model
+
+
+def test_same_size_bundle_with_other_content_is_not_paired(tmp_path, trained_model):
+    path = str(tmp_path / "model.joblib")
+    save_variant(trained_model, path, "a")
+    stale_serving = str(tmp_path / "a.serving.joblib")
+    shutil.copyfile(serving_bundle_path(path), stale_serving)
+    size_a = os.path.getsize(path)
+
+    save_variant(trained_model, path, "b")
+    assert os.path.getsize(path) == size_a
+    shutil.copyfile(stale_serving, serving_bundle_path(path))
+
+    loaded = SeatRecommender()
+    loaded.load_model(path, mmap=True)
+    assert loaded.load_info["mode"] == "full"
+    assert loaded.metadata["variant"] == "b"
+
+
+def test_copied_bundle_pair_still_maps(tmp_path, trained_model):
+    src = str(tmp_path / "model.joblib")
+    save_variant(trained_model, src, "a")
+    dst = str(tmp_path / "copy" / "model.joblib")
+    os.makedirs(os.path.dirname(dst))
+    shutil.copyfile(src, dst)
+    shutil.copyfile(serving_bundle_path(src), serving_bundle_path(dst))
+
+    loaded = SeatRecommender()
+    loaded.load_model(dst, mmap=True)
+    assert loaded.load_info["mode"] == "mmap"
+
+
+def test_full_bundle_replaced_after_mmap_load(tmp_path, trained_model):
+    path = str(tmp_path / "model.joblib")
+    save_variant(trained_model, path, "a")
+    loaded = SeatRecommender()
+    loaded.load_model(path, mmap=True)
+    assert loaded.load_info["mode"] == "mmap"
+
+    other = str(tmp_path / "other.joblib")
+    save_variant(trained_model, other, "b")
+    shutil.copyfile(other, path)  # 서빙 번들은 그대로, 전체 번들만 교체
+
+    assert loaded.row_model is not None
+    assert loaded.load_info["mode"] == "full"
+    assert loaded.metadata["variant"] == "b"
@@ -0,0 +1,139 @@
+"""
+감쇠 대원 통계 동기화 / 서빙 통계 기준
+
+- 기본 설정(반감기 0)의 통계 = 이전 통계 (DB 트리거 / 루프 구현과 같은 값)
+- /stats/sync 업서트 행은 decayed_* 열과 반감기만 (트리거 통계 / 원시 집계 열 없음)
+- 감쇠 통계로 학습한 모델은 같은 반감기의 DB 행만 스냅샷 대원에 덮어씀
+- 섀도우 모델용 DB 통계는 거르기 전 행 그대로
+"""
+import copy
+import uuid
+
+import pytest
+
+from app.config import settings
+from app.models.serving import request_db_stats
+from app.models.stats_snapshot import MemberStatsSnapshot, StatsOverlay
+from app.services.member_stats_engine import DECAYED_PREFIX, MemberStatsEngine
+from app.services.supabase_client import STATS_COLUMNS
+from scripts.bench_member_statistics import legacy_member_statistics
+from scripts.benchmark_utils import make_synthetic_arrangements
+
+
+def member_id(name: str) -> str:
+    return str(uuid.uuid5(uuid.NAMESPACE_URL, name))
+
+
+def arrangement(day: str, *seats):
+    return {
+        "date": day,
+        "seats": [{"member_id": m, "part": "ALTO", "row": r, "col": c} for m, r, c in seats],
+    }
+
+
+def stats_row(preferred_row: int, half_life=None) -> dict:
+    return {
+        "preferred_row": preferred_row, "preferred_col": 5, "row_consistency": 80.0,
+        "col_consistency": 80.0, "is_fixed_seat": False, "total_appearances": 4,
+        "stats_half_life_days": half_life,
+    }
+
+
+def test_default_config_keeps_previous_stats():
+    """감쇠는 opt-in: 기본 설정은 전체 재계산 / 증분 반영 모두 이전 통계와 같음"""
+    assert settings.MEMBER_STATS_HALF_LIFE_DAYS == 0
+    arrangements = make_synthetic_arrangements(n_arrangements=30, members_per_part_scale=0.5)
+    expected, expected_parts = legacy_member_statistics(arrangements)
+
+    rebuilt = MemberStatsEngine(workers=2)
+    rebuilt.rebuild(arrangements)
+    incremental = MemberStatsEngine()
+    for arrangement in arrangements:
+        incremental.update(arrangement)
+
+    for engine in (rebuilt, incremental):
+        stats = engine.stats()
+        assert stats == expected
+        assert engine.parts() == expected_parts
+        for member_id, member_stats in stats.items():
+            for key, value in member_stats.items():
+                assert type(value) is type(expected[member_id][key]), (member_id, key)
+
+
+def test_default_model_overlays_trigger_rows(trained_model):
+    """반감기 0으로 학습한 모델은 트리거 통계 행(stats_half_life_days 없음)을 그대로 덮어씀"""
+    model = copy.deepcopy(trained_model)
+    model.stats_snapshot = MemberStatsSnapshot.from_stats({"a": stats_row(1)})
+    model.metadata = {**model.metadata, "stats_half_life_days": 0.0}
+
+    assert model.member_stats({"a": stats_row(3)})["a"]["preferred_row"] == 3
+
+
+def test_upsert_rows_only_touch_decayed_columns():
+    engine = MemberStatsEngine(half_life_days=30.0, workers=1)
+    alto = member_id("alto")
+    engine.rebuild([
+        arrangement("2026-01-01", (alto, 1, 3), ("unknown_1", 2, 2)),
+        arrangement("2026-03-01", (alto, 2, 4)),
+    ])
+
+    rows = engine.dirty_rows()
+
+    assert [row["member_id"] for row in rows] == [alto]
+    expected = {"member_id", "decayed_half_life_days", *(DECAYED_PREFIX + column for column in STATS_COLUMNS)}
+    assert set(rows[0]) == expected
+    assert rows[0]["decayed_half_life_days"] == 30.0
+    # 최근 자리(2행)가 반감기 감쇠로 우세
+    assert rows[0]["decayed_preferred_row"] == 2
+    assert rows[0]["decayed_total_appearances"] == 2
+
+
+def test_incremental_update_matches_rebuild():
+    first = arrangement("2026-01-01", ("a", 1, 3), ("b", 2, 2))
+    second = arrangement("2026-02-15", ("a", 2, 4), ("b", 2, 3))
+    rebuilt = MemberStatsEngine(half_life_days=30.0, workers=1)
+    rebuilt.rebuild([first, second])
+    incremental = MemberStatsEngine(half_life_days=30.0, workers=1)
+    incremental.update(first)
+    incremental.update(second)
+
+    assert incremental.stats() == rebuilt.stats()
+
+
+@pytest.fixture
+def decayed_model(trained_model):
+    """스냅샷 대원 a, b를 반감기 30일 통계로 학습한 것으로 간주한 모델"""
+    model = copy.deepcopy(trained_model)
+    model.stats_snapshot = MemberStatsSnapshot.from_stats({"a": stats_row(1), "b": stats_row(1)})
+    model.metadata = {**model.metadata, "stats_half_life_days": 30.0}
+    return model
+
+
+def test_overlay_only_uses_rows_with_model_half_life(decayed_model):
+    db_stats = {
+        "a": stats_row(3, half_life=30.0),   # 같은 반감기 → 덮어씀
+        "b": stats_row(4),                   # 트리거 통계 → 스냅샷 유지
+        "c": stats_row(5),                   # 스냅샷에 없는 대원 → DB 행 사용
+    }
+
+    member_stats = decayed_model.member_stats(db_stats)
+
+    assert isinstance(member_stats, StatsOverlay)
+    assert member_stats["a"]["preferred_row"] == 3
+    assert member_stats["b"]["preferred_row"] == 1
+    assert member_stats["c"]["preferred_row"] == 5
+    assert request_db_stats(member_stats) is db_stats
+
+
+def test_overlay_skips_other_half_life(decayed_model):
+    member_stats = decayed_model.member_stats({"a": stats_row(3, half_life=90.0)})
+
+    assert member_stats["a"]["preferred_row"] == 1
+
+
+def test_db_trained_model_overlays_all_rows(decayed_model):
+    decayed_model.metadata["stats_half_life_days"] = None
+
+    member_stats = decayed_model.member_stats({"b": stats_row(4)})
+
+    assert member_stats["b"]["preferred_row"] == 4
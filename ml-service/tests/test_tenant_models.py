@@ -0,0 +1,182 @@
+"""
+테넌트 모델 캐시 (app/models/tenant_models.py)
+
+- 메모리 예산 기반 LRU 제거 / 예산보다 큰 모델 단독 보관
+- 번들 교체 시 다시 로드
+- 같은 테넌트 동시 로드는 한 번만 (single-flight), 실패도 대기자에게 전달
+"""
+import asyncio
+import copy
+import os
+import threading
+
+import pytest
+
+from app.models.tenant_models import BUNDLE_FILENAME, TenantModelCache
+
+TENANTS = ("choir-a", "choir-b", "choir-c")
+
+
+@pytest.fixture(scope="module")
+def tenant_root(tmp_path_factory, trained_model):
+    root = tmp_path_factory.mktemp("tenants")
+    for tenant_id in TENANTS:
+        os.makedirs(root / tenant_id)
+        model = copy.deepcopy(trained_model)
+        model.metadata["version"] = tenant_id
+        model.save_model(str(root / tenant_id / BUNDLE_FILENAME))
+    return root
+
+
+@pytest.fixture(scope="module")
+def model_mb(tenant_root) -> float:
+    cache = TenantModelCache(root=str(tenant_root), budget_mb=1024)
+    cache.get(TENANTS[0])
+    return cache.resident_bytes / 2**20
+
+
+def resident(cache: TenantModelCache):
+    """최근 사용 순 테넌트"""
+    return [m["tenant_id"] for m in cache.status()["models"]]
+
+
+def test_lru_eviction_within_budget(tenant_root, model_mb):
+    cache = TenantModelCache(root=str(tenant_root), budget_mb=model_mb * 2.5)
+    a, b, c = TENANTS
+
+    model_a = cache.get(a)
+    cache.get(b)
+    assert cache.get(a) is model_a  # a를 최근 사용으로
+    cache.get(c)
+
+    assert resident(cache) == [c, a]
+    assert cache.resident_bytes <= cache.budget_bytes
+    status = cache.status()
+    assert (status["hits"], status["misses"], status["evictions"]) == (1, 3, 1)
+    assert cache.get_cached(b) is None
+    assert cache.get_cached(a) is model_a
+
+
+def test_oversized_model_kept_alone(tenant_root):
+    cache = TenantModelCache(root=str(tenant_root), budget_mb=0)
+    a, b, _ = TENANTS
+
+    cache.get(a)
+    model_b = cache.get(b)
+
+    assert resident(cache) == [b]
+    assert cache.get(b) is model_b
+    assert cache.evictions == 1
+
+
+def test_reload_when_bundle_changes(tenant_root, model_mb):
+    cache = TenantModelCache(root=str(tenant_root), budget_mb=model_mb * 4)
+    tenant_id = TENANTS[0]
+    path = cache.path_for(tenant_id)
+
+    first = cache.get(tenant_id)
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert cache.get_cached(tenant_id) is None
+    assert cache.get(tenant_id) is not first
+    assert cache.misses == 2
+
+
+def test_missing_and_invalid_tenants(tenant_root):
+    cache = TenantModelCache(root=str(tenant_root), budget_mb=64)
+
+    with pytest.raises(FileNotFoundError):
+        cache.get("unknown-choir")
+    with pytest.raises(ValueError):
+        cache.get("../choir-a")
+    assert cache.load_errors == 1
+    assert cache.evict(TENANTS[0]) is False
+
+
+def concurrent_get(cache: TenantModelCache, tenant_id: str, n_threads: int):
+    """n개 스레드가 동시에 get() — (결과 목록, 예외 목록)"""
+    results, errors = [], []
+
+    def worker():
+        try:
+            results.append(cache.get(tenant_id))
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker) for _ in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    return threads, results, errors
+
+
+def blocking_load(cache: TenantModelCache, fail: bool = False):
+    """첫 로드가 release될 때까지 멈추는 _load (로드 횟수 기록)"""
+    original = cache._load
+    release = threading.Event()
+    calls = []
+
+    def load(tenant_id, path):
+        calls.append(tenant_id)
+        release.wait(5)
+        if fail:
+            raise OSError("bundle read failed")
+        return original(tenant_id, path)
+
+    cache._load = load
+    return release, calls
+
+
+def wait_for_waiters(cache: TenantModelCache, n: int):
+    for _ in range(500):
+        if cache.coalesced >= n:
+            return
+        threading.Event().wait(0.01)
+
+
+def test_single_flight_load(tenant_root):
+    cache = TenantModelCache(root=str(tenant_root), budget_mb=64)
+    release, calls = blocking_load(cache)
+
+    threads, results, errors = concurrent_get(cache, TENANTS[0], 8)
+    wait_for_waiters(cache, 7)
+    assert cache.status()["loading"] == [TENANTS[0]]
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert errors == []
+    assert calls == [TENANTS[0]]
+    assert len(results) == 8 and all(model is results[0] for model in results)
+    assert (cache.misses, cache.coalesced) == (1, 7)
+    assert cache.status()["loading"] == []
+
+
+def test_single_flight_shares_failure(tenant_root):
+    cache = TenantModelCache(root=str(tenant_root), budget_mb=64)
+    release, calls = blocking_load(cache, fail=True)
+
+    threads, results, errors = concurrent_get(cache, TENANTS[1], 4)
+    wait_for_waiters(cache, 3)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == []
+    assert len(errors) == 4 and all(isinstance(e, OSError) for e in errors)
+    assert calls == [TENANTS[1]]
+    assert cache.load_errors == 1
+    # 실패한 로드는 남지 않으므로 다음 요청에서 다시 시도
+    del cache._load
+    assert cache.get(TENANTS[1]).metadata["version"] == TENANTS[1]
+
+
+def test_aget_loads_off_loop(tenant_root):
+    cache = TenantModelCache(root=str(tenant_root), budget_mb=64)
+
+    async def run():
+        return await cache.aget(TENANTS[2]), await cache.aget(TENANTS[2])
+
+    first, second = asyncio.run(run())
+    assert first is second
+    assert (cache.misses, cache.hits) == (1, 1)
@@ -0,0 +1,45 @@
+"""
+스케일링 전 배열 묶음으로 학습 (app/models/seat_recommender.py train_arrays)
+
+- 청크 partial_fit 스케일러 = 전체 fit 스케일러
+- float32 X는 사본 없이 제자리 스케일링하고 scaler를 dataset에 기록 (두 번 스케일링 방지)
+- 피처 저장소 경로(이미 스케일링된 X)와 같은 모델
+"""
+import numpy as np
+from sklearn.preprocessing import StandardScaler
+
+from app.models.seat_recommender import SeatRecommender, fit_scaler_in_chunks
+
+
+def unscaled(training_set) -> dict:
+    """피처 저장소 결과를 스케일링 전 float32 배열 묶음으로 되돌림"""
+    scaler = training_set["scaler"]
+    X = (training_set["X"] * scaler.scale_ + scaler.mean_).astype(np.float32)
+    return {**training_set, "X": X, "scaler": None}
+
+
+def test_chunked_scaler_matches_fit(training_set):
+    X = unscaled(training_set)["X"]
+
+    chunked = fit_scaler_in_chunks(X, chunk_rows=7)
+    full = StandardScaler().fit(X)
+
+    np.testing.assert_allclose(chunked.mean_, full.mean_, rtol=1e-6, atol=1e-6)
+    np.testing.assert_allclose(chunked.scale_, full.scale_, rtol=1e-5, atol=1e-6)
+
+
+def test_float32_input_scaled_in_place_once(training_set, trained_model):
+    dataset = unscaled(training_set)
+    X = dataset["X"]
+
+    model = SeatRecommender()
+    model.train_arrays(dataset)
+
+    assert dataset["X"] is X
+    assert dataset["scaler"] is model.scaler
+    np.testing.assert_allclose(X, training_set["X"], atol=1e-4)
+    np.testing.assert_allclose(model.scaler.mean_, trained_model.scaler.mean_, rtol=1e-5, atol=1e-5)
+
+    # 같은 dataset으로 다시 학습해도 스케일링 결과 유지
+    SeatRecommender().train_arrays(dataset)
+    np.testing.assert_allclose(dataset["X"], training_set["X"], atol=1e-4)
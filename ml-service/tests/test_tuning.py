@@ -0,0 +1,63 @@
+"""
+하이퍼파라미터 탐색 (app/models/tuning.py)
+
+- 캐시 키 = 코퍼스 지문 + 피처 설정 지문 (통계 반감기가 바뀌면 새로 생성)
+- 하이퍼파라미터만 바뀐 경우는 같은 캐시 재사용
+- 폴드마다 학습 폴드로만 스케일러 학습, /train과 같은 학습 절차로 평가
+"""
+import numpy as np
+
+from app.config import settings
+from app.models import tuning
+
+
+def test_cache_key_follows_feature_config(monkeypatch):
+    path = tuning.feature_cache_path("corpus")
+
+    assert tuning.feature_cache_path("other") != path
+    monkeypatch.setattr(settings, "MEMBER_STATS_HALF_LIFE_DAYS", settings.MEMBER_STATS_HALF_LIFE_DAYS + 30)
+    assert tuning.feature_cache_path("corpus") != path
+
+
+def test_cache_reused_until_half_life_changes(monkeypatch, tmp_path, training_set):
+    monkeypatch.setattr(settings, "FEATURE_CACHE_DIR", str(tmp_path))
+    first = tuning.load_feature_cache(training_set, "corpus")
+
+    # 캐시 적중: 입력 배열을 다시 읽지 않음
+    cached = tuning.load_feature_cache({}, "corpus")
+    np.testing.assert_array_equal(cached["X"], first["X"])
+
+    monkeypatch.setattr(settings, "MEMBER_STATS_HALF_LIFE_DAYS", settings.MEMBER_STATS_HALF_LIFE_DAYS + 30)
+    tuning.load_feature_cache(training_set, "corpus")
+    assert len(list(tmp_path.glob("features-*.npz"))) == 2
+
+
+def test_run_search_fits_folds_like_training(monkeypatch, tmp_path, training_set):
+    monkeypatch.setattr(settings, "FEATURE_CACHE_DIR", str(tmp_path))
+    scaled_rows = []
+    fit_scaler = tuning.fit_scaler_in_chunks
+    monkeypatch.setattr(tuning, "fit_scaler_in_chunks", lambda X: scaled_rows.append(len(X)) or fit_scaler(X))
+    grid = {"n_estimators": [1, 40], "max_depth": [1, 3]}
+
+    report = tuning.run_search(training_set, "corpus", grid=grid, n_folds=3, n_jobs=1)
+
+    # 스케일러는 폴드마다 학습 폴드로만 학습
+    n_rows = len(training_set["X"])
+    assert len(scaled_rows) == 4 * 3
+    assert all(rows < n_rows for rows in scaled_rows)
+    assert sum(scaled_rows[:3]) == 2 * n_rows
+
+    for name in ("row", "col"):
+        best = report["best"][name]
+        assert best["params"]["n_estimators"] == 40  # 트리 하나짜리 설정보다 나음
+        assert best["metrics"][f"{name}_near_accuracy"] == max(
+            r["metrics"][f"{name}_near_accuracy"] for r in report["results"]
+        )
+        # 조기 종료 / 크기 선택을 거친 앙상블 크기
+        assert best["metrics"][f"{name}_n_estimators"] <= 40
+
+    # 피처 캐시 재사용: 입력 배열 없이 같은 결과
+    cached = tuning.run_search({}, "corpus", grid=grid, n_folds=3, n_jobs=1)
+    assert len(list(tmp_path.glob("features-*.npz"))) == 1
+    assert [r["params"] for r in cached["results"]] == [r["params"] for r in report["results"]]
+    assert cached["best"]["row"]["metrics"]["row_near_accuracy"] == report["best"]["row"]["metrics"]["row_near_accuracy"]
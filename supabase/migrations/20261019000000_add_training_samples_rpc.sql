@@ -0,0 +1,106 @@
+-- ML 학습 샘플 RPC: 좌석 1행 = 학습 샘플 1개
+-- ML 서비스(/train)가 원본 좌석을 받아 파이썬에서 조인/집계하던 것을 DB에서 처리
+-- - 좌석 시점의 파트, 키, 행/열 레이블
+-- - 대원 통계 (member_seat_statistics, 없으면 NULL)
+-- - 배치 컨텍스트 (배치별 파트 인원/비율, 총 인원) — JSON 학습 경로와 동일한 정의
+--   total_members: 배치의 전체 좌석 수 (SPECIAL 포함)
+--   *_ratio: 파트 좌석 수 / total_members
+-- 키셋 페이지네이션: id > p_after, p_low <= id < p_high, id 순, 최대 1000행
+-- 컨텍스트는 해당 페이지에 포함된 배치만 집계하므로 호출 비용은 페이지 크기에 비례
+
+CREATE OR REPLACE FUNCTION get_training_samples(
+  p_after UUID DEFAULT NULL,
+  p_limit INTEGER DEFAULT 1000,
+  p_low UUID DEFAULT NULL,
+  p_high UUID DEFAULT NULL
+)
+RETURNS TABLE (
+  id UUID,
+  arrangement_id UUID,
+  member_id UUID,
+  part part,
+  height_cm INTEGER,
+  seat_row INTEGER,
+  seat_col INTEGER,
+  arrangement_updated_at TIMESTAMPTZ,
+  preferred_row INTEGER,
+  preferred_col INTEGER,
+  row_consistency DOUBLE PRECISION,
+  col_consistency DOUBLE PRECISION,
+  is_fixed_seat BOOLEAN,
+  total_appearances INTEGER,
+  stats_updated_at TIMESTAMPTZ,
+  total_members INTEGER,
+  soprano_count INTEGER,
+  alto_count INTEGER,
+  tenor_count INTEGER,
+  bass_count INTEGER,
+  soprano_ratio DOUBLE PRECISION,
+  alto_ratio DOUBLE PRECISION,
+  tenor_ratio DOUBLE PRECISION,
+  bass_ratio DOUBLE PRECISION
+)
+LANGUAGE sql
+STABLE
+AS $$
+  WITH page AS (
+    SELECT s.id, s.arrangement_id, s.member_id, s.part, s.seat_row, s.seat_column
+    FROM seats s
+    WHERE (p_after IS NULL OR s.id > p_after)
+      AND (p_low IS NULL OR s.id >= p_low)
+      AND (p_high IS NULL OR s.id < p_high)
+    ORDER BY s.id
+    LIMIT LEAST(GREATEST(COALESCE(p_limit, 1000), 1), 1000)
+  ),
+  context AS (
+    SELECT
+      s.arrangement_id,
+      COUNT(*)::INTEGER AS total_members,
+      (COUNT(*) FILTER (WHERE s.part = 'SOPRANO'))::INTEGER AS soprano_count,
+      (COUNT(*) FILTER (WHERE s.part = 'ALTO'))::INTEGER AS alto_count,
+      (COUNT(*) FILTER (WHERE s.part = 'TENOR'))::INTEGER AS tenor_count,
+      (COUNT(*) FILTER (WHERE s.part = 'BASS'))::INTEGER AS bass_count
+    FROM seats s
+    WHERE s.arrangement_id IN (SELECT DISTINCT pg.arrangement_id FROM page pg)
+    GROUP BY s.arrangement_id
+  )
+  SELECT
+    pg.id,
+    pg.arrangement_id,
+    pg.member_id,
+    pg.part,
+    m.height_cm,
+    pg.seat_row,
+    pg.seat_column AS seat_col,
+    a.updated_at AS arrangement_updated_at,
+    st.preferred_row,
+    st.preferred_col,
+    st.row_consistency::DOUBLE PRECISION,
+    st.col_consistency::DOUBLE PRECISION,
+    st.is_fixed_seat,
+    st.total_appearances,
+    st.updated_at AS stats_updated_at,
+    c.total_members,
+    c.soprano_count,
+    c.alto_count,
+    c.tenor_count,
+    c.bass_count,
+    c.soprano_count::DOUBLE PRECISION / c.total_members,
+    c.alto_count::DOUBLE PRECISION / c.total_members,
+    c.tenor_count::DOUBLE PRECISION / c.total_members,
+    c.bass_count::DOUBLE PRECISION / c.total_members
+  FROM page pg
+  JOIN context c ON c.arrangement_id = pg.arrangement_id
+  JOIN arrangements a ON a.id = pg.arrangement_id
+  LEFT JOIN members m ON m.id = pg.member_id
+  LEFT JOIN member_seat_statistics st
+    ON st.member_id = pg.member_id AND st.total_appearances > 0
+  ORDER BY pg.id;
+$$;
+
+-- ML 서비스(service_role) 전용
+REVOKE ALL ON FUNCTION get_training_samples(UUID, INTEGER, UUID, UUID) FROM PUBLIC, anon, authenticated;
+GRANT EXECUTE ON FUNCTION get_training_samples(UUID, INTEGER, UUID, UUID) TO service_role;
+
+COMMENT ON FUNCTION get_training_samples(UUID, INTEGER, UUID, UUID) IS
+  'ML 학습 샘플 (좌석별 파트/통계/배치 컨텍스트) 키셋 페이지 조회 RPC';
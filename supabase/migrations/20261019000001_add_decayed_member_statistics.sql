@@ -0,0 +1,129 @@
+-- ML 서비스의 시간 감쇠 대원 통계를 트리거 통계와 분리해 저장
+-- - member_seat_statistics의 기존 통계 열(preferred_row, row_counts, col_sum 등)은
+--   seats 트리거(update_member_seat_statistics_on_seat_change)만 갱신
+-- - decayed_* 열은 ML 서비스 /stats/sync만 갱신 (반감기 MEMBER_STATS_HALF_LIFE_DAYS로 감쇠한 통계)
+-- - member_serving_statistics: 학습(get_training_samples, COPY)과 추천이 같은 기준으로 읽는 통계
+--   감쇠 통계가 동기화된 대원은 decayed_* 값, 아니면 트리거 값
+
+ALTER TABLE member_seat_statistics
+  ADD COLUMN IF NOT EXISTS decayed_preferred_row INTEGER,
+  ADD COLUMN IF NOT EXISTS decayed_preferred_col INTEGER,
+  ADD COLUMN IF NOT EXISTS decayed_row_consistency NUMERIC(5,2),
+  ADD COLUMN IF NOT EXISTS decayed_col_consistency NUMERIC(5,2),
+  ADD COLUMN IF NOT EXISTS decayed_is_fixed_seat BOOLEAN,
+  ADD COLUMN IF NOT EXISTS decayed_total_appearances INTEGER,
+  ADD COLUMN IF NOT EXISTS decayed_half_life_days DOUBLE PRECISION;  -- NULL이면 감쇠 통계 없음
+
+COMMENT ON COLUMN member_seat_statistics.decayed_half_life_days IS
+  'ML 서비스가 감쇠 통계(decayed_*)를 계산한 반감기 (일, 0이면 감쇠 없음). NULL이면 미동기화';
+
+CREATE OR REPLACE VIEW member_serving_statistics AS
+SELECT
+  st.id,
+  st.member_id,
+  CASE WHEN st.decayed_half_life_days IS NULL THEN st.preferred_row ELSE st.decayed_preferred_row END AS preferred_row,
+  CASE WHEN st.decayed_half_life_days IS NULL THEN st.preferred_col ELSE st.decayed_preferred_col END AS preferred_col,
+  CASE WHEN st.decayed_half_life_days IS NULL THEN st.row_consistency ELSE st.decayed_row_consistency END AS row_consistency,
+  CASE WHEN st.decayed_half_life_days IS NULL THEN st.col_consistency ELSE st.decayed_col_consistency END AS col_consistency,
+  CASE WHEN st.decayed_half_life_days IS NULL THEN st.is_fixed_seat ELSE st.decayed_is_fixed_seat END AS is_fixed_seat,
+  CASE WHEN st.decayed_half_life_days IS NULL THEN st.total_appearances ELSE st.decayed_total_appearances END AS total_appearances,
+  st.decayed_half_life_days AS stats_half_life_days,
+  st.updated_at
+FROM member_seat_statistics st
+WHERE st.total_appearances > 0 OR st.decayed_half_life_days IS NOT NULL;
+
+ALTER VIEW member_serving_statistics SET (security_invoker = on);
+GRANT SELECT ON member_serving_statistics TO authenticated, service_role;
+
+COMMENT ON VIEW member_serving_statistics IS
+  'ML 학습/추천용 대원 통계 (감쇠 통계가 있으면 decayed_*, 없으면 트리거 통계)';
+
+-- 학습 샘플 RPC: 추천과 같은 통계 기준 (member_serving_statistics)
+CREATE OR REPLACE FUNCTION get_training_samples(
+  p_after UUID DEFAULT NULL,
+  p_limit INTEGER DEFAULT 1000,
+  p_low UUID DEFAULT NULL,
+  p_high UUID DEFAULT NULL
+)
+RETURNS TABLE (
+  id UUID,
+  arrangement_id UUID,
+  member_id UUID,
+  part part,
+  height_cm INTEGER,
+  seat_row INTEGER,
+  seat_col INTEGER,
+  arrangement_updated_at TIMESTAMPTZ,
+  preferred_row INTEGER,
+  preferred_col INTEGER,
+  row_consistency DOUBLE PRECISION,
+  col_consistency DOUBLE PRECISION,
+  is_fixed_seat BOOLEAN,
+  total_appearances INTEGER,
+  stats_updated_at TIMESTAMPTZ,
+  total_members INTEGER,
+  soprano_count INTEGER,
+  alto_count INTEGER,
+  tenor_count INTEGER,
+  bass_count INTEGER,
+  soprano_ratio DOUBLE PRECISION,
+  alto_ratio DOUBLE PRECISION,
+  tenor_ratio DOUBLE PRECISION,
+  bass_ratio DOUBLE PRECISION
+)
+LANGUAGE sql
+STABLE
+AS $$
+  WITH page AS (
+    SELECT s.id, s.arrangement_id, s.member_id, s.part, s.seat_row, s.seat_column
+    FROM seats s
+    WHERE (p_after IS NULL OR s.id > p_after)
+      AND (p_low IS NULL OR s.id >= p_low)
+      AND (p_high IS NULL OR s.id < p_high)
+    ORDER BY s.id
+    LIMIT LEAST(GREATEST(COALESCE(p_limit, 1000), 1), 1000)
+  ),
+  context AS (
+    SELECT
+      s.arrangement_id,
+      COUNT(*)::INTEGER AS total_members,
+      (COUNT(*) FILTER (WHERE s.part = 'SOPRANO'))::INTEGER AS soprano_count,
+      (COUNT(*) FILTER (WHERE s.part = 'ALTO'))::INTEGER AS alto_count,
+      (COUNT(*) FILTER (WHERE s.part = 'TENOR'))::INTEGER AS tenor_count,
+      (COUNT(*) FILTER (WHERE s.part = 'BASS'))::INTEGER AS bass_count
+    FROM seats s
+    WHERE s.arrangement_id IN (SELECT DISTINCT pg.arrangement_id FROM page pg)
+    GROUP BY s.arrangement_id
+  )
+  SELECT
+    pg.id,
+    pg.arrangement_id,
+    pg.member_id,
+    pg.part,
+    m.height_cm,
+    pg.seat_row,
+    pg.seat_column AS seat_col,
+    a.updated_at AS arrangement_updated_at,
+    st.preferred_row,
+    st.preferred_col,
+    st.row_consistency::DOUBLE PRECISION,
+    st.col_consistency::DOUBLE PRECISION,
+    st.is_fixed_seat,
+    st.total_appearances,
+    st.updated_at AS stats_updated_at,
+    c.total_members,
+    c.soprano_count,
+    c.alto_count,
+    c.tenor_count,
+    c.bass_count,
+    c.soprano_count::DOUBLE PRECISION / c.total_members,
+    c.alto_count::DOUBLE PRECISION / c.total_members,
+    c.tenor_count::DOUBLE PRECISION / c.total_members,
+    c.bass_count::DOUBLE PRECISION / c.total_members
+  FROM page pg
+  JOIN context c ON c.arrangement_id = pg.arrangement_id
+  JOIN arrangements a ON a.id = pg.arrangement_id
+  LEFT JOIN members m ON m.id = pg.member_id
+  LEFT JOIN member_serving_statistics st ON st.member_id = pg.member_id
+  ORDER BY pg.id;
+$$;